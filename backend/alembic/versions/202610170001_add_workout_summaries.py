@@ -0,0 +1,45 @@
+"""Add workout_summaries table
+
+Revision ID: 202610170001
+Revises: 202602010002
+Create Date: 2026-10-17
+
+This migration creates the workout_summaries read model holding precomputed
+per-workout stats (tonnage, top sets, AMRAP results, failed sets). Summaries are
+written when a workout is completed; existing completed workouts are summarized
+by running `python -m app.commands.backfill_workout_summaries` after upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202610170001'
+down_revision: Union[str, None] = '202602010002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'workout_summaries',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('workout_id', sa.String(36), sa.ForeignKey('workouts.id'), nullable=False),
+        sa.Column('program_id', sa.String(36), sa.ForeignKey('programs.id'), nullable=False),
+        sa.Column('completed_date', sa.DateTime(), nullable=False),
+        sa.Column('total_tonnage', sa.Float(), nullable=False),
+        sa.Column('accessory_volume', sa.Float(), nullable=False),
+        sa.Column('failed_set_count', sa.Integer(), nullable=False),
+        sa.Column('lift_stats', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False)
+    )
+    op.create_index('ix_workout_summaries_workout_id', 'workout_summaries', ['workout_id'], unique=True)
+    op.create_index('ix_workout_summaries_program_id', 'workout_summaries', ['program_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_workout_summaries_program_id', table_name='workout_summaries')
+    op.drop_index('ix_workout_summaries_workout_id', table_name='workout_summaries')
+    op.drop_table('workout_summaries')
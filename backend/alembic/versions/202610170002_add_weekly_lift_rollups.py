@@ -0,0 +1,51 @@
+"""Add weekly_lift_rollups table
+
+Revision ID: 202610170002
+Revises: 202610170001
+Create Date: 2026-10-17
+
+This migration creates weekly per-lift rollups keyed by (user_id, lift_type,
+ISO week start) that back the volume, tonnage and consistency analytics.
+Populate them for existing history by running
+`python -m app.commands.rebuild_lift_rollups` after upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202610170002'
+down_revision: Union[str, None] = '202610170001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'weekly_lift_rollups',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('user_id', sa.String(36), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column(
+            'lift_type',
+            postgresql.ENUM('SQUAT', 'DEADLIFT', 'BENCH_PRESS', 'PRESS', name='lifttype', create_type=False),
+            nullable=False
+        ),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('sessions_completed', sa.Integer(), nullable=False),
+        sa.Column('sessions_skipped', sa.Integer(), nullable=False),
+        sa.Column('set_count', sa.Integer(), nullable=False),
+        sa.Column('total_reps', sa.Integer(), nullable=False),
+        sa.Column('tonnage', sa.Float(), nullable=False),
+        sa.Column('best_e1rm', sa.Float(), nullable=True),
+        sa.Column('failed_targets', sa.Integer(), nullable=False),
+        sa.UniqueConstraint('user_id', 'lift_type', 'week_start', name='uq_weekly_lift_rollup')
+    )
+    op.create_index('ix_weekly_lift_rollups_user_id', 'weekly_lift_rollups', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_weekly_lift_rollups_user_id', table_name='weekly_lift_rollups')
+    op.drop_table('weekly_lift_rollups')
@@ -0,0 +1,42 @@
+"""Add equipment_profiles table
+
+Revision ID: 202610170003
+Revises: 202610170002
+Create Date: 2026-10-17
+
+This migration creates equipment_profiles: per-user bar weight and plate
+inventories. The user's default profile replaces rounding_increment when
+prescribing weights; users without a profile keep increment rounding.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202610170003'
+down_revision: Union[str, None] = '202610170002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'equipment_profiles',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('user_id', sa.String(36), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('weight_unit', postgresql.ENUM('LBS', 'KG', name='weightunit', create_type=False), nullable=False),
+        sa.Column('bar_weight', sa.Float(), nullable=False),
+        sa.Column('is_default', sa.Boolean(), nullable=False),
+        sa.Column('plates', sa.JSON(), nullable=False),
+        sa.Column('microplates', sa.JSON(), nullable=False)
+    )
+    op.create_index('ix_equipment_profiles_user_id', 'equipment_profiles', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_equipment_profiles_user_id', table_name='equipment_profiles')
+    op.drop_table('equipment_profiles')
@@ -0,0 +1,60 @@
+"""Add schedule mode columns to programs
+
+Revision ID: 202610170004
+Revises: 202610170003
+Create Date: 2026-10-17
+
+This migration adds programs.schedule_mode, scheduled_cycles and
+schedule_shifts. Programs in VIRTUAL mode compute upcoming workouts from
+their training days and training maxes and only write a workouts row when a
+workout is completed or skipped. Existing programs stay MATERIALIZED;
+scheduled_cycles is backfilled from their highest generated cycle.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202610170004'
+down_revision: Union[str, None] = '202610170003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+schedulemode = postgresql.ENUM('MATERIALIZED', 'VIRTUAL', name='schedulemode')
+
+
+def upgrade() -> None:
+    schedulemode.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        'programs',
+        sa.Column(
+            'schedule_mode',
+            postgresql.ENUM('MATERIALIZED', 'VIRTUAL', name='schedulemode', create_type=False),
+            nullable=False,
+            server_default='MATERIALIZED'
+        )
+    )
+    op.add_column('programs', sa.Column('scheduled_cycles', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('programs', sa.Column('schedule_shifts', sa.JSON(), nullable=True))
+
+    op.execute(
+        """
+        UPDATE programs SET scheduled_cycles = latest.cycle_number
+        FROM (
+            SELECT program_id, MAX(cycle_number) AS cycle_number
+            FROM workouts GROUP BY program_id
+        ) AS latest
+        WHERE latest.program_id = programs.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('programs', 'schedule_shifts')
+    op.drop_column('programs', 'scheduled_cycles')
+    op.drop_column('programs', 'schedule_mode')
+    schedulemode.drop(op.get_bind(), checkfirst=True)
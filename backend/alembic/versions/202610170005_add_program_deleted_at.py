@@ -0,0 +1,32 @@
+"""Add deleted_at to programs
+
+Revision ID: 202610170005
+Revises: 202610170004
+Create Date: 2026-10-17
+
+This migration adds programs.deleted_at. Deleting a program now only sets
+this column, which hides the program from every query; its workouts and
+other rows are purged afterwards by a background task or by
+`python -m app.commands.purge_deleted_programs`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202610170005'
+down_revision: Union[str, None] = '202610170004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('programs', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_programs_deleted_at', 'programs', ['deleted_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_programs_deleted_at', table_name='programs')
+    op.drop_column('programs', 'deleted_at')
@@ -0,0 +1,71 @@
+"""Add best_rep_maxes table
+
+Revision ID: 202610170006
+Revises: 202610170005
+Create Date: 2026-10-17
+
+This migration creates best_rep_maxes: the current best per (user, lift,
+reps, unit), upserted when a PR is logged. rep_maxes stays as the
+append-only log. Existing logs are backfilled with the heaviest entry per
+key; each best reuses its log entry's id.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202610170006'
+down_revision: Union[str, None] = '202610170005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'best_rep_maxes',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('user_id', sa.String(36), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column(
+            'lift_type',
+            postgresql.ENUM('SQUAT', 'DEADLIFT', 'BENCH_PRESS', 'PRESS', name='lifttype', create_type=False),
+            nullable=False
+        ),
+        sa.Column('reps', sa.Integer(), nullable=False),
+        sa.Column(
+            'weight_unit',
+            postgresql.ENUM('LBS', 'KG', name='weightunit', create_type=False),
+            nullable=False
+        ),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.Column('calculated_1rm', sa.Float(), nullable=False),
+        sa.Column('achieved_date', sa.Date(), nullable=False),
+        sa.Column('rep_max_id', sa.String(36), sa.ForeignKey('rep_maxes.id'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('user_id', 'lift_type', 'reps', 'weight_unit', name='uq_best_rep_max')
+    )
+
+    op.execute(
+        """
+        INSERT INTO best_rep_maxes (
+            id, user_id, lift_type, reps, weight_unit, weight, calculated_1rm,
+            achieved_date, rep_max_id, updated_at
+        )
+        SELECT id, user_id, lift_type, reps, weight_unit, weight, calculated_1rm,
+               achieved_date, id, created_at
+        FROM (
+            SELECT rep_maxes.*, ROW_NUMBER() OVER (
+                PARTITION BY user_id, lift_type, reps, weight_unit
+                ORDER BY weight DESC, achieved_date, created_at
+            ) AS weight_rank
+            FROM rep_maxes
+        ) AS ranked
+        WHERE weight_rank = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('best_rep_maxes')
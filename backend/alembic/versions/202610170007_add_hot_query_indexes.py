@@ -0,0 +1,42 @@
+"""Add composite indexes for hot query filters
+
+Revision ID: 202610170007
+Revises: 202610170006
+Create Date: 2026-10-17
+
+This migration adds composite indexes matching the filters the services
+apply most: workouts by (program_id, status, scheduled_date), workout_sets
+by (workout_id, set_type, set_number) and (workout_id, is_target_met),
+rep_maxes by (user_id, lift_type, achieved_date) and training_maxes by
+(program_id, lift_type, cycle_number). tests/test_query_plans.py checks the
+hot queries keep using indexes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202610170007'
+down_revision: Union[str, None] = '202610170006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_workouts_program_status_date', 'workouts', ['program_id', 'status', 'scheduled_date']),
+    ('ix_workout_sets_workout_type_number', 'workout_sets', ['workout_id', 'set_type', 'set_number']),
+    ('ix_workout_sets_workout_target_met', 'workout_sets', ['workout_id', 'is_target_met']),
+    ('ix_rep_maxes_user_lift_date', 'rep_maxes', ['user_id', 'lift_type', 'achieved_date']),
+    ('ix_training_maxes_program_lift_cycle', 'training_maxes', ['program_id', 'lift_type', 'cycle_number']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,34 @@
+"""Add job_locks table
+
+Revision ID: 202610170008
+Revises: 202610170007
+Create Date: 2026-10-17
+
+This migration creates named locks that background jobs take before running,
+so the in-process missed-workout job runs once even when several API workers
+have it enabled.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202610170008'
+down_revision: Union[str, None] = '202610170007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_locks',
+        sa.Column('name', sa.String(100), primary_key=True),
+        sa.Column('locked_by', sa.String(36), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_locks')
@@ -0,0 +1,5 @@
+"""
+Command-line maintenance commands.
+
+Run with `python -m app.commands.<name>` from the backend directory.
+"""
@@ -0,0 +1,43 @@
+"""
+Create workout summaries for completed workouts logged before summaries existed.
+
+Usage:
+    python -m app.commands.backfill_workout_summaries [--batch-size 500]
+"""
+import argparse
+from typing import List, Optional
+from app.database import SessionLocal
+from app.services.analytics import AnalyticsService
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Backfill missing workout summaries.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Backfill missing workout summaries.")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Workouts summarized per transaction (default: 500)"
+    )
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        created = AnalyticsService.backfill_workout_summaries(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"Created {created} workout summaries")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
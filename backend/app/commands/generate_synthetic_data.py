@@ -0,0 +1,88 @@
+"""
+Fill a database with synthetic users and multi-year training histories.
+
+Meant for load and scale testing: sizing indexes, caches and batch jobs
+against realistic volumes. Writes to DATABASE_URL (SQLite or PostgreSQL),
+which must already be migrated with `alembic upgrade head`; never point it
+at production. Every generated user's password is --password.
+
+Usage:
+    python -m app.commands.generate_synthetic_data --users N [--years 5] [--seed S]
+        [--batch-size 20] [--skip-derived] [--password PASSWORD]
+"""
+import argparse
+from typing import List, Optional
+from app.database import SessionLocal
+from app.services.synthetic_data import SyntheticDataGenerator, SyntheticDataStats
+
+
+def _print_progress(stats: SyntheticDataStats) -> None:
+    print(
+        f"batch {stats.batches}: {stats.users} users, {stats.programs} programs, "
+        f"{stats.workouts} workouts, {stats.sets} sets, {stats.rep_maxes} PRs "
+        f"in {stats.elapsed_seconds:.1f}s",
+        flush=True
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Generate synthetic users and their training histories.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Generate synthetic users with multi-year training histories.")
+    parser.add_argument("--users", type=int, required=True, help="Number of users to generate")
+    parser.add_argument("--years", type=float, default=5.0, help="Years of history per user (default: 5)")
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for repeatable data; use a different seed for each run into the same database"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=20,
+        help="Users written per transaction (default: 20)"
+    )
+    parser.add_argument(
+        "--skip-derived",
+        action="store_true",
+        help="Don't build best rep maxes, workout summaries and weekly rollups for each batch"
+    )
+    parser.add_argument(
+        "--password",
+        default="loadtest-password",
+        help="Password of every generated user (default: loadtest-password)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.users < 1 or args.batch_size < 1 or args.years <= 0:
+        parser.error("--users, --batch-size and --years must be positive")
+
+    db = SessionLocal()
+    try:
+        generator = SyntheticDataGenerator(db, seed=args.seed, years=args.years, password=args.password)
+        stats = generator.run(
+            args.users,
+            batch_size=args.batch_size,
+            rebuild_derived=not args.skip_derived,
+            on_batch=_print_progress
+        )
+    finally:
+        db.close()
+
+    print(
+        f"Generated {stats.users} users: {stats.programs} programs, {stats.workouts} workouts, "
+        f"{stats.sets} sets and {stats.rep_maxes} PRs in {stats.elapsed_seconds:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""
+Skip or reschedule every user's missed workouts according to their preference.
+
+Meant to run nightly from cron or a scheduled task. Large user bases can be
+split across parallel processes with --shard-index/--shard-count.
+
+Usage:
+    python -m app.commands.process_missed_workouts [--shard-index 0 --shard-count 1]
+        [--chunk-size 500] [--date YYYY-MM-DD]
+"""
+import argparse
+from datetime import date
+from typing import List, Optional
+from app.database import SessionLocal
+from app.services.missed_workouts import MissedWorkoutBatchService, MissedWorkoutRunStats
+
+
+def _print_progress(stats: MissedWorkoutRunStats) -> None:
+    print(
+        f"chunk {stats.chunks}: {stats.users} users, {stats.workouts_skipped} skipped, "
+        f"{stats.workouts_rescheduled} rescheduled ({stats.workouts_shifted} moved) "
+        f"in {stats.elapsed_seconds:.1f}s",
+        flush=True
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Process missed workouts for one shard of users.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Skip or reschedule missed workouts for all users.")
+    parser.add_argument("--shard-index", type=int, default=0, help="Shard to process (default: 0)")
+    parser.add_argument("--shard-count", type=int, default=1, help="Number of shards (default: 1)")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help="Users processed per transaction (default: 500)"
+    )
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=None,
+        help="Treat workouts before this date as missed (default: today)"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        MissedWorkoutBatchService.shard_bounds(args.shard_index, args.shard_count)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    db = SessionLocal()
+    try:
+        stats = MissedWorkoutBatchService.run(
+            db,
+            today=args.date,
+            shard_index=args.shard_index,
+            shard_count=args.shard_count,
+            chunk_size=args.chunk_size,
+            on_chunk=_print_progress
+        )
+    finally:
+        db.close()
+
+    print(
+        f"Processed {stats.users} users: {stats.workouts_skipped} skipped, "
+        f"{stats.workouts_rescheduled} rescheduled ({stats.workouts_shifted} workouts moved) "
+        f"in {stats.elapsed_seconds:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,41 @@
+"""
+Purge soft-deleted programs that are still waiting for their background purge.
+
+Deleting a program hides it at once and purges it after the response; this
+command cleans up after purges that never ran (for example on a restart).
+
+Usage:
+    python -m app.commands.purge_deleted_programs [--limit N]
+"""
+import argparse
+from typing import List, Optional
+from app.database import SessionLocal
+from app.services.program import ProgramService
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Purge soft-deleted programs and their data.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Purge soft-deleted programs.")
+    parser.add_argument("--limit", type=int, help="Purge at most this many programs")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        purged = ProgramService.purge_deleted_programs(db, limit=args.limit)
+    finally:
+        db.close()
+
+    print(f"Purged {purged} deleted programs")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,44 @@
+"""
+Rebuild the weekly lift rollups by replaying logged workouts.
+
+Usage:
+    python -m app.commands.rebuild_lift_rollups [--user-id ID] [--batch-size 500]
+"""
+import argparse
+from typing import List, Optional
+from app.database import SessionLocal
+from app.services.analytics import AnalyticsService
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Replay completed and skipped workouts into the weekly lift rollups.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Rebuild weekly lift rollups from workout sets.")
+    parser.add_argument("--user-id", help="Only rebuild this user's rollups")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Workouts read per query (default: 500)"
+    )
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        written = AnalyticsService.rebuild_lift_rollups(db, args.user_id, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"Wrote {written} weekly lift rollups")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
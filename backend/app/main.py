@@ -1,9 +1,44 @@
 """
 Main FastAPI application.
 """
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from anyio import to_thread
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.config import settings
+from app.database import engine
+from app.utils.auth_cache import auth_cache
+from app.utils.metrics import UNMATCHED_ROUTE, metrics_collector
+from app.utils.missed_workout_scheduler import missed_workout_scheduler
+from app.utils.password_hasher import password_hasher
+from app.utils.profiler import request_profiler
+from app.utils.program_cache import program_detail_cache
+from app.utils.query_tracker import query_tracker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Size the threadpool that runs sync endpoints and dependencies.
+
+    Routers are plain `def` functions using the sync SQLAlchemy session, so
+    FastAPI runs each request in a worker thread instead of blocking the
+    event loop. Also starts the daily missed-workout job when enabled.
+    """
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
+    if not settings.MISSED_WORKOUT_JOB_ENABLED:
+        yield
+        return
+
+    missed_workout_scheduler.start()
+    try:
+        yield
+    finally:
+        missed_workout_scheduler.stop()
+
 
 # Initialize FastAPI app
 # Note: Database tables are created via Alembic migrations, not here
@@ -12,7 +47,8 @@ app = FastAPI(
     version="0.1.0",
     docs_url=f"/api/{settings.API_VERSION}/docs",
     redoc_url=f"/api/{settings.API_VERSION}/redoc",
-    openapi_url=f"/api/{settings.API_VERSION}/openapi.json"
+    openapi_url=f"/api/{settings.API_VERSION}/openapi.json",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -27,6 +63,67 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def track_queries(request: Request, call_next):
+    """
+    Report each request's SQL statement count and database time.
+
+    Adds X-DB-Query-Count and X-DB-Time-Ms to every response, and
+    X-DB-Repeated-Queries (executions of the most repeated statement) when a
+    statement repeats often enough to be a likely N+1.
+    """
+    stats = query_tracker.start_request()
+    response = await call_next(request)
+    if stats is None:
+        return response
+
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    repeated = query_tracker.finish_request(stats, f"{request.method} {route}")
+    response.headers["X-DB-Query-Count"] = str(stats.count)
+    response.headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+    if repeated:
+        response.headers["X-DB-Repeated-Queries"] = str(repeated[0][1])
+    return response
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record each request's latency by route template and count requests in flight."""
+    if not metrics_collector.enabled:
+        return await call_next(request)
+
+    metrics_collector.request_started()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", UNMATCHED_ROUTE)
+        metrics_collector.request_finished(
+            request.method, route, status_code, time.perf_counter() - started
+        )
+
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """
+    Profile requests that carry a valid X-Profile-Token header.
+
+    The profile id is returned in X-Profile-Id; the profile itself is read
+    from /api/v1/profiles. Requests with a missing or wrong token run as usual.
+    """
+    if not request_profiler.authorized(request.headers.get("X-Profile-Token")):
+        return await call_next(request)
+
+    profile = request_profiler.start(request.method, request.url.path)
+    response = await call_next(request)
+    request_profiler.finish(profile, response.status_code)
+    response.headers["X-Profile-Id"] = profile.id
+    return response
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -43,8 +140,24 @@ async def health_check():
     return {"status": "healthy"}
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def metrics():
+        """Metrics endpoint in the Prometheus text exposition format."""
+        body = metrics_collector.render(
+            pool=engine.pool,
+            caches={"auth": auth_cache.metrics(), "program_detail": program_detail_cache.metrics()},
+            components={
+                "password_hasher": password_hasher.metrics(),
+                "missed_workout_job": missed_workout_scheduler.metrics(),
+                "query_tracker": query_tracker.metrics()
+            }
+        )
+        return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # Import routers
-from app.routers import auth, users, programs, exercises, workouts, rep_maxes, warmup_templates, analytics # noqa: E402
+from app.routers import auth, users, programs, exercises, workouts, rep_maxes, warmup_templates, analytics, equipment_profiles, profiles # noqa: E402
 
 # Include routers
 app.include_router(
@@ -94,3 +207,15 @@ app.include_router(
     prefix=f"/api/{settings.API_VERSION}/analytics",
     tags=["Analytics"]
 )
+
+app.include_router(
+    equipment_profiles.router,
+    prefix=f"/api/{settings.API_VERSION}/equipment-profiles",
+    tags=["Equipment Profiles"]
+)
+
+app.include_router(
+    profiles.router,
+    prefix=f"/api/{settings.API_VERSION}/profiles",
+    tags=["Profiling"]
+)
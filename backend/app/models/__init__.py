@@ -6,7 +6,10 @@ from app.models.program import Program, TrainingMax, TrainingMaxHistory, Program
 from app.models.exercise import Exercise
 from app.models.workout import Workout, WorkoutSet, WorkoutMainLift
 from app.models.warmup import WarmupTemplate
-from app.models.rep_max import RepMax
+from app.models.rep_max import RepMax, BestRepMax
+from app.models.analytics import WorkoutSummary, WeeklyLiftRollup
+from app.models.equipment import EquipmentProfile
+from app.models.job_lock import JobLock
 
 __all__ = [
     "User",
@@ -21,4 +24,9 @@ __all__ = [
     "WorkoutMainLift",
     "WarmupTemplate",
     "RepMax",
+    "BestRepMax",
+    "WorkoutSummary",
+    "WeeklyLiftRollup",
+    "EquipmentProfile",
+    "JobLock",
 ]
@@ -0,0 +1,68 @@
+"""
+Analytics read models derived from logged workouts.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import (
+    Column, String, Integer, Float, Date, DateTime, ForeignKey, JSON, Enum as SQLEnum, UniqueConstraint
+)
+from app.database import Base
+from app.models.program import LiftType
+
+
+class WorkoutSummary(Base):
+    """Precomputed statistics for a completed workout, written when it is completed."""
+
+    __tablename__ = "workout_summaries"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    workout_id = Column(String(36), ForeignKey("workouts.id"), nullable=False, unique=True, index=True)
+    program_id = Column(String(36), ForeignKey("programs.id"), nullable=False, index=True)
+    completed_date = Column(DateTime, nullable=False)
+
+    total_tonnage = Column(Float, nullable=False, default=0.0)  # Main lift weight x reps (warmup + working)
+    accessory_volume = Column(Float, nullable=False, default=0.0)  # Accessory weight x reps
+    failed_set_count = Column(Integer, nullable=False, default=0)  # Working/AMRAP sets below target
+
+    # Per-lift stats keyed by lift type:
+    # {"SQUAT": {"tonnage": float, "top_set_weight": float, "top_set_reps": int,
+    #            "amrap_reps": int|null, "amrap_weight": float|null, "estimated_1rm": float|null,
+    #            "failed_sets": int}, ...}
+    lift_stats = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<WorkoutSummary Workout {self.workout_id}>"
+
+
+
+class WeeklyLiftRollup(Base):
+    """
+    Running totals for one lift in one ISO week for a user.
+
+    Updated incrementally when workouts are completed or skipped and rebuilt
+    from workout_sets with `python -m app.commands.rebuild_lift_rollups`.
+    """
+
+    __tablename__ = "weekly_lift_rollups"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
+    lift_type = Column(SQLEnum(LiftType, name='lifttype', create_type=False), nullable=False)
+    week_start = Column(Date, nullable=False)  # Monday of the ISO week
+
+    sessions_completed = Column(Integer, nullable=False, default=0)  # Completed workouts including this lift
+    sessions_skipped = Column(Integer, nullable=False, default=0)  # Skipped workouts including this lift
+    set_count = Column(Integer, nullable=False, default=0)  # Warmup + working sets
+    total_reps = Column(Integer, nullable=False, default=0)
+    tonnage = Column(Float, nullable=False, default=0.0)  # Weight x reps over warmup + working sets
+    best_e1rm = Column(Float, nullable=True)  # Best estimated 1RM from a working set
+    failed_targets = Column(Integer, nullable=False, default=0)  # Working/AMRAP sets below target
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'lift_type', 'week_start', name='uq_weekly_lift_rollup'),
+    )
+
+    def __repr__(self):
+        return f"<WeeklyLiftRollup {self.user_id} {self.lift_type} {self.week_start}>"
@@ -0,0 +1,30 @@
+"""
+Equipment profile model.
+"""
+import uuid
+from sqlalchemy import Column, String, Float, Boolean, ForeignKey, JSON, Enum as SQLEnum
+from app.database import Base
+from app.models.user import WeightUnit
+
+
+class EquipmentProfile(Base):
+    """A bar and plate inventory the user trains with."""
+
+    __tablename__ = "equipment_profiles"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
+
+    name = Column(String(100), nullable=False)
+    weight_unit = Column(SQLEnum(WeightUnit, name='weightunit', create_type=False), nullable=False)
+    bar_weight = Column(Float, nullable=False)
+
+    # Whether prescriptions are rounded to this profile (one per user)
+    is_default = Column(Boolean, default=False, nullable=False)
+
+    # JSON arrays: [{"weight": float, "pairs": int|null}, ...]; null pairs = unlimited
+    plates = Column(JSON, nullable=False)
+    microplates = Column(JSON, nullable=False, default=list)
+
+    def __repr__(self):
+        return f"<EquipmentProfile {self.name}>"
@@ -0,0 +1,23 @@
+"""
+Job lock model.
+"""
+from sqlalchemy import Column, String, DateTime
+from app.database import Base
+
+
+class JobLock(Base):
+    """
+    A named lock that keeps a background job to one run at a time across processes.
+
+    A row is held while locked_until is in the future; an expired lock can be
+    taken over, so a crashed holder doesn't block the job for good.
+    """
+
+    __tablename__ = "job_locks"
+
+    name = Column(String(100), primary_key=True)
+    locked_by = Column(String(36), nullable=True)  # Token of the run holding the lock
+    locked_until = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<JobLock {self.name}>"
@@ -4,7 +4,8 @@ Program and training max models.
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Float, Date, DateTime, ForeignKey, Text, JSON, Enum as SQLEnum, UniqueConstraint
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, ForeignKey, Text, JSON, Index, Enum as SQLEnum, UniqueConstraint, event
+from sqlalchemy.orm import Session, with_loader_criteria
 from app.database import Base
 
 
@@ -23,6 +24,12 @@ class LiftType(str, enum.Enum):
     PRESS = "PRESS"
 
 
+class ScheduleMode(str, enum.Enum):
+    """How a program's upcoming workouts are stored."""
+    MATERIALIZED = "MATERIALIZED"  # Workout rows are written when each cycle is generated
+    VIRTUAL = "VIRTUAL"  # Workouts are computed on demand and written when completed or skipped
+
+
 class TrainingMaxReason(str, enum.Enum):
     """Reason for training max change."""
     INITIAL = "INITIAL"
@@ -51,12 +58,46 @@ class Program(Base):
     include_deload = Column(Integer, default=1, nullable=False)  # 1 = include deload week, 0 = skip deload
     status = Column(SQLEnum(ProgramStatus, name='programstatus', create_type=False), default=ProgramStatus.ACTIVE, nullable=False)
 
+    schedule_mode = Column(SQLEnum(ScheduleMode, name='schedulemode', create_type=False), default=ScheduleMode.MATERIALIZED, nullable=False)
+    scheduled_cycles = Column(Integer, default=1, nullable=False)  # Cycles generated so far
+    # Virtual mode only: reschedules as [{"from": "2026-01-05", "days": 2}, ...], applied in order
+    schedule_shifts = Column(JSON, nullable=True)
+
+    # Set when the user deletes the program; its rows are purged in the background
+    deleted_at = Column(DateTime, nullable=True, index=True)
+
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     def __repr__(self):
         return f"<Program {self.name}>"
 
 
+@event.listens_for(Session, "do_orm_execute")
+def _hide_deleted_programs(execute_state):
+    """
+    Leave soft-deleted programs out of every ORM query.
+
+    Applies wherever Program appears in a SELECT, including joins from
+    workouts, so a deleted program's data disappears as soon as deleted_at
+    is set. Pass execution_options(include_deleted=True) to see them.
+    """
+    if execute_state.is_relationship_load:
+        # Once any do_orm_execute listener exists, SQLAlchemy hands the parent
+        # query's yield_per to selectinload queries, which then refuse to run
+        if execute_state.execution_options.get("yield_per"):
+            execute_state.update_execution_options(yield_per=None)
+        return
+
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(Program, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
+
+
 class TrainingMax(Base):
     """Current training max for a lift."""
 
@@ -74,6 +115,11 @@ class TrainingMax(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # Current and per-cycle training max lookups
+        Index('ix_training_maxes_program_lift_cycle', 'program_id', 'lift_type', 'cycle_number'),
+    )
+
     def __repr__(self):
         return f"<TrainingMax {self.lift_type}: {self.value}>"
 
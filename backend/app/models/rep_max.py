@@ -3,14 +3,19 @@ Rep max (personal records) model.
 """
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Float, Date, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, ForeignKey, Index, Enum as SQLEnum, UniqueConstraint
 from app.database import Base
 from app.models.program import LiftType
 from app.models.workout import WeightUnit
 
 
 class RepMax(Base):
-    """Personal record for a specific rep range."""
+    """
+    Personal record for a specific rep range.
+
+    Append-only log: a row is added for every PR. The current best per rep
+    range is kept in BestRepMax.
+    """
 
     __tablename__ = "rep_maxes"
 
@@ -30,5 +35,45 @@ class RepMax(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # Recent PRs of a lift (suggested training max); per-rep bests are in best_rep_maxes
+        Index('ix_rep_maxes_user_lift_date', 'user_id', 'lift_type', 'achieved_date'),
+    )
+
     def __repr__(self):
         return f"<RepMax {self.lift_type} {self.reps}RM: {self.weight} {self.weight_unit}>"
+
+
+class BestRepMax(Base):
+    """
+    Current best for one lift, rep count and unit of a user.
+
+    Upserted alongside each new RepMax row, so PR checks are a single
+    lookup on the unique key and the rep max screens read one row per rep
+    range instead of the whole log. Rebuilt from rep_maxes with
+    RepMaxService.rebuild_best_rep_maxes.
+    """
+
+    __tablename__ = "best_rep_maxes"
+    __table_args__ = (
+        UniqueConstraint("user_id", "lift_type", "reps", "weight_unit", name="uq_best_rep_max"),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)  # Leads the unique key
+
+    lift_type = Column(SQLEnum(LiftType, name='lifttype', create_type=False), nullable=False)
+    reps = Column(Integer, nullable=False)
+    weight_unit = Column(SQLEnum(WeightUnit, name='weightunit', create_type=False), nullable=False)
+
+    weight = Column(Float, nullable=False)
+    calculated_1rm = Column(Float, nullable=False)
+    achieved_date = Column(Date, nullable=False)
+
+    # The rep_maxes log entry this best came from
+    rep_max_id = Column(String(36), ForeignKey("rep_maxes.id"), nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<BestRepMax {self.lift_type} {self.reps}RM: {self.weight} {self.weight_unit}>"
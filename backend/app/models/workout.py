@@ -4,7 +4,7 @@ Workout and workout set models.
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Float, Date, DateTime, ForeignKey, Text, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, ForeignKey, Text, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models.program import LiftType
@@ -82,6 +82,11 @@ class Workout(Base):
     # Relationship to main lifts
     main_lifts = relationship("WorkoutMainLift", backref="workout", cascade="all, delete-orphan", order_by="WorkoutMainLift.lift_order")
 
+    __table_args__ = (
+        # Listing, missed-workout and history filters: program, then status, then a date range
+        Index('ix_workouts_program_status_date', 'program_id', 'status', 'scheduled_date'),
+    )
+
     def __repr__(self):
         return f"<Workout Cycle {self.cycle_number} Week {self.week_number}>"
 
@@ -112,5 +117,11 @@ class WorkoutSet(Base):
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # AMRAP/top-set lookups and the failed-set scan for cycle recommendations
+        Index('ix_workout_sets_workout_type_number', 'workout_id', 'set_type', 'set_number'),
+        Index('ix_workout_sets_workout_target_met', 'workout_id', 'is_target_met'),
+    )
+
     def __repr__(self):
         return f"<WorkoutSet {self.set_type} Set {self.set_number}>"
@@ -4,9 +4,16 @@ Analytics API endpoints.
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 from typing import Optional
+from datetime import date
 
 from app.database import get_db
-from app.schemas.analytics import TrainingMaxProgressionResponse, WorkoutHistoryResponse
+from app.schemas.analytics import (
+    TrainingMaxProgressionResponse,
+    WorkoutHistoryResponse,
+    VolumeOverTimeResponse,
+    TonnageByLiftResponse,
+    ConsistencyResponse
+)
 from app.services.analytics import AnalyticsService
 from app.models.user import User
 from app.models.program import LiftType
@@ -22,7 +29,7 @@ router = APIRouter()
     summary="Get training max progression",
     description="Get training max progression over time for all lifts in a program."
 )
-async def get_training_max_progression(
+def get_training_max_progression(
     program_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -48,11 +55,11 @@ async def get_training_max_progression(
     summary="Get workout history",
     description="Get detailed workout history with performance statistics."
 )
-async def get_workout_history(
+def get_workout_history(
     program_id: str,
     lift_type: Optional[LiftType] = Query(None, description="Filter by lift type"),
-    limit: int = Query(20, ge=1, le=100, description="Number of results per page"),
-    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    limit: int = Query(20, ge=1, le=100, description="Number of workouts per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> WorkoutHistoryResponse:
@@ -64,10 +71,75 @@ async def get_workout_history(
     - Weight used in AMRAP set
     - Calculated 1RM from AMRAP performance
 
-    Supports filtering by lift type and pagination.
+    Supports filtering by lift type and cursor pagination: pass the
+    response's next_cursor as cursor to fetch the following page.
 
     Workouts are returned in reverse chronological order (most recent first).
     """
     return AnalyticsService.get_workout_history(
-        db, current_user, program_id, lift_type, limit, offset
+        db, current_user, program_id, lift_type, limit, cursor
     )
+
+
+@router.get(
+    "/volume",
+    response_model=VolumeOverTimeResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get volume over time",
+    description="Get weekly main lift volume across all programs."
+)
+def get_volume_over_time(
+    lift_type: Optional[LiftType] = Query(None, description="Filter by lift type"),
+    start_date: Optional[date] = Query(None, description="Include weeks from this date"),
+    end_date: Optional[date] = Query(None, description="Include weeks up to this date"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> VolumeOverTimeResponse:
+    """
+    Get weekly volume (sets, reps, tonnage) for the main lifts.
+
+    Read from weekly rollups maintained as workouts are completed, so the
+    response time does not grow with training history.
+    """
+    return AnalyticsService.get_volume_over_time(db, current_user, lift_type, start_date, end_date)
+
+
+@router.get(
+    "/tonnage-by-lift",
+    response_model=TonnageByLiftResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get tonnage per lift",
+    description="Get total tonnage and best estimated 1RM for each main lift."
+)
+def get_tonnage_by_lift(
+    start_date: Optional[date] = Query(None, description="Include weeks from this date"),
+    end_date: Optional[date] = Query(None, description="Include weeks up to this date"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> TonnageByLiftResponse:
+    """
+    Get tonnage per main lift, read from the weekly rollups.
+    """
+    return AnalyticsService.get_tonnage_by_lift(db, current_user, start_date, end_date)
+
+
+@router.get(
+    "/consistency",
+    response_model=ConsistencyResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get training consistency",
+    description="Get completed vs skipped lift sessions per week."
+)
+def get_consistency(
+    start_date: Optional[date] = Query(None, description="Include weeks from this date"),
+    end_date: Optional[date] = Query(None, description="Include weeks up to this date"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> ConsistencyResponse:
+    """
+    Get weekly and overall completion rates, read from the weekly rollups.
+
+    Each main lift in a workout counts as one session, so a skipped
+    2-lift workout counts as two skipped sessions.
+    """
+    return AnalyticsService.get_consistency(db, current_user, start_date, end_date)
@@ -38,7 +38,7 @@ async def register(
 
     Returns authentication tokens upon successful registration.
     """
-    return AuthService.register_user(db, user_data)
+    return await AuthService.register_user(db, user_data)
 
 
 @router.post(
@@ -61,7 +61,7 @@ async def login(
 
     Use the access token for authenticated API requests.
     """
-    return AuthService.login_user(db, login_data)
+    return await AuthService.login_user(db, login_data)
 
 
 @router.post(
@@ -71,7 +71,7 @@ async def login(
     summary="Refresh access token",
     description="Get a new access token using a valid refresh token."
 )
-async def refresh_token(
+def refresh_token(
     token_data: RefreshTokenRequest,
     db: Session = Depends(get_db)
 ) -> RefreshTokenResponse:
@@ -92,7 +92,7 @@ async def refresh_token(
     summary="Request password reset",
     description="Request a password reset email. (Not yet implemented)"
 )
-async def request_password_reset(
+def request_password_reset(
     db: Session = Depends(get_db)
 ) -> MessageResponse:
     """
@@ -116,7 +116,7 @@ async def request_password_reset(
     summary="Reset password",
     description="Reset password using reset token. (Not yet implemented)"
 )
-async def reset_password(
+def reset_password(
     db: Session = Depends(get_db)
 ) -> MessageResponse:
     """
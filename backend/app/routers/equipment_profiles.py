@@ -0,0 +1,116 @@
+"""
+Equipment profile API endpoints.
+"""
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from typing import List
+from app.database import get_db
+from app.schemas.equipment import EquipmentProfileResponse, EquipmentProfileCreateRequest
+from app.services.equipment import EquipmentService
+from app.models.user import User
+from app.utils.dependencies import get_current_user
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    response_model=List[EquipmentProfileResponse],
+    status_code=status.HTTP_200_OK,
+    summary="List equipment profiles",
+    description="Get all equipment profiles for the current user."
+)
+def list_equipment_profiles(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> List[EquipmentProfileResponse]:
+    """
+    Get all equipment profiles for the current user.
+
+    The default profile (the one prescriptions are rounded to) is returned first.
+    """
+    return EquipmentService.get_equipment_profiles(db, current_user)
+
+
+@router.get(
+    "/{profile_id}",
+    response_model=EquipmentProfileResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get equipment profile",
+    description="Get a specific equipment profile by ID."
+)
+def get_equipment_profile(
+    profile_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> EquipmentProfileResponse:
+    """
+    Get a specific equipment profile.
+
+    Returns the profile if it belongs to the current user.
+    """
+    return EquipmentService.get_equipment_profile_by_id(db, current_user, profile_id)
+
+
+@router.post(
+    "",
+    response_model=EquipmentProfileResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create equipment profile",
+    description="Create a bar and plate inventory."
+)
+def create_equipment_profile(
+    profile_data: EquipmentProfileCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> EquipmentProfileResponse:
+    """
+    Create an equipment profile.
+
+    When a profile is the default and its unit matches the user's weight
+    unit preference, prescribed weights are rounded to the nearest weight
+    its bar and plates can load instead of the rounding increment. Setting
+    is_default unsets any existing default profile.
+    """
+    return EquipmentService.create_equipment_profile(db, current_user, profile_data)
+
+
+@router.put(
+    "/{profile_id}",
+    response_model=EquipmentProfileResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Update equipment profile",
+    description="Update an existing equipment profile."
+)
+def update_equipment_profile(
+    profile_id: str,
+    profile_data: EquipmentProfileCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> EquipmentProfileResponse:
+    """
+    Update an existing equipment profile.
+
+    All fields are required (full replacement).
+    Setting is_default unsets any other default profile.
+    """
+    return EquipmentService.update_equipment_profile(db, current_user, profile_id, profile_data)
+
+
+@router.delete(
+    "/{profile_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete equipment profile",
+    description="Delete an equipment profile."
+)
+def delete_equipment_profile(
+    profile_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> None:
+    """
+    Delete an equipment profile.
+
+    Prescriptions go back to the rounding increment if it was the default.
+    """
+    EquipmentService.delete_equipment_profile(db, current_user, profile_id)
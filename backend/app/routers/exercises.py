@@ -21,7 +21,7 @@ router = APIRouter()
     summary="List exercises",
     description="Get all available exercises (predefined from book + user's custom exercises)."
 )
-async def list_exercises(
+def list_exercises(
     category: Optional[ExerciseCategory] = Query(None, description="Filter by category"),
     is_predefined: Optional[bool] = Query(None, description="Filter by predefined status"),
     current_user: User = Depends(get_current_user),
@@ -48,7 +48,7 @@ async def list_exercises(
     summary="Create custom exercise",
     description="Create a new custom exercise for the current user."
 )
-async def create_exercise(
+def create_exercise(
     exercise_data: ExerciseCreateRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -0,0 +1,95 @@
+"""
+Request profile API endpoints.
+
+Profiles are kept in memory per worker process, so a profile is found only
+on the worker that served the profiled request.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from typing import List
+from app.schemas.profile import ProfileDetailResponse, ProfiledStatementResponse, ProfileSummary
+from app.utils.dependencies import require_profiling_token
+from app.utils.profiler import RequestProfile, request_profiler
+
+router = APIRouter(dependencies=[Depends(require_profiling_token)])
+
+
+def _get_profile(profile_id: str) -> RequestProfile:
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return profile
+
+
+@router.get(
+    "",
+    response_model=List[ProfileSummary],
+    status_code=status.HTTP_200_OK,
+    summary="List request profiles",
+    description="Get the buffered request profiles of this worker, newest first."
+)
+def list_profiles() -> List[ProfileSummary]:
+    """
+    List buffered request profiles.
+
+    Returns:
+        Profile summaries, newest first
+    """
+    return [ProfileSummary(**profile.summary()) for profile in request_profiler.list()]
+
+
+@router.get(
+    "/{profile_id}",
+    response_model=ProfileDetailResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get request profile",
+    description="Get a request profile with its SQL statements and collapsed stack samples."
+)
+def get_profile(profile_id: str) -> ProfileDetailResponse:
+    """
+    Get a request profile.
+
+    Args:
+        profile_id: Profile ID from the X-Profile-Id response header
+
+    Returns:
+        Profile with statements and collapsed stacks
+
+    Raises:
+        HTTPException: If the profile is not in the buffer
+    """
+    profile = _get_profile(profile_id)
+    return ProfileDetailResponse(
+        **profile.summary(),
+        statements=[
+            ProfiledStatementResponse(sql=statement.sql, duration_ms=statement.seconds * 1000)
+            for statement in profile.statements
+        ],
+        collapsed_stacks=profile.collapsed()
+    )
+
+
+@router.get(
+    "/{profile_id}/collapsed",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get request profile flame graph input",
+    description="Get a request profile's samples in collapsed-stack format for flamegraph.pl or speedscope."
+)
+def get_profile_collapsed(profile_id: str) -> PlainTextResponse:
+    """
+    Get a request profile's collapsed stacks.
+
+    Args:
+        profile_id: Profile ID from the X-Profile-Id response header
+
+    Returns:
+        One "outer;...;inner count" line per distinct stack
+
+    Raises:
+        HTTPException: If the profile is not in the buffer
+    """
+    return PlainTextResponse(_get_profile(profile_id).collapsed())
@@ -1,7 +1,7 @@
 """
 Program management API endpoints.
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
@@ -27,7 +27,7 @@ router = APIRouter()
     summary="Create a new program",
     description="Create a new training program with training maxes, training days, and accessories."
 )
-async def create_program(
+def create_program(
     program_data: ProgramCreateRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -57,7 +57,7 @@ async def create_program(
     summary="List all programs",
     description="Get all programs for the current user (active, completed, paused)."
 )
-async def list_programs(
+def list_programs(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> List[ProgramResponse]:
@@ -77,7 +77,7 @@ async def list_programs(
     summary="Get program details",
     description="Get detailed information about a specific program."
 )
-async def get_program(
+def get_program(
     program_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -101,7 +101,7 @@ async def get_program(
     summary="Get program templates",
     description="Get all training day templates with accessories for a program."
 )
-async def get_program_templates(
+def get_program_templates(
     program_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -124,7 +124,7 @@ async def get_program_templates(
     summary="Get program day accessories",
     description="Get accessories organized by day (deduplicated, single source of truth)."
 )
-async def get_program_day_accessories(
+def get_program_day_accessories(
     program_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -151,7 +151,7 @@ async def get_program_day_accessories(
     summary="Update program",
     description="Update program name, status, or end date."
 )
-async def update_program(
+def update_program(
     program_id: str,
     update_data: ProgramUpdateRequest,
     current_user: User = Depends(get_current_user),
@@ -175,7 +175,7 @@ async def update_program(
     summary="Update accessories for a training day",
     description="Update the accessory exercises for a specific training day. Changes apply to future workouts."
 )
-async def update_accessories(
+def update_accessories(
     program_id: str,
     day_number: int,
     update_data: AccessoriesUpdateRequest,
@@ -199,7 +199,7 @@ async def update_accessories(
     summary="Complete cycle and increase training maxes",
     description="Finish current cycle and automatically increase training maxes per 5/3/1 methodology."
 )
-async def complete_cycle(
+def complete_cycle(
     program_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -244,7 +244,7 @@ async def complete_cycle(
     summary="Generate next 4-week cycle",
     description="Create 16 new workouts for the next cycle using updated training maxes."
 )
-async def generate_next_cycle(
+def generate_next_cycle(
     program_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -281,20 +281,24 @@ async def generate_next_cycle(
     summary="Delete program",
     description="Delete a program and all associated data (workouts, training maxes, etc.)."
 )
-async def delete_program(
+def delete_program(
     program_id: str,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> None:
     """
     Delete a program and all its associated data.
 
-    This will permanently delete:
+    The program disappears immediately; its data is purged after the
+    response is sent. This will permanently delete:
     - The program itself
     - All workouts and workout sets
     - All training maxes and training max history
     - All program templates
+    - Personal records set in the program's workouts
 
     This action cannot be undone.
     """
     ProgramService.delete_program(db, current_user, program_id)
+    background_tasks.add_task(ProgramService.purge_program_task, db.get_bind(), program_id)
@@ -19,7 +19,7 @@ router = APIRouter()
     summary="Get all rep maxes",
     description="Get personal records (rep maxes) for all lifts across all rep ranges (1-12)."
 )
-async def get_all_rep_maxes(
+def get_all_rep_maxes(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> AllRepMaxesResponse:
@@ -58,7 +58,7 @@ async def get_all_rep_maxes(
     summary="Get rep maxes for specific lift",
     description="Get personal records for a specific lift across all rep ranges (1-12)."
 )
-async def get_rep_maxes_by_lift(
+def get_rep_maxes_by_lift(
     lift_type: str = Path(
         ...,
         description="Lift type",
@@ -7,6 +7,7 @@ from app.database import get_db
 from app.schemas.user import UserResponse, UserUpdateRequest
 from app.models.user import User
 from app.utils.dependencies import get_current_user
+from app.utils.auth_cache import auth_cache
 
 router = APIRouter()
 
@@ -18,7 +19,7 @@ router = APIRouter()
     summary="Get current user",
     description="Get the profile of the currently authenticated user."
 )
-async def get_current_user_profile(
+def get_current_user_profile(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> UserResponse:
@@ -44,7 +45,7 @@ async def get_current_user_profile(
     summary="Update current user",
     description="Update the profile of the currently authenticated user."
 )
-async def update_current_user_profile(
+def update_current_user_profile(
     update_data: UserUpdateRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -72,4 +73,7 @@ async def update_current_user_profile(
     db.commit()
     db.refresh(current_user)
 
+    # Cached sessions for this user (in every worker) must reload the profile
+    auth_cache.invalidate_user(current_user.id)
+
     return UserResponse.model_validate(current_user)
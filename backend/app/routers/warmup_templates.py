@@ -21,7 +21,7 @@ router = APIRouter()
     summary="List warmup templates",
     description="Get all warmup templates for the current user, optionally filtered by lift type."
 )
-async def list_warmup_templates(
+def list_warmup_templates(
     lift_type: Optional[LiftType] = Query(None, description="Filter by lift type"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -45,7 +45,7 @@ async def list_warmup_templates(
     summary="Get warmup template",
     description="Get a specific warmup template by ID."
 )
-async def get_warmup_template(
+def get_warmup_template(
     template_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -65,7 +65,7 @@ async def get_warmup_template(
     summary="Create warmup template",
     description="Create a new custom warmup template."
 )
-async def create_warmup_template(
+def create_warmup_template(
     template_data: WarmupTemplateCreateRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -92,7 +92,7 @@ async def create_warmup_template(
     summary="Update warmup template",
     description="Update an existing warmup template."
 )
-async def update_warmup_template(
+def update_warmup_template(
     template_id: str,
     template_data: WarmupTemplateCreateRequest,
     current_user: User = Depends(get_current_user),
@@ -114,7 +114,7 @@ async def update_warmup_template(
     summary="Delete warmup template",
     description="Delete a warmup template."
 )
-async def delete_warmup_template(
+def delete_warmup_template(
     template_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
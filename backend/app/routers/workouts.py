@@ -1,7 +1,8 @@
 """
 Workout API endpoints.
 """
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
@@ -9,11 +10,12 @@ from app.database import get_db
 from app.schemas.workout import (
     WorkoutResponse, WorkoutDetailResponse, WorkoutCompleteRequest,
     WorkoutCompletionResponse, MissedWorkoutsResponse, HandleMissedWorkoutRequest,
-    HandleMissedWorkoutResponse
+    HandleMissedWorkoutResponse, WorkoutLoadingPlanResponse
 )
 from app.services.workout import WorkoutService
 from app.models.user import User
 from app.utils.dependencies import get_current_user
+from app.utils.profiler import profiled
 
 router = APIRouter()
 
@@ -25,7 +27,8 @@ router = APIRouter()
     summary="List workouts",
     description="Get workouts for the current user with optional filters."
 )
-async def list_workouts(
+def list_workouts(
+    response: Response,
     program_id: Optional[str] = Query(None, description="Filter by program ID"),
     workout_status: Optional[str] = Query(None, description="Filter by status (scheduled, completed, skipped)"),
     start_date: Optional[date] = Query(None, description="Filter by date >= start_date"),
@@ -33,6 +36,8 @@ async def list_workouts(
     main_lifts: Optional[List[str]] = Query(None, description="Filter by main lifts (press, deadlift, bench_press, squat)"),
     cycle_number: Optional[int] = Query(None, description="Filter by cycle number"),
     week_number: Optional[int] = Query(None, ge=1, le=4, description="Filter by week number (1-4)"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (all workouts if omitted)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header value from the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> List[WorkoutResponse]:
@@ -48,8 +53,12 @@ async def list_workouts(
     - week_number: Filter by week (1-4)
 
     Returns workouts ordered by scheduled date.
+
+    Pass limit to page through results: when more workouts remain, the
+    X-Next-Cursor response header holds the cursor for the next page.
+    For a complete export use GET /workouts/stream instead.
     """
-    return WorkoutService.get_workouts(
+    workouts, next_cursor = WorkoutService.get_workouts(
         db,
         current_user,
         program_id=program_id,
@@ -58,17 +67,87 @@ async def list_workouts(
         end_date=end_date,
         main_lifts=main_lifts,
         cycle_number=cycle_number,
-        week_number=week_number
+        week_number=week_number,
+        limit=limit,
+        cursor=cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return workouts
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Stream workouts",
+    description="Stream all matching workouts as newline-delimited JSON."
+)
+def stream_workouts(
+    program_id: Optional[str] = Query(None, description="Filter by program ID"),
+    workout_status: Optional[str] = Query(None, description="Filter by status (scheduled, completed, skipped)"),
+    start_date: Optional[date] = Query(None, description="Filter by date >= start_date"),
+    end_date: Optional[date] = Query(None, description="Filter by date <= end_date"),
+    main_lifts: Optional[List[str]] = Query(None, description="Filter by main lifts (press, deadlift, bench_press, squat)"),
+    cycle_number: Optional[int] = Query(None, description="Filter by cycle number"),
+    week_number: Optional[int] = Query(None, ge=1, le=4, description="Filter by week number (1-4)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Stream workouts as NDJSON (one WorkoutResponse object per line).
+
+    Accepts the same filters as GET /workouts and uses the same ordering.
+    Workouts are read from the database in batches while the response is
+    written, so memory stays flat for any history size.
+    """
+    return StreamingResponse(
+        WorkoutService.stream_workouts(
+            db,
+            current_user,
+            program_id=program_id,
+            workout_status=workout_status,
+            start_date=start_date,
+            end_date=end_date,
+            main_lifts=main_lifts,
+            cycle_number=cycle_number,
+            week_number=week_number
+        ),
+        media_type="application/x-ndjson"
     )
 
 
+@router.get(
+    "/calendar",
+    response_model=List[WorkoutDetailResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Get workout calendar",
+    description="Get all workouts in a date range with their prescribed or logged sets."
+)
+def get_workout_calendar(
+    start_date: date = Query(..., description="First day of the range"),
+    end_date: date = Query(..., description="Last day of the range (at most 93 days after start_date)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> List[WorkoutDetailResponse]:
+    """
+    Get every workout scheduled between start_date and end_date (inclusive).
+
+    Each workout has the same content as GET /workouts/{workout_id}:
+    prescribed warmup, working and accessory sets for upcoming workouts,
+    and logged sets for completed ones. Use this for calendar views instead
+    of fetching each day's detail separately.
+    """
+    return WorkoutService.get_workout_calendar(db, current_user, start_date, end_date)
+
+
 @router.get(
     "/missed",
     response_model=MissedWorkoutsResponse,
     summary="Get missed workouts",
     description="Get all workouts that are past their scheduled date but not completed."
 )
-async def get_missed_workouts(
+def get_missed_workouts(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> MissedWorkoutsResponse:
@@ -94,7 +173,8 @@ async def get_missed_workouts(
     summary="Get workout details",
     description="Get detailed workout information including all prescribed sets."
 )
-async def get_workout(
+@profiled
+def get_workout(
     workout_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -114,6 +194,29 @@ async def get_workout(
     return WorkoutService.get_workout_detail(db, current_user, workout_id)
 
 
+@router.get(
+    "/{workout_id}/loading-plan",
+    response_model=WorkoutLoadingPlanResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get session loading plan",
+    description="Get the plates to load for every set of a workout with the fewest plate changes."
+)
+def get_loading_plan(
+    workout_id: str,
+    share_bar: bool = Query(False, description="Run all main lifts on one bar instead of a fresh bar per lift"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> WorkoutLoadingPlanResponse:
+    """
+    Plan bar loading for a whole session.
+
+    Covers warmups, working sets and the AMRAP set of each main lift in
+    order. Each step lists the plates to strip and add per side before the
+    set; the plan minimizes the total number of plates moved.
+    """
+    return WorkoutService.get_loading_plan(db, current_user, workout_id, share_bar)
+
+
 @router.post(
     "/{workout_id}/complete",
     response_model=WorkoutCompletionResponse,
@@ -121,7 +224,8 @@ async def get_workout(
     summary="Complete workout",
     description="Log all sets, mark workout as completed, and get performance analysis."
 )
-async def complete_workout(
+@profiled
+def complete_workout(
     workout_id: str,
     completion_data: WorkoutCompleteRequest,
     current_user: User = Depends(get_current_user),
@@ -173,7 +277,7 @@ async def complete_workout(
     summary="Skip workout",
     description="Mark a workout as intentionally skipped."
 )
-async def skip_workout(
+def skip_workout(
     workout_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -199,7 +303,7 @@ async def skip_workout(
     summary="Handle missed workout",
     description="Skip or reschedule a missed workout."
 )
-async def handle_missed_workout(
+def handle_missed_workout(
     workout_id: str,
     request: HandleMissedWorkoutRequest,
     current_user: User = Depends(get_current_user),
@@ -103,9 +103,8 @@ class WorkoutHistoryResponse(BaseModel):
     """Response for workout history analytics."""
 
     workouts: List[WorkoutHistoryItem] = Field(..., description="List of workout history items")
-    total: int = Field(..., description="Total number of workouts matching criteria")
-    limit: int = Field(..., description="Number of results per page")
-    offset: int = Field(..., description="Offset for pagination")
+    limit: int = Field(..., description="Maximum number of workouts per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (null on the last page)")
 
     class Config:
         json_schema_extra = {
@@ -126,8 +125,110 @@ class WorkoutHistoryResponse(BaseModel):
                         "notes": "Felt strong!"
                     }
                 ],
-                "total": 45,
                 "limit": 20,
-                "offset": 0
+                "next_cursor": "MjAyNC0xMi0xNVQxODozMDowMHx1dWlkLWhlcmU="
+            }
+        }
+
+
+class WeeklyVolumePoint(BaseModel):
+    """Training volume for one ISO week."""
+
+    week_start: str = Field(..., description="Monday of the ISO week (YYYY-MM-DD)")
+    iso_week: str = Field(..., description="ISO week label (YYYY-Www)")
+    set_count: int = Field(..., description="Main lift sets (warmup + working)")
+    total_reps: int = Field(..., description="Main lift reps")
+    tonnage: float = Field(..., description="Main lift weight x reps")
+
+
+class VolumeOverTimeResponse(BaseModel):
+    """Response for weekly volume analytics."""
+
+    lift_type: Optional[LiftType] = Field(None, description="Lift filter (null for all lifts)")
+    weeks: List[WeeklyVolumePoint] = Field(..., description="Weeks with logged volume, oldest first")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "lift_type": "SQUAT",
+                "weeks": [
+                    {
+                        "week_start": "2024-02-12",
+                        "iso_week": "2024-W07",
+                        "set_count": 7,
+                        "total_reps": 35,
+                        "tonnage": 6350.0
+                    }
+                ]
+            }
+        }
+
+
+class LiftTonnage(BaseModel):
+    """Totals for a single lift."""
+
+    lift_type: LiftType = Field(..., description="Lift type")
+    set_count: int = Field(..., description="Sets (warmup + working)")
+    total_reps: int = Field(..., description="Reps")
+    tonnage: float = Field(..., description="Weight x reps")
+    best_e1rm: Optional[float] = Field(None, description="Best estimated 1RM from a working set")
+
+
+class TonnageByLiftResponse(BaseModel):
+    """Response for tonnage per lift analytics."""
+
+    lifts: List[LiftTonnage] = Field(..., description="Totals per lift")
+    total_tonnage: float = Field(..., description="Tonnage across all lifts")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "lifts": [
+                    {
+                        "lift_type": "SQUAT",
+                        "set_count": 84,
+                        "total_reps": 402,
+                        "tonnage": 78150.0,
+                        "best_e1rm": 342.0
+                    }
+                ],
+                "total_tonnage": 78150.0
+            }
+        }
+
+
+class WeeklyConsistencyPoint(BaseModel):
+    """Completed and skipped lift sessions for one ISO week."""
+
+    week_start: str = Field(..., description="Monday of the ISO week (YYYY-MM-DD)")
+    iso_week: str = Field(..., description="ISO week label (YYYY-Www)")
+    sessions_completed: int = Field(..., description="Lift sessions completed")
+    sessions_skipped: int = Field(..., description="Lift sessions skipped")
+    completion_rate: Optional[float] = Field(None, description="Completed / (completed + skipped)")
+
+
+class ConsistencyResponse(BaseModel):
+    """Response for training consistency analytics."""
+
+    weeks: List[WeeklyConsistencyPoint] = Field(..., description="Weeks with completed or skipped sessions, oldest first")
+    sessions_completed: int = Field(..., description="Lift sessions completed in the range")
+    sessions_skipped: int = Field(..., description="Lift sessions skipped in the range")
+    completion_rate: Optional[float] = Field(None, description="Completion rate over the range")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "weeks": [
+                    {
+                        "week_start": "2024-02-12",
+                        "iso_week": "2024-W07",
+                        "sessions_completed": 3,
+                        "sessions_skipped": 1,
+                        "completion_rate": 0.75
+                    }
+                ],
+                "sessions_completed": 3,
+                "sessions_skipped": 1,
+                "completion_rate": 0.75
             }
         }
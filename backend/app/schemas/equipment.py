@@ -0,0 +1,103 @@
+"""
+Equipment profile-related Pydantic schemas.
+"""
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+from app.models.user import WeightUnit
+
+
+class PlatePairs(BaseModel):
+    """Schema for one plate size in an inventory."""
+
+    weight: float = Field(..., gt=0, le=100, description="Plate weight")
+    pairs: Optional[int] = Field(None, ge=1, le=50, description="Pairs available (null = as many as needed)")
+
+    @field_validator('weight')
+    @classmethod
+    def validate_weight(cls, v):
+        if abs(v * 100 - round(v * 100)) > 1e-6:
+            raise ValueError("weight must be a multiple of 0.01")
+        return v
+
+
+def _validate_unique_weights(plates: List[PlatePairs]) -> List[PlatePairs]:
+    weights = [plate.weight for plate in plates]
+    if len(weights) != len(set(weights)):
+        raise ValueError("each plate weight may only be listed once")
+    return plates
+
+
+class EquipmentProfileResponse(BaseModel):
+    """Schema for equipment profile response."""
+
+    id: str = Field(..., description="Equipment profile ID")
+    name: str = Field(..., description="Profile name")
+    weight_unit: WeightUnit = Field(..., description="Unit of the bar and plate weights")
+    bar_weight: float = Field(..., description="Weight of the empty bar")
+    is_default: bool = Field(..., description="Whether prescriptions are rounded to this profile")
+    plates: List[PlatePairs] = Field(..., description="Plate inventory")
+    microplates: List[PlatePairs] = Field(..., description="Fractional plates")
+
+    class Config:
+        from_attributes = True
+        json_schema_extra = {
+            "example": {
+                "id": "uuid-here",
+                "name": "Home gym",
+                "weight_unit": "LBS",
+                "bar_weight": 45,
+                "is_default": True,
+                "plates": [
+                    {"weight": 45, "pairs": 4},
+                    {"weight": 25, "pairs": 2},
+                    {"weight": 10, "pairs": 2},
+                    {"weight": 5, "pairs": 2},
+                    {"weight": 2.5, "pairs": 1}
+                ],
+                "microplates": [{"weight": 1.25, "pairs": 1}]
+            }
+        }
+
+
+class EquipmentProfileCreateRequest(BaseModel):
+    """Schema for creating or replacing an equipment profile."""
+
+    name: str = Field(..., min_length=1, max_length=100, description="Profile name")
+    weight_unit: WeightUnit = Field(..., description="Unit of the bar and plate weights")
+    bar_weight: float = Field(..., gt=0, le=100, description="Weight of the empty bar")
+    is_default: bool = Field(False, description="Whether prescriptions should be rounded to this profile")
+    # Entry limits keep the plate solver compiled for a profile small
+    plates: List[PlatePairs] = Field(..., max_length=20, description="Plate inventory")
+    microplates: List[PlatePairs] = Field(
+        default_factory=list, max_length=20, description="Fractional plates (2.5 or lighter)"
+    )
+
+    @field_validator('plates')
+    @classmethod
+    def validate_plates(cls, v):
+        return _validate_unique_weights(v)
+
+    @field_validator('microplates')
+    @classmethod
+    def validate_microplates(cls, v):
+        if any(plate.weight > 2.5 for plate in v):
+            raise ValueError("microplates must weigh 2.5 or less")
+        return _validate_unique_weights(v)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "Home gym",
+                "weight_unit": "LBS",
+                "bar_weight": 45,
+                "is_default": True,
+                "plates": [
+                    {"weight": 45, "pairs": 4},
+                    {"weight": 25, "pairs": 2},
+                    {"weight": 10, "pairs": 2},
+                    {"weight": 5, "pairs": 2},
+                    {"weight": 2.5, "pairs": 1}
+                ],
+                "microplates": [{"weight": 1.25, "pairs": 1}]
+            }
+        }
@@ -0,0 +1,38 @@
+"""
+Request profile Pydantic schemas.
+"""
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class ProfileSummary(BaseModel):
+    """A buffered request profile, without its samples."""
+
+    id: str = Field(..., description="Profile ID, also sent in the X-Profile-Id response header")
+    method: str = Field(..., description="HTTP method of the profiled request")
+    path: str = Field(..., description="Path of the profiled request")
+    status_code: Optional[int] = Field(None, description="Response status code")
+    created_at: datetime = Field(..., description="When the request started (UTC)")
+    duration_ms: float = Field(..., description="Time until the response headers were ready")
+    interval_ms: float = Field(..., description="Time between stack samples")
+    sample_count: int = Field(..., description="Stack samples taken")
+    statement_count: int = Field(..., description="SQL statements run")
+    db_ms: float = Field(..., description="Total SQL statement time")
+
+
+class ProfiledStatementResponse(BaseModel):
+    """A SQL statement run by a profiled request."""
+
+    sql: str = Field(..., description="Statement text without parameter values")
+    duration_ms: float = Field(..., description="Statement time")
+
+
+class ProfileDetailResponse(ProfileSummary):
+    """A buffered request profile with its statements and samples."""
+
+    statements: List[ProfiledStatementResponse] = Field(..., description="SQL statements in execution order")
+    collapsed_stacks: str = Field(
+        ...,
+        description="Samples in collapsed-stack format (flamegraph.pl, speedscope), SQL as innermost frames"
+    )
@@ -4,7 +4,7 @@ Program-related Pydantic schemas.
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict, List
 from datetime import date, datetime
-from app.models.program import ProgramStatus
+from app.models.program import ProgramStatus, ScheduleMode
 
 
 class TrainingMaxInput(BaseModel):
@@ -59,6 +59,10 @@ class ProgramCreateRequest(BaseModel):
     target_cycles: Optional[int] = Field(None, ge=1, le=52, description="Number of cycles to run (optional)")
     training_days: List[str] = Field(..., min_length=2, max_length=4, description="Days to train (2-4 days)")
     include_deload: bool = Field(default=True, description="Include deload week (week 4) in each cycle")
+    schedule_mode: ScheduleMode = Field(
+        default=ScheduleMode.MATERIALIZED,
+        description="VIRTUAL computes upcoming workouts on demand instead of storing them up front"
+    )
     training_maxes: TrainingMaxInput = Field(..., description="Training maxes for each lift")
     accessories: Dict[str, List[AccessoryExerciseInput]] = Field(
         ...,
@@ -193,6 +197,7 @@ class ProgramResponse(BaseModel):
     end_date: Optional[date] = Field(None, description="End date")
     status: ProgramStatus = Field(..., description="Program status")
     training_days: List[str] = Field(..., description="Training days")
+    schedule_mode: ScheduleMode = Field(default=ScheduleMode.MATERIALIZED, description="How upcoming workouts are stored")
     created_at: datetime = Field(..., description="Creation timestamp")
 
     class Config:
@@ -222,6 +227,7 @@ class ProgramDetailResponse(BaseModel):
     target_cycles: Optional[int] = Field(None, description="Number of cycles to run")
     status: ProgramStatus = Field(..., description="Program status")
     training_days: List[str] = Field(..., description="Training days")
+    schedule_mode: ScheduleMode = Field(default=ScheduleMode.MATERIALIZED, description="How upcoming workouts are stored")
     current_cycle: int = Field(default=1, description="Current cycle number")
     current_week: int = Field(default=1, description="Current week number")
     training_maxes: Dict[str, TrainingMaxResponse] = Field(..., description="Current training maxes")
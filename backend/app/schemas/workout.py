@@ -37,6 +37,28 @@ class WorkoutSetResponse(BaseModel):
         from_attributes = True
 
 
+class LiftSummaryResponse(BaseModel):
+    """Precomputed stats for one lift in a completed workout."""
+    tonnage: float
+    top_set_weight: Optional[float] = None
+    top_set_reps: Optional[int] = None
+    amrap_reps: Optional[int] = None
+    amrap_weight: Optional[float] = None
+    estimated_1rm: Optional[float] = None
+    failed_sets: int = 0
+
+
+class WorkoutSummaryResponse(BaseModel):
+    """Precomputed stats for a completed workout."""
+    total_tonnage: float
+    accessory_volume: float
+    failed_set_count: int
+    lift_stats: Dict[str, LiftSummaryResponse]
+
+    class Config:
+        from_attributes = True
+
+
 class WorkoutResponse(BaseModel):
     """Basic workout information."""
     id: str
@@ -50,6 +72,7 @@ class WorkoutResponse(BaseModel):
     status: str
     notes: Optional[str]
     created_at: datetime
+    summary: Optional[WorkoutSummaryResponse] = None  # Set for completed workouts in list views
 
     class Config:
         from_attributes = True
@@ -88,6 +111,27 @@ class WorkoutDetailResponse(BaseModel):
         from_attributes = True
 
 
+class PlateChangeStep(BaseModel):
+    """One set in a session loading plan."""
+    lift_type: str
+    set_type: str
+    set_number: int
+    target_weight: float
+    loaded_weight: float = Field(..., description="Nearest weight the plates can make")
+    plates: List[float] = Field(..., description="Plates per side, innermost first")
+    remove: List[float] = Field(..., description="Plates to strip per side before this set, outermost first")
+    add: List[float] = Field(..., description="Plates to add per side before this set, innermost first")
+
+
+class WorkoutLoadingPlanResponse(BaseModel):
+    """Bar loading plan for a whole session."""
+    workout_id: str
+    bar_weight: float
+    share_bar: bool
+    total_changes: int = Field(..., description="Plates removed plus plates added, per side")
+    steps: List[PlateChangeStep]
+
+
 class SetLogRequest(BaseModel):
     """Request to log a single set."""
     set_type: str = Field(..., description="warmup, working, or accessory")
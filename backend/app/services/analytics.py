@@ -1,23 +1,34 @@
 """
 Analytics service for training data insights.
 """
+import uuid
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
-from typing import Dict, List, Optional
+from sqlalchemy import and_, case, desc, func, insert, or_
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
 from collections import defaultdict
 from fastapi import HTTPException, status
 
 from app.models.program import Program, TrainingMaxHistory, LiftType
 from app.models.workout import Workout, WorkoutSet, WorkoutMainLift, SetType, WorkoutStatus
+from app.models.analytics import WorkoutSummary, WeeklyLiftRollup
 from app.models.user import User
 from app.schemas.analytics import (
     TrainingMaxProgressionResponse,
     TrainingMaxDataPoint,
     WorkoutHistoryResponse,
     WorkoutHistoryItem,
-    WorkoutKeyStats
+    WorkoutKeyStats,
+    VolumeOverTimeResponse,
+    WeeklyVolumePoint,
+    TonnageByLiftResponse,
+    LiftTonnage,
+    ConsistencyResponse,
+    WeeklyConsistencyPoint
 )
 from app.utils.calculations import calculate_1rm
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.sql import upsert
 
 
 class AnalyticsService:
@@ -86,24 +97,28 @@ class AnalyticsService:
         program_id: str,
         lift_type: Optional[LiftType] = None,
         limit: int = 20,
-        offset: int = 0
+        cursor: Optional[str] = None
     ) -> WorkoutHistoryResponse:
         """
         Get workout history with key statistics.
 
+        Pages are keyed on (completed_date, id) so each page is an index range
+        scan rather than an offset re-scan, and the AMRAP sets for the whole
+        page are fetched in a single query.
+
         Args:
             db: Database session
             user: Current user
             program_id: Program ID
             lift_type: Optional filter by lift type
-            limit: Number of results to return (default 20)
-            offset: Offset for pagination (default 0)
+            limit: Number of workouts to return (default 20)
+            cursor: next_cursor from the previous page (None for the first page)
 
         Returns:
-            WorkoutHistoryResponse with paginated workout history
+            WorkoutHistoryResponse with one page of workout history
 
         Raises:
-            HTTPException: If program not found or doesn't belong to user
+            HTTPException: If program not found, doesn't belong to user, or cursor is invalid
         """
         # Verify program ownership
         program = db.query(Program).filter(
@@ -120,7 +135,8 @@ class AnalyticsService:
         # Build query for completed workouts, eager load main_lifts
         query = db.query(Workout).filter(
             Workout.program_id == program_id,
-            Workout.status == WorkoutStatus.COMPLETED
+            Workout.status == WorkoutStatus.COMPLETED,
+            Workout.completed_date.isnot(None)
         ).options(joinedload(Workout.main_lifts))
 
         if lift_type:
@@ -129,13 +145,40 @@ class AnalyticsService:
                 WorkoutMainLift.lift_type == lift_type
             )
 
-        # Get total count
-        total = query.count()
+        if cursor:
+            # Continue after the last workout of the previous page
+            cursor_date, cursor_id = decode_cursor(cursor, datetime.fromisoformat, str)
+            query = query.filter(or_(
+                Workout.completed_date < cursor_date,
+                and_(Workout.completed_date == cursor_date, Workout.id < cursor_id)
+            ))
 
-        # Get paginated workouts
+        # Fetch one extra row to know whether another page exists
         workouts = query.order_by(
-            desc(Workout.completed_date)
-        ).limit(limit).offset(offset).all()
+            desc(Workout.completed_date),
+            desc(Workout.id)
+        ).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(workouts) > limit:
+            workouts = workouts[:limit]
+            next_cursor = encode_cursor(workouts[-1].completed_date, workouts[-1].id)
+
+        # Read precomputed stats for the page from workout summaries
+        summaries = AnalyticsService.get_workout_summaries(db, [w.id for w in workouts])
+
+        # Fall back to the AMRAP set (last working set, set 3) for workouts without a
+        # summary (not yet backfilled), fetched for all of them at once
+        amrap_sets = {}
+        unsummarized_ids = [w.id for w in workouts if w.id not in summaries]
+        if unsummarized_ids:
+            page_sets = db.query(WorkoutSet).filter(
+                WorkoutSet.workout_id.in_(unsummarized_ids),
+                WorkoutSet.set_type.in_([SetType.WORKING, SetType.AMRAP]),
+                WorkoutSet.set_number == 3
+            ).all()
+            for ws in page_sets:
+                amrap_sets.setdefault((ws.workout_id, ws.lift_type), ws)
 
         # Build response items with key stats
         # Note: For multi-lift workouts, we create one history item per lift
@@ -143,34 +186,36 @@ class AnalyticsService:
         for workout in workouts:
             # For each main lift in the workout
             for main_lift in workout.main_lifts:
-                # Get AMRAP set for this specific lift (last working set, set 3)
-                amrap_set = db.query(WorkoutSet).filter(
-                    WorkoutSet.workout_id == workout.id,
-                    WorkoutSet.set_type == SetType.WORKING,
-                    WorkoutSet.set_number == 3
-                ).first()
-
-                # Calculate key stats from AMRAP set
+                # Calculate key stats from the summary, or the AMRAP set if not summarized
                 key_stats = WorkoutKeyStats(
                     amrap_reps=None,
                     amrap_weight=None,
                     calculated_1rm=None
                 )
 
-                if amrap_set:
-                    key_stats.amrap_reps = amrap_set.actual_reps
-                    key_stats.amrap_weight = amrap_set.actual_weight
-                    key_stats.calculated_1rm = calculate_1rm(
-                        amrap_set.actual_weight,
-                        amrap_set.actual_reps
-                    )
+                summary = summaries.get(workout.id)
+                if summary:
+                    lift_stats = summary.lift_stats.get(main_lift.lift_type.value, {})
+                    key_stats.amrap_reps = lift_stats.get("amrap_reps")
+                    key_stats.amrap_weight = lift_stats.get("amrap_weight")
+                    key_stats.calculated_1rm = lift_stats.get("estimated_1rm")
+                else:
+                    amrap_set = amrap_sets.get((workout.id, main_lift.lift_type))
+                    if not amrap_set and len(workout.main_lifts) == 1:
+                        # Sets logged before lift_type was recorded on workout_sets
+                        amrap_set = amrap_sets.get((workout.id, None))
 
-                # Get the date and convert to ISO format string
-                workout_date = workout.completed_date.date() if workout.completed_date else workout.scheduled_date
+                    if amrap_set:
+                        key_stats.amrap_reps = amrap_set.actual_reps
+                        key_stats.amrap_weight = amrap_set.actual_weight
+                        key_stats.calculated_1rm = calculate_1rm(
+                            amrap_set.actual_weight,
+                            amrap_set.actual_reps
+                        )
 
                 workout_item = WorkoutHistoryItem(
                     id=workout.id,
-                    date=workout_date.isoformat(),
+                    date=workout.completed_date.date().isoformat(),
                     lift=main_lift.lift_type,
                     cycle=workout.cycle_number,
                     week=workout.week_number,
@@ -182,7 +227,734 @@ class AnalyticsService:
 
         return WorkoutHistoryResponse(
             workouts=workout_items,
-            total=total,
             limit=limit,
-            offset=offset
+            next_cursor=next_cursor
+        )
+
+    @staticmethod
+    def get_workout_summaries(
+        db: Session,
+        workout_ids: List[str]
+    ) -> Dict[str, WorkoutSummary]:
+        """
+        Load the summaries for a set of workouts in one query.
+
+        Args:
+            db: Database session
+            workout_ids: Workout IDs
+
+        Returns:
+            Dict mapping workout ID to its WorkoutSummary (missing if not summarized)
+        """
+        if not workout_ids:
+            return {}
+
+        summaries = db.query(WorkoutSummary).filter(
+            WorkoutSummary.workout_id.in_(workout_ids)
+        ).all()
+        return {summary.workout_id: summary for summary in summaries}
+
+    @staticmethod
+    def build_workout_summary(
+        workout: Workout,
+        logged_sets: List[WorkoutSet]
+    ) -> WorkoutSummary:
+        """
+        Compute the summary row for a completed workout from its logged sets.
+
+        Tonnage is weight x reps over each main lift's warmup and working sets.
+        The AMRAP stats come from the lift's last working set (set 3), matching
+        what workout history has always reported.
+
+        Args:
+            workout: The completed workout (with main_lifts loaded)
+            logged_sets: All sets logged for the workout
+
+        Returns:
+            Unsaved WorkoutSummary
+        """
+        lift_stats = {
+            main_lift.lift_type.value: AnalyticsService._empty_lift_stats()
+            for main_lift in workout.main_lifts
+        }
+        # Sets logged before lift_type was recorded belong to the only main lift
+        default_lift = workout.main_lifts[0].lift_type if len(workout.main_lifts) == 1 else None
+
+        total_tonnage = 0.0
+        accessory_volume = 0.0
+        failed_set_count = 0
+
+        for ws in logged_sets:
+            volume = ws.actual_weight * ws.actual_reps
+
+            if ws.set_type == SetType.ACCESSORY:
+                accessory_volume += volume
+                continue
+
+            total_tonnage += volume
+            is_working = ws.set_type in [SetType.WORKING, SetType.AMRAP]
+            if is_working and not ws.is_target_met:
+                failed_set_count += 1
+
+            lift_type = ws.lift_type or default_lift
+            if not lift_type:
+                continue
+            stats = lift_stats.setdefault(lift_type.value, AnalyticsService._empty_lift_stats())
+            stats["tonnage"] += volume
+
+            if not is_working:
+                continue
+
+            if not ws.is_target_met:
+                stats["failed_sets"] += 1
+
+            # Heaviest working set, more reps wins a tie
+            top_key = (stats["top_set_weight"] or 0, stats["top_set_reps"] or 0)
+            if stats["top_set_weight"] is None or (ws.actual_weight, ws.actual_reps) > top_key:
+                stats["top_set_weight"] = ws.actual_weight
+                stats["top_set_reps"] = ws.actual_reps
+
+            if ws.set_number == 3 and stats["amrap_reps"] is None:
+                stats["amrap_reps"] = ws.actual_reps
+                stats["amrap_weight"] = ws.actual_weight
+                stats["estimated_1rm"] = calculate_1rm(ws.actual_weight, ws.actual_reps)
+
+        completed_date = workout.completed_date or datetime.combine(workout.scheduled_date, time())
+
+        return WorkoutSummary(
+            workout_id=workout.id,
+            program_id=workout.program_id,
+            completed_date=completed_date,
+            total_tonnage=total_tonnage,
+            accessory_volume=accessory_volume,
+            failed_set_count=failed_set_count,
+            lift_stats=lift_stats
+        )
+
+    @staticmethod
+    def _empty_lift_stats() -> dict:
+        """Get the starting per-lift stats for a workout summary."""
+        return {
+            "tonnage": 0.0,
+            "top_set_weight": None,
+            "top_set_reps": None,
+            "amrap_reps": None,
+            "amrap_weight": None,
+            "estimated_1rm": None,
+            "failed_sets": 0
+        }
+
+    @staticmethod
+    def record_workout_summary(
+        db: Session,
+        workout: Workout,
+        logged_sets: List[WorkoutSet]
+    ) -> WorkoutSummary:
+        """
+        Add the summary for a workout to the current transaction.
+
+        Called from workout completion so the summary commits with the sets.
+
+        Args:
+            db: Database session
+            workout: The completed workout
+            logged_sets: All sets logged for the workout
+
+        Returns:
+            The pending WorkoutSummary
+        """
+        summary = AnalyticsService.build_workout_summary(workout, logged_sets)
+        db.add(summary)
+        return summary
+
+    @staticmethod
+    def backfill_workout_summaries(
+        db: Session,
+        batch_size: int = 500,
+        user_ids: Optional[List[str]] = None
+    ) -> int:
+        """
+        Create summaries for completed workouts that do not have one yet.
+
+        Works through history in keyset batches on workout ID, loading each
+        batch's sets with a single query and committing once per batch.
+
+        Args:
+            db: Database session
+            batch_size: Number of workouts per batch
+            user_ids: Only backfill these users' workouts (all users if None)
+
+        Returns:
+            Number of summaries created
+        """
+        created = 0
+
+        last_id = None
+        while True:
+            query = db.query(Workout).filter(
+                Workout.status == WorkoutStatus.COMPLETED,
+                ~db.query(WorkoutSummary).filter(
+                    WorkoutSummary.workout_id == Workout.id
+                ).exists()
+            ).options(joinedload(Workout.main_lifts))
+            if user_ids is not None:
+                query = query.join(Program).filter(Program.user_id.in_(user_ids))
+            if last_id:
+                query = query.filter(Workout.id > last_id)
+            workouts = query.order_by(Workout.id).limit(batch_size).all()
+
+            if not workouts:
+                return created
+            last_id = workouts[-1].id
+
+            sets_by_workout: Dict[str, List[WorkoutSet]] = defaultdict(list)
+            for ws in db.query(WorkoutSet).filter(
+                WorkoutSet.workout_id.in_([w.id for w in workouts])
+            ).all():
+                sets_by_workout[ws.workout_id].append(ws)
+
+            for workout in workouts:
+                AnalyticsService.record_workout_summary(db, workout, sets_by_workout[workout.id])
+
+            db.commit()
+            created += len(workouts)
+
+    @staticmethod
+    def _week_start(day: date) -> date:
+        """Get the Monday of the ISO week containing a date."""
+        return day - timedelta(days=day.weekday())
+
+    @staticmethod
+    def _empty_rollup_totals() -> dict:
+        """Get zeroed totals for one lift in one week."""
+        return {
+            "sessions_completed": 0,
+            "sessions_skipped": 0,
+            "set_count": 0,
+            "total_reps": 0,
+            "tonnage": 0.0,
+            "best_e1rm": None,
+            "failed_targets": 0
+        }
+
+    @staticmethod
+    def _add_rollup_totals(current: dict, delta: dict) -> dict:
+        """
+        Combine two sets of rollup totals.
+
+        Counters are summed and best_e1rm keeps the higher value.
+        """
+        combined = {key: (current[key] or 0) + delta[key] for key in delta if key != "best_e1rm"}
+        best = [value for value in (current["best_e1rm"], delta["best_e1rm"]) if value is not None]
+        combined["best_e1rm"] = max(best) if best else None
+        return combined
+
+    @staticmethod
+    def _completed_rollup_deltas(
+        workout: Workout,
+        logged_sets: List[WorkoutSet]
+    ) -> Dict[LiftType, dict]:
+        """
+        Compute what a completed workout adds to each of its lifts' weekly rollup.
+
+        Args:
+            workout: The completed workout (with main_lifts loaded)
+            logged_sets: All sets logged for the workout
+
+        Returns:
+            Dict mapping lift type to rollup totals for this workout
+        """
+        deltas = {
+            main_lift.lift_type: AnalyticsService._empty_rollup_totals()
+            for main_lift in workout.main_lifts
+        }
+        # Sets logged before lift_type was recorded belong to the only main lift
+        default_lift = workout.main_lifts[0].lift_type if len(workout.main_lifts) == 1 else None
+
+        for ws in logged_sets:
+            if ws.set_type == SetType.ACCESSORY:
+                continue
+            lift_type = ws.lift_type or default_lift
+            if not lift_type:
+                continue
+
+            totals = deltas.setdefault(lift_type, AnalyticsService._empty_rollup_totals())
+            totals["set_count"] += 1
+            totals["total_reps"] += ws.actual_reps
+            totals["tonnage"] += ws.actual_weight * ws.actual_reps
+
+            if ws.set_type not in [SetType.WORKING, SetType.AMRAP]:
+                continue
+            if not ws.is_target_met:
+                totals["failed_targets"] += 1
+            if ws.actual_reps > 0:
+                e1rm = calculate_1rm(ws.actual_weight, ws.actual_reps)
+                if totals["best_e1rm"] is None or e1rm > totals["best_e1rm"]:
+                    totals["best_e1rm"] = e1rm
+
+        for totals in deltas.values():
+            totals["sessions_completed"] = 1
+        return deltas
+
+    @staticmethod
+    def _skipped_rollup_deltas(workout: Workout) -> Dict[LiftType, dict]:
+        """Compute what a skipped workout adds to each of its lifts' weekly rollup."""
+        deltas = {}
+        for main_lift in workout.main_lifts:
+            totals = AnalyticsService._empty_rollup_totals()
+            totals["sessions_skipped"] = 1
+            deltas[main_lift.lift_type] = totals
+        return deltas
+
+    @staticmethod
+    def _apply_rollup_deltas(
+        db: Session,
+        user_id: str,
+        day: date,
+        deltas: Dict[LiftType, dict]
+    ) -> None:
+        """Add per-lift totals to the user's rollups for the week containing day."""
+        AnalyticsService._apply_rollup_deltas_bulk(
+            db, {(user_id, AnalyticsService._week_start(day)): deltas}
+        )
+
+    @staticmethod
+    def _apply_rollup_deltas_bulk(
+        db: Session,
+        deltas_by_week: Dict[Tuple[str, date], Dict[LiftType, dict]]
+    ) -> None:
+        """
+        Add per-lift totals to many users' weekly rollups.
+
+        Every row is written with one upsert that adds to the stored counters
+        in SQL, so concurrent completions for the same week neither lose an
+        update nor collide creating the row. Keys must be distinct, so combine
+        deltas for the same week before calling.
+        """
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "lift_type": lift_type,
+                "week_start": week_start,
+                **delta
+            }
+            for (user_id, week_start), deltas in deltas_by_week.items()
+            for lift_type, delta in deltas.items()
+        ]
+        if not rows:
+            return
+
+        rollups = WeeklyLiftRollup.__table__.c
+        stmt = upsert(db, WeeklyLiftRollup)
+        added = {
+            key: rollups[key] + stmt.excluded[key]
+            for key in AnalyticsService._empty_rollup_totals()
+            if key != "best_e1rm"
+        }
+        added["best_e1rm"] = case(
+            (stmt.excluded.best_e1rm.is_(None), rollups.best_e1rm),
+            (
+                or_(rollups.best_e1rm.is_(None), stmt.excluded.best_e1rm > rollups.best_e1rm),
+                stmt.excluded.best_e1rm
+            ),
+            else_=rollups.best_e1rm
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[rollups.user_id, rollups.lift_type, rollups.week_start],
+                set_=added
+            ),
+            rows
+        )
+
+    @staticmethod
+    def record_completed_workout_rollups(
+        db: Session,
+        user_id: str,
+        workout: Workout,
+        logged_sets: List[WorkoutSet]
+    ) -> None:
+        """
+        Add a completed workout to the user's weekly lift rollups.
+
+        Called from workout completion so the rollups commit with the sets.
+
+        Args:
+            db: Database session
+            user_id: Owner of the workout
+            workout: The completed workout (with main_lifts loaded)
+            logged_sets: All sets logged for the workout
+        """
+        day = (workout.completed_date or datetime.combine(workout.scheduled_date, time())).date()
+        deltas = AnalyticsService._completed_rollup_deltas(workout, logged_sets)
+        AnalyticsService._apply_rollup_deltas(db, user_id, day, deltas)
+
+    @staticmethod
+    def record_skipped_workout_rollups(
+        db: Session,
+        user_id: str,
+        workouts: List[Workout]
+    ) -> None:
+        """
+        Add skipped workouts to the user's weekly lift rollups.
+
+        Skips count toward the week the workout was scheduled in.
+
+        Args:
+            db: Database session
+            user_id: Owner of the workouts
+            workouts: The skipped workouts (with main_lifts loaded)
+        """
+        AnalyticsService.record_skipped_rollups_for_users(db, {user_id: workouts})
+
+    @staticmethod
+    def remove_skipped_workout_rollups(
+        db: Session,
+        user_id: str,
+        workout: Workout
+    ) -> None:
+        """
+        Take a previously skipped workout back out of the user's weekly lift rollups.
+
+        Called when a skipped workout is completed after all, so the rollups
+        match a rebuild, which counts the workout only as completed. Only
+        existing rows with a skip to take back are decremented; a skip made
+        before the rollups were built has no row. Rows left with no sessions
+        are deleted.
+
+        Args:
+            db: Database session
+            user_id: Owner of the workout
+            workout: The workout as it was skipped (with main_lifts loaded)
+        """
+        week_start = AnalyticsService._week_start(workout.scheduled_date)
+        lift_types = [main_lift.lift_type for main_lift in workout.main_lifts]
+        rollups = db.query(WeeklyLiftRollup).filter(
+            WeeklyLiftRollup.user_id == user_id,
+            WeeklyLiftRollup.week_start == week_start,
+            WeeklyLiftRollup.lift_type.in_(lift_types)
+        )
+
+        rollups.filter(WeeklyLiftRollup.sessions_skipped > 0).update(
+            {WeeklyLiftRollup.sessions_skipped: WeeklyLiftRollup.sessions_skipped - 1},
+            synchronize_session=False
+        )
+        rollups.filter(
+            WeeklyLiftRollup.sessions_completed == 0,
+            WeeklyLiftRollup.sessions_skipped == 0
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def record_skipped_rollups_for_users(
+        db: Session,
+        workouts_by_user: Dict[str, List[Workout]]
+    ) -> None:
+        """
+        Add skipped workouts of many users to their weekly lift rollups.
+
+        Deltas are combined per user and week first, so existing rollups are
+        read in one query however many workouts were skipped.
+
+        Args:
+            db: Database session
+            workouts_by_user: Skipped workouts (with main_lifts loaded) by owner's user ID
+        """
+        deltas_by_week: Dict[Tuple[str, date], Dict[LiftType, dict]] = {}
+        for user_id, workouts in workouts_by_user.items():
+            for workout in workouts:
+                week_deltas = deltas_by_week.setdefault(
+                    (user_id, AnalyticsService._week_start(workout.scheduled_date)), {}
+                )
+                for lift_type, delta in AnalyticsService._skipped_rollup_deltas(workout).items():
+                    current = week_deltas.get(lift_type)
+                    week_deltas[lift_type] = (
+                        AnalyticsService._add_rollup_totals(current, delta) if current else delta
+                    )
+
+        AnalyticsService._apply_rollup_deltas_bulk(db, deltas_by_week)
+
+    @staticmethod
+    def rebuild_lift_rollups(
+        db: Session,
+        user_id: Optional[str] = None,
+        batch_size: int = 500,
+        users_per_batch: int = 100
+    ) -> int:
+        """
+        Replay completed and skipped workouts into fresh weekly lift rollups.
+
+        Users are rebuilt in keyset batches of users_per_batch, each committed
+        on its own, so memory is bounded by one batch's weekly totals however
+        large the history is.
+
+        Args:
+            db: Database session
+            user_id: Only rebuild this user's rollups (all users if None)
+            batch_size: Number of workouts per batch
+            users_per_batch: Number of users rebuilt per transaction
+
+        Returns:
+            Number of rollup rows written
+        """
+        if user_id:
+            return AnalyticsService.rebuild_lift_rollups_for_users(db, [user_id], batch_size)
+
+        written = 0
+        last_user_id = None
+        while True:
+            query = db.query(User.id)
+            if last_user_id:
+                query = query.filter(User.id > last_user_id)
+            user_ids = [row.id for row in query.order_by(User.id).limit(users_per_batch)]
+
+            if not user_ids:
+                return written
+            last_user_id = user_ids[-1]
+            written += AnalyticsService.rebuild_lift_rollups_for_users(db, user_ids, batch_size)
+
+    @staticmethod
+    def rebuild_lift_rollups_for_users(
+        db: Session,
+        user_ids: List[str],
+        batch_size: int = 500
+    ) -> int:
+        """
+        Replay some users' completed and skipped workouts into fresh weekly lift rollups.
+
+        Workouts are read in keyset batches with one sets query per batch,
+        totals are accumulated in memory and the rollups are written with a
+        single insert and committed.
+
+        Args:
+            db: Database session
+            user_ids: Users whose rollups are rebuilt
+            batch_size: Number of workouts per batch
+
+        Returns:
+            Number of rollup rows written
+        """
+        totals: Dict[Tuple[str, LiftType, date], dict] = {}
+
+        last_id = None
+        while True:
+            query = db.query(Workout, Program.user_id).join(Program).filter(
+                Program.user_id.in_(user_ids),
+                Workout.status.in_([WorkoutStatus.COMPLETED, WorkoutStatus.SKIPPED])
+            ).options(joinedload(Workout.main_lifts))
+            if last_id:
+                query = query.filter(Workout.id > last_id)
+            batch = query.order_by(Workout.id).limit(batch_size).all()
+
+            if not batch:
+                break
+            last_id = batch[-1][0].id
+
+            sets_by_workout: Dict[str, List[WorkoutSet]] = defaultdict(list)
+            completed_ids = [w.id for w, _ in batch if w.status == WorkoutStatus.COMPLETED]
+            if completed_ids:
+                for ws in db.query(WorkoutSet).filter(WorkoutSet.workout_id.in_(completed_ids)).all():
+                    sets_by_workout[ws.workout_id].append(ws)
+
+            for workout, owner_id in batch:
+                if workout.status == WorkoutStatus.COMPLETED:
+                    day = (workout.completed_date or datetime.combine(workout.scheduled_date, time())).date()
+                    deltas = AnalyticsService._completed_rollup_deltas(workout, sets_by_workout[workout.id])
+                else:
+                    day = workout.scheduled_date
+                    deltas = AnalyticsService._skipped_rollup_deltas(workout)
+
+                week_start = AnalyticsService._week_start(day)
+                for lift_type, delta in deltas.items():
+                    key = (owner_id, lift_type, week_start)
+                    current = totals.get(key, AnalyticsService._empty_rollup_totals())
+                    totals[key] = AnalyticsService._add_rollup_totals(current, delta)
+
+        db.query(WeeklyLiftRollup).filter(
+            WeeklyLiftRollup.user_id.in_(user_ids)
+        ).delete(synchronize_session=False)
+
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": owner_id,
+                "lift_type": lift_type,
+                "week_start": week_start,
+                **week_totals
+            }
+            for (owner_id, lift_type, week_start), week_totals in totals.items()
+        ]
+        if rows:
+            db.execute(insert(WeeklyLiftRollup), rows)
+        db.commit()
+        return len(rows)
+
+    @staticmethod
+    def _rollup_query(
+        db: Session,
+        user: User,
+        *columns,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ):
+        """Build a query over the user's rollups for the weeks overlapping a date range."""
+        query = db.query(*columns).filter(WeeklyLiftRollup.user_id == user.id)
+        if start_date:
+            query = query.filter(WeeklyLiftRollup.week_start >= AnalyticsService._week_start(start_date))
+        if end_date:
+            query = query.filter(WeeklyLiftRollup.week_start <= end_date)
+        return query
+
+    @staticmethod
+    def _iso_week_label(week_start: date) -> str:
+        """Format a week as an ISO week label, e.g. 2024-W07."""
+        iso_year, iso_week, _ = week_start.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}"
+
+    @staticmethod
+    def get_volume_over_time(
+        db: Session,
+        user: User,
+        lift_type: Optional[LiftType] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> VolumeOverTimeResponse:
+        """
+        Get weekly training volume from the weekly lift rollups.
+
+        Args:
+            db: Database session
+            user: Current user
+            lift_type: Only include this lift (all lifts if None)
+            start_date: Include weeks overlapping this date onwards
+            end_date: Include weeks starting on or before this date
+
+        Returns:
+            VolumeOverTimeResponse with one point per week that has data
+        """
+        query = AnalyticsService._rollup_query(
+            db, user,
+            WeeklyLiftRollup.week_start,
+            func.sum(WeeklyLiftRollup.set_count),
+            func.sum(WeeklyLiftRollup.total_reps),
+            func.sum(WeeklyLiftRollup.tonnage),
+            start_date=start_date,
+            end_date=end_date
+        )
+        if lift_type:
+            query = query.filter(WeeklyLiftRollup.lift_type == lift_type)
+
+        rows = query.group_by(WeeklyLiftRollup.week_start).order_by(WeeklyLiftRollup.week_start).all()
+
+        return VolumeOverTimeResponse(
+            lift_type=lift_type,
+            weeks=[
+                WeeklyVolumePoint(
+                    week_start=week_start.isoformat(),
+                    iso_week=AnalyticsService._iso_week_label(week_start),
+                    set_count=set_count,
+                    total_reps=total_reps,
+                    tonnage=tonnage
+                )
+                for week_start, set_count, total_reps, tonnage in rows
+            ]
+        )
+
+    @staticmethod
+    def get_tonnage_by_lift(
+        db: Session,
+        user: User,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> TonnageByLiftResponse:
+        """
+        Get total tonnage per lift from the weekly lift rollups.
+
+        Args:
+            db: Database session
+            user: Current user
+            start_date: Include weeks overlapping this date onwards
+            end_date: Include weeks starting on or before this date
+
+        Returns:
+            TonnageByLiftResponse with one entry per lift that has data
+        """
+        rows = AnalyticsService._rollup_query(
+            db, user,
+            WeeklyLiftRollup.lift_type,
+            func.sum(WeeklyLiftRollup.set_count),
+            func.sum(WeeklyLiftRollup.total_reps),
+            func.sum(WeeklyLiftRollup.tonnage),
+            func.max(WeeklyLiftRollup.best_e1rm),
+            start_date=start_date,
+            end_date=end_date
+        ).group_by(WeeklyLiftRollup.lift_type).order_by(WeeklyLiftRollup.lift_type).all()
+
+        lifts = [
+            LiftTonnage(
+                lift_type=lift_type,
+                set_count=set_count,
+                total_reps=total_reps,
+                tonnage=tonnage,
+                best_e1rm=best_e1rm
+            )
+            for lift_type, set_count, total_reps, tonnage, best_e1rm in rows
+        ]
+        return TonnageByLiftResponse(
+            lifts=lifts,
+            total_tonnage=sum(lift.tonnage for lift in lifts)
+        )
+
+    @staticmethod
+    def get_consistency(
+        db: Session,
+        user: User,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> ConsistencyResponse:
+        """
+        Get completed vs skipped lift sessions per week from the weekly lift rollups.
+
+        A workout with two main lifts counts as two lift sessions.
+
+        Args:
+            db: Database session
+            user: Current user
+            start_date: Include weeks overlapping this date onwards
+            end_date: Include weeks starting on or before this date
+
+        Returns:
+            ConsistencyResponse with weekly and overall completion rates
+        """
+        rows = AnalyticsService._rollup_query(
+            db, user,
+            WeeklyLiftRollup.week_start,
+            func.sum(WeeklyLiftRollup.sessions_completed),
+            func.sum(WeeklyLiftRollup.sessions_skipped),
+            start_date=start_date,
+            end_date=end_date
+        ).group_by(WeeklyLiftRollup.week_start).order_by(WeeklyLiftRollup.week_start).all()
+
+        def completion_rate(completed: int, skipped: int) -> Optional[float]:
+            total = completed + skipped
+            return round(completed / total, 3) if total else None
+
+        weeks = [
+            WeeklyConsistencyPoint(
+                week_start=week_start.isoformat(),
+                iso_week=AnalyticsService._iso_week_label(week_start),
+                sessions_completed=completed,
+                sessions_skipped=skipped,
+                completion_rate=completion_rate(completed, skipped)
+            )
+            for week_start, completed, skipped in rows
+        ]
+        sessions_completed = sum(week.sessions_completed for week in weeks)
+        sessions_skipped = sum(week.sessions_skipped for week in weeks)
+
+        return ConsistencyResponse(
+            weeks=weeks,
+            sessions_completed=sessions_completed,
+            sessions_skipped=sessions_skipped,
+            completion_rate=completion_rate(sessions_completed, sessions_skipped)
         )
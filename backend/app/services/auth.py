@@ -1,28 +1,78 @@
 """
 Authentication service with business logic.
 """
-from sqlalchemy.orm import Session
+import time
+from typing import Optional
+from sqlalchemy.orm import Session, make_transient_to_detached
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from app.models.user import User
 from app.schemas.auth import UserRegisterRequest, UserLoginRequest, TokenResponse
 from app.utils.security import (
-    get_password_hash,
-    verify_password,
     create_access_token,
     create_refresh_token,
     decode_token,
     validate_password_strength
 )
+from app.utils.auth_cache import auth_cache, CachedAuth
+from app.utils.password_hasher import password_hasher
 
 
 class AuthService:
     """Service for handling authentication operations."""
 
     @staticmethod
-    def register_user(db: Session, user_data: UserRegisterRequest) -> TokenResponse:
+    def _get_user_by_email(db: Session, email: str) -> Optional[User]:
+        """Find a user by (case-insensitive) email."""
+        return db.query(User).filter(User.email == email.lower()).first()
+
+    @staticmethod
+    def _create_user(db: Session, user_data: UserRegisterRequest, password_hash: str) -> User:
+        """Insert a new user with an already hashed password."""
+        new_user = User(
+            first_name=user_data.first_name.strip(),
+            last_name=user_data.last_name.strip(),
+            email=user_data.email.lower(),
+            password_hash=password_hash
+        )
+
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+        return new_user
+
+    @staticmethod
+    def _update_password_hash(db: Session, user: User, password_hash: str) -> None:
+        """Store a new hash for a user's existing password."""
+        user.password_hash = password_hash
+        db.commit()
+        # Reload here so building the token response doesn't lazy-load on the event loop
+        db.refresh(user)
+
+    @staticmethod
+    def _token_response(user: User) -> TokenResponse:
+        """Issue access and refresh tokens for a user."""
+        access_token = create_access_token(data={"sub": user.id})
+        refresh_token = create_refresh_token(data={"sub": user.id})
+
+        return TokenResponse(
+            user_id=user.id,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            email=user.email,
+            access_token=access_token,
+            refresh_token=refresh_token,
+            token_type="bearer"
+        )
+
+    @staticmethod
+    async def register_user(db: Session, user_data: UserRegisterRequest) -> TokenResponse:
         """
         Register a new user.
 
+        The password is hashed on the password worker pool and the queries
+        run on the threadpool, so the event loop is never blocked.
+
         Args:
             db: Database session
             user_data: User registration data
@@ -34,7 +84,7 @@ class AuthService:
             HTTPException: If email already exists or password is weak
         """
         # Check if email already exists
-        existing_user = db.query(User).filter(User.email == user_data.email.lower()).first()
+        existing_user = await run_in_threadpool(AuthService._get_user_by_email, db, user_data.email)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -50,39 +100,21 @@ class AuthService:
             )
 
         # Hash password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
 
         # Create new user
-        new_user = User(
-            first_name=user_data.first_name.strip(),
-            last_name=user_data.last_name.strip(),
-            email=user_data.email.lower(),
-            password_hash=hashed_password
-        )
+        new_user = await run_in_threadpool(AuthService._create_user, db, user_data, hashed_password)
 
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-
-        # Generate tokens
-        access_token = create_access_token(data={"sub": new_user.id})
-        refresh_token = create_refresh_token(data={"sub": new_user.id})
-
-        return TokenResponse(
-            user_id=new_user.id,
-            first_name=new_user.first_name,
-            last_name=new_user.last_name,
-            email=new_user.email,
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_type="bearer"
-        )
+        return AuthService._token_response(new_user)
 
     @staticmethod
-    def login_user(db: Session, login_data: UserLoginRequest) -> TokenResponse:
+    async def login_user(db: Session, login_data: UserLoginRequest) -> TokenResponse:
         """
         Authenticate a user and return tokens.
 
+        If the stored hash was made with a different bcrypt cost than
+        BCRYPT_ROUNDS, the password is rehashed at the current cost.
+
         Args:
             db: Database session
             login_data: User login credentials
@@ -94,7 +126,7 @@ class AuthService:
             HTTPException: If credentials are invalid
         """
         # Find user by email
-        user = db.query(User).filter(User.email == login_data.email.lower()).first()
+        user = await run_in_threadpool(AuthService._get_user_by_email, db, login_data.email)
 
         if not user:
             raise HTTPException(
@@ -103,25 +135,18 @@ class AuthService:
             )
 
         # Verify password
-        if not verify_password(login_data.password, user.password_hash):
+        if not await password_hasher.verify(login_data.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
 
-        # Generate tokens
-        access_token = create_access_token(data={"sub": user.id})
-        refresh_token = create_refresh_token(data={"sub": user.id})
+        # Upgrade (or downgrade) the hash to the configured cost
+        if password_hasher.needs_rehash(user.password_hash):
+            new_hash = await password_hasher.hash(login_data.password)
+            await run_in_threadpool(AuthService._update_password_hash, db, user, new_hash)
 
-        return TokenResponse(
-            user_id=user.id,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            email=user.email,
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_type="bearer"
-        )
+        return AuthService._token_response(user)
 
     @staticmethod
     def refresh_access_token(db: Session, refresh_token: str) -> dict:
@@ -178,11 +203,25 @@ class AuthService:
             "token_type": "bearer"
         }
 
+    @staticmethod
+    def _user_snapshot(user: User) -> dict:
+        """Get the cacheable column values of a user (everything but the password hash)."""
+        return {
+            column.key: getattr(user, column.key)
+            for column in User.__table__.columns
+            if column.key != "password_hash"
+        }
+
     @staticmethod
     def get_current_user(db: Session, token: str) -> User:
         """
         Get the current authenticated user from access token.
 
+        Verified tokens are cached briefly with a snapshot of the user, so
+        repeat requests skip JWT verification and the users query. The
+        snapshot is attached to the session, so it can still be updated and
+        any column left out of it loads on access.
+
         Args:
             db: Database session
             token: The access token
@@ -193,6 +232,15 @@ class AuthService:
         Raises:
             HTTPException: If token is invalid or user not found
         """
+        cached = auth_cache.get(token)
+        if cached:
+            user = User(**cached.user)
+            make_transient_to_detached(user)
+            db.add(user)
+            return user
+
+        loaded_at = time.time()
+
         # Decode token
         payload = decode_token(token)
 
@@ -229,4 +277,9 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        auth_cache.put(
+            token,
+            CachedAuth(payload=payload, user=AuthService._user_snapshot(user)),
+            loaded_at
+        )
         return user
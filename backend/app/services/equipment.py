@@ -0,0 +1,259 @@
+"""
+Equipment profile service with business logic.
+"""
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import List, Optional
+from app.models.equipment import EquipmentProfile
+from app.models.user import User
+from app.schemas.equipment import EquipmentProfileResponse, EquipmentProfileCreateRequest
+from app.utils.plates import DEFAULT_PLATE_INVENTORY, PlateInventory, RoundingGrid, get_rounding_grid
+
+
+class EquipmentService:
+    """Service for handling equipment profile operations."""
+
+    @staticmethod
+    def to_inventory(profile: EquipmentProfile) -> PlateInventory:
+        """
+        Convert a profile to the hashable inventory the plate solver compiles.
+
+        Args:
+            profile: Equipment profile
+
+        Returns:
+            PlateInventory with the profile's plates and microplates, heaviest first
+        """
+        plates = sorted(
+            ((plate["weight"], plate.get("pairs")) for plate in profile.plates + (profile.microplates or [])),
+            key=lambda plate: plate[0],
+            reverse=True
+        )
+        return PlateInventory(bar_weight=profile.bar_weight, plates=tuple(plates))
+
+    @staticmethod
+    def get_default_profile(db: Session, user: User) -> Optional[EquipmentProfile]:
+        """
+        Get the profile prescriptions are rounded to.
+
+        A default profile in a different unit than the user's weight unit
+        preference is ignored, since training maxes are in the user's unit.
+
+        Args:
+            db: Database session
+            user: Current user
+
+        Returns:
+            The default EquipmentProfile, or None
+        """
+        return db.query(EquipmentProfile).filter(
+            EquipmentProfile.user_id == user.id,
+            EquipmentProfile.is_default == True, # noqa: E712
+            EquipmentProfile.weight_unit == user.weight_unit_preference
+        ).first()
+
+    @staticmethod
+    def get_rounding_grid(db: Session, user: User) -> Optional[RoundingGrid]:
+        """
+        Get the loadable-weight grid of the user's default profile.
+
+        Grids are compiled once per distinct inventory and shared.
+
+        Args:
+            db: Database session
+            user: Current user
+
+        Returns:
+            RoundingGrid, or None to round to user.rounding_increment
+        """
+        profile = EquipmentService.get_default_profile(db, user)
+        if profile is None:
+            return None
+        return get_rounding_grid(EquipmentService.to_inventory(profile))
+
+    @staticmethod
+    def get_plate_inventory(db: Session, user: User) -> PlateInventory:
+        """
+        Get the inventory to plan bar loading with.
+
+        Args:
+            db: Database session
+            user: Current user
+
+        Returns:
+            The default profile's inventory, or DEFAULT_PLATE_INVENTORY
+        """
+        profile = EquipmentService.get_default_profile(db, user)
+        if profile is None:
+            return DEFAULT_PLATE_INVENTORY
+        return EquipmentService.to_inventory(profile)
+
+    @staticmethod
+    def get_equipment_profiles(db: Session, user: User) -> List[EquipmentProfileResponse]:
+        """
+        Get user's equipment profiles.
+
+        Args:
+            db: Database session
+            user: Current user
+
+        Returns:
+            List of EquipmentProfileResponse, default profile first
+        """
+        profiles = db.query(EquipmentProfile).filter(
+            EquipmentProfile.user_id == user.id
+        ).order_by(
+            EquipmentProfile.is_default.desc(),
+            EquipmentProfile.name
+        ).all()
+
+        return [EquipmentProfileResponse.model_validate(profile) for profile in profiles]
+
+    @staticmethod
+    def _get_owned_profile(db: Session, user: User, profile_id: str) -> EquipmentProfile:
+        profile = db.query(EquipmentProfile).filter(
+            EquipmentProfile.id == profile_id,
+            EquipmentProfile.user_id == user.id
+        ).first()
+
+        if not profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Equipment profile not found"
+            )
+
+        return profile
+
+    @staticmethod
+    def _unset_other_defaults(db: Session, user: User, profile_id: Optional[str] = None) -> None:
+        query = db.query(EquipmentProfile).filter(
+            EquipmentProfile.user_id == user.id,
+            EquipmentProfile.is_default == True # noqa: E712
+        )
+        if profile_id is not None:
+            query = query.filter(EquipmentProfile.id != profile_id)
+        for existing_default in query.all():
+            existing_default.is_default = False
+
+    @staticmethod
+    def get_equipment_profile_by_id(
+        db: Session,
+        user: User,
+        profile_id: str
+    ) -> EquipmentProfileResponse:
+        """
+        Get a specific equipment profile by ID.
+
+        Args:
+            db: Database session
+            user: Current user
+            profile_id: Profile ID
+
+        Returns:
+            EquipmentProfileResponse
+
+        Raises:
+            HTTPException: If profile not found or doesn't belong to user
+        """
+        profile = EquipmentService._get_owned_profile(db, user, profile_id)
+        return EquipmentProfileResponse.model_validate(profile)
+
+    @staticmethod
+    def create_equipment_profile(
+        db: Session,
+        user: User,
+        profile_data: EquipmentProfileCreateRequest
+    ) -> EquipmentProfileResponse:
+        """
+        Create a new equipment profile.
+
+        If is_default is True, unset the user's existing default profile.
+
+        Args:
+            db: Database session
+            user: Current user
+            profile_data: Profile creation data
+
+        Returns:
+            EquipmentProfileResponse
+        """
+        if profile_data.is_default:
+            EquipmentService._unset_other_defaults(db, user)
+
+        profile = EquipmentProfile(
+            user_id=user.id,
+            name=profile_data.name,
+            weight_unit=profile_data.weight_unit,
+            bar_weight=profile_data.bar_weight,
+            is_default=profile_data.is_default,
+            plates=[plate.model_dump() for plate in profile_data.plates],
+            microplates=[plate.model_dump() for plate in profile_data.microplates]
+        )
+
+        db.add(profile)
+        db.commit()
+        db.refresh(profile)
+
+        return EquipmentProfileResponse.model_validate(profile)
+
+    @staticmethod
+    def update_equipment_profile(
+        db: Session,
+        user: User,
+        profile_id: str,
+        profile_data: EquipmentProfileCreateRequest
+    ) -> EquipmentProfileResponse:
+        """
+        Update an equipment profile (full replacement).
+
+        If is_default is True, unset the user's other default profile.
+
+        Args:
+            db: Database session
+            user: Current user
+            profile_id: Profile ID
+            profile_data: Updated profile data
+
+        Returns:
+            EquipmentProfileResponse
+
+        Raises:
+            HTTPException: If profile not found or doesn't belong to user
+        """
+        profile = EquipmentService._get_owned_profile(db, user, profile_id)
+
+        if profile_data.is_default:
+            EquipmentService._unset_other_defaults(db, user, profile_id)
+
+        profile.name = profile_data.name
+        profile.weight_unit = profile_data.weight_unit
+        profile.bar_weight = profile_data.bar_weight
+        profile.is_default = profile_data.is_default
+        profile.plates = [plate.model_dump() for plate in profile_data.plates]
+        profile.microplates = [plate.model_dump() for plate in profile_data.microplates]
+
+        db.commit()
+        db.refresh(profile)
+
+        return EquipmentProfileResponse.model_validate(profile)
+
+    @staticmethod
+    def delete_equipment_profile(
+        db: Session,
+        user: User,
+        profile_id: str
+    ) -> None:
+        """
+        Delete an equipment profile.
+
+        Args:
+            db: Database session
+            user: Current user
+            profile_id: Profile ID
+
+        Raises:
+            HTTPException: If profile not found or doesn't belong to user
+        """
+        profile = EquipmentService._get_owned_profile(db, user, profile_id)
+        db.delete(profile)
+        db.commit()
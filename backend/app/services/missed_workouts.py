@@ -0,0 +1,220 @@
+"""
+Batch processing of missed workouts across all users.
+
+Users whose missed-workout preference is SKIP or RESCHEDULE are processed in
+chunks ordered by user id, so overdue workouts are handled by a scheduled
+job rather than on the user's next request. Stored workouts in a chunk are
+handled with a fixed number of statements and one commit. Users with
+virtual-schedule programs go through WorkoutService.auto_handle_missed_workouts,
+because their missed workouts are computed rather than stored.
+"""
+import time
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import case
+from sqlalchemy.orm import Session, selectinload
+from app.models.program import Program, ScheduleMode
+from app.models.user import User, MissedWorkoutPreference
+from app.models.workout import Workout, WorkoutStatus
+from app.services.analytics import AnalyticsService
+from app.services.workout import WorkoutService
+from app.utils.sql import date_add_days
+
+# Shards split user ids (UUID strings) by their leading 8 hex digits
+_SHARD_KEY_SPACE = 16 ** 8
+
+
+class MissedWorkoutRunStats:
+    """Progress counters for one batch run."""
+
+    def __init__(self):
+        self.chunks = 0
+        self.users = 0
+        self.workouts_skipped = 0
+        self.workouts_rescheduled = 0  # Missed workouts moved to a new date
+        self.workouts_shifted = 0  # All workouts moved, including upcoming ones
+        self._started_at = time.perf_counter()
+        self.elapsed_seconds = 0.0
+
+    def record_chunk(self, users: int) -> None:
+        """Count a finished chunk and update the elapsed time."""
+        self.chunks += 1
+        self.users += users
+        self.elapsed_seconds = time.perf_counter() - self._started_at
+
+    def as_dict(self) -> Dict[str, float]:
+        """Get the counters as a dict."""
+        return {
+            "chunks": self.chunks,
+            "users": self.users,
+            "workouts_skipped": self.workouts_skipped,
+            "workouts_rescheduled": self.workouts_rescheduled,
+            "workouts_shifted": self.workouts_shifted,
+            "elapsed_seconds": self.elapsed_seconds
+        }
+
+
+class MissedWorkoutBatchService:
+    """Service for handling every user's missed workouts in batches."""
+
+    @staticmethod
+    def shard_bounds(shard_index: int, shard_count: int) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the user id range covered by a shard.
+
+        Args:
+            shard_index: Shard number (0-based)
+            shard_count: Total number of shards
+
+        Returns:
+            Tuple of (inclusive lower bound, exclusive upper bound); None means unbounded
+
+        Raises:
+            ValueError: If shard_index is not in [0, shard_count)
+        """
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError(f"Shard index must be between 0 and {shard_count - 1}")
+
+        lower = f"{shard_index * _SHARD_KEY_SPACE // shard_count:08x}" if shard_index > 0 else None
+        upper = (
+            f"{(shard_index + 1) * _SHARD_KEY_SPACE // shard_count:08x}"
+            if shard_index < shard_count - 1 else None
+        )
+        return lower, upper
+
+    @staticmethod
+    def run(
+        db: Session,
+        today: Optional[date] = None,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        chunk_size: int = 500,
+        on_chunk: Optional[Callable[[MissedWorkoutRunStats], None]] = None
+    ) -> MissedWorkoutRunStats:
+        """
+        Skip or reschedule every overdue scheduled workout of one shard of users.
+
+        Users are read in keyset chunks by id and each chunk is committed on
+        its own, so an interrupted run keeps its progress and running it again
+        only finds what is left.
+
+        Args:
+            db: Database session
+            today: Workouts dated before this are missed (defaults to today)
+            shard_index: Shard of users to process (0-based)
+            shard_count: Number of shards the users are split into
+            chunk_size: Users per chunk
+            on_chunk: Called with the running totals after each chunk
+
+        Returns:
+            MissedWorkoutRunStats for the run
+
+        Raises:
+            ValueError: If the shard is invalid
+        """
+        today = today or date.today()
+        lower, upper = MissedWorkoutBatchService.shard_bounds(shard_index, shard_count)
+        stats = MissedWorkoutRunStats()
+
+        last_id = None
+        while True:
+            query = db.query(User).filter(
+                User.missed_workout_preference.in_([
+                    MissedWorkoutPreference.SKIP, MissedWorkoutPreference.RESCHEDULE
+                ])
+            )
+            if last_id:
+                query = query.filter(User.id > last_id)
+            elif lower:
+                query = query.filter(User.id >= lower)
+            if upper:
+                query = query.filter(User.id < upper)
+
+            users = query.order_by(User.id).limit(chunk_size).all()
+            if not users:
+                break
+
+            last_id = users[-1].id
+            MissedWorkoutBatchService._process_chunk(db, users, today, stats)
+            db.commit()
+
+            stats.record_chunk(len(users))
+            if on_chunk:
+                on_chunk(stats)
+
+        return stats
+
+    @staticmethod
+    def _process_chunk(
+        db: Session,
+        users: List[User],
+        today: date,
+        stats: MissedWorkoutRunStats
+    ) -> None:
+        """Handle the missed workouts of one chunk of users (the caller commits)."""
+        # Read before the per-user path below commits and expires the users
+        preference_by_user = {user.id: user.missed_workout_preference for user in users}
+        virtual_user_ids = {
+            row.user_id for row in db.query(Program.user_id).filter(
+                Program.user_id.in_(list(preference_by_user)),
+                Program.schedule_mode == ScheduleMode.VIRTUAL
+            ).distinct().all()
+        }
+
+        # Virtual-schedule workouts have to be computed, so these users are planned one by one
+        for user in [user for user in users if user.id in virtual_user_ids]:
+            preference = preference_by_user.pop(user.id)
+            results = WorkoutService.auto_handle_missed_workouts(db, user, today=today)
+            if preference == MissedWorkoutPreference.SKIP:
+                stats.workouts_skipped += len(results)
+            else:
+                stats.workouts_rescheduled += len(results)
+                stats.workouts_shifted += sum({
+                    result.workout.program_id: result.rescheduled_count for result in results
+                }.values())
+
+        if not preference_by_user:
+            return
+
+        missed = db.query(Workout, Program.user_id).join(Program).filter(
+            Program.user_id.in_(list(preference_by_user)),
+            Workout.status == WorkoutStatus.SCHEDULED,
+            Workout.scheduled_date < today
+        ).options(selectinload(Workout.main_lifts)).all()
+
+        skipped_by_user: Dict[str, List[Workout]] = {}
+        earliest_by_program: Dict[str, date] = {}
+        for workout, user_id in missed:
+            if preference_by_user[user_id] == MissedWorkoutPreference.SKIP:
+                skipped_by_user.setdefault(user_id, []).append(workout)
+            else:
+                earliest = earliest_by_program.get(workout.program_id)
+                if earliest is None or workout.scheduled_date < earliest:
+                    earliest_by_program[workout.program_id] = workout.scheduled_date
+                stats.workouts_rescheduled += 1
+
+        if skipped_by_user:
+            skipped_ids = [w.id for workouts in skipped_by_user.values() for w in workouts]
+            AnalyticsService.record_skipped_rollups_for_users(db, skipped_by_user)
+            db.query(Workout).filter(Workout.id.in_(skipped_ids)).update(
+                {Workout.status: WorkoutStatus.SKIPPED},
+                synchronize_session=False
+            )
+            stats.workouts_skipped += len(skipped_ids)
+
+        if earliest_by_program:
+            # Each program's earliest missed workout moves to today and the rest
+            # of its schedule moves with it, all in one statement
+            from_date = case(earliest_by_program, value=Workout.program_id)
+            days = case(
+                {program_id: (today - earliest).days for program_id, earliest in earliest_by_program.items()},
+                value=Workout.program_id
+            )
+            stats.workouts_shifted += db.query(Workout).filter(
+                Workout.program_id.in_(list(earliest_by_program)),
+                Workout.status == WorkoutStatus.SCHEDULED,
+                Workout.scheduled_date >= from_date
+            ).update(
+                {Workout.scheduled_date: date_add_days(Workout.scheduled_date, days)},
+                synchronize_session=False
+            )
@@ -1,15 +1,22 @@
 """
 Program service with business logic.
 """
+import time
+import uuid
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from datetime import date, timedelta, datetime
 from app.models.program import (
     Program, ProgramTemplate, ProgramDayAccessories, TrainingMax, TrainingMaxHistory,
-    LiftType, ProgramStatus, TrainingMaxReason
+    LiftType, ProgramStatus, ScheduleMode, TrainingMaxReason
 )
 from app.models.workout import Workout, WorkoutMainLift, WeekType, WorkoutStatus
+from app.models.analytics import WorkoutSummary
+from app.services.analytics import AnalyticsService
+from app.utils.program_cache import program_detail_cache
 from app.models.user import User
 from app.schemas.program import (
     ProgramCreateRequest, ProgramResponse, ProgramDetailResponse,
@@ -18,6 +25,14 @@ from app.schemas.program import (
 )
 
 
+class ScheduleSlot(NamedTuple):
+    """One training day of a cycle, before training maxes are applied."""
+    scheduled_date: date
+    week_number: int
+    week_type: WeekType  # Representative week type for the workout
+    lifts: List[Tuple[LiftType, WeekType]]  # (lift, lift's own week type) in lift order
+
+
 class ProgramService:
     """Service for handling program operations."""
 
@@ -53,6 +68,14 @@ class ProgramService:
         [LiftType.PRESS]                          # Day 3
     ]
 
+    # Standard training max increments per completed cycle (5/3/1)
+    CYCLE_TM_INCREMENTS = {
+        LiftType.PRESS: 5.0,          # Upper body: +5 lbs
+        LiftType.BENCH_PRESS: 5.0,    # Upper body: +5 lbs
+        LiftType.SQUAT: 10.0,         # Lower body: +10 lbs
+        LiftType.DEADLIFT: 10.0       # Lower body: +10 lbs
+    }
+
     @staticmethod
     def get_weeks_per_cycle(template_type: str, include_deload: bool) -> int:
         """
@@ -160,7 +183,9 @@ class ProgramService:
             target_cycles=program_data.target_cycles,
             training_days=program_data.training_days,
             include_deload=1 if program_data.include_deload else 0,
-            status=ProgramStatus.ACTIVE
+            status=ProgramStatus.ACTIVE,
+            schedule_mode=program_data.schedule_mode,
+            scheduled_cycles=1
         )
 
         db.add(program)
@@ -311,10 +336,13 @@ class ProgramService:
                     )
                     db.add(day_accessories)
 
-        # Generate first cycle's workouts (4 weeks)
-        workouts_created = ProgramService._generate_workouts(
-            db, program, program_data.start_date, cycle_number=1
-        )
+        # Generate first cycle's workouts (4 weeks); virtual programs only count them
+        if program.schedule_mode == ScheduleMode.VIRTUAL:
+            workouts_created = len(ProgramService.get_cycle_slots(program, program_data.start_date))
+        else:
+            workouts_created = ProgramService._generate_workouts(
+                db, program, program_data.start_date, cycle_number=1
+            )
 
         db.commit()
         db.refresh(program)
@@ -327,6 +355,7 @@ class ProgramService:
             end_date=program.end_date,
             status=program.status,
             training_days=program.training_days,
+            schedule_mode=program.schedule_mode,
             current_cycle=1,
             current_week=1,
             training_maxes=training_maxes_dict,
@@ -335,30 +364,48 @@ class ProgramService:
         )
 
     @staticmethod
-    def _generate_workouts(
-        db: Session,
-        program: Program,
-        start_date: date,
-        cycle_number: int
-    ) -> int:
+    def get_cycle_start_date(program: Program, cycle_number: int) -> date:
+        """
+        Get the first day of a cycle in a virtual-schedule program.
+
+        Virtual cycles run back to back from the program start date, so a
+        cycle's dates do not depend on which workouts have been stored.
+
+        Args:
+            program: Program instance
+            cycle_number: Cycle number (1-based)
+
+        Returns:
+            Date the cycle starts on, before any reschedule shifts
         """
-        Generate workouts for a cycle.
+        weeks_per_cycle = ProgramService.get_weeks_per_cycle(
+            program.template_type,
+            bool(program.include_deload)
+        )
+        return program.start_date + timedelta(weeks=weeks_per_cycle * (cycle_number - 1))
+
+    @staticmethod
+    def get_cycle_slots(program: Program, start_date: date) -> List[ScheduleSlot]:
+        """
+        Lay out the training days of one cycle.
 
         - 3-day programs: 5 weeks with rolling progression (each lift has its own week_type)
         - 2-day/4-day programs: 3-4 weeks (all lifts share the same week_type per week)
 
+        This is the single definition of a cycle's schedule: materialized
+        programs insert one workout per slot, virtual programs compute them
+        on demand.
+
         Args:
-            db: Database session
             program: Program instance
             start_date: Start date for this cycle
-            cycle_number: Cycle number
 
         Returns:
-            Number of workouts created
+            List of ScheduleSlot in date order
         """
         # Handle 3-day programs differently (rolling 5-week progression)
         if program.template_type == '3_day':
-            return ProgramService._generate_3_day_workouts(db, program, start_date, cycle_number)
+            return ProgramService._get_3_day_cycle_slots(program, start_date)
 
         # Standard 2-day/4-day progression
         week_types = [
@@ -372,11 +419,11 @@ class ProgramService:
         if not program.include_deload:
             week_types = week_types[:3]  # Only weeks 1-3
 
+        slots = []
         current_date = start_date
-        workouts_created = 0
 
         for week_num, week_type in enumerate(week_types, start=1):
-            # Create workouts for each training day this week
+            # One slot for each training day this week
             for day_offset in range(7):
                 check_date = current_date + timedelta(days=day_offset)
                 day_name = check_date.strftime('%A').lower()
@@ -388,84 +435,45 @@ class ProgramService:
                     # Determine which lifts should be performed on this day
                     if program.template_type == '2_day':
                         lifts = ProgramService.TWO_DAY_LIFT_ORDER[day_index]
-                    elif program.template_type == '3_day':
-                        lifts = ProgramService.THREE_DAY_LIFT_ORDER[day_index]
                     else:
                         # 4-day program: One lift per training day
                         lifts = [ProgramService.FOUR_DAY_LIFT_ORDER[day_index]]
 
-                    # Create ONE workout for this training day
-                    workout = Workout(
-                        program_id=program.id,
+                    # For 2-day/4-day, all lifts share the week's week_type
+                    slots.append(ScheduleSlot(
                         scheduled_date=check_date,
-                        cycle_number=cycle_number,
                         week_number=week_num,
                         week_type=week_type,
-                        status=WorkoutStatus.SCHEDULED
-                    )
-                    db.add(workout)
-                    db.flush()  # Get workout.id for foreign key
-
-                    # Create WorkoutMainLift records for each lift on this day
-                    for order, lift in enumerate(lifts, start=1):
-                        # Get current training max for this lift and cycle
-                        training_max_record = db.query(TrainingMax).filter(
-                            TrainingMax.program_id == program.id,
-                            TrainingMax.lift_type == lift,
-                            TrainingMax.cycle_number == cycle_number
-                        ).first()
-
-                        if not training_max_record:
-                            raise HTTPException(
-                                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                                detail=f"Training max not found for {lift.value} in cycle {cycle_number}"
-                            )
-
-                        workout_main_lift = WorkoutMainLift(
-                            workout_id=workout.id,
-                            lift_type=lift,
-                            lift_order=order,
-                            current_training_max=training_max_record.value,
-                            week_type=week_type  # For 2-day/4-day, all lifts share same week_type
-                        )
-                        db.add(workout_main_lift)
-
-                    workouts_created += 1
+                        lifts=[(lift, week_type) for lift in lifts]
+                    ))
 
             # Move to next week
             current_date += timedelta(days=7)
 
-        return workouts_created
+        return slots
 
     @staticmethod
-    def _generate_3_day_workouts(
-        db: Session,
-        program: Program,
-        start_date: date,
-        cycle_number: int
-    ) -> int:
+    def _get_3_day_cycle_slots(program: Program, start_date: date) -> List[ScheduleSlot]:
         """
-        Generate workouts for 3-day program with rolling progression (5 weeks).
+        Lay out a 3-day program cycle with rolling progression (5 weeks).
         Each lift progresses independently through 5s -> 3s -> 5/3/1 -> Deload.
 
         Args:
-            db: Database session
             program: Program instance
             start_date: Start date for this cycle
-            cycle_number: Cycle number
 
         Returns:
-            Number of workouts created
+            List of ScheduleSlot in date order
         """
+        slots = []
         current_date = start_date
-        workouts_created = 0
 
         # Iterate through 5 weeks
         for week_num in range(1, 6):
             # Get the lifts scheduled for this week from the predefined schedule
             week_lifts = ProgramService.THREE_DAY_LIFT_SCHEDULE[week_num]
 
-            # Create workouts for each training day this week
+            # One slot for each training day this week
             for day_offset in range(7):
                 check_date = current_date + timedelta(days=day_offset)
                 day_name = check_date.strftime('%A').lower()
@@ -483,71 +491,152 @@ class ProgramService:
                         # For week 5 deload, we might have 4 lifts for 3 days
                         # In this case, combine first two lifts on day 0
                         if day_index == 0 and len(week_lifts) == 4:
-                            lifts_this_day = [week_lifts[0][0], week_lifts[1][0]]  # Press + Deadlift
-                            lift_week_type_map = {
-                                week_lifts[0][0]: week_lifts[0][1],
-                                week_lifts[1][0]: week_lifts[1][1]
-                            }
-                            workout_week_type = week_lifts[0][1]  # Use first lift's week_type
+                            lifts_this_day = [week_lifts[0], week_lifts[1]]  # Press + Deadlift
                         elif day_index == 1 and len(week_lifts) == 4:
-                            lifts_this_day = [week_lifts[2][0]]  # Bench
-                            lift_week_type_map = {week_lifts[2][0]: week_lifts[2][1]}
-                            workout_week_type = week_lifts[2][1]
+                            lifts_this_day = [week_lifts[2]]  # Bench
                         elif day_index == 2 and len(week_lifts) == 4:
-                            lifts_this_day = [week_lifts[3][0]]  # Squat
-                            lift_week_type_map = {week_lifts[3][0]: week_lifts[3][1]}
-                            workout_week_type = week_lifts[3][1]
+                            lifts_this_day = [week_lifts[3]]  # Squat
                         else:
                             continue
                     else:
                         # Normal case: one lift per day
-                        lift_type, week_type = week_lifts[day_index]
-                        lifts_this_day = [lift_type]
-                        lift_week_type_map = {lift_type: week_type}
-                        workout_week_type = week_type
+                        lifts_this_day = [week_lifts[day_index]]
 
-                    # Create workout
-                    workout = Workout(
-                        program_id=program.id,
+                    slots.append(ScheduleSlot(
                         scheduled_date=check_date,
-                        cycle_number=cycle_number,
                         week_number=week_num,
-                        week_type=workout_week_type,  # Representative week type
-                        status=WorkoutStatus.SCHEDULED
-                    )
-                    db.add(workout)
-                    db.flush()
-
-                    # Create WorkoutMainLift records for each lift
-                    for order, lift in enumerate(lifts_this_day, start=1):
-                        # Get current training max
-                        training_max_record = db.query(TrainingMax).filter(
-                            TrainingMax.program_id == program.id,
-                            TrainingMax.lift_type == lift,
-                            TrainingMax.cycle_number == cycle_number
-                        ).first()
-
-                        if not training_max_record:
-                            raise HTTPException(
-                                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                                detail=f"Training max not found for {lift.value} in cycle {cycle_number}"
-                            )
-
-                        workout_main_lift = WorkoutMainLift(
-                            workout_id=workout.id,
-                            lift_type=lift,
-                            lift_order=order,
-                            current_training_max=training_max_record.value,
-                            week_type=lift_week_type_map[lift]  # Each lift gets its own week_type
-                        )
-                        db.add(workout_main_lift)
-
-                    workouts_created += 1
+                        week_type=lifts_this_day[0][1],  # Representative week type
+                        lifts=lifts_this_day  # Each lift keeps its own week_type
+                    ))
 
             # Move to next week
             current_date += timedelta(days=7)
 
-        return workouts_created
+        return slots
+
+    @staticmethod
+    def _generate_workouts(
+        db: Session,
+        program: Program,
+        start_date: date,
+        cycle_number: int
+    ) -> int:
+        """
+        Generate and store the workouts for a cycle.
+
+        Training maxes are loaded once per cycle and workouts are inserted in one
+        batched statement per table, so the cost does not grow with cycle length.
+
+        Args:
+            db: Database session
+            program: Program instance
+            start_date: Start date for this cycle
+            cycle_number: Cycle number
+
+        Returns:
+            Number of workouts created
+        """
+        # Load the cycle's training maxes once instead of per lift per day
+        training_maxes = ProgramService._get_cycle_training_maxes(db, program, cycle_number)
+
+        workout_rows = []
+        main_lift_rows = []
+        for slot in ProgramService.get_cycle_slots(program, start_date):
+            # Create ONE workout for this training day (id assigned client-side)
+            workout_id = str(uuid.uuid4())
+            workout_rows.append({
+                "id": workout_id,
+                "program_id": program.id,
+                "scheduled_date": slot.scheduled_date,
+                "cycle_number": cycle_number,
+                "week_number": slot.week_number,
+                "week_type": slot.week_type,
+                "status": WorkoutStatus.SCHEDULED
+            })
+
+            # Create WorkoutMainLift rows for each lift on this day
+            for order, (lift, lift_week_type) in enumerate(slot.lifts, start=1):
+                main_lift_rows.append({
+                    "id": str(uuid.uuid4()),
+                    "workout_id": workout_id,
+                    "lift_type": lift,
+                    "lift_order": order,
+                    "current_training_max": ProgramService._require_training_max(
+                        training_maxes, lift, cycle_number
+                    ),
+                    "week_type": lift_week_type
+                })
+
+        return ProgramService._insert_workouts(db, workout_rows, main_lift_rows)
+
+    @staticmethod
+    def _get_cycle_training_maxes(
+        db: Session,
+        program: Program,
+        cycle_number: int
+    ) -> Dict[LiftType, float]:
+        """
+        Load all training maxes for a cycle in a single query.
+
+        Args:
+            db: Database session
+            program: Program instance
+            cycle_number: Cycle number
+
+        Returns:
+            Dict mapping lift type to training max value
+        """
+        # Training maxes may have been added earlier in this transaction
+        db.flush()
+
+        training_maxes = {}
+        records = db.query(TrainingMax).filter(
+            TrainingMax.program_id == program.id,
+            TrainingMax.cycle_number == cycle_number
+        ).all()
+        for record in records:
+            training_maxes.setdefault(record.lift_type, record.value)
+
+        return training_maxes
+
+    @staticmethod
+    def _require_training_max(
+        training_maxes: Dict[LiftType, float],
+        lift: LiftType,
+        cycle_number: int
+    ) -> float:
+        """Look up a lift's training max, failing if the cycle has none."""
+        if lift not in training_maxes:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Training max not found for {lift.value} in cycle {cycle_number}"
+            )
+        return training_maxes[lift]
+
+    @staticmethod
+    def _insert_workouts(
+        db: Session,
+        workout_rows: List[dict],
+        main_lift_rows: List[dict]
+    ) -> int:
+        """
+        Insert generated workouts and their main lifts with one batched statement per table.
+
+        Args:
+            db: Database session
+            workout_rows: Workout column values (ids pre-assigned)
+            main_lift_rows: WorkoutMainLift column values referencing workout_rows ids
+
+        Returns:
+            Number of workouts inserted
+        """
+        if workout_rows:
+            db.execute(insert(Workout), workout_rows)
+        if main_lift_rows:
+            db.execute(insert(WorkoutMainLift), main_lift_rows)
+
+        return len(workout_rows)
+
 
     @staticmethod
     def get_user_programs(db: Session, user: User) -> List[ProgramResponse]:
@@ -572,6 +661,11 @@ class ProgramService:
         """
         Get detailed program information.
 
+        The program, its current training maxes, workout count and current
+        cycle/week come from one query using window functions (supported by
+        PostgreSQL and SQLite alike). Results are kept briefly in
+        program_detail_cache; writes that change the program invalidate the entry.
+
         Args:
             db: Database session
             user: Current user
@@ -583,46 +677,86 @@ class ProgramService:
         Raises:
             HTTPException: If program not found or not owned by user
         """
-        program = db.query(Program).filter(
+        cached = program_detail_cache.get(program_id, user.id)
+        if cached:
+            return cached
+        loaded_at = time.time()
+
+        # Latest training max per lift: rank each lift's records by cycle
+        ranked_tms = select(
+            TrainingMax.program_id,
+            TrainingMax.lift_type,
+            TrainingMax.value,
+            TrainingMax.effective_date,
+            TrainingMax.cycle_number,
+            func.row_number().over(
+                partition_by=TrainingMax.lift_type,
+                order_by=TrainingMax.cycle_number.desc()
+            ).label("tm_rank")
+        ).where(TrainingMax.program_id == program_id).subquery()
+
+        # Latest workout by cycle and week, with the program's workout count on every row
+        ranked_workouts = select(
+            Workout.program_id,
+            Workout.cycle_number,
+            Workout.week_number,
+            func.count().over().label("workout_count"),
+            func.row_number().over(
+                order_by=(Workout.cycle_number.desc(), Workout.week_number.desc())
+            ).label("workout_rank")
+        ).where(Workout.program_id == program_id).subquery()
+
+        # One row per lift with a training max (one row if none), each carrying the program
+        rows = db.query(
+            Program,
+            ranked_tms.c.lift_type,
+            ranked_tms.c.value,
+            ranked_tms.c.effective_date,
+            ranked_tms.c.cycle_number,
+            ranked_workouts.c.cycle_number,
+            ranked_workouts.c.week_number,
+            ranked_workouts.c.workout_count
+        ).outerjoin(
+            ranked_tms, and_(ranked_tms.c.program_id == Program.id, ranked_tms.c.tm_rank == 1)
+        ).outerjoin(
+            ranked_workouts,
+            and_(ranked_workouts.c.program_id == Program.id, ranked_workouts.c.workout_rank == 1)
+        ).filter(
             Program.id == program_id,
             Program.user_id == user.id
-        ).first()
+        ).all()
 
-        if not program:
+        if not rows:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Program not found"
             )
 
-        # Get current training maxes
-        training_maxes_dict = {}
-        for lift in LiftType:
-            tm = db.query(TrainingMax).filter(
-                TrainingMax.program_id == program.id,
-                TrainingMax.lift_type == lift
-            ).order_by(TrainingMax.cycle_number.desc()).first()
-
-            if tm:
-                training_maxes_dict[lift.value] = TrainingMaxResponse(
-                    value=tm.value,
-                    effective_date=tm.effective_date,
-                    cycle=tm.cycle_number
-                )
-
-        # Count workouts
-        workout_count = db.query(Workout).filter(
-            Workout.program_id == program.id
-        ).count()
-
-        # Get current cycle/week (simplified - just use latest workout)
-        latest_workout = db.query(Workout).filter(
-            Workout.program_id == program.id
-        ).order_by(Workout.cycle_number.desc(), Workout.week_number.desc()).first()
+        program, _, _, _, _, latest_cycle, latest_week, stored_count = rows[0]
+        training_maxes_dict = {
+            lift_type.value: TrainingMaxResponse(value=value, effective_date=effective_date, cycle=cycle)
+            for _, lift_type, value, effective_date, cycle, _, _, _ in rows
+            if lift_type is not None
+        }
 
-        current_cycle = latest_workout.cycle_number if latest_workout else 1
-        current_week = latest_workout.week_number if latest_workout else 1
+        if program.schedule_mode == ScheduleMode.VIRTUAL:
+            # Every slot of every scheduled cycle is a workout, stored or not
+            workout_count = sum(
+                len(ProgramService.get_cycle_slots(
+                    program, ProgramService.get_cycle_start_date(program, cycle)
+                ))
+                for cycle in range(1, program.scheduled_cycles + 1)
+            )
+            current_cycle = program.scheduled_cycles
+            current_week = ProgramService.get_weeks_per_cycle(
+                program.template_type, bool(program.include_deload)
+            )
+        else:
+            workout_count = stored_count or 0
+            current_cycle = latest_cycle or 1
+            current_week = latest_week or 1
 
-        return ProgramDetailResponse(
+        detail = ProgramDetailResponse(
             id=program.id,
             name=program.name,
             template_type=program.template_type,
@@ -631,12 +765,15 @@ class ProgramService:
             target_cycles=program.target_cycles,
             status=program.status,
             training_days=program.training_days,
+            schedule_mode=program.schedule_mode,
             current_cycle=current_cycle,
             current_week=current_week,
             training_maxes=training_maxes_dict,
             workouts_generated=workout_count,
             created_at=program.created_at
         )
+        program_detail_cache.put(program_id, user.id, detail, loaded_at)
+        return detail
 
     @staticmethod
     def get_program_templates(
@@ -736,6 +873,7 @@ class ProgramService:
             setattr(program, field, value)
 
         db.commit()
+        program_detail_cache.invalidate(program_id)
         db.refresh(program)
 
         return ProgramResponse.model_validate(program)
@@ -885,18 +1023,10 @@ class ProgramService:
         # Determine next cycle number
         next_cycle = max(tm.cycle_number for tm in current_tms) + 1
 
-        # Standard progression increments per 5/3/1
-        increments = {
-            LiftType.PRESS: 5.0,          # Upper body: +5 lbs
-            LiftType.BENCH_PRESS: 5.0,    # Upper body: +5 lbs
-            LiftType.SQUAT: 10.0,         # Lower body: +10 lbs
-            LiftType.DEADLIFT: 10.0       # Lower body: +10 lbs
-        }
-
         # Create new training maxes with increases
         new_tms = {}
         for lift_type, old_tm in latest_tms.items():
-            increment = increments[lift_type]
+            increment = ProgramService.CYCLE_TM_INCREMENTS[lift_type]
             new_value = old_tm.value + increment
 
             # Create new training max record
@@ -929,6 +1059,7 @@ class ProgramService:
             }
 
         db.commit()
+        program_detail_cache.invalidate(program_id)
 
         return {
             "cycle_completed": next_cycle - 1,
@@ -968,18 +1099,23 @@ class ProgramService:
                 detail="Program not found"
             )
 
-        # Get latest cycle number
-        latest_workout = db.query(Workout).filter(
-            Workout.program_id == program.id
-        ).order_by(Workout.cycle_number.desc()).first()
+        if program.schedule_mode == ScheduleMode.VIRTUAL:
+            # Virtual cycles have no rows to look at; the program tracks how many exist
+            latest_workout = None
+            next_cycle = program.scheduled_cycles + 1
+        else:
+            # Get latest cycle number
+            latest_workout = db.query(Workout).filter(
+                Workout.program_id == program.id
+            ).order_by(Workout.cycle_number.desc()).first()
 
-        if not latest_workout:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No existing workouts found. Cannot generate next cycle."
-            )
+            if not latest_workout:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No existing workouts found. Cannot generate next cycle."
+                )
 
-        next_cycle = latest_workout.cycle_number + 1
+            next_cycle = latest_workout.cycle_number + 1
 
         # Check if training maxes exist for next cycle
         tms_for_next_cycle = db.query(TrainingMax).filter(
@@ -993,19 +1129,26 @@ class ProgramService:
                 detail=f"No training maxes found for cycle {next_cycle}. Complete current cycle first."
             )
 
-        # Calculate start date for next cycle
-        # Cycles are 3 or 4 weeks depending on include_deload
-        start_date = latest_workout.scheduled_date + timedelta(days=7)
-
-        # Generate workouts for next cycle (3 or 4 weeks)
-        workouts_created = ProgramService._generate_workouts(
-            db,
-            program,
-            start_date,
-            next_cycle
-        )
+        if latest_workout is None:
+            # Virtual workouts are computed on demand; extending the horizon is all it takes
+            start_date = ProgramService.get_cycle_start_date(program, next_cycle)
+            workouts_created = len(ProgramService.get_cycle_slots(program, start_date))
+        else:
+            # Calculate start date for next cycle
+            # Cycles are 3 or 4 weeks depending on include_deload
+            start_date = latest_workout.scheduled_date + timedelta(days=7)
+
+            # Generate workouts for next cycle (3 or 4 weeks)
+            workouts_created = ProgramService._generate_workouts(
+                db,
+                program,
+                start_date,
+                next_cycle
+            )
 
+        program.scheduled_cycles = next_cycle
         db.commit()
+        program_detail_cache.invalidate(program_id)
 
         return {
             "cycle_number": next_cycle,
@@ -1016,7 +1159,11 @@ class ProgramService:
     @staticmethod
     def delete_program(db: Session, user: User, program_id: str) -> None:
         """
-        Delete a program and all associated data.
+        Soft-delete a program.
+
+        Sets deleted_at, which hides the program and everything under it from
+        all queries, in one UPDATE whatever the program's size. The rows are
+        removed later by purge_program (see purge_program_task).
 
         Args:
             db: Database session
@@ -1026,45 +1173,102 @@ class ProgramService:
         Raises:
             HTTPException: If program not found or doesn't belong to user
         """
-        from app.models.workout import WorkoutSet
-
-        # Get program and verify ownership
-        program = db.query(Program).filter(
+        updated = db.query(Program).filter(
             Program.id == program_id,
-            Program.user_id == user.id
-        ).first()
+            Program.user_id == user.id,
+            Program.deleted_at.is_(None)
+        ).update({Program.deleted_at: datetime.utcnow()}, synchronize_session=False)
 
-        if not program:
+        if not updated:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Program not found"
             )
+        db.commit()
+        program_detail_cache.invalidate(program_id)
+
+    @staticmethod
+    def purge_program(db: Session, program_id: str) -> None:
+        """
+        Permanently delete a soft-deleted program and all associated data.
+
+        Each table is cleared with one set-based DELETE keyed by subqueries
+        on the program's workouts, so the statement count does not depend on
+        the number of workouts. The owner's weekly rollups are rebuilt
+        afterwards, since they span programs.
+
+        Args:
+            db: Database session
+            program_id: Program ID
+        """
+        from app.models.workout import WorkoutSet
+        from app.models.rep_max import RepMax, BestRepMax
+        from app.services.rep_max import RepMaxService
+
+        program = db.query(Program).execution_options(include_deleted=True).filter(
+            Program.id == program_id,
+            Program.deleted_at.isnot(None)
+        ).first()
+        if not program:
+            return
+        user_id = program.user_id
+
+        workout_ids = db.query(Workout.id).filter(Workout.program_id == program_id).scalar_subquery()
+        set_ids = db.query(WorkoutSet.id).filter(WorkoutSet.workout_id.in_(workout_ids)).scalar_subquery()
+
+        # Children first, so foreign keys hold after every statement. Bests may
+        # point at the PRs being removed, so the user's are rebuilt from the log
+        db.query(BestRepMax).filter(BestRepMax.user_id == user_id).delete(synchronize_session=False)
+        db.query(RepMax).filter(RepMax.workout_set_id.in_(set_ids)).delete(synchronize_session=False)
+        db.query(WorkoutSummary).filter(WorkoutSummary.program_id == program_id).delete(synchronize_session=False)
+        db.query(WorkoutSet).filter(WorkoutSet.workout_id.in_(workout_ids)).delete(synchronize_session=False)
+        db.query(WorkoutMainLift).filter(WorkoutMainLift.workout_id.in_(workout_ids)).delete(synchronize_session=False)
+        db.query(Workout).filter(Workout.program_id == program_id).delete(synchronize_session=False)
+        for model in (ProgramTemplate, ProgramDayAccessories, TrainingMax, TrainingMaxHistory):
+            db.query(model).filter(model.program_id == program_id).delete(synchronize_session=False)
+        db.query(Program).filter(Program.id == program_id).delete(synchronize_session=False)
+        RepMaxService.rebuild_best_rep_maxes(db, user_id)
+        db.commit()
 
-        # Delete all related data in proper order
-        # 1. Delete workout sets and workout main lifts (both reference workouts)
-        workouts = db.query(Workout).filter(Workout.program_id == program_id).all()
-        for workout in workouts:
-            db.query(WorkoutSet).filter(WorkoutSet.workout_id == workout.id).delete()
-            db.query(WorkoutMainLift).filter(WorkoutMainLift.workout_id == workout.id).delete()
+        AnalyticsService.rebuild_lift_rollups(db, user_id)
 
-        # 2. Delete workouts (references program)
-        db.query(Workout).filter(Workout.program_id == program_id).delete()
+    @staticmethod
+    def purge_program_task(bind: Engine, program_id: str) -> None:
+        """
+        Purge a soft-deleted program in a session of its own.
 
-        # 3. Delete program templates (references program)
-        db.query(ProgramTemplate).filter(ProgramTemplate.program_id == program_id).delete()
+        Meant for FastAPI background tasks, which run after the request's
+        session is closed.
 
-        # 3b. PHASE 2: Delete program day accessories (new table, references program)
-        db.query(ProgramDayAccessories).filter(ProgramDayAccessories.program_id == program_id).delete()
+        Args:
+            bind: Engine of the request's session
+            program_id: Program ID
+        """
+        with Session(bind=bind, autoflush=False) as db:
+            ProgramService.purge_program(db, program_id)
 
-        # 4. Delete training maxes (references program)
-        db.query(TrainingMax).filter(TrainingMax.program_id == program_id).delete()
+    @staticmethod
+    def purge_deleted_programs(db: Session, limit: Optional[int] = None) -> int:
+        """
+        Purge soft-deleted programs whose background purge did not run.
 
-        # 5. Delete training max history (references program)
-        db.query(TrainingMaxHistory).filter(TrainingMaxHistory.program_id == program_id).delete()
+        Args:
+            db: Database session
+            limit: Maximum number of programs to purge
 
-        # 6. Finally, delete the program itself
-        db.delete(program)
-        db.commit()
+        Returns:
+            Number of programs purged
+        """
+        query = db.query(Program.id).execution_options(include_deleted=True).filter(
+            Program.deleted_at.isnot(None)
+        ).order_by(Program.deleted_at)
+        if limit:
+            query = query.limit(limit)
+
+        program_ids = [row.id for row in query.all()]
+        for program_id in program_ids:
+            ProgramService.purge_program(db, program_id)
+        return len(program_ids)
 
     @staticmethod
     def get_program_day_accessories(
@@ -1,18 +1,46 @@
 """
 Rep max service with business logic.
 """
+import uuid
+from collections import defaultdict
+from datetime import date, datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import Dict
-from app.models.rep_max import RepMax
+from sqlalchemy import and_, func, insert, select
+from typing import Dict, Iterable, List, Optional
+from app.models.rep_max import RepMax, BestRepMax
 from app.models.program import LiftType
 from app.models.user import User
+from app.models.workout import WorkoutSet
+from app.utils.calculations import calculate_1rm
 from app.schemas.rep_max import RepMaxRecord, RepMaxByRepsResponse, AllRepMaxesResponse
 
 
 class RepMaxService:
     """Service for handling rep max operations."""
 
+    @staticmethod
+    def _records_by_reps(best_rep_maxes: Iterable[BestRepMax]) -> Dict[int, RepMaxRecord]:
+        """
+        Build the response records for one lift, keyed by rep count.
+
+        Rows for the same rep count in different units are collapsed to the
+        one with the highest calculated 1RM.
+        """
+        best_by_reps: Dict[int, BestRepMax] = {}
+        for rm in best_rep_maxes:
+            if rm.reps not in best_by_reps or rm.calculated_1rm > best_by_reps[rm.reps].calculated_1rm:
+                best_by_reps[rm.reps] = rm
+
+        return {
+            reps: RepMaxRecord(
+                weight=rm.weight,
+                calculated_1rm=rm.calculated_1rm,
+                achieved_date=rm.achieved_date,
+                weight_unit=rm.weight_unit.value
+            )
+            for reps, rm in sorted(best_by_reps.items())
+        }
+
     @staticmethod
     def get_rep_maxes_by_lift(
         db: Session,
@@ -32,34 +60,16 @@ class RepMaxService:
         """
         lift_enum = LiftType(lift_type.upper())
 
-        # Get all rep maxes for this lift
-        rep_maxes = db.query(RepMax).filter(
+        best_rep_maxes = db.query(BestRepMax).filter(
             and_(
-                RepMax.user_id == user.id,
-                RepMax.lift_type == lift_enum
+                BestRepMax.user_id == user.id,
+                BestRepMax.lift_type == lift_enum
             )
         ).all()
 
-        # Organize by rep count, keeping only the best (highest calculated 1RM) for each rep count
-        best_by_reps: Dict[int, RepMax] = {}
-        for rm in rep_maxes:
-            if rm.reps not in best_by_reps or rm.calculated_1rm > best_by_reps[rm.reps].calculated_1rm:
-                best_by_reps[rm.reps] = rm
-
-        # Convert to response format
-        rep_maxes_dict = {
-            reps: RepMaxRecord(
-                weight=rm.weight,
-                calculated_1rm=rm.calculated_1rm,
-                achieved_date=rm.achieved_date,
-                weight_unit=rm.weight_unit.value
-            )
-            for reps, rm in best_by_reps.items()
-        }
-
         return RepMaxByRepsResponse(
             lift_type=lift_type,
-            rep_maxes=rep_maxes_dict
+            rep_maxes=RepMaxService._records_by_reps(best_rep_maxes)
         )
 
     @staticmethod
@@ -77,36 +87,119 @@ class RepMaxService:
         Returns:
             AllRepMaxesResponse with rep maxes for all 4 lifts
         """
-        result = {}
-
-        for lift in LiftType:
-            # Get all rep maxes for this lift
-            rep_maxes = db.query(RepMax).filter(
-                and_(
-                    RepMax.user_id == user.id,
-                    RepMax.lift_type == lift
-                )
-            ).all()
-
-            # Organize by rep count
-            best_by_reps: Dict[int, RepMax] = {}
-            for rm in rep_maxes:
-                if rm.reps not in best_by_reps or rm.calculated_1rm > best_by_reps[rm.reps].calculated_1rm:
-                    best_by_reps[rm.reps] = rm
-
-            # Convert to response format
-            if best_by_reps:
-                rep_maxes_dict = {
-                    reps: RepMaxRecord(
-                        weight=rm.weight,
-                        calculated_1rm=rm.calculated_1rm,
-                        achieved_date=rm.achieved_date,
-                        weight_unit=rm.weight_unit.value
-                    )
-                    for reps, rm in best_by_reps.items()
-                }
-                result[lift.value] = rep_maxes_dict
-            else:
-                result[lift.value] = None
+        by_lift: Dict[LiftType, List[BestRepMax]] = defaultdict(list)
+        for rm in db.query(BestRepMax).filter(BestRepMax.user_id == user.id).all():
+            by_lift[rm.lift_type].append(rm)
 
+        result = {
+            lift.value: RepMaxService._records_by_reps(by_lift[lift]) if by_lift[lift] else None
+            for lift in LiftType
+        }
         return AllRepMaxesResponse(lifts=result)
+
+    @staticmethod
+    def record_rep_max(
+        db: Session,
+        user_id: str,
+        lift_type: LiftType,
+        workout_set: WorkoutSet,
+        achieved_date: date
+    ) -> Optional[RepMax]:
+        """
+        Record a set as a rep max if it beats the user's best for its rep count.
+
+        The best is found with one lookup on best_rep_maxes' unique key; a new
+        PR appends a rep_maxes row and upserts the best. Nothing is committed.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            lift_type: Lift of the set
+            workout_set: Logged set (actual_weight, actual_reps and weight_unit are used)
+            achieved_date: Date of the set
+
+        Returns:
+            The new RepMax, or None if the set is not a PR
+        """
+        best = db.query(BestRepMax).filter(
+            BestRepMax.user_id == user_id,
+            BestRepMax.lift_type == lift_type,
+            BestRepMax.reps == workout_set.actual_reps,
+            BestRepMax.weight_unit == workout_set.weight_unit
+        ).first()
+
+        if best and workout_set.actual_weight <= best.weight:
+            return None
+
+        rep_max = RepMax(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            lift_type=lift_type,
+            reps=workout_set.actual_reps,
+            weight=workout_set.actual_weight,
+            weight_unit=workout_set.weight_unit,
+            calculated_1rm=calculate_1rm(workout_set.actual_weight, workout_set.actual_reps),
+            achieved_date=achieved_date,
+            workout_set_id=workout_set.id
+        )
+        db.add(rep_max)
+
+        if not best:
+            best = BestRepMax(
+                user_id=user_id,
+                lift_type=lift_type,
+                reps=rep_max.reps,
+                weight_unit=rep_max.weight_unit
+            )
+            db.add(best)
+        best.weight = rep_max.weight
+        best.calculated_1rm = rep_max.calculated_1rm
+        best.achieved_date = rep_max.achieved_date
+        best.rep_max_id = rep_max.id
+        best.updated_at = datetime.utcnow()
+
+        return rep_max
+
+    @staticmethod
+    def rebuild_best_rep_maxes(db: Session, user_id: Optional[str] = None) -> int:
+        """
+        Rebuild best_rep_maxes from the rep_maxes log.
+
+        The heaviest entry per (user, lift, reps, unit) is picked with a window
+        function and copied over in one INSERT ... SELECT. Nothing is committed.
+
+        Args:
+            db: Database session
+            user_id: Only rebuild this user's bests (all users if None)
+
+        Returns:
+            Number of rows written
+        """
+        delete_query = db.query(BestRepMax)
+        if user_id:
+            delete_query = delete_query.filter(BestRepMax.user_id == user_id)
+        delete_query.delete(synchronize_session=False)
+
+        ranked = select(
+            RepMax,
+            func.row_number().over(
+                partition_by=(RepMax.user_id, RepMax.lift_type, RepMax.reps, RepMax.weight_unit),
+                order_by=(RepMax.weight.desc(), RepMax.achieved_date, RepMax.created_at)
+            ).label("weight_rank")
+        )
+        if user_id:
+            ranked = ranked.where(RepMax.user_id == user_id)
+        ranked = ranked.subquery()
+
+        columns = ["id", "user_id", "lift_type", "reps", "weight_unit", "weight", "calculated_1rm", "achieved_date"]
+        result = db.execute(
+            insert(BestRepMax).from_select(
+                columns + ["rep_max_id", "updated_at"],
+                select(
+                    *[ranked.c[column] for column in columns],
+                    ranked.c.id,
+                    ranked.c.created_at
+                ).where(ranked.c.weight_rank == 1)
+            )
+        )
+        return result.rowcount
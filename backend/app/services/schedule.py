@@ -0,0 +1,294 @@
+"""
+Virtual schedule service.
+
+Programs in VIRTUAL schedule mode store no upcoming workouts. Each workout
+is computed on demand from the program's training days, the template lift
+order and the cycle's training maxes, and is written as a Workout row only
+when it is completed or skipped. Computed workouts are transient Workout
+objects with stable ids, so the workout service can treat them like stored
+ones.
+"""
+import uuid
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from app.models.program import Program, TrainingMax, LiftType, ScheduleMode
+from app.models.workout import Workout, WorkoutMainLift, WorkoutStatus
+from app.models.user import User
+from app.services.program import ProgramService, ScheduleSlot
+
+# Namespace for deriving virtual workout ids
+VIRTUAL_WORKOUT_NAMESPACE = uuid.UUID("5b8f2d4e-6c1a-4f0e-9a37-2e51c8d0b6a4")
+
+
+class ScheduleService:
+    """Service for computing and storing virtual-schedule workouts."""
+
+    @staticmethod
+    def virtual_workout_id(program_id: str, cycle_number: int, slot_date: date) -> str:
+        """
+        Get the id of a virtual workout.
+
+        The id comes from the slot's original date, so it does not change when
+        the workout is rescheduled and is kept when the workout is stored.
+
+        Args:
+            program_id: Program ID
+            cycle_number: Cycle number
+            slot_date: Date of the slot before any reschedule shifts
+
+        Returns:
+            Workout ID
+        """
+        return str(uuid.uuid5(
+            VIRTUAL_WORKOUT_NAMESPACE, f"{program_id}/{cycle_number}/{slot_date.isoformat()}"
+        ))
+
+    @staticmethod
+    def shifted_date(slot_date: date, shifts: Optional[List[dict]]) -> date:
+        """
+        Apply a program's reschedule shifts to a slot date.
+
+        Each shift moves every date on or after its "from" date by its "days",
+        in the order the reschedules happened.
+
+        Args:
+            slot_date: Date of the slot before any reschedule shifts
+            shifts: Program.schedule_shifts
+
+        Returns:
+            The date the workout is currently scheduled for
+        """
+        for shift in shifts or []:
+            if slot_date >= date.fromisoformat(shift["from"]):
+                slot_date += timedelta(days=shift["days"])
+        return slot_date
+
+    @staticmethod
+    def add_shift(program: Program, from_date: date, days: int) -> None:
+        """Record a reschedule of a virtual program's workouts from from_date onwards."""
+        # Assign a new list so the JSON column is marked as changed
+        program.schedule_shifts = [
+            *(program.schedule_shifts or []),
+            {"from": from_date.isoformat(), "days": days}
+        ]
+
+    @staticmethod
+    def is_virtual(workout: Workout) -> bool:
+        """Check whether a workout was computed rather than loaded from the database."""
+        return inspect(workout).transient
+
+    @staticmethod
+    def get_virtual_workouts(
+        db: Session,
+        user: User,
+        program_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Workout]:
+        """
+        Compute the user's unstored virtual-schedule workouts.
+
+        Uses three queries however many workouts are computed: the virtual
+        programs, their training maxes, and the ids already stored.
+
+        Args:
+            db: Database session
+            user: Current user
+            program_id: Only this program
+            start_date: Filter by scheduled date >= start_date
+            end_date: Filter by scheduled date <= end_date
+
+        Returns:
+            Transient Workout objects with main lifts, ordered by (scheduled_date, id)
+        """
+        query = db.query(Program).filter(
+            Program.user_id == user.id,
+            Program.schedule_mode == ScheduleMode.VIRTUAL
+        )
+        if program_id:
+            query = query.filter(Program.id == program_id)
+        programs = query.all()
+        if not programs:
+            return []
+
+        candidates: List[Tuple[Program, int, ScheduleSlot, date, str]] = []
+        for program in programs:
+            # Reschedules only move workouts later, by at most the sum of all shifts
+            max_shift = sum(shift["days"] for shift in program.schedule_shifts or [])
+            weeks_per_cycle = ProgramService.get_weeks_per_cycle(
+                program.template_type, bool(program.include_deload)
+            )
+
+            for cycle_number in range(1, program.scheduled_cycles + 1):
+                cycle_start = ProgramService.get_cycle_start_date(program, cycle_number)
+                if end_date and cycle_start > end_date:
+                    break
+                cycle_end = cycle_start + timedelta(weeks=weeks_per_cycle, days=max_shift)
+                if start_date and cycle_end < start_date:
+                    continue
+
+                for slot in ProgramService.get_cycle_slots(program, cycle_start):
+                    scheduled_date = ScheduleService.shifted_date(
+                        slot.scheduled_date, program.schedule_shifts
+                    )
+                    if start_date and scheduled_date < start_date:
+                        continue
+                    if end_date and scheduled_date > end_date:
+                        continue
+                    workout_id = ScheduleService.virtual_workout_id(
+                        program.id, cycle_number, slot.scheduled_date
+                    )
+                    candidates.append((program, cycle_number, slot, scheduled_date, workout_id))
+
+        if not candidates:
+            return []
+
+        # Workouts that were completed or skipped are read from the workouts table instead
+        stored_ids = {
+            row.id for row in db.query(Workout.id).filter(
+                Workout.id.in_([candidate[-1] for candidate in candidates])
+            ).all()
+        }
+
+        training_maxes: Dict[Tuple[str, int], Dict[LiftType, float]] = {}
+        for record in db.query(TrainingMax).filter(
+            TrainingMax.program_id.in_([program.id for program in programs])
+        ).all():
+            training_maxes.setdefault(
+                (record.program_id, record.cycle_number), {}
+            ).setdefault(record.lift_type, record.value)
+
+        workouts = [
+            ScheduleService._build_workout(
+                program, cycle_number, slot, scheduled_date, workout_id,
+                training_maxes.get((program.id, cycle_number), {})
+            )
+            for program, cycle_number, slot, scheduled_date, workout_id in candidates
+            if workout_id not in stored_ids
+        ]
+        workouts.sort(key=lambda workout: (workout.scheduled_date, workout.id))
+        return workouts
+
+    @staticmethod
+    def _build_workout(
+        program: Program,
+        cycle_number: int,
+        slot: ScheduleSlot,
+        scheduled_date: date,
+        workout_id: str,
+        training_maxes: Dict[LiftType, float]
+    ) -> Workout:
+        """Build the transient Workout and main lifts for a schedule slot."""
+        return Workout(
+            id=workout_id,
+            program_id=program.id,
+            scheduled_date=scheduled_date,
+            completed_date=None,
+            cycle_number=cycle_number,
+            week_number=slot.week_number,
+            week_type=slot.week_type,
+            status=WorkoutStatus.SCHEDULED,
+            notes=None,
+            created_at=program.created_at,
+            main_lifts=[
+                WorkoutMainLift(
+                    id=str(uuid.uuid5(uuid.UUID(workout_id), lift.value)),
+                    workout_id=workout_id,
+                    lift_type=lift,
+                    lift_order=order,
+                    current_training_max=ProgramService._require_training_max(
+                        training_maxes, lift, cycle_number
+                    ),
+                    week_type=lift_week_type,
+                    created_at=program.created_at
+                )
+                for order, (lift, lift_week_type) in enumerate(slot.lifts, start=1)
+            ]
+        )
+
+    @staticmethod
+    def find_virtual_workout(
+        db: Session,
+        user: User,
+        workout_id: str,
+        program_id: Optional[str] = None
+    ) -> Optional[Workout]:
+        """
+        Find an unstored virtual workout by id.
+
+        Virtual ids are version 5 UUIDs, so any other id is rejected without
+        a query. Otherwise slot ids are derived program by program until one
+        matches, and only that workout is built.
+
+        Args:
+            db: Database session
+            user: Current user
+            workout_id: Workout ID
+            program_id: Only look in this program
+
+        Returns:
+            Transient Workout, or None if no virtual program of the user has it
+        """
+        try:
+            if uuid.UUID(workout_id).version != 5:
+                return None
+        except ValueError:
+            return None
+
+        query = db.query(Program).filter(
+            Program.user_id == user.id,
+            Program.schedule_mode == ScheduleMode.VIRTUAL
+        )
+        if program_id:
+            query = query.filter(Program.id == program_id)
+
+        for program in query.all():
+            for cycle_number in range(1, program.scheduled_cycles + 1):
+                cycle_start = ProgramService.get_cycle_start_date(program, cycle_number)
+                for slot in ProgramService.get_cycle_slots(program, cycle_start):
+                    if ScheduleService.virtual_workout_id(program.id, cycle_number, slot.scheduled_date) != workout_id:
+                        continue
+
+                    # A completed or skipped workout is read from the workouts table instead
+                    if db.query(Workout.id).filter(Workout.id == workout_id).first():
+                        return None
+
+                    training_maxes: Dict[LiftType, float] = {}
+                    for record in db.query(TrainingMax).filter(
+                        TrainingMax.program_id == program.id,
+                        TrainingMax.cycle_number == cycle_number
+                    ).all():
+                        training_maxes.setdefault(record.lift_type, record.value)
+
+                    return ScheduleService._build_workout(
+                        program, cycle_number, slot,
+                        ScheduleService.shifted_date(slot.scheduled_date, program.schedule_shifts),
+                        workout_id, training_maxes
+                    )
+        return None
+
+    @staticmethod
+    def materialize_workouts(db: Session, workouts: List[Workout]) -> None:
+        """
+        Store virtual workouts and their main lifts so they can be updated.
+
+        Rows keep the virtual ids, so links to the workouts stay valid. All
+        rows are written in one flush; the caller commits.
+
+        Args:
+            db: Database session
+            workouts: Transient Workouts from get_virtual_workouts
+        """
+        if not workouts:
+            return
+
+        now = datetime.utcnow()
+        for workout in workouts:
+            workout.created_at = now
+            for main_lift in workout.main_lifts:
+                main_lift.created_at = now
+
+        db.add_all(workouts)
+        db.flush()
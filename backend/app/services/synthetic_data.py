@@ -0,0 +1,594 @@
+"""
+Synthetic training histories for load and scale testing.
+
+Each generated user trains through back-to-back programs on the 2/3/4-day
+templates over several years. Schedules come from ProgramService's cycle
+layout and set weights from the batched prescription engine, so the rows
+look like ones written by the app. Every user has a simulated estimated 1RM
+per lift that grows towards a ceiling. That drives AMRAP reps, PRs and
+failed cycles, which reset the training max to 90%. Some workouts are
+skipped, some are rescheduled by a day or two, and a few recent ones are
+left overdue for the missed-workout flow.
+
+Rows are written with one batched insert per table for each chunk of
+users. The chunk's derived rows (best rep maxes, workout summaries and
+weekly rollups) are then built with the existing services for just those
+users, so the work per chunk stays the same however many users there are.
+"""
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.exercise import Exercise
+from app.models.program import (
+    LiftType, Program, ProgramDayAccessories, ProgramStatus, ProgramTemplate, ScheduleMode,
+    TrainingMax, TrainingMaxHistory, TrainingMaxReason
+)
+from app.models.rep_max import RepMax
+from app.models.user import MissedWorkoutPreference, User, WeightUnit
+from app.models.workout import SetType, WeekType, Workout, WorkoutMainLift, WorkoutSet, WorkoutStatus
+from app.services.analytics import AnalyticsService
+from app.services.program import ProgramService, ScheduleSlot
+from app.services.rep_max import RepMaxService
+from app.utils.calculations import PRESCRIBED_REPS, WARMUP_SCHEME, WORKING_SET_PERCENTAGES, calculate_1rm
+from app.utils.prescriptions import prescribe_warmup_weights, prescribe_working_weights
+from app.utils.security import get_password_hash
+
+# Tables in foreign key order
+_TABLES = (
+    User, Program, TrainingMax, TrainingMaxHistory, ProgramTemplate, ProgramDayAccessories,
+    Workout, WorkoutMainLift, WorkoutSet, RepMax
+)
+
+# Prescription week (1-4) of each week type; 3-day cycles number their weeks 1-5
+_PRESCRIPTION_WEEK = {
+    WeekType.WEEK_1_5S: 1,
+    WeekType.WEEK_2_3S: 2,
+    WeekType.WEEK_3_531: 3,
+    WeekType.WEEK_4_DELOAD: 4
+}
+
+# Template share among generated users and the training days each one can use
+_TEMPLATES = (("4_day", 0.5), ("3_day", 0.3), ("2_day", 0.2))
+_TRAINING_DAYS = {
+    "4_day": (["monday", "tuesday", "thursday", "friday"], ["monday", "wednesday", "friday", "saturday"]),
+    "3_day": (["monday", "wednesday", "friday"], ["tuesday", "thursday", "saturday"]),
+    "2_day": (["monday", "thursday"], ["tuesday", "friday"], ["wednesday", "saturday"])
+}
+
+# Starting training max range in pounds
+_STARTING_TMS = {
+    LiftType.PRESS: (65, 135),
+    LiftType.BENCH_PRESS: (115, 225),
+    LiftType.SQUAT: (135, 315),
+    LiftType.DEADLIFT: (185, 365)
+}
+
+_POUNDS_PER_KG = 2.20462
+
+# Overdue workouts are only left in the last this many days
+_MISSED_WINDOW_DAYS = 14
+
+
+class SyntheticDataStats:
+    """Progress counters for one generation run."""
+
+    def __init__(self):
+        self.batches = 0
+        self.users = 0
+        self.programs = 0
+        self.workouts = 0
+        self.sets = 0
+        self.rep_maxes = 0
+        self._started_at = time.perf_counter()
+        self.elapsed_seconds = 0.0
+
+    def record_batch(self, rows: Dict[type, List[dict]]) -> None:
+        """Count a written batch and update the elapsed time."""
+        self.batches += 1
+        self.users += len(rows[User])
+        self.programs += len(rows[Program])
+        self.workouts += len(rows[Workout])
+        self.sets += len(rows[WorkoutSet])
+        self.rep_maxes += len(rows[RepMax])
+        self.elapsed_seconds = time.perf_counter() - self._started_at
+
+    def as_dict(self) -> Dict[str, float]:
+        """Get the counters as a dict."""
+        return {
+            "batches": self.batches,
+            "users": self.users,
+            "programs": self.programs,
+            "workouts": self.workouts,
+            "sets": self.sets,
+            "rep_maxes": self.rep_maxes,
+            "elapsed_seconds": self.elapsed_seconds
+        }
+
+
+class _Lifter:
+    """A generated user's unit settings and simulated strength."""
+
+    def __init__(self, user_id: str, unit: WeightUnit, skip_rate: float, reschedule_rate: float):
+        self.user_id = user_id
+        self.unit = unit
+        self.increment = 2.5 if unit == WeightUnit.KG else 5.0
+        self.training_maxes: Dict[LiftType, float] = {}
+        self.strength: Dict[LiftType, float] = {}  # Estimated 1RM per lift
+        self.ceiling: Dict[LiftType, float] = {}  # Strength the lifter can grow to
+        self.skip_rate = skip_rate
+        self.reschedule_rate = reschedule_rate
+        self.best_weights: Dict[Tuple[LiftType, int], float] = {}
+
+    def round(self, weight: float) -> float:
+        return round(weight / self.increment) * self.increment
+
+
+class SyntheticDataGenerator:
+    """Generates users with multi-year training histories and writes them in bulk."""
+
+    def __init__(
+        self,
+        db: Session,
+        seed: Optional[int] = None,
+        years: float = 5.0,
+        today: Optional[date] = None,
+        password: str = "loadtest-password"
+    ):
+        """
+        Prepare a generator.
+
+        Args:
+            db: Database session
+            seed: Random seed; the same seed, date and arguments give the same data
+            years: Length of each user's history, ending today
+            today: Workouts after this date are left scheduled (defaults to today)
+            password: Password of every generated user (hashed once)
+        """
+        self.db = db
+        self.rng = random.Random(seed)
+        self.today = today or date.today()
+        self.history_start = self.today - timedelta(days=round(365.25 * years))
+        self.password_hash = get_password_hash(password)
+        self.exercise_ids = [
+            row.id for row in db.query(Exercise.id).filter(Exercise.is_predefined.is_(True)).order_by(Exercise.id)
+        ]
+
+    def run(
+        self,
+        users: int,
+        batch_size: int = 20,
+        rebuild_derived: bool = True,
+        on_batch: Optional[Callable[[SyntheticDataStats], None]] = None
+    ) -> SyntheticDataStats:
+        """
+        Generate and store users with their histories.
+
+        Each batch of users is inserted with one statement per table and
+        committed on its own, followed by the batch's derived rows.
+
+        Args:
+            users: Number of users to generate
+            batch_size: Users per batch
+            rebuild_derived: Build best rep maxes, workout summaries and weekly
+                rollups for each batch's users
+            on_batch: Called with the running totals after each batch
+
+        Returns:
+            SyntheticDataStats for the run
+        """
+        stats = SyntheticDataStats()
+
+        for first in range(0, users, batch_size):
+            rows: Dict[type, List[dict]] = {table: [] for table in _TABLES}
+            for index in range(first, min(first + batch_size, users)):
+                self._add_user(rows, index)
+
+            for table in _TABLES:
+                if rows[table]:
+                    self.db.execute(insert(table), rows[table])
+            self.db.commit()
+
+            if rebuild_derived:
+                self._build_derived([row["id"] for row in rows[User]])
+
+            stats.record_batch(rows)
+            if on_batch:
+                on_batch(stats)
+
+        return stats
+
+    def _build_derived(self, user_ids: List[str]) -> None:
+        """Build best rep maxes, workout summaries and weekly rollups for a batch of new users."""
+        for user_id in user_ids:
+            RepMaxService.rebuild_best_rep_maxes(self.db, user_id)
+        self.db.commit()
+        AnalyticsService.backfill_workout_summaries(self.db, user_ids=user_ids)
+        AnalyticsService.rebuild_lift_rollups_for_users(self.db, user_ids)
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _add_user(self, rows: Dict[type, List[dict]], index: int) -> None:
+        """Add one user and their programs."""
+        rng = self.rng
+        user_id = self._uuid()
+        unit = WeightUnit.KG if rng.random() < 0.2 else WeightUnit.LBS
+        created_at = datetime.combine(self.history_start + timedelta(days=rng.randint(0, 180)), datetime.min.time())
+
+        rows[User].append({
+            "id": user_id,
+            "first_name": "Load",
+            "last_name": f"Test {index}",
+            "email": f"loadtest-{user_id[:8]}-{index}@example.com",
+            "password_hash": self.password_hash,
+            "weight_unit_preference": unit,
+            "rounding_increment": 2.5 if unit == WeightUnit.KG else 5.0,
+            "missed_workout_preference": rng.choice(list(MissedWorkoutPreference)),
+            "created_at": created_at,
+            "updated_at": created_at
+        })
+
+        scale = 1 / _POUNDS_PER_KG if unit == WeightUnit.KG else 1.0
+        lifter = _Lifter(
+            user_id, unit, skip_rate=rng.uniform(0.02, 0.15), reschedule_rate=rng.uniform(0.0, 0.1)
+        )
+        for lift, (low, high) in _STARTING_TMS.items():
+            lifter.training_maxes[lift] = lifter.round(rng.uniform(low, high) * scale)
+            lifter.strength[lift] = lifter.training_maxes[lift] / 0.9 * rng.uniform(0.98, 1.12)
+            lifter.ceiling[lift] = lifter.strength[lift] * rng.uniform(1.3, 2.0)
+
+        template = rng.choices([t for t, _ in _TEMPLATES], weights=[w for _, w in _TEMPLATES])[0]
+        start_date = created_at.date()
+        program_number = 1
+        while start_date <= self.today:
+            # Most people stick with a template; some switch between programs
+            if program_number > 1 and rng.random() < 0.2:
+                template = rng.choices([t for t, _ in _TEMPLATES], weights=[w for _, w in _TEMPLATES])[0]
+            end_date = self._add_program(rows, lifter, template, start_date, program_number)
+            if end_date is None:
+                break
+
+            # Time off between programs costs some strength
+            gap_weeks = rng.choice([0, 0, 1, 1, 2, 4])
+            for lift in lifter.strength:
+                lifter.strength[lift] *= 1 - 0.01 * gap_weeks
+            start_date = end_date + timedelta(days=1 + 7 * gap_weeks)
+            program_number += 1
+
+    def _add_program(
+        self,
+        rows: Dict[type, List[dict]],
+        lifter: _Lifter,
+        template: str,
+        start_date: date,
+        program_number: int
+    ) -> Optional[date]:
+        """
+        Add a program with its cycles up to today.
+
+        Returns:
+            The completed program's last day, or None if the program is still active
+        """
+        rng = self.rng
+        target_cycles = rng.randint(4, 10)
+        program = Program(
+            id=self._uuid(),
+            user_id=lifter.user_id,
+            name=f"{template.replace('_', '-')} program {program_number}",
+            template_type=template,
+            start_date=start_date,
+            target_cycles=target_cycles,
+            training_days=list(rng.choice(_TRAINING_DAYS[template])),
+            include_deload=1 if rng.random() < 0.85 else 0,
+            schedule_mode=ScheduleMode.MATERIALIZED
+        )
+        weeks_per_cycle = ProgramService.get_weeks_per_cycle(template, bool(program.include_deload))
+        planned_end = start_date + timedelta(weeks=weeks_per_cycle * target_cycles) - timedelta(days=1)
+        active = planned_end >= self.today
+        accessories_by_lift = self._add_templates(rows, program)
+
+        cycle_number = 1
+        while cycle_number <= target_cycles:
+            cycle_start = ProgramService.get_cycle_start_date(program, cycle_number)
+            if cycle_start > self.today:
+                break
+            failed_lifts = self._add_cycle(
+                rows, lifter, program, cycle_number, cycle_start, accessories_by_lift
+            )
+            # Cycles are completed, raising the training maxes, once they are over
+            next_start = cycle_start + timedelta(weeks=weeks_per_cycle)
+            if cycle_number < target_cycles and next_start <= self.today:
+                self._progress(rows, lifter, program, cycle_number, failed_lifts, next_start)
+            cycle_number += 1
+
+        created_at = datetime.combine(start_date, datetime.min.time())
+        rows[Program].append({
+            "id": program.id,
+            "user_id": lifter.user_id,
+            "name": program.name,
+            "template_type": template,
+            "start_date": start_date,
+            "end_date": None if active else planned_end,
+            "target_cycles": target_cycles,
+            "training_days": program.training_days,
+            "include_deload": program.include_deload,
+            "status": ProgramStatus.ACTIVE if active else ProgramStatus.COMPLETED,
+            "schedule_mode": ScheduleMode.MATERIALIZED,
+            "scheduled_cycles": cycle_number - 1,
+            "created_at": created_at
+        })
+        return None if active else planned_end
+
+    def _add_templates(self, rows: Dict[type, List[dict]], program: Program) -> Dict[LiftType, List[dict]]:
+        """
+        Add a program's day templates and accessories, laid out like ProgramService.create_program.
+
+        Returns:
+            Accessories of each lift's earliest day, as used when completing a workout
+        """
+        if program.template_type == "2_day":
+            lifts_by_day = {day: lifts for day, lifts in enumerate(ProgramService.TWO_DAY_LIFT_ORDER, start=1)}
+        else:
+            lifts_by_day = {day: [lift] for day, lift in enumerate(ProgramService.FOUR_DAY_LIFT_ORDER, start=1)}
+
+        accessories_by_lift: Dict[LiftType, List[dict]] = {}
+        for day_number, lifts in lifts_by_day.items():
+            accessories = [
+                {
+                    "exercise_id": exercise_id,
+                    "sets": self.rng.choice([3, 4, 5]),
+                    "reps": self.rng.choice([8, 10, 12, 15]),
+                    "weight_type": "fixed",
+                    "circuit_group": None
+                }
+                for exercise_id in self.rng.sample(self.exercise_ids, min(len(self.exercise_ids), self.rng.randint(1, 3)))
+            ]
+            for lift in lifts:
+                rows[ProgramTemplate].append({
+                    "id": self._uuid(), "program_id": program.id, "day_number": day_number, "main_lift": lift
+                })
+                accessories_by_lift.setdefault(lift, accessories)
+            if accessories:
+                rows[ProgramDayAccessories].append({
+                    "id": self._uuid(), "program_id": program.id, "day_number": day_number, "accessories": accessories
+                })
+        return accessories_by_lift
+
+    def _add_cycle(
+        self,
+        rows: Dict[type, List[dict]],
+        lifter: _Lifter,
+        program: Program,
+        cycle_number: int,
+        cycle_start: date,
+        accessories_by_lift: Dict[LiftType, List[dict]]
+    ) -> Set[LiftType]:
+        """
+        Add a cycle's training maxes and workouts.
+
+        Returns:
+            Lifts whose AMRAP set fell short of the prescribed reps
+        """
+        rng = self.rng
+        if cycle_number == 1:
+            for lift, value in lifter.training_maxes.items():
+                rows[TrainingMax].append(self._training_max_row(
+                    program, lift, value, cycle_start, cycle_number, TrainingMaxReason.INITIAL
+                ))
+                rows[TrainingMaxHistory].append(self._history_row(
+                    program, lift, None, value, cycle_start, TrainingMaxReason.INITIAL
+                ))
+
+        slots = ProgramService.get_cycle_slots(program, cycle_start)
+        main_lifts = [(slot, lift, week_type) for slot in slots for lift, week_type in slot.lifts]
+        training_maxes = [lifter.training_maxes[lift] for _, lift, _ in main_lifts]
+        increments = [lifter.increment] * len(main_lifts)
+        working = prescribe_working_weights(
+            training_maxes, [_PRESCRIPTION_WEEK[week_type] for _, _, week_type in main_lifts], increments
+        )
+        warmups = prescribe_warmup_weights(
+            training_maxes, increments, bar_weight=20.0 if lifter.unit == WeightUnit.KG else 45.0
+        )
+        weights_by_lift = {
+            (slot.scheduled_date, lift): (working[i], warmups[i]) for i, (slot, lift, _) in enumerate(main_lifts)
+        }
+
+        failed_lifts = set()
+        for slot in slots:
+            workout_id = self._uuid()
+            scheduled_date = slot.scheduled_date
+            workout_status = WorkoutStatus.SCHEDULED
+            completed_at = None
+            if scheduled_date <= self.today:
+                roll = rng.random()
+                if (self.today - scheduled_date).days < _MISSED_WINDOW_DAYS and roll < 0.1:
+                    pass  # Overdue, still scheduled
+                elif roll < 0.1 + lifter.skip_rate:
+                    workout_status = WorkoutStatus.SKIPPED
+                else:
+                    if roll < 0.1 + lifter.skip_rate + lifter.reschedule_rate:
+                        scheduled_date = min(scheduled_date + timedelta(days=rng.randint(1, 2)), self.today)
+                    workout_status = WorkoutStatus.COMPLETED
+                    completed_at = datetime.combine(scheduled_date, datetime.min.time()) + timedelta(
+                        hours=rng.randint(6, 20), minutes=rng.randint(0, 59)
+                    )
+
+            rows[Workout].append({
+                "id": workout_id,
+                "program_id": program.id,
+                "scheduled_date": scheduled_date,
+                "completed_date": completed_at,
+                "cycle_number": cycle_number,
+                "week_number": slot.week_number,
+                "week_type": slot.week_type,
+                "status": workout_status,
+                "notes": None,
+                "created_at": datetime.combine(cycle_start, datetime.min.time())
+            })
+            for order, (lift, week_type) in enumerate(slot.lifts, start=1):
+                rows[WorkoutMainLift].append({
+                    "id": self._uuid(),
+                    "workout_id": workout_id,
+                    "lift_type": lift,
+                    "lift_order": order,
+                    "current_training_max": lifter.training_maxes[lift],
+                    "week_type": week_type,
+                    "created_at": datetime.combine(cycle_start, datetime.min.time())
+                })
+                if completed_at:
+                    working, warmups = weights_by_lift[(slot.scheduled_date, lift)]
+                    if self._add_lift_sets(
+                        rows, lifter, workout_id, slot, lift, week_type, working, warmups,
+                        accessories_by_lift.get(lift, []), completed_at
+                    ):
+                        failed_lifts.add(lift)
+
+        return failed_lifts
+
+    def _add_lift_sets(
+        self,
+        rows: Dict[type, List[dict]],
+        lifter: _Lifter,
+        workout_id: str,
+        slot: ScheduleSlot,
+        lift: LiftType,
+        week_type: WeekType,
+        working: List[float],
+        warmups: List[float],
+        accessories: List[dict],
+        completed_at: datetime
+    ) -> bool:
+        """
+        Add one lift's warmup, working and accessory sets, and its PR if any.
+
+        Returns:
+            True if the AMRAP set fell short of the prescribed reps
+        """
+        rng = self.rng
+        week = _PRESCRIPTION_WEEK[week_type]
+        strength = lifter.strength[lift] * rng.uniform(0.96, 1.04)  # Good and bad days
+
+        def add_set(set_type, set_number, prescribed_reps, actual_reps, prescribed_weight,
+                    actual_weight, percentage, exercise_id=None):
+            set_id = self._uuid()
+            rows[WorkoutSet].append({
+                "id": set_id,
+                "workout_id": workout_id,
+                "exercise_id": exercise_id,
+                "set_type": set_type,
+                "set_number": set_number,
+                "lift_type": lift,
+                "prescribed_reps": prescribed_reps,
+                "actual_reps": actual_reps,
+                "prescribed_weight": prescribed_weight,
+                "actual_weight": actual_weight,
+                "weight_unit": lifter.unit,
+                "percentage_of_tm": percentage,
+                "is_target_met": prescribed_reps is None or actual_reps >= prescribed_reps,
+                "notes": None,
+                "created_at": completed_at
+            })
+            return set_id
+
+        for set_number, (weight, (percentage, reps)) in enumerate(zip(warmups, WARMUP_SCHEME), start=1):
+            add_set(SetType.WARMUP, set_number, reps, reps, weight, weight, percentage)
+
+        failed = False
+        for set_number, weight in enumerate(working, start=1):
+            prescribed = PRESCRIBED_REPS[week][set_number - 1]
+            # Inverse Epley: the most reps this weight allows today
+            capacity = max(0, int(30 * (strength / weight - 1))) if weight > 0 else prescribed
+            amrap = set_number == 3 and week_type != WeekType.WEEK_4_DELOAD
+            if amrap:
+                reps = max(0, min(capacity + rng.choice([-1, 0, 0, 1]), 20))
+                failed = reps < prescribed
+            else:
+                reps = min(prescribed, max(capacity, prescribed - 1))
+            set_id = add_set(
+                SetType.AMRAP if amrap else SetType.WORKING, set_number, prescribed, reps,
+                weight, weight, WORKING_SET_PERCENTAGES[week][set_number - 1]
+            )
+            if amrap and reps > 0 and weight > lifter.best_weights.get((lift, reps), 0.0):
+                lifter.best_weights[(lift, reps)] = weight
+                rows[RepMax].append({
+                    "id": self._uuid(),
+                    "user_id": lifter.user_id,
+                    "lift_type": lift,
+                    "reps": reps,
+                    "weight": weight,
+                    "weight_unit": lifter.unit,
+                    "calculated_1rm": calculate_1rm(weight, reps),
+                    "achieved_date": completed_at.date(),
+                    "workout_set_id": set_id,
+                    "created_at": completed_at
+                })
+
+        for accessory in accessories:
+            weight = lifter.round(lifter.training_maxes[lift] * rng.uniform(0.15, 0.35))
+            for set_number in range(1, accessory["sets"] + 1):
+                reps = max(1, accessory["reps"] + rng.choice([-2, -1, 0, 0, 0, 1]))
+                add_set(SetType.ACCESSORY, set_number, accessory["reps"], reps, None, weight, None,
+                        exercise_id=accessory["exercise_id"])
+
+        return failed
+
+    def _progress(
+        self,
+        rows: Dict[type, List[dict]],
+        lifter: _Lifter,
+        program: Program,
+        cycle_number: int,
+        failed_lifts: Set[LiftType],
+        next_start: date
+    ) -> None:
+        """Set the next cycle's training maxes: the standard increment, or a 90% reset after a failed AMRAP."""
+        scale = 0.5 if lifter.unit == WeightUnit.KG else 1.0
+        for lift, old_value in list(lifter.training_maxes.items()):
+            if lift in failed_lifts:
+                new_value = lifter.round(old_value * 0.9)
+                reason = TrainingMaxReason.FAILED_REPS
+            else:
+                new_value = old_value + ProgramService.CYCLE_TM_INCREMENTS[lift] * scale
+                reason = TrainingMaxReason.CYCLE_COMPLETION
+            lifter.training_maxes[lift] = new_value
+            rows[TrainingMax].append(
+                self._training_max_row(program, lift, new_value, next_start, cycle_number + 1, reason)
+            )
+            rows[TrainingMaxHistory].append(
+                self._history_row(program, lift, old_value, new_value, next_start, reason)
+            )
+
+            # Training moves strength part of the way to the lifter's ceiling
+            strength = lifter.strength[lift]
+            lifter.strength[lift] = strength + (lifter.ceiling[lift] - strength) * self.rng.uniform(0.01, 0.06)
+
+    def _training_max_row(self, program: Program, lift: LiftType, value: float, effective_date: date,
+                          cycle_number: int, reason: TrainingMaxReason) -> dict:
+        return {
+            "id": self._uuid(),
+            "program_id": program.id,
+            "lift_type": lift,
+            "value": value,
+            "effective_date": effective_date,
+            "cycle_number": cycle_number,
+            "reason": reason,
+            "notes": None,
+            "created_at": datetime.combine(effective_date, datetime.min.time())
+        }
+
+    def _history_row(self, program: Program, lift: LiftType, old_value: Optional[float], new_value: float,
+                     change_date: date, reason: TrainingMaxReason) -> dict:
+        return {
+            "id": self._uuid(),
+            "program_id": program.id,
+            "lift_type": lift,
+            "old_value": old_value,
+            "new_value": new_value,
+            "change_date": datetime.combine(change_date, datetime.min.time()),
+            "reason": reason,
+            "notes": None
+        }
@@ -1,14 +1,21 @@
 """
 Workout service with business logic.
 """
-from sqlalchemy.orm import Session, joinedload
+import heapq
+import uuid
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.orm import Session, joinedload, selectinload
 from fastapi import HTTPException, status
-from typing import List, Optional, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, date
 from app.models.workout import Workout, WorkoutSet, WorkoutMainLift, WorkoutStatus, WeekType, SetType
-from app.models.program import Program, ProgramTemplate, ProgramDayAccessories, LiftType
+from app.models.program import Program, ProgramTemplate, ProgramDayAccessories, LiftType, ScheduleMode
 from app.models.rep_max import RepMax
 from app.models.user import User, WeightUnit
+from app.services.analytics import AnalyticsService
+from app.services.equipment import EquipmentService
+from app.services.rep_max import RepMaxService
+from app.services.schedule import ScheduleService
 from datetime import timedelta
 from app.schemas.workout import (
     WorkoutResponse, WorkoutDetailResponse, WorkoutSetResponse,
@@ -16,19 +23,29 @@ from app.schemas.workout import (
     WorkoutSetsForLift, WorkoutCompletionResponse, WorkoutAnalysis,
     LiftAnalysis, FailedSetInfo, MissedWorkoutInfo, MissedWorkoutsResponse,
     HandleMissedWorkoutRequest, HandleMissedWorkoutResponse,
-    CycleFailedRepsAnalysis
+    CycleFailedRepsAnalysis, WorkoutSummaryResponse,
+    PlateChangeStep, WorkoutLoadingPlanResponse
 )
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.program_cache import program_detail_cache
+from app.utils.sql import date_add_days
 from app.utils.calculations import (
     calculate_working_weight, get_prescribed_reps,
-    calculate_warmup_weights, calculate_1rm, calculate_training_max
+    calculate_warmup_weights, calculate_1rm, calculate_training_max,
+    WORKING_SET_PERCENTAGES, PRESCRIBED_REPS, WARMUP_SCHEME
 )
+from app.utils.prescriptions import prescribe_working_weights, prescribe_warmup_weights
+from app.utils.plates import RoundingGrid, plan_plate_changes
 
 
 class WorkoutService:
     """Service for handling workout operations."""
 
+    # Longest range the calendar endpoint returns in one request (a 3-month view)
+    MAX_CALENDAR_DAYS = 93
+
     @staticmethod
-    def get_workouts(
+    def _workouts_query(
         db: Session,
         user: User,
         program_id: Optional[str] = None,
@@ -38,28 +55,12 @@ class WorkoutService:
         main_lifts: Optional[List[str]] = None,
         cycle_number: Optional[int] = None,
         week_number: Optional[int] = None
-    ) -> List[WorkoutResponse]:
-        """
-        Get workouts for user with optional filters.
-
-        Args:
-            db: Database session
-            user: Current user
-            program_id: Filter by program
-            workout_status: Filter by status (scheduled, completed, skipped)
-            start_date: Filter by date >= start_date
-            end_date: Filter by date <= end_date
-            main_lifts: Filter by main lifts (workouts containing any of these lifts)
-            cycle_number: Filter by cycle
-            week_number: Filter by week
-
-        Returns:
-            List of WorkoutResponse
-        """
-        # Base query - only user's programs, eager load main_lifts
+    ):
+        """Build the filtered query over the user's workouts (see get_workouts for filters)."""
+        # Base query - only user's programs
         query = db.query(Workout).join(Program).filter(
             Program.user_id == user.id
-        ).options(joinedload(Workout.main_lifts))
+        )
 
         # Apply filters
         if program_id:
@@ -91,10 +92,230 @@ class WorkoutService:
         if week_number:
             query = query.filter(Workout.week_number == week_number)
 
-        # Order by scheduled date
-        workouts = query.order_by(Workout.scheduled_date).all()
+        return query
+
+    @staticmethod
+    def _virtual_workouts(
+        db: Session,
+        user: User,
+        program_id: Optional[str] = None,
+        workout_status: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        main_lifts: Optional[List[str]] = None,
+        cycle_number: Optional[int] = None,
+        week_number: Optional[int] = None
+    ) -> List[Workout]:
+        """Compute the unstored virtual-schedule workouts matching the get_workouts filters."""
+        if workout_status:
+            try:
+                # Virtual workouts are always scheduled
+                if WorkoutStatus(workout_status.upper()) != WorkoutStatus.SCHEDULED:
+                    return []
+            except ValueError:
+                pass  # Invalid status, ignore filter
+
+        workouts = ScheduleService.get_virtual_workouts(db, user, program_id, start_date, end_date)
+        return [
+            w for w in workouts
+            if (not main_lifts or any(lift.lift_type in main_lifts for lift in w.main_lifts))
+            and (not cycle_number or w.cycle_number == cycle_number)
+            and (not week_number or w.week_number == week_number)
+        ]
+
+    @staticmethod
+    def _schedule_order(workout: Workout) -> Tuple[date, str]:
+        """Sort key matching ORDER BY scheduled_date, id."""
+        return workout.scheduled_date, workout.id
+
+    @staticmethod
+    def _get_user_workout(
+        db: Session,
+        user: User,
+        workout_id: str,
+        materialize: bool = False
+    ) -> Workout:
+        """
+        Load one of the user's workouts with its main lifts.
+
+        Workouts of virtual-schedule programs that are not stored yet are
+        computed instead; with materialize, such a workout is stored first so
+        it can be updated.
+
+        Raises:
+            HTTPException: If workout not found or not owned by user
+        """
+        workout = db.query(Workout).join(Program).filter(
+            Workout.id == workout_id,
+            Program.user_id == user.id
+        ).options(joinedload(Workout.main_lifts)).first()
 
-        return [WorkoutResponse.model_validate(w) for w in workouts]
+        if not workout:
+            workout = ScheduleService.find_virtual_workout(db, user, workout_id)
+            if workout and materialize:
+                ScheduleService.materialize_workouts(db, [workout])
+
+        if not workout:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Workout not found"
+            )
+        return workout
+
+    @staticmethod
+    def _workout_responses(db: Session, workouts: List[Workout]) -> List[WorkoutResponse]:
+        """Convert workouts to responses, attaching summaries for completed ones in one query."""
+        summaries = AnalyticsService.get_workout_summaries(
+            db, [w.id for w in workouts if w.status == WorkoutStatus.COMPLETED]
+        )
+
+        responses = []
+        for w in workouts:
+            response = WorkoutResponse.model_validate(w)
+            summary = summaries.get(w.id)
+            if summary:
+                response.summary = WorkoutSummaryResponse.model_validate(summary)
+            responses.append(response)
+        return responses
+
+    @staticmethod
+    def get_workouts(
+        db: Session,
+        user: User,
+        program_id: Optional[str] = None,
+        workout_status: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        main_lifts: Optional[List[str]] = None,
+        cycle_number: Optional[int] = None,
+        week_number: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[WorkoutResponse], Optional[str]]:
+        """
+        Get workouts for user with optional filters.
+
+        Workouts are ordered by (scheduled_date, id). With a limit, one page
+        is returned along with a cursor for the next page; without one, all
+        matching workouts are returned.
+
+        Args:
+            db: Database session
+            user: Current user
+            program_id: Filter by program
+            workout_status: Filter by status (scheduled, completed, skipped)
+            start_date: Filter by date >= start_date
+            end_date: Filter by date <= end_date
+            main_lifts: Filter by main lifts (workouts containing any of these lifts)
+            cycle_number: Filter by cycle
+            week_number: Filter by week
+            limit: Page size (None for no limit)
+            cursor: Cursor from the previous page
+
+        Returns:
+            Tuple of (list of WorkoutResponse, next page cursor or None)
+
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        query = WorkoutService._workouts_query(
+            db, user, program_id, workout_status, start_date, end_date,
+            main_lifts, cycle_number, week_number
+        ).options(joinedload(Workout.main_lifts))
+        virtual = WorkoutService._virtual_workouts(
+            db, user, program_id, workout_status, start_date, end_date,
+            main_lifts, cycle_number, week_number
+        )
+
+        if cursor:
+            cursor_date, cursor_id = decode_cursor(cursor, date.fromisoformat, str)
+            query = query.filter(or_(
+                Workout.scheduled_date > cursor_date,
+                and_(Workout.scheduled_date == cursor_date, Workout.id > cursor_id)
+            ))
+            virtual = [
+                w for w in virtual
+                if WorkoutService._schedule_order(w) > (cursor_date, cursor_id)
+            ]
+
+        query = query.order_by(Workout.scheduled_date, Workout.id)
+        if limit is None:
+            workouts = list(heapq.merge(query.all(), virtual, key=WorkoutService._schedule_order))
+            return WorkoutService._workout_responses(db, workouts), None
+
+        # Fetch one extra row to know whether there is another page
+        workouts = list(heapq.merge(
+            query.limit(limit + 1).all(), virtual, key=WorkoutService._schedule_order
+        ))[:limit + 1]
+        next_cursor = None
+        if len(workouts) > limit:
+            workouts = workouts[:limit]
+            next_cursor = encode_cursor(workouts[-1].scheduled_date, workouts[-1].id)
+
+        return WorkoutService._workout_responses(db, workouts), next_cursor
+
+    @staticmethod
+    def stream_workouts(
+        db: Session,
+        user: User,
+        program_id: Optional[str] = None,
+        workout_status: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        main_lifts: Optional[List[str]] = None,
+        cycle_number: Optional[int] = None,
+        week_number: Optional[int] = None,
+        batch_size: int = 500
+    ) -> Iterator[str]:
+        """
+        Stream matching workouts as NDJSON lines.
+
+        Rows are fetched batch_size at a time with yield_per (a server-side
+        cursor on PostgreSQL), with main lifts and summaries loaded per
+        batch, so memory use does not grow with the size of the history.
+        Unstored virtual-schedule workouts are merged in date order.
+
+        Args:
+            db: Database session, used only to find the engine; the stream
+                opens and closes its own session because it outlives the request's
+            user: Current user
+            program_id: Filter by program
+            workout_status: Filter by status (scheduled, completed, skipped)
+            start_date: Filter by date >= start_date
+            end_date: Filter by date <= end_date
+            main_lifts: Filter by main lifts (workouts containing any of these lifts)
+            cycle_number: Filter by cycle
+            week_number: Filter by week
+            batch_size: Rows fetched per round trip
+
+        Returns:
+            Iterator of JSON-encoded WorkoutResponse lines
+        """
+        stream_db = Session(bind=db.get_bind())
+        try:
+            query = WorkoutService._workouts_query(
+                stream_db, user, program_id, workout_status, start_date, end_date,
+                main_lifts, cycle_number, week_number
+            ).options(selectinload(Workout.main_lifts)).order_by(
+                Workout.scheduled_date, Workout.id
+            ).yield_per(batch_size)
+            virtual = WorkoutService._virtual_workouts(
+                stream_db, user, program_id, workout_status, start_date, end_date,
+                main_lifts, cycle_number, week_number
+            )
+
+            batch: List[Workout] = []
+            for workout in heapq.merge(query, virtual, key=WorkoutService._schedule_order):
+                batch.append(workout)
+                if len(batch) == batch_size:
+                    for response in WorkoutService._workout_responses(stream_db, batch):
+                        yield response.model_dump_json() + "\n"
+                    batch = []
+
+            for response in WorkoutService._workout_responses(stream_db, batch):
+                yield response.model_dump_json() + "\n"
+        finally:
+            stream_db.close()
 
     @staticmethod
     def get_workout_detail(
@@ -117,31 +338,204 @@ class WorkoutService:
             HTTPException: If workout not found or not owned by user
         """
         # Get workout and verify ownership, eager load main_lifts
-        workout = db.query(Workout).join(Program).filter(
-            Workout.id == workout_id,
-            Program.user_id == user.id
-        ).options(joinedload(Workout.main_lifts)).first()
+        workout = WorkoutService._get_user_workout(db, user, workout_id)
 
-        if not workout:
+        # For completed workouts, fetch actual logged sets from database
+        logged_sets = None
+        prescribed_sets = {}
+        accessories_by_lift = {}
+        if workout.status == WorkoutStatus.COMPLETED:
+            logged_sets = db.query(WorkoutSet).filter(
+                WorkoutSet.workout_id == workout_id
+            ).order_by(WorkoutSet.set_number).all()
+        else:
+            prescribed_sets = WorkoutService._prescribe_sets(
+                [workout], user.rounding_increment, EquipmentService.get_rounding_grid(db, user)
+            )
+            accessories_by_lift = WorkoutService._load_accessory_sets(db, [workout.program_id])
+
+        return WorkoutService._build_workout_detail(
+            workout, prescribed_sets, logged_sets, accessories_by_lift
+        )
+
+    @staticmethod
+    def get_workout_calendar(
+        db: Session,
+        user: User,
+        start_date: date,
+        end_date: date
+    ) -> List[WorkoutDetailResponse]:
+        """
+        Get every workout scheduled in a date range with its sets.
+
+        Equivalent to calling get_workout_detail for each workout in the
+        range, but uses a fixed number of queries: workouts and main lifts,
+        logged sets for completed workouts, and one template/accessory
+        preload for all programs involved.
+
+        Args:
+            db: Database session
+            user: Current user
+            start_date: First day of the range (inclusive)
+            end_date: Last day of the range (inclusive)
+
+        Returns:
+            List of WorkoutDetailResponse ordered by scheduled date
+
+        Raises:
+            HTTPException: If the range is reversed or longer than MAX_CALENDAR_DAYS
+        """
+        if end_date < start_date:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Workout not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="end_date must be on or after start_date"
+            )
+        if (end_date - start_date).days + 1 > WorkoutService.MAX_CALENDAR_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Date range cannot exceed {WorkoutService.MAX_CALENDAR_DAYS} days"
+            )
+
+        workouts = db.query(Workout).join(Program).filter(
+            Program.user_id == user.id,
+            Workout.scheduled_date >= start_date,
+            Workout.scheduled_date <= end_date
+        ).options(selectinload(Workout.main_lifts)).order_by(
+            Workout.scheduled_date, Workout.id
+        ).all()
+        workouts = list(heapq.merge(
+            workouts,
+            ScheduleService.get_virtual_workouts(db, user, start_date=start_date, end_date=end_date),
+            key=WorkoutService._schedule_order
+        ))
+
+        sets_by_workout: Dict[str, List[WorkoutSet]] = {
+            w.id: [] for w in workouts if w.status == WorkoutStatus.COMPLETED
+        }
+        if sets_by_workout:
+            for workout_set in db.query(WorkoutSet).filter(
+                WorkoutSet.workout_id.in_(list(sets_by_workout))
+            ).order_by(WorkoutSet.set_number).all():
+                sets_by_workout[workout_set.workout_id].append(workout_set)
+
+        upcoming = [w for w in workouts if w.status != WorkoutStatus.COMPLETED]
+        prescribed_sets = WorkoutService._prescribe_sets(
+            upcoming, user.rounding_increment, EquipmentService.get_rounding_grid(db, user) if upcoming else None
+        )
+        accessories_by_lift = WorkoutService._load_accessory_sets(
+            db, list({w.program_id for w in upcoming})
+        )
+
+        return [
+            WorkoutService._build_workout_detail(
+                workout, prescribed_sets, sets_by_workout.get(workout.id), accessories_by_lift
+            )
+            for workout in workouts
+        ]
+
+    @staticmethod
+    def get_loading_plan(
+        db: Session,
+        user: User,
+        workout_id: str,
+        share_bar: bool = False
+    ) -> WorkoutLoadingPlanResponse:
+        """
+        Plan bar loading for a whole session with the fewest plate changes.
+
+        Sets run in order: for each main lift, warmups then working sets
+        (ending with the AMRAP set). Loadings are chosen across the whole
+        sequence rather than set by set, so a set may use more plates than
+        its minimum when that saves changes later. Plates come from the
+        user's default equipment profile, or a standard 45 lb set without one.
+
+        Args:
+            db: Database session
+            user: Current user
+            workout_id: Workout ID
+            share_bar: Whether the main lifts share one bar; otherwise each
+                lift starts from an empty bar
+
+        Returns:
+            WorkoutLoadingPlanResponse with one step per set
+
+        Raises:
+            HTTPException: If workout not found or not owned by user
+        """
+        detail = WorkoutService.get_workout_detail(db, user, workout_id)
+
+        segments = []
+        for main_lift in sorted(detail.main_lifts, key=lambda lift: lift.lift_order):
+            lift_sets = detail.sets_by_lift.get(main_lift.lift_type)
+            if lift_sets is None:
+                continue
+            segment = [
+                (main_lift.lift_type, workout_set)
+                for workout_set in lift_sets.warmup_sets + lift_sets.main_sets
+                if workout_set.prescribed_weight is not None
+            ]
+            if share_bar and segments:
+                segments[-1].extend(segment)
+            else:
+                segments.append(segment)
+
+        inventory = EquipmentService.get_plate_inventory(db, user)
+        steps = []
+        total_changes = 0
+        for segment in segments:
+            plan = plan_plate_changes(
+                inventory, tuple(workout_set.prescribed_weight for _, workout_set in segment)
             )
+            total_changes += plan.total_changes
+            for (lift_type, workout_set), change in zip(segment, plan.steps):
+                steps.append(PlateChangeStep(
+                    lift_type=lift_type,
+                    set_type=workout_set.set_type,
+                    set_number=workout_set.set_number,
+                    target_weight=workout_set.prescribed_weight,
+                    loaded_weight=change.load.total_weight,
+                    plates=change.load.plates,
+                    remove=change.removed,
+                    add=change.added
+                ))
+
+        return WorkoutLoadingPlanResponse(
+            workout_id=detail.id,
+            bar_weight=inventory.bar_weight,
+            share_bar=share_bar,
+            total_changes=total_changes,
+            steps=steps
+        )
+
+    @staticmethod
+    def _build_workout_detail(
+        workout: Workout,
+        prescribed_sets: Dict[tuple, WorkoutSetsForLift],
+        logged_sets: Optional[List[WorkoutSet]],
+        accessories_by_lift: Dict[tuple, List[WorkoutSetResponse]]
+    ) -> WorkoutDetailResponse:
+        """
+        Build a workout detail response without querying.
 
+        Args:
+            workout: The workout (with main_lifts loaded)
+            prescribed_sets: Warmup and main sets keyed by (workout_id, lift_type),
+                from _prescribe_sets (used for workouts that are not completed)
+            logged_sets: Logged sets ordered by set number (completed workouts only)
+            accessories_by_lift: Prescribed accessory sets keyed by (program_id, lift_type),
+                from _load_accessory_sets (used for workouts that are not completed)
+
+        Returns:
+            WorkoutDetailResponse with sets organized by lift
+        """
         # Build sets for each main lift
         sets_by_lift = {}
         accessory_sets = []
 
-        # For completed workouts, fetch actual logged sets from database
-        if workout.status == WorkoutStatus.COMPLETED:
-            # Query all workout sets for this workout
-            workout_sets = db.query(WorkoutSet).filter(
-                WorkoutSet.workout_id == workout_id
-            ).order_by(WorkoutSet.set_number).all()
-
+        if logged_sets is not None:
             # Group sets by lift type (for warmup/main) and collect accessories separately
             sets_by_lift_type = {}
-            for workout_set in workout_sets:
+            for workout_set in logged_sets:
                 # Convert to response format
                 set_response = WorkoutSetResponse(
                     set_type=workout_set.set_type.value,
@@ -196,35 +590,15 @@ class WorkoutService:
                     main_sets=lift_sets['main']
                 )
         else:
-            # For scheduled workouts, calculate prescribed sets
+            # For scheduled workouts, use the batch-computed prescriptions
             for main_lift in workout.main_lifts:
-                lift_type_str = main_lift.lift_type.value
-
-                # Calculate prescribed sets for this lift
-                warmup_sets = WorkoutService._calculate_warmup_sets(
-                    main_lift.current_training_max,
-                    user.rounding_increment
-                )
-
-                main_sets = WorkoutService._calculate_main_sets(
-                    main_lift.current_training_max,
-                    workout.week_number,
-                    workout.week_type,
-                    user.rounding_increment
-                )
-
-                sets_by_lift[main_lift.lift_type.value] = WorkoutSetsForLift(
-                    warmup_sets=warmup_sets,
-                    main_sets=main_sets
-                )
+                sets_by_lift[main_lift.lift_type.value] = prescribed_sets[(workout.id, main_lift.lift_type)]
 
             # Get accessory sets once at workout level (from first main lift's template)
             if workout.main_lifts:
-                accessory_sets = WorkoutService._get_accessory_sets(
-                    db,
-                    workout.program_id,
-                    workout.main_lifts[0].lift_type
-                )
+                accessory_sets = list(accessories_by_lift.get(
+                    (workout.program_id, workout.main_lifts[0].lift_type), []
+                ))
 
         return WorkoutDetailResponse(
             id=workout.id,
@@ -245,93 +619,113 @@ class WorkoutService:
         )
 
     @staticmethod
-    def _calculate_warmup_sets(
-        training_max: float,
-        rounding_increment: float
-    ) -> List[WorkoutSetResponse]:
-        """Calculate warmup sets for workout."""
-        warmups = calculate_warmup_weights(training_max, rounding_increment)
+    def _prescribe_sets(
+        workouts: List[Workout],
+        rounding_increment: float,
+        grid: Optional[RoundingGrid] = None
+    ) -> Dict[tuple, WorkoutSetsForLift]:
+        """
+        Calculate warmup and main sets for every main lift of a list of workouts.
 
-        return [
-            WorkoutSetResponse(
-                set_type="warmup",
-                set_number=i + 1,
-                prescribed_reps=warmup["reps"],
-                prescribed_weight=warmup["weight"],
-                percentage_of_tm=warmup["percentage"]
-            )
-            for i, warmup in enumerate(warmups)
-        ]
+        All weights are computed in one call to the batched prescription engine.
 
-    @staticmethod
-    def _calculate_main_sets(
-        training_max: float,
-        week_number: int,
-        week_type: WeekType,
-        rounding_increment: float
-    ) -> List[WorkoutSetResponse]:
-        """Calculate main working sets for workout."""
-        main_sets = []
-
-        for set_num in range(1, 4):  # 3 main working sets
-            weight = calculate_working_weight(
-                training_max,
-                week_number,
-                set_num,
-                rounding_increment
-            )
+        Args:
+            workouts: Workouts with main_lifts loaded
+            rounding_increment: User's weight rounding increment
+            grid: Loadable weights of the user's equipment profile, used
+                instead of the increment when set
+
+        Returns:
+            Dict mapping (workout_id, lift_type) to that lift's prescribed sets
+        """
+        lifts = [(workout, main_lift) for workout in workouts for main_lift in workout.main_lifts]
+        training_maxes = [main_lift.current_training_max for _, main_lift in lifts]
+        increments = [rounding_increment] * len(lifts)
 
-            reps = get_prescribed_reps(week_number, set_num)
+        warmup_weights = prescribe_warmup_weights(training_maxes, increments, grid=grid)
+        working_weights = prescribe_working_weights(
+            training_maxes, [workout.week_number for workout, _ in lifts], increments, grid=grid
+        )
 
-            # Last set is AMRAP (except deload week)
-            is_amrap = (set_num == 3 and week_type != WeekType.WEEK_4_DELOAD)
+        prescribed = {}
+        for (workout, main_lift), warmups, working in zip(lifts, warmup_weights, working_weights):
+            warmup_sets = [
+                WorkoutSetResponse(
+                    set_type="warmup",
+                    set_number=i + 1,
+                    prescribed_reps=reps,
+                    prescribed_weight=weight,
+                    percentage_of_tm=percentage
+                )
+                for i, (weight, (percentage, reps)) in enumerate(zip(warmups, WARMUP_SCHEME))
+            ]
 
-            main_sets.append(
+            # Last set is AMRAP (except deload week); AMRAP still has minimum reps (5, 3, or 1)
+            main_sets = [
                 WorkoutSetResponse(
-                    set_type="amrap" if is_amrap else "working",
+                    set_type="amrap" if set_num == 3 and workout.week_type != WeekType.WEEK_4_DELOAD else "working",
                     set_number=set_num,
-                    prescribed_reps=reps,  # AMRAP still has minimum reps (5, 3, or 1)
+                    prescribed_reps=reps,
                     prescribed_weight=weight,
                     percentage_of_tm=None  # Could calculate if needed
                 )
+                for set_num, (weight, reps) in enumerate(zip(working, PRESCRIBED_REPS[workout.week_number]), 1)
+            ]
+
+            prescribed[(workout.id, main_lift.lift_type)] = WorkoutSetsForLift(
+                warmup_sets=warmup_sets,
+                main_sets=main_sets
             )
 
-        return main_sets
+        return prescribed
 
     @staticmethod
-    def _get_accessory_sets(
+    def _load_accessory_sets(
         db: Session,
-        program_id: str,
-        lift_type: LiftType
-    ) -> List[WorkoutSetResponse]:
-        """Get prescribed accessory sets for a workout day.
-
-        PHASE 3: Now reads from ProgramDayAccessories table instead of ProgramTemplate.
-        First looks up the day_number from ProgramTemplate, then queries ProgramDayAccessories.
+        program_ids: List[str]
+    ) -> Dict[tuple, List[WorkoutSetResponse]]:
         """
-        # First, find the day_number for this lift from ProgramTemplate
-        template = db.query(ProgramTemplate).filter(
-            ProgramTemplate.program_id == program_id,
-            ProgramTemplate.main_lift == lift_type
-        ).first()
+        Load prescribed accessory sets for every main lift of a set of programs.
 
-        if not template:
-            return []
+        Uses one ProgramTemplate query (to find each lift's day) and one
+        ProgramDayAccessories query, regardless of how many programs or
+        workouts need them.
 
-        day_number = template.day_number
+        Args:
+            db: Database session
+            program_ids: Programs to load
 
-        # PHASE 3: Read from the new ProgramDayAccessories table
-        day_accessories = db.query(ProgramDayAccessories).filter(
-            ProgramDayAccessories.program_id == program_id,
-            ProgramDayAccessories.day_number == day_number
-        ).first()
+        Returns:
+            Dict mapping (program_id, lift_type) to that lift's day accessory sets
+        """
+        if not program_ids:
+            return {}
+
+        # Find the day_number for each lift; the lowest day wins if a lift appears twice
+        day_by_lift: Dict[tuple, int] = {}
+        for template in db.query(ProgramTemplate).filter(
+            ProgramTemplate.program_id.in_(program_ids)
+        ).order_by(ProgramTemplate.day_number).all():
+            day_by_lift.setdefault((template.program_id, template.main_lift), template.day_number)
+
+        # PHASE 3: Read from the ProgramDayAccessories table
+        accessories_by_day = {
+            (day.program_id, day.day_number): day.accessories
+            for day in db.query(ProgramDayAccessories).filter(
+                ProgramDayAccessories.program_id.in_(program_ids)
+            ).all()
+        }
 
-        if not day_accessories or not day_accessories.accessories:
-            return []
+        return {
+            key: WorkoutService._accessory_sets(accessories_by_day.get((key[0], day_number)))
+            for key, day_number in day_by_lift.items()
+        }
 
-        # Build accessory sets from the day accessories
+    @staticmethod
+    def _accessory_sets(accessories: Optional[List[dict]]) -> List[WorkoutSetResponse]:
+        """Expand a day's accessory prescriptions into individual sets."""
         accessory_sets = []
-        for acc in day_accessories.accessories:
+        for acc in accessories or []:
             # Each accessory has multiple sets
             for set_num in range(1, acc["sets"] + 1):
                 accessory_sets.append(
@@ -355,7 +749,8 @@ class WorkoutService:
         current_tm: float,
         rounding_increment: float,
         warmup_sets: list,
-        day_accessories: list
+        day_accessories: list,
+        grid: Optional[RoundingGrid] = None
     ) -> dict:
         """
         Calculate prescribed reps and weight based on set type.
@@ -367,6 +762,8 @@ class WorkoutService:
             rounding_increment: User's rounding preference
             warmup_sets: Pre-calculated warmup sets
             day_accessories: List of accessory exercises for the day
+            grid: Loadable weights of the user's equipment profile, used
+                instead of the increment when set
 
         Returns:
             Dict with prescribed_reps, prescribed_weight, percentage_of_tm
@@ -390,16 +787,10 @@ class WorkoutService:
                 current_tm,
                 workout.week_number,
                 set_number,
-                rounding_increment
+                rounding_increment,
+                grid
             )
-            # Calculate percentage
-            percentages = {
-                1: [0.65, 0.75, 0.85],
-                2: [0.70, 0.80, 0.90],
-                3: [0.75, 0.85, 0.95],
-                4: [0.40, 0.50, 0.60],
-            }
-            result["percentage_of_tm"] = percentages[workout.week_number][set_number - 1]
+            result["percentage_of_tm"] = WORKING_SET_PERCENTAGES[workout.week_number][set_number - 1]
 
         # Warmup sets
         elif set_type == "warmup":
@@ -445,17 +836,8 @@ class WorkoutService:
         Raises:
             HTTPException: If workout not found or already completed
         """
-        # Get workout and verify ownership, eager load main_lifts
-        workout = db.query(Workout).join(Program).filter(
-            Workout.id == workout_id,
-            Program.user_id == user.id
-        ).options(joinedload(Workout.main_lifts)).first()
-
-        if not workout:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Workout not found"
-            )
+        # Get workout and verify ownership; a virtual workout is stored now
+        workout = WorkoutService._get_user_workout(db, user, workout_id, materialize=True)
 
         if workout.status == WorkoutStatus.COMPLETED:
             raise HTTPException(
@@ -463,6 +845,25 @@ class WorkoutService:
                 detail="Workout already completed"
             )
 
+        completed_date = completion_data.completed_date or datetime.utcnow()
+
+        # Load the program's day templates and accessories once for all lifts
+        # (templates are read highest day first so a lift maps to its earliest day)
+        day_number_by_lift = {
+            template.main_lift: template.day_number
+            for template in db.query(ProgramTemplate).filter(
+                ProgramTemplate.program_id == workout.program_id
+            ).order_by(ProgramTemplate.day_number.desc()).all()
+        }
+        accessories_by_day = {
+            da.day_number: da.accessories or []
+            for da in db.query(ProgramDayAccessories).filter(
+                ProgramDayAccessories.program_id == workout.program_id
+            ).all()
+        }
+
+        grid = EquipmentService.get_rounding_grid(db, user)
+
         # Build training maxes lookup by lift type
         training_maxes_by_lift = {}
         warmup_sets_by_lift = {}
@@ -477,27 +878,16 @@ class WorkoutService:
             # Pre-calculate warmup sets for this lift
             warmup_sets_by_lift[lift_type] = calculate_warmup_weights(
                 current_tm,
-                user.rounding_increment
+                user.rounding_increment,
+                grid=grid
             )
 
-            # Get day_number from program template for this lift
-            program_template = db.query(ProgramTemplate).filter(
-                ProgramTemplate.program_id == workout.program_id,
-                ProgramTemplate.main_lift == lift_type
-            ).first()
-
-            # Get day accessories from ProgramDayAccessories table
-            if program_template:
-                day_accessories = db.query(ProgramDayAccessories).filter(
-                    ProgramDayAccessories.program_id == workout.program_id,
-                    ProgramDayAccessories.day_number == program_template.day_number
-                ).first()
-                day_accessories_by_lift[lift_type] = day_accessories.accessories if day_accessories else []
-            else:
-                day_accessories_by_lift[lift_type] = []
+            day_number = day_number_by_lift.get(lift_type)
+            day_accessories_by_lift[lift_type] = accessories_by_day.get(day_number, [])
 
-        # Save all sets and track AMRAP sets (one per lift)
-        amrap_workout_set_ids_by_lift = {}
+        # Build all sets in memory (ids assigned client-side) and track AMRAP sets (one per lift)
+        logged_sets = []
+        amrap_sets_by_lift = {}
         for set_log in completion_data.sets:
             # Determine which lift this set belongs to
             lift_type = LiftType(set_log.lift_type) if set_log.lift_type else None
@@ -522,7 +912,8 @@ class WorkoutService:
                 current_tm=current_tm,
                 rounding_increment=user.rounding_increment,
                 warmup_sets=warmup_sets_calculated,
-                day_accessories=day_accessories
+                day_accessories=day_accessories,
+                grid=grid
             )
 
             # Calculate if target was met (actual_reps >= prescribed_reps)
@@ -536,6 +927,7 @@ class WorkoutService:
                 exercise_id = None
 
             workout_set = WorkoutSet(
+                id=str(uuid.uuid4()),
                 workout_id=workout.id,
                 exercise_id=exercise_id,
                 set_type=SetType(set_log.set_type.upper()),
@@ -548,44 +940,51 @@ class WorkoutService:
                 weight_unit=WeightUnit(set_log.weight_unit.upper()),
                 percentage_of_tm=prescribed_values["percentage_of_tm"],
                 is_target_met=is_target_met,
-                notes=set_log.notes
+                notes=set_log.notes,
+                created_at=datetime.utcnow()
             )
-
-            db.add(workout_set)
+            logged_sets.append(workout_set)
 
             # Track the AMRAP set (last working set on non-deload weeks) per lift
-            print(f"DEBUG PR: set_type={set_log.set_type}, set_number={set_log.set_number}, week_type={workout.week_type}, lift={lift_type}")
             if (set_log.set_type in ["working", "amrap"] and
                 set_log.set_number == 3 and
                 workout.week_type != WeekType.WEEK_4_DELOAD):
-                db.flush()  # Get the workout_set ID
-                amrap_workout_set_ids_by_lift[lift_type] = workout_set.id
-                print(f"DEBUG PR: Tracked AMRAP for {lift_type}: workout_set_id={workout_set.id}")
+                amrap_sets_by_lift[lift_type] = workout_set
+
+        # Insert all sets with a single executemany
+        db.execute(
+            insert(WorkoutSet),
+            [WorkoutService._workout_set_row(ws) for ws in logged_sets]
+        )
 
-        # Detect AMRAP and update rep maxes for each lift
-        for lift_type, amrap_workout_set_id in amrap_workout_set_ids_by_lift.items():
+        # Detect AMRAP and update rep maxes for each lift from the in-memory sets
+        for lift_type, amrap_set in amrap_sets_by_lift.items():
             WorkoutService._detect_amrap_and_update_rep_max(
                 db,
                 user,
                 lift_type,
-                amrap_workout_set_id
+                amrap_set,
+                completed_date.date()
             )
 
         # Update workout status
+        was_skipped = workout.status == WorkoutStatus.SKIPPED
         workout.status = WorkoutStatus.COMPLETED
-        workout.completed_date = completion_data.completed_date or datetime.utcnow()
+        workout.completed_date = completed_date
         if completion_data.workout_notes:
             workout.notes = completion_data.workout_notes
 
+        # Summary and rollups are written in the same transaction as the sets they are built from
+        AnalyticsService.record_workout_summary(db, workout, logged_sets)
+        if was_skipped:
+            AnalyticsService.remove_skipped_workout_rollups(db, user.id, workout)
+        AnalyticsService.record_completed_workout_rollups(db, user.id, workout, logged_sets)
+
         db.commit()
         db.refresh(workout)
+        program_detail_cache.invalidate(workout.program_id)
 
-        # Get all logged sets for analysis
-        logged_sets = db.query(WorkoutSet).filter(
-            WorkoutSet.workout_id == workout.id
-        ).all()
-
-        # Generate performance analysis
+        # Generate performance analysis from the sets just logged
         analysis = WorkoutService.analyze_workout_performance(db, workout, logged_sets, user.id)
 
         return WorkoutCompletionResponse(
@@ -593,73 +992,30 @@ class WorkoutService:
             analysis=analysis
         )
 
+    @staticmethod
+    def _workout_set_row(workout_set: WorkoutSet) -> dict:
+        """Get the column values of an unsaved WorkoutSet for a bulk insert."""
+        return {
+            column.key: getattr(workout_set, column.key)
+            for column in WorkoutSet.__table__.columns
+        }
+
     @staticmethod
     def _detect_amrap_and_update_rep_max(
         db: Session,
         user: User,
         lift_type: LiftType,
-        amrap_workout_set_id: str
+        amrap_set: WorkoutSet,
+        achieved_date: date
     ):
         """
         Detect AMRAP set and update rep max if performance is good.
 
-        AMRAP is the last working set (set 3) on non-deload weeks.
+        AMRAP is the last working set (set 3) on non-deload weeks. The set is
+        passed in from the completion request so it does not need to be reloaded.
+        A PR is logged to rep_maxes and upserted into best_rep_maxes.
         """
-        # Get the AMRAP workout set
-        amrap_set = db.query(WorkoutSet).filter(
-            WorkoutSet.id == amrap_workout_set_id
-        ).first()
-
-        print(f"DEBUG PR: _detect_amrap called for {lift_type}, amrap_set={amrap_set}")
-
-        if not amrap_set:
-            print(f"DEBUG PR: No amrap_set found for id={amrap_workout_set_id}")
-            return
-
-        print(f"DEBUG PR: amrap_set weight={amrap_set.actual_weight}, reps={amrap_set.actual_reps}")
-
-        # Calculate 1RM from AMRAP performance
-        calculated_1rm = calculate_1rm(amrap_set.actual_weight, amrap_set.actual_reps)
-        print(f"DEBUG PR: Calculated 1RM={calculated_1rm}")
-
-        # Only update if this is a new PR for this rep range
-        existing_rep_max = db.query(RepMax).filter(
-            RepMax.user_id == user.id,
-            RepMax.lift_type == lift_type,
-            RepMax.reps == amrap_set.actual_reps
-        ).order_by(RepMax.achieved_date.desc()).first()
-
-        print(f"DEBUG PR: existing_rep_max={existing_rep_max}")
-
-        # Update if no existing record or if this is heavier
-        should_update = (
-            not existing_rep_max or
-            amrap_set.actual_weight > existing_rep_max.weight
-        )
-
-        print(f"DEBUG PR: should_update={should_update}")
-
-        if should_update:
-            # Get workout to access completed_date
-            workout = db.query(Workout).join(WorkoutSet).filter(
-                WorkoutSet.id == amrap_workout_set_id
-            ).first()
-
-            # Use date from completed_date, or today
-            achieved = workout.completed_date.date() if workout and workout.completed_date else date.today()
-
-            rep_max = RepMax(
-                user_id=user.id,
-                lift_type=lift_type,
-                reps=amrap_set.actual_reps,
-                weight=amrap_set.actual_weight,
-                weight_unit=amrap_set.weight_unit,
-                calculated_1rm=calculated_1rm,
-                achieved_date=achieved,
-                workout_set_id=amrap_set.id
-            )
-
-            db.add(rep_max)
+        RepMaxService.record_rep_max(db, user.id, lift_type, amrap_set, achieved_date)
 
     @staticmethod
     def skip_workout(
@@ -681,17 +1037,8 @@ class WorkoutService:
         Raises:
             HTTPException: If workout not found, not owned by user, or already completed/skipped
         """
-        # Get workout and verify ownership, eager load main_lifts
-        workout = db.query(Workout).join(Program).filter(
-            Workout.id == workout_id,
-            Program.user_id == user.id
-        ).options(joinedload(Workout.main_lifts)).first()
-
-        if not workout:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Workout not found"
-            )
+        # Get workout and verify ownership; a virtual workout is stored now
+        workout = WorkoutService._get_user_workout(db, user, workout_id, materialize=True)
 
         if workout.status == WorkoutStatus.COMPLETED:
             raise HTTPException(
@@ -707,6 +1054,7 @@ class WorkoutService:
 
         # Update workout status to skipped
         workout.status = WorkoutStatus.SKIPPED
+        AnalyticsService.record_skipped_workout_rollups(db, user.id, [workout])
 
         db.commit()
         db.refresh(workout)
@@ -1070,6 +1418,66 @@ class WorkoutService:
                 )
             }
 
+    @staticmethod
+    def _load_missed_workouts(db: Session, user: User, today: date) -> List[Workout]:
+        """Load the user's scheduled workouts dated before today, stored and virtual, by date."""
+        # Find all scheduled workouts with past dates
+        missed = db.query(Workout).join(Program).filter(
+            Program.user_id == user.id,
+            Workout.status == WorkoutStatus.SCHEDULED,
+            Workout.scheduled_date < today
+        ).options(joinedload(Workout.main_lifts)).order_by(
+            Workout.scheduled_date, Workout.id
+        ).all()
+
+        return list(heapq.merge(
+            missed,
+            ScheduleService.get_virtual_workouts(db, user, end_date=today - timedelta(days=1)),
+            key=WorkoutService._schedule_order
+        ))
+
+    @staticmethod
+    def _shift_schedule(
+        db: Session,
+        user: User,
+        program: Program,
+        from_date: date,
+        days: int
+    ) -> int:
+        """
+        Move a program's scheduled workouts on or after from_date by a number of days.
+
+        Stored workouts move with a single UPDATE; virtual-schedule workouts
+        move by recording the shift on the program. ORM objects already loaded
+        keep their old dates until the session is expired (on commit).
+
+        Args:
+            db: Database session
+            user: Owner of the program
+            program: Program to reschedule
+            from_date: Earliest scheduled date to move
+            days: Days to move by
+
+        Returns:
+            Number of workouts moved
+        """
+        moved = 0
+        if program.schedule_mode == ScheduleMode.VIRTUAL:
+            moved += len(ScheduleService.get_virtual_workouts(
+                db, user, program.id, start_date=from_date
+            ))
+            ScheduleService.add_shift(program, from_date, days)
+
+        moved += db.query(Workout).filter(
+            Workout.program_id == program.id,
+            Workout.status == WorkoutStatus.SCHEDULED,
+            Workout.scheduled_date >= from_date
+        ).update(
+            {Workout.scheduled_date: date_add_days(Workout.scheduled_date, days)},
+            synchronize_session=False
+        )
+        return moved
+
     @staticmethod
     def get_missed_workouts(
         db: Session,
@@ -1090,15 +1498,7 @@ class WorkoutService:
             MissedWorkoutsResponse with list of missed workouts
         """
         today = date.today()
-
-        # Find all scheduled workouts with past dates
-        missed = db.query(Workout).join(Program).filter(
-            Program.user_id == user.id,
-            Workout.status == WorkoutStatus.SCHEDULED,
-            Workout.scheduled_date < today
-        ).options(joinedload(Workout.main_lifts)).order_by(
-            Workout.scheduled_date
-        ).all()
+        missed = WorkoutService._load_missed_workouts(db, user, today)
 
         missed_infos = []
         for workout in missed:
@@ -1141,16 +1541,7 @@ class WorkoutService:
             HTTPException: If workout not found, not owned, or invalid action
         """
         # Get workout and verify ownership
-        workout = db.query(Workout).join(Program).filter(
-            Workout.id == workout_id,
-            Program.user_id == user.id
-        ).options(joinedload(Workout.main_lifts)).first()
-
-        if not workout:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Workout not found"
-            )
+        workout = WorkoutService._get_user_workout(db, user, workout_id)
 
         if workout.status != WorkoutStatus.SCHEDULED:
             raise HTTPException(
@@ -1166,8 +1557,11 @@ class WorkoutService:
             )
 
         if request.action == "skip":
-            # Simply skip the workout
+            # Simply skip the workout (storing it first if it is virtual)
+            if ScheduleService.is_virtual(workout):
+                ScheduleService.materialize_workouts(db, [workout])
             workout.status = WorkoutStatus.SKIPPED
+            AnalyticsService.record_skipped_workout_rollups(db, user.id, [workout])
             db.commit()
             db.refresh(workout)
 
@@ -1187,24 +1581,18 @@ class WorkoutService:
                     detail="Cannot reschedule to a past date"
                 )
 
-            # Calculate how many days to shift
-            days_shift = (reschedule_to - workout.scheduled_date).days
-
-            # Get all scheduled workouts for this program from this workout onwards
-            future_workouts = db.query(Workout).filter(
-                Workout.program_id == workout.program_id,
-                Workout.status == WorkoutStatus.SCHEDULED,
-                Workout.scheduled_date >= workout.scheduled_date
-            ).order_by(Workout.scheduled_date).all()
-
-            # Shift all future workouts by the same amount
-            rescheduled_count = 0
-            for w in future_workouts:
-                w.scheduled_date = w.scheduled_date + timedelta(days=days_shift)
-                rescheduled_count += 1
+            # Shift this workout and everything scheduled after it by the same amount
+            program = db.query(Program).filter(Program.id == workout.program_id).first()
+            rescheduled_count = WorkoutService._shift_schedule(
+                db, user, program, workout.scheduled_date,
+                (reschedule_to - workout.scheduled_date).days
+            )
 
             db.commit()
-            db.refresh(workout)
+            if ScheduleService.is_virtual(workout):
+                workout = ScheduleService.find_virtual_workout(db, user, workout_id, workout.program_id)
+            else:
+                db.refresh(workout)
 
             return HandleMissedWorkoutResponse(
                 workout=WorkoutResponse.model_validate(workout),
@@ -1221,7 +1609,8 @@ class WorkoutService:
     @staticmethod
     def auto_handle_missed_workouts(
         db: Session,
-        user: User
+        user: User,
+        today: Optional[date] = None
     ) -> List[HandleMissedWorkoutResponse]:
         """
         Automatically handle all missed workouts based on user preference.
@@ -1229,9 +1618,17 @@ class WorkoutService:
         Only processes if user preference is 'skip' or 'reschedule'.
         If preference is 'ask', returns empty list (user must handle manually).
 
+        The whole backlog is planned up front and written in one commit.
+        Skipping marks every missed workout at once. Rescheduling moves each
+        program's earliest missed workout to today and shifts the rest of
+        that program's schedule, including its other missed workouts, by the
+        same amount with one UPDATE. This is what handling the missed
+        workouts one by one in date order would do.
+
         Args:
             db: Database session
             user: Current user
+            today: Workouts dated before this are missed (defaults to today)
 
         Returns:
             List of HandleMissedWorkoutResponse for each handled workout
@@ -1241,21 +1638,57 @@ class WorkoutService:
         if user.missed_workout_preference == MissedWorkoutPreference.ASK:
             return []
 
-        missed_response = WorkoutService.get_missed_workouts(db, user)
-        results = []
+        today = today or date.today()
+        missed = WorkoutService._load_missed_workouts(db, user, today)
+        if not missed:
+            return []
 
-        for missed_info in missed_response.missed_workouts:
-            if user.missed_workout_preference == MissedWorkoutPreference.SKIP:
-                request = HandleMissedWorkoutRequest(action="skip")
-            else:  # RESCHEDULE
-                request = HandleMissedWorkoutRequest(
-                    action="reschedule",
-                    reschedule_date=date.today()
+        if user.missed_workout_preference == MissedWorkoutPreference.SKIP:
+            ScheduleService.materialize_workouts(
+                db, [w for w in missed if ScheduleService.is_virtual(w)]
+            )
+            for workout in missed:
+                workout.status = WorkoutStatus.SKIPPED
+            AnalyticsService.record_skipped_workout_rollups(db, user.id, missed)
+
+            # Responses are built before the commit expires the loaded workouts
+            results = [
+                HandleMissedWorkoutResponse(
+                    workout=WorkoutResponse.model_validate(workout),
+                    action_taken="skipped",
+                    rescheduled_count=0
                 )
+                for workout in missed
+            ]
+            db.commit()
+            return results
 
-            result = WorkoutService.handle_missed_workout(
-                db, user, missed_info.workout.id, request
+        # RESCHEDULE: missed is in date order, so the first per program is its earliest
+        earliest: Dict[str, Workout] = {}
+        for workout in missed:
+            earliest.setdefault(workout.program_id, workout)
+        programs = {
+            program.id: program
+            for program in db.query(Program).filter(Program.id.in_(list(earliest))).all()
+        }
+
+        days_by_program = {}
+        moved_by_program = {}
+        for program_id, first in earliest.items():
+            days_by_program[program_id] = (today - first.scheduled_date).days
+            moved_by_program[program_id] = WorkoutService._shift_schedule(
+                db, user, programs[program_id], first.scheduled_date, days_by_program[program_id]
             )
-            results.append(result)
 
+        results = [
+            HandleMissedWorkoutResponse(
+                workout=WorkoutResponse.model_validate(workout).model_copy(update={
+                    "scheduled_date": workout.scheduled_date + timedelta(days=days_by_program[workout.program_id])
+                }),
+                action_taken="rescheduled",
+                rescheduled_count=moved_by_program[workout.program_id]
+            )
+            for workout in missed
+        ]
+        db.commit()
         return results
@@ -0,0 +1,204 @@
+"""
+Short-lived cache of verified access tokens and the users they belong to.
+
+Entries are keyed by a hash of the token and hold the decoded payload and a
+snapshot of the user's columns, so repeat requests with the same token skip
+both JWT verification and the users query. Profile updates publish an
+invalidation through an InvalidationChannel so every worker drops entries
+for that user that were cached before the change.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+from app.config import settings
+
+
+class InvalidationChannel:
+    """Broadcasts "user changed" events to every cache that shares the channel."""
+
+    def publish(self, user_id: str) -> None:
+        """Record that a user changed now."""
+        raise NotImplementedError
+
+    def invalidated_since(self, user_id: str, since: float) -> bool:
+        """Check whether a user changed after the given time.time() value."""
+        raise NotImplementedError
+
+
+class LocalInvalidationChannel(InvalidationChannel):
+    """Invalidation within a single process (one uvicorn worker)."""
+
+    def __init__(self):
+        self._changed_at: Dict[str, float] = {}
+
+    def publish(self, user_id: str) -> None:
+        self._changed_at[user_id] = time.time()
+
+    def invalidated_since(self, user_id: str, since: float) -> bool:
+        return self._changed_at.get(user_id, 0.0) > since
+
+
+class FileInvalidationChannel(InvalidationChannel):
+    """
+    Invalidation shared by all workers on a host through marker files.
+
+    Publishing writes the time.time() of the change into a file named after the user in the
+    directory, and checks compare against that value rather than the file's mtime, which can
+    be coarser than time.time() or come from a different clock on network filesystems.
+    Checking costs one small file read per cache hit.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, user_id: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(user_id.encode("utf-8")).hexdigest())
+
+    def publish(self, user_id: str) -> None:
+        path = self._path(user_id)
+        # Write then rename so a concurrent reader never sees a half-written value
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "w") as f:
+            f.write(repr(time.time()))
+        os.replace(tmp_path, path)
+
+    def invalidated_since(self, user_id: str, since: float) -> bool:
+        try:
+            with open(self._path(user_id)) as f:
+                changed_at = f.read()
+        except FileNotFoundError:
+            return False
+        try:
+            return float(changed_at) > since
+        except ValueError:
+            # An unreadable marker still means the user changed at some point
+            return True
+
+
+class CachedAuth(NamedTuple):
+    """A verified token payload and the user's column values."""
+    payload: Dict[str, Any]
+    user: Dict[str, Any]
+
+
+class _Entry(NamedTuple):
+    auth: CachedAuth
+    cached_at: float
+    expires_at: float
+
+
+class AuthCache:
+    """Bounded, thread-safe LRU cache of verified tokens with a TTL."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int, channel: InvalidationChannel):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.channel = channel
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[CachedAuth]:
+        """
+        Get the cached auth for a token.
+
+        Args:
+            token: The access token
+
+        Returns:
+            CachedAuth, or None if missing, expired or invalidated
+        """
+        if not self.enabled:
+            return None
+
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+
+        if self.channel.invalidated_since(entry.auth.user["id"], entry.cached_at):
+            with self._lock:
+                self._entries.pop(key, None)
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._hits += 1
+        return entry.auth
+
+    def put(self, token: str, auth: CachedAuth, loaded_at: float) -> None:
+        """
+        Cache the auth for a token.
+
+        Args:
+            token: The access token
+            auth: Verified payload and user snapshot
+            loaded_at: time.time() taken before the user was read, so a change
+                committed while the read was in flight still invalidates it
+        """
+        if not self.enabled:
+            return
+
+        expires_at = loaded_at + self.ttl_seconds
+        if auth.payload.get("exp"):
+            expires_at = min(expires_at, float(auth.payload["exp"]))
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = _Entry(auth, loaded_at, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop cached auth for a user in this and every other worker on the channel."""
+        self.channel.publish(user_id)
+
+    def clear(self) -> None:
+        """Drop every entry held by this process."""
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Get this process's lookup counts.
+
+        Returns:
+            Dict with hits, misses and entries
+        """
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "entries": len(self._entries)}
+
+
+def _create_channel() -> InvalidationChannel:
+    if settings.AUTH_CACHE_INVALIDATION_DIR:
+        return FileInvalidationChannel(settings.AUTH_CACHE_INVALIDATION_DIR)
+    return LocalInvalidationChannel()
+
+
+auth_cache = AuthCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    channel=_create_channel()
+)
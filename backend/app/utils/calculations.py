@@ -1,7 +1,32 @@
 """
 Calculation utilities for 5/3/1 program.
 """
-from typing import List, Dict
+from typing import List, Dict, Optional
+from app.utils.plates import DEFAULT_PLATE_INVENTORY, PlateInventory, RoundingGrid, get_plate_solver
+
+# Working set percentages of training max by week (sets 1-3)
+WORKING_SET_PERCENTAGES = {
+    1: (0.65, 0.75, 0.85),  # Week 1
+    2: (0.70, 0.80, 0.90),  # Week 2
+    3: (0.75, 0.85, 0.95),  # Week 3
+    4: (0.40, 0.50, 0.60),  # Week 4 (deload)
+}
+
+# Prescribed reps by week (sets 1-3); the last set is AMRAP except in the deload week
+PRESCRIBED_REPS = {
+    1: (5, 5, 5),  # Week 1: 5/5/5+
+    2: (3, 3, 3),  # Week 2: 3/3/3+
+    3: (5, 3, 1),  # Week 3: 5/3/1+
+    4: (5, 5, 5),  # Week 4 (deload): 5/5/5
+}
+
+# Standard warmup: (percentage of training max, reps); 0% is the empty bar
+WARMUP_SCHEME = (
+    (0.0, 5),   # Empty bar
+    (0.40, 5),  # 40%
+    (0.50, 5),  # 50%
+    (0.60, 3),  # 60%
+)
 
 
 def calculate_1rm(weight: float, reps: int) -> float:
@@ -39,7 +64,8 @@ def calculate_working_weight(
     training_max: float,
     week: int,
     set_number: int,
-    rounding_increment: float = 5.0
+    rounding_increment: float = 5.0,
+    grid: Optional[RoundingGrid] = None
 ) -> float:
     """
     Calculate working weight for a given week and set.
@@ -54,20 +80,18 @@ def calculate_working_weight(
         week: Week number (1-4)
         set_number: Set number (1-3)
         rounding_increment: How to round the weight (default: 5.0)
+        grid: Loadable weights from the user's equipment profile; when
+            given, the weight is rounded to the grid instead of the increment
 
     Returns:
         Calculated and rounded working weight
     """
-    percentages = {
-        1: [0.65, 0.75, 0.85],  # Week 1
-        2: [0.70, 0.80, 0.90],  # Week 2
-        3: [0.75, 0.85, 0.95],  # Week 3
-        4: [0.40, 0.50, 0.60],  # Week 4 (deload)
-    }
-
-    percentage = percentages[week][set_number - 1]
+    percentage = WORKING_SET_PERCENTAGES[week][set_number - 1]
     raw_weight = training_max * percentage
 
+    if grid is not None:
+        return grid.round(raw_weight)
+
     # Round to nearest increment
     return round(raw_weight / rounding_increment) * rounding_increment
 
@@ -83,20 +107,14 @@ def get_prescribed_reps(week: int, set_number: int) -> int:
     Returns:
         Number of prescribed reps
     """
-    reps_scheme = {
-        1: [5, 5, 5],  # Week 1: 5/5/5+
-        2: [3, 3, 3],  # Week 2: 3/3/3+
-        3: [5, 3, 1],  # Week 3: 5/3/1+
-        4: [5, 5, 5],  # Week 4 (deload): 5/5/5
-    }
-
-    return reps_scheme[week][set_number - 1]
+    return PRESCRIBED_REPS[week][set_number - 1]
 
 
 def calculate_warmup_weights(
     training_max: float,
     rounding_increment: float = 5.0,
-    bar_weight: float = 45.0
+    bar_weight: float = 45.0,
+    grid: Optional[RoundingGrid] = None
 ) -> List[Dict]:
     """
     Calculate standard 5/3/1 warmup progression.
@@ -111,29 +129,30 @@ def calculate_warmup_weights(
         training_max: The training max for the lift
         rounding_increment: How to round weights
         bar_weight: Weight of the barbell
+        grid: Loadable weights from the user's equipment profile; when
+            given, weights are rounded to the grid and its bar is used
 
     Returns:
         List of warmup sets with weight and reps
     """
-    warmups = [
-        {"percentage": 0.0, "reps": 5},    # Empty bar
-        {"percentage": 0.40, "reps": 5},   # 40%
-        {"percentage": 0.50, "reps": 5},   # 50%
-        {"percentage": 0.60, "reps": 3},   # 60%
-    ]
+    if grid is not None:
+        bar_weight = grid.bar_weight
 
     result = []
-    for warmup in warmups:
-        if warmup["percentage"] == 0.0:
+    for percentage, reps in WARMUP_SCHEME:
+        if percentage == 0.0:
             weight = bar_weight
         else:
-            raw_weight = training_max * warmup["percentage"]
-            weight = round(raw_weight / rounding_increment) * rounding_increment
+            raw_weight = training_max * percentage
+            if grid is not None:
+                weight = grid.round(raw_weight)
+            else:
+                weight = round(raw_weight / rounding_increment) * rounding_increment
 
         result.append({
             "weight": weight,
-            "reps": warmup["reps"],
-            "percentage": warmup["percentage"]
+            "reps": reps,
+            "percentage": percentage
         })
 
     return result
@@ -146,34 +165,25 @@ def calculate_plates(
 ) -> List[float]:
     """
     Calculate which plates to load per side of bar.
-    Uses greedy algorithm to minimize number of plates.
+    Uses the exact solver in app.utils.plates to minimize number of plates;
+    if the target cannot be built, the plates for the nearest loadable weight
+    are returned.
 
     Args:
         target_weight: Target weight to load
         bar_weight: Weight of the barbell
-        available_plates: List of available plate weights
+        available_plates: List of available plate weights (unlimited pairs of each)
 
     Returns:
         List of plates to load on one side
     """
     if available_plates is None:
-        # TODO: Make available plates configurable per user
-        available_plates = [45, 35, 25, 10, 5, 2.5, 1.0, 0.75, 0.5, 0.25]
-
-    weight_per_side = (target_weight - bar_weight) / 2
-
-    if weight_per_side <= 0:
-        return []
-
-    plates = []
-    remaining = weight_per_side
-
-    for plate in sorted(available_plates, reverse=True):
-        while remaining >= plate:
-            plates.append(plate)
-            remaining -= plate
+        plates = DEFAULT_PLATE_INVENTORY.plates
+    else:
+        plates = tuple((plate, None) for plate in sorted(set(available_plates), reverse=True))
 
-    return plates
+    solver = get_plate_solver(PlateInventory(bar_weight=bar_weight, plates=plates))
+    return solver.solve(target_weight).plates
 
 
 def format_plate_display(plates: List[float]) -> str:
@@ -1,12 +1,14 @@
 """
 FastAPI dependency functions.
 """
-from fastapi import Depends
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.services.auth import AuthService
 from app.models.user import User
+from app.utils.profiler import request_profiler
 
 # Security scheme for Swagger UI
 security = HTTPBearer()
@@ -31,3 +33,27 @@ def get_current_user(
     """
     token = credentials.credentials
     return AuthService.get_current_user(db, token)
+
+
+def require_profiling_token(
+    x_profile_token: Optional[str] = Header(None)
+) -> None:
+    """
+    Dependency that allows only callers holding PROFILING_TOKEN.
+
+    Args:
+        x_profile_token: X-Profile-Token header
+
+    Raises:
+        HTTPException: 404 if profiling is disabled, 403 if the token is wrong
+    """
+    if not request_profiler.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    if not request_profiler.authorized(x_profile_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid profiling token"
+        )
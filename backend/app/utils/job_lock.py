@@ -0,0 +1,63 @@
+"""
+Cross-process locks for background jobs, stored as rows in job_locks.
+
+A lock is taken with one conditional UPDATE (or an INSERT the first time the
+job runs), so two processes racing for it can't both succeed on PostgreSQL
+or SQLite. Locks expire after their TTL so a crashed run doesn't block the
+job for good; the TTL must be longer than a run can take.
+"""
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.job_lock import JobLock
+
+
+def acquire_job_lock(db: Session, name: str, ttl: timedelta, now: Optional[datetime] = None) -> Optional[str]:
+    """
+    Take a named lock unless another run holds it.
+
+    Commits the session.
+
+    Args:
+        db: Database session
+        name: Lock name
+        ttl: How long the lock is held unless released first
+        now: Current UTC time (defaults to now)
+
+    Returns:
+        Token to release the lock with, or None if it is held
+    """
+    now = now or datetime.utcnow()
+    token = str(uuid.uuid4())
+
+    claimed = db.query(JobLock).filter(
+        JobLock.name == name,
+        or_(JobLock.locked_until.is_(None), JobLock.locked_until <= now)
+    ).update({JobLock.locked_by: token, JobLock.locked_until: now + ttl}, synchronize_session=False)
+    if claimed:
+        db.commit()
+        return token
+
+    # No free row: either the lock is held or this job has never run
+    db.add(JobLock(name=name, locked_by=token, locked_until=now + ttl))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return None
+    return token
+
+
+def release_job_lock(db: Session, name: str, token: str) -> None:
+    """
+    Release a lock taken with acquire_job_lock (no-op if it expired and was taken over).
+
+    Commits the session.
+    """
+    db.query(JobLock).filter(JobLock.name == name, JobLock.locked_by == token).update(
+        {JobLock.locked_by: None, JobLock.locked_until: None}, synchronize_session=False
+    )
+    db.commit()
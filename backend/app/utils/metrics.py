@@ -0,0 +1,258 @@
+"""
+Process metrics in the Prometheus text exposition format.
+
+The HTTP middleware records each request's latency by route template and the
+number of requests in flight. Pool events count connection checkouts, and
+InstrumentedQueuePool times how long each checkout waited. Cursor events
+time every statement and attribute it to the innermost app.services method
+on the stack ("other" when no service method ran it). GET /metrics renders
+these together with the caches' hit counts and the other singletons'
+metrics() snapshots, so any scraper can read them without a metrics server.
+Values are per process; with several workers each one reports its own.
+"""
+import math
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+from app.config import settings
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+# Route label for requests that matched no route, so unknown paths don't add series
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, (bool, int)):
+        return str(int(value))
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _header(name: str, help_text: str, metric_type: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+
+
+class Histogram:
+    """Thread-safe histogram with one series per label combination."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        """Record one observation for a label combination."""
+        with self._lock:
+            # Per-bucket (non-cumulative) counts, then sum and count
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, labels: Tuple[str, ...] = ()) -> int:
+        """Get the number of observations for a label combination."""
+        with self._lock:
+            series = self._series.get(labels)
+            return int(series[-1]) if series else 0
+
+    def render(self) -> List[str]:
+        """Render the histogram's exposition lines."""
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+
+        lines = _header(self.name, self.help_text, "histogram")
+        names = self.label_names + ("le",)
+        for labels, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_labels(names, labels + (_number(bound),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(names, labels + ('+Inf',))} {int(series[-1])}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {int(series[-1])}")
+        return lines
+
+
+class MetricsCollector:
+    """Request, connection pool and statement metrics for one process."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.request_seconds = Histogram(
+            "http_request_duration_seconds", "Time to respond to a request, by route template.",
+            ("method", "route"), REQUEST_BUCKETS
+        )
+        self.pool_wait_seconds = Histogram(
+            "db_pool_wait_seconds", "Time spent getting a connection from the pool.", (), DB_BUCKETS
+        )
+        self.statement_seconds = Histogram(
+            "db_statement_duration_seconds", "SQL statement time, by the service method that ran it.",
+            ("service_method",), DB_BUCKETS
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._responses: Dict[Tuple[str, str, str], int] = {}
+        self._pool_checkouts = 0
+
+    def request_started(self) -> None:
+        """Count a request as in flight."""
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        """
+        Record a finished request.
+
+        Args:
+            method: HTTP method
+            route: Route template (UNMATCHED_ROUTE if no route matched)
+            status_code: Response status, or 500 if the app raised
+            seconds: Time until the response headers were ready
+        """
+        self.request_seconds.observe(seconds, (method, route))
+        key = (method, route, str(status_code))
+        with self._lock:
+            self._in_flight -= 1
+            self._responses[key] = self._responses.get(key, 0) + 1
+
+    def pool_checkout(self) -> None:
+        """Count a connection checkout."""
+        with self._lock:
+            self._pool_checkouts += 1
+
+    def render(
+        self,
+        pool: Optional[Pool],
+        caches: Dict[str, Dict[str, float]],
+        components: Dict[str, Dict[str, float]]
+    ) -> str:
+        """
+        Render every metric in the text exposition format.
+
+        Args:
+            pool: The application engine's pool, for checked-out and overflow gauges
+            caches: metrics() of each cache layer (hits, misses, entries), by cache name
+            components: Other metrics() snapshots, by metric name prefix; exported as gauges
+
+        Returns:
+            Exposition text ending in a newline
+        """
+        with self._lock:
+            in_flight = self._in_flight
+            responses = dict(self._responses)
+            checkouts = self._pool_checkouts
+
+        lines = self.request_seconds.render()
+        lines += _header("http_requests_total", "Responses sent, by route template and status.", "counter")
+        for labels, count in sorted(responses.items()):
+            lines.append(f"http_requests_total{_labels(('method', 'route', 'status'), labels)} {count}")
+        lines += _header("http_requests_in_flight", "Requests being handled.", "gauge")
+        lines.append(f"http_requests_in_flight {in_flight}")
+
+        lines += _header("db_pool_checkouts_total", "Connections checked out of the pool.", "counter")
+        lines.append(f"db_pool_checkouts_total {checkouts}")
+        if isinstance(pool, QueuePool):
+            lines += _header("db_pool_checked_out", "Connections currently checked out.", "gauge")
+            lines.append(f"db_pool_checked_out {pool.checkedout()}")
+            lines += _header("db_pool_overflow", "Connections open beyond the pool size.", "gauge")
+            lines.append(f"db_pool_overflow {max(pool.overflow(), 0)}")
+        lines += self.pool_wait_seconds.render()
+        lines += self.statement_seconds.render()
+
+        lines += _render_caches(caches)
+        for prefix, snapshot in components.items():
+            lines += _render_gauges(prefix, snapshot)
+        return "\n".join(lines) + "\n"
+
+
+def _render_caches(caches: Dict[str, Dict[str, float]]) -> List[str]:
+    lines: List[str] = []
+    for key, metric_type, help_text in (
+        ("hits", "counter", "Cache lookups that found an entry."),
+        ("misses", "counter", "Cache lookups that found nothing usable."),
+        ("entries", "gauge", "Entries held by the cache.")
+    ):
+        name = f"cache_{key}_total" if metric_type == "counter" else f"cache_{key}"
+        lines += _header(name, help_text, metric_type)
+        for cache, snapshot in sorted(caches.items()):
+            lines.append(f"{name}{_labels(('cache',), (cache,))} {_number(snapshot[key])}")
+    return lines
+
+
+def _render_gauges(prefix: str, snapshot: Dict[str, float]) -> List[str]:
+    lines: List[str] = []
+    for key, value in snapshot.items():
+        name = f"{prefix}_{key}"
+        lines += _header(name, f"{prefix} {key.replace('_', ' ')}.", "gauge")
+        lines.append(f"{name} {_number(value)}")
+    return lines
+
+
+def _service_method() -> str:
+    """Get the qualified name of the innermost app.services function on the stack."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith("app.services."):
+            return frame.f_code.co_qualname
+        frame = frame.f_back
+    return "other"
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout took, pre-ping included."""
+
+    def connect(self):
+        if not metrics_collector.enabled:
+            return super().connect()
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            metrics_collector.pool_wait_seconds.observe(time.perf_counter() - started)
+
+
+metrics_collector = MetricsCollector(enabled=settings.METRICS_ENABLED)
+
+
+@event.listens_for(Pool, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    if metrics_collector.enabled:
+        metrics_collector.pool_checkout()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and metrics_collector.enabled:
+        context._metrics_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is not None:
+        metrics_collector.statement_seconds.observe(time.perf_counter() - started, (_service_method(),))
@@ -0,0 +1,127 @@
+"""
+In-process daily scheduler for the missed-workout batch.
+
+Deployments without an external cron can set MISSED_WORKOUT_JOB_ENABLED and
+the API process runs MissedWorkoutBatchService once a day at
+MISSED_WORKOUT_JOB_TIME (server local time) on a background thread. Every
+worker process with the setting starts a scheduler, so each run first takes
+the "missed_workouts" job lock; a worker that finds the lock held skips that
+night instead of shifting the same workouts a second time.
+"""
+import logging
+import threading
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.services.missed_workouts import MissedWorkoutBatchService, MissedWorkoutRunStats
+from app.utils.job_lock import acquire_job_lock, release_job_lock
+
+logger = logging.getLogger(__name__)
+
+JOB_LOCK_NAME = "missed_workouts"
+
+# Longer than any run; a lock left by a crashed worker frees up after this
+_JOB_LOCK_TTL = timedelta(hours=6)
+
+
+class MissedWorkoutScheduler:
+    """Runs the missed-workout batch daily on a daemon thread and tracks run metrics."""
+
+    def __init__(self, run_at: time, chunk_size: int, session_factory: Callable[[], Session] = SessionLocal):
+        self.run_at = run_at
+        self.chunk_size = chunk_size
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._failures = 0
+        self._lock_skips = 0
+        self._last_run: Optional[Dict[str, float]] = None
+        self._last_run_finished_at: Optional[datetime] = None
+
+    def seconds_until_next_run(self, now: datetime) -> float:
+        """Get the seconds from now until the next run_at."""
+        next_run = datetime.combine(now.date(), self.run_at)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    def run_once(self) -> Optional[MissedWorkoutRunStats]:
+        """
+        Run the batch for all users now, in a session of its own.
+
+        Returns:
+            The run's stats, or None if another process holds the job lock
+        """
+        db = self.session_factory()
+        try:
+            token = acquire_job_lock(db, JOB_LOCK_NAME, _JOB_LOCK_TTL)
+            if token is None:
+                logger.info("Missed-workout job lock is held by another process; skipping this run")
+                with self._lock:
+                    self._lock_skips += 1
+                return None
+            try:
+                stats = MissedWorkoutBatchService.run(db, chunk_size=self.chunk_size)
+            finally:
+                db.rollback()
+                release_job_lock(db, JOB_LOCK_NAME, token)
+        except Exception:
+            with self._lock:
+                self._failures += 1
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            self._runs += 1
+            self._last_run = stats.as_dict()
+            self._last_run_finished_at = datetime.utcnow()
+        return stats
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.seconds_until_next_run(datetime.now())):
+            try:
+                self.run_once()
+            except Exception:  # A failed night is counted and logged; the next one still runs
+                logger.exception("Missed-workout job failed")
+
+    def start(self) -> None:
+        """Start the scheduler thread (no-op if already running)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="missed-workout-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the scheduler thread, waiting for a run in progress to finish."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Get a snapshot of scheduler activity.
+
+        Returns:
+            Dict with runs, failures, runs skipped because the job lock was held
+            and the last run's counters (prefixed last_run_)
+        """
+        with self._lock:
+            snapshot = {"runs": self._runs, "failures": self._failures, "lock_skips": self._lock_skips}
+            for key, value in (self._last_run or {}).items():
+                snapshot[f"last_run_{key}"] = value
+            if self._last_run_finished_at:
+                snapshot["last_run_finished_at"] = self._last_run_finished_at.timestamp()
+            return snapshot
+
+
+missed_workout_scheduler = MissedWorkoutScheduler(
+    run_at=time.fromisoformat(settings.MISSED_WORKOUT_JOB_TIME),
+    chunk_size=settings.MISSED_WORKOUT_JOB_CHUNK_SIZE
+)
@@ -0,0 +1,50 @@
+"""
+Keyset pagination cursor utilities.
+"""
+import base64
+from typing import Any, Callable, Tuple
+from fastapi import HTTPException, status
+
+CURSOR_SEPARATOR = "|"
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row on a page as an opaque cursor.
+
+    Args:
+        values: Sort key values in order (dates are stored in ISO format)
+
+    Returns:
+        URL-safe cursor string
+    """
+    parts = [v.isoformat() if hasattr(v, "isoformat") else str(v) for v in values]
+    raw = CURSOR_SEPARATOR.join(parts)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> Tuple[Any, ...]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+        parsers: One parser per sort key value (e.g. datetime.fromisoformat, str)
+
+    Returns:
+        Tuple of parsed sort key values
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        parts = raw.split(CURSOR_SEPARATOR)
+        if len(parts) != len(parsers):
+            raise ValueError("Unexpected number of cursor values")
+        return tuple(parse(part) for parse, part in zip(parsers, parts))
+    except (ValueError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
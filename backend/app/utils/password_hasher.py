@@ -0,0 +1,107 @@
+"""
+Bounded worker pool for bcrypt password hashing and verification.
+
+bcrypt is deliberately slow (hundreds of milliseconds at the default cost).
+Running it on a small dedicated pool keeps a burst of logins from taking
+over the event loop or the threadpool shared by every other endpoint:
+callers await the result without holding a thread, and at most
+PASSWORD_HASH_WORKERS hashes run at once.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from fastapi import HTTPException, status
+from app.config import settings
+from app.utils.security import get_password_hash, get_password_hash_rounds, verify_password
+
+
+class PasswordHasher:
+    """Runs bcrypt work on a bounded thread pool and tracks queueing metrics."""
+
+    def __init__(self, workers: int, max_queue: int, rounds: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a bcrypt call on the pool.
+
+        Raises:
+            HTTPException: 503 if max_queue requests are already waiting
+        """
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent sign-ins, please retry shortly",
+                    headers={"Retry-After": "1"}
+                )
+            self._queued += 1
+        submitted_at = time.perf_counter()
+
+        def task() -> Any:
+            wait_seconds = time.perf_counter() - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait_seconds += wait_seconds
+                self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        return await asyncio.wrap_future(self._executor.submit(task))
+
+    async def hash(self, password: str) -> str:
+        """Hash a password at the configured cost."""
+        return await self._run(get_password_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Check a password against a stored hash."""
+        return await self._run(verify_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether a stored hash was made at a different cost than configured."""
+        return get_password_hash_rounds(hashed_password) != self.rounds
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Get a snapshot of pool activity.
+
+        Returns:
+            Dict with workers, queued, running, completed, rejected,
+            avg_wait_seconds and max_wait_seconds
+        """
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "workers": self.workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": self._total_wait_seconds / started if started else 0.0,
+                "max_wait_seconds": self._max_wait_seconds
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    rounds=settings.BCRYPT_ROUNDS
+)
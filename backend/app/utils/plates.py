@@ -0,0 +1,369 @@
+"""
+Exact plate-loading solver and whole-session loading planner.
+
+Weights are converted to integer units (hundredths, reduced by the greatest
+common divisor of the plates) so there is no float drift. Each
+inventory is compiled once into a table covering every per-side load it can
+build, with the fewest plates for each, plus a nearest-loadable index, so a
+lookup is a couple of list reads. Compiled solvers are memoized by inventory.
+
+plan_plate_changes picks one loading per set of a session so the total
+number of plates taken off and put on between sets is as small as possible.
+Plates come off the outside of the sleeve first, so going from one loading
+to the next keeps their common inner plates and swaps the rest. The search
+is a shortest path through the layered graph of candidate loadings per set.
+"""
+from bisect import bisect_left
+from functools import lru_cache, reduce
+from math import floor, gcd
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+# Weights are resolved to hundredths of a pound/kilogram
+WEIGHT_SCALE = 100
+
+# Heaviest per-side load an inventory is compiled for, however many plates it has
+MAX_LOAD_PER_SIDE = 500.0
+
+# Candidate loadings per set for the session planner: at most this many
+# plates more than the minimum, and at most this many loadings
+MAX_EXTRA_PLATES = 2
+MAX_LOADINGS_PER_SET = 64
+
+
+class PlateInventory(NamedTuple):
+    """
+    A bar and the plates available to load it.
+
+    plates holds (plate weight, pairs available) entries; pairs of None
+    means as many as needed up to MAX_LOAD_PER_SIDE.
+    """
+    bar_weight: float
+    plates: Tuple[Tuple[float, Optional[int]], ...]
+
+
+class PlateLoad(NamedTuple):
+    """Plates for one side of the bar and the total weight they make."""
+    plates: List[float]
+    total_weight: float
+    exact: bool
+
+
+class PlateChange(NamedTuple):
+    """One step of a loading plan: the plates to strip and add per side, then the load."""
+    load: PlateLoad
+    removed: List[float]
+    added: List[float]
+
+
+class LoadingPlan(NamedTuple):
+    """Loads for a sequence of sets and the plate changes (per side) they take."""
+    steps: List[PlateChange]
+    total_changes: int
+
+
+DEFAULT_PLATE_INVENTORY = PlateInventory(
+    bar_weight=45.0,
+    plates=tuple((plate, None) for plate in (45, 35, 25, 10, 5, 2.5, 1.0, 0.75, 0.5, 0.25))
+)
+
+
+def _to_hundredths(weight: float) -> int:
+    hundredths = round(weight * WEIGHT_SCALE)
+    if hundredths < 0 or abs(weight * WEIGHT_SCALE - hundredths) > 1e-6:
+        raise ValueError(f"Weight {weight} must be a non-negative multiple of {1 / WEIGHT_SCALE}")
+    return hundredths
+
+
+class PlateSolver:
+    """Minimum-plate loadings for every per-side weight an inventory can build."""
+
+    def __init__(self, inventory: PlateInventory):
+        self.inventory = inventory
+        self.bar_weight = float(inventory.bar_weight)
+
+        plates = [(_to_hundredths(weight), pairs) for weight, pairs in inventory.plates if pairs != 0]
+        if any(weight == 0 for weight, _ in plates):
+            raise ValueError("Plate weights must be positive")
+
+        self._unit = reduce(gcd, (weight for weight, _ in plates), 0) or 1
+        self._plates = sorted(((weight // self._unit, pairs) for weight, pairs in plates), reverse=True)
+        cap = _to_hundredths(MAX_LOAD_PER_SIDE) // self._unit
+
+        # Unlimited plates are one reusable item; counted plates are split into
+        # 1, 2, 4, ... bundles so each bundle is used at most once
+        items = []
+        max_side = 0
+        unlimited = False
+        for hundredths, pairs in sorted(plates, reverse=True):
+            weight = hundredths // self._unit
+            if pairs is None:
+                items.append((weight, 1, True))
+                unlimited = True
+                continue
+            max_side += weight * pairs
+            bundle = 1
+            while pairs > 0:
+                take = min(bundle, pairs)
+                items.append((weight, take, False))
+                pairs -= take
+                bundle *= 2
+        max_side = cap if unlimited else min(max_side, cap)
+
+        # combos[s] = fewest plates making s units per side, heaviest first; items
+        # are visited heaviest first so appending keeps that order, and ties go
+        # to the loading with heavier plates
+        combos: List[Optional[Tuple[int, ...]]] = [None] * (max_side + 1)
+        combos[0] = ()
+        for weight, take, reusable in items:
+            size = weight * take
+            sides = range(size, max_side + 1) if reusable else range(max_side, size - 1, -1)
+            for side in sides:
+                previous = combos[side - size]
+                if previous is None:
+                    continue
+                candidate = previous + (weight,) * take
+                current = combos[side]
+                if current is None or len(candidate) < len(current) or (
+                    len(candidate) == len(current) and candidate > current
+                ):
+                    combos[side] = candidate
+
+        self._combos = combos
+        self._loadable = [side for side, combo in enumerate(combos) if combo is not None]
+
+        # floor/ceiling indexes: the closest loadable side at or below / at or above s
+        self._floor: List[int] = [0] * (max_side + 1)
+        self._ceiling: List[Optional[int]] = [None] * (max_side + 1)
+        loadable = 0
+        for side in range(max_side + 1):
+            if combos[side] is not None:
+                loadable = side
+            self._floor[side] = loadable
+        loadable = None
+        for side in range(max_side, -1, -1):
+            if combos[side] is not None:
+                loadable = side
+            self._ceiling[side] = loadable
+
+    def _side_weight(self, units: int) -> float:
+        return units * self._unit / WEIGHT_SCALE
+
+    @property
+    def loadable_weights(self) -> List[float]:
+        """Every total weight the inventory can build, ascending."""
+        return [self.bar_weight + 2 * self._side_weight(side) for side in self._loadable]
+
+    def _nearest_side(self, target_weight: float) -> Tuple[int, bool]:
+        """Get the loadable per-side units closest to a target and whether they match it."""
+        per_side = (target_weight - self.bar_weight) / 2
+        if per_side <= 0:
+            return 0, per_side == 0
+
+        units = per_side * WEIGHT_SCALE / self._unit
+        if abs(units - round(units)) < 1e-6:
+            units = round(units)
+        lower = min(floor(units), len(self._floor) - 1)
+        below = self._floor[lower]
+        above = self._ceiling[lower + 1] if lower + 1 < len(self._ceiling) else None
+        side = above if above is not None and above - units < units - below else below
+        return side, side == units
+
+    def _load(self, plates: Tuple[int, ...], exact: bool) -> PlateLoad:
+        return PlateLoad(
+            plates=[self._side_weight(plate) for plate in plates],
+            total_weight=self.bar_weight + 2 * self._side_weight(sum(plates)),
+            exact=exact
+        )
+
+    def solve(self, target_weight: float) -> PlateLoad:
+        """
+        Load the bar as close to a target as possible with the fewest plates.
+
+        Args:
+            target_weight: Target total weight including the bar
+
+        Returns:
+            PlateLoad with the plates per side (heaviest first) and the total
+            they make; exact is False when the target cannot be built and
+            the nearest loadable weight (the lighter one on ties) is used
+        """
+        side, exact = self._nearest_side(target_weight)
+        return self._load(self._combos[side], exact)
+
+    def _loadings(self, side: int) -> List[Tuple[int, ...]]:
+        """
+        List the ways to build a per-side load, heaviest plate first.
+
+        Only loadings with at most MAX_EXTRA_PLATES plates more than the
+        minimum are listed, fewest plates first, up to MAX_LOADINGS_PER_SET.
+        """
+        fewest_plates = len(self._combos[side])
+        found: List[Tuple[int, ...]] = []
+
+        def extend(start: int, remaining: int, slots: int, prefix: Tuple[int, ...]) -> None:
+            if len(found) >= MAX_LOADINGS_PER_SET:
+                return
+            if remaining == 0:
+                if slots == 0:
+                    found.append(prefix)
+                return
+            fewest = self._combos[remaining]
+            if fewest is None or len(fewest) > slots:
+                return
+            for i in range(start, len(self._plates)):
+                weight, pairs = self._plates[i]
+                if weight * slots < remaining:
+                    # Lighter plates cannot fill the remaining slots either
+                    return
+                most = min(slots, remaining // weight if pairs is None else min(pairs, remaining // weight))
+                for count in range(most, 0, -1):
+                    extend(i + 1, remaining - weight * count, slots - count, prefix + (weight,) * count)
+
+        # Search by plate count so the fewest-plate loadings come first
+        for plate_count in range(fewest_plates, fewest_plates + MAX_EXTRA_PLATES + 1):
+            extend(0, side, plate_count, ())
+        return found
+
+
+class RoundingGrid:
+    """
+    The sorted weights an inventory can load, for rounding prescriptions.
+
+    Rounding is a binary search for the nearest weight in the grid (the
+    lighter one on ties); targets below the bar round up to the bar.
+    """
+
+    def __init__(self, bar_weight: float, weights: Sequence[float]):
+        self.bar_weight = bar_weight
+        self.weights = tuple(weights)
+
+    def round(self, weight: float) -> float:
+        """
+        Round a weight to the nearest loadable weight.
+
+        Args:
+            weight: Raw weight
+
+        Returns:
+            Nearest weight in the grid
+        """
+        i = bisect_left(self.weights, weight)
+        if i == len(self.weights):
+            return self.weights[-1]
+        if i == 0 or self.weights[i] == weight:
+            return self.weights[i]
+        below, above = self.weights[i - 1], self.weights[i]
+        return above if above - weight < weight - below else below
+
+    def round_many(self, weights: Sequence[float]) -> List[float]:
+        """Round each weight with round()."""
+        return [self.round(weight) for weight in weights]
+
+
+def _common_inner_plates(current: Tuple[int, ...], following: Tuple[int, ...]) -> int:
+    shared = 0
+    for a, b in zip(current, following):
+        if a != b:
+            break
+        shared += 1
+    return shared
+
+
+def _change_cost(current: Tuple[int, ...], following: Tuple[int, ...]) -> int:
+    shared = _common_inner_plates(current, following)
+    return len(current) + len(following) - 2 * shared
+
+@lru_cache(maxsize=128)
+def get_plate_solver(inventory: PlateInventory = DEFAULT_PLATE_INVENTORY) -> PlateSolver:
+    """
+    Get the compiled solver for an inventory, building it on first use.
+
+    Args:
+        inventory: Bar and plates to load
+
+    Returns:
+        PlateSolver shared by every caller with the same inventory
+    """
+    return PlateSolver(inventory)
+
+
+@lru_cache(maxsize=128)
+def get_rounding_grid(inventory: PlateInventory = DEFAULT_PLATE_INVENTORY) -> RoundingGrid:
+    """
+    Get the rounding grid for an inventory, compiling it on first use.
+
+    Args:
+        inventory: Bar and plates to load
+
+    Returns:
+        RoundingGrid shared by every caller with the same inventory
+    """
+    return RoundingGrid(float(inventory.bar_weight), get_plate_solver(inventory).loadable_weights)
+
+
+@lru_cache(maxsize=1024)
+def plan_plate_changes(
+    inventory: PlateInventory,
+    target_weights: Tuple[float, ...]
+) -> LoadingPlan:
+    """
+    Plan the loads for consecutive sets on one bar with the fewest plate changes.
+
+    The bar starts empty. Each target is loaded at its nearest loadable
+    weight; among the loadings that make it, the plan picks the sequence
+    that takes the fewest plates off and puts the fewest on (per side),
+    preferring fewer plates on the bar on ties. Plans are memoized by
+    (inventory, target_weights).
+
+    Args:
+        inventory: Bar and plates to load
+        target_weights: Target total weight of each set, in order
+
+    Returns:
+        LoadingPlan with one step per target
+    """
+    solver = get_plate_solver(inventory)
+    targets = [solver._nearest_side(weight) for weight in target_weights]
+
+    # Shortest path through one layer of candidate loadings per set;
+    # paths[i][j] = (changes, plates on the bar, previous candidate) for layer i, candidate j
+    layers: List[List[Tuple[int, ...]]] = []
+    paths: List[List[Tuple[int, int, int]]] = []
+    previous_layer: List[Tuple[int, ...]] = [()]
+    previous_paths = [(0, 0, -1)]
+    for side, _ in targets:
+        layer = solver._loadings(side)
+        layer_paths = []
+        for loading in layer:
+            layer_paths.append(min(
+                (changes + _change_cost(before, loading), plates + len(loading), k)
+                for k, (before, (changes, plates, _)) in enumerate(zip(previous_layer, previous_paths))
+            ))
+        layers.append(layer)
+        paths.append(layer_paths)
+        previous_layer, previous_paths = layer, layer_paths
+
+    if not layers:
+        return LoadingPlan(steps=[], total_changes=0)
+
+    # Walk back from the cheapest final loading
+    chosen = []
+    j = min(range(len(paths[-1])), key=lambda k: paths[-1][k][:2])
+    total_changes = paths[-1][j][0]
+    for i in range(len(layers) - 1, -1, -1):
+        chosen.append(layers[i][j])
+        j = paths[i][j][2]
+    chosen.reverse()
+
+    steps = []
+    current: Tuple[int, ...] = ()
+    for loading, (_, exact) in zip(chosen, targets):
+        shared = _common_inner_plates(current, loading)
+        steps.append(PlateChange(
+            load=solver._load(loading, exact),
+            removed=[solver._side_weight(plate) for plate in reversed(current[shared:])],
+            added=[solver._side_weight(plate) for plate in loading[shared:]]
+        ))
+        current = loading
+
+    return LoadingPlan(steps=steps, total_changes=total_changes)
@@ -0,0 +1,149 @@
+"""
+Batched 5/3/1 prescription engine.
+
+Computes working and warmup weights for many (training max, week, rounding
+increment) rows in one call, with the same rounding as the per-set functions
+in app.utils.calculations. NumPy is used for large batches when it is
+installed; otherwise, and for small batches where array setup costs more than
+it saves, a pure-Python path produces identical results. When a RoundingGrid
+from an equipment profile is given, weights snap to the nearest loadable
+weight instead of the rounding increment.
+"""
+from typing import List, Optional, Sequence
+from app.utils.calculations import WORKING_SET_PERCENTAGES, WARMUP_SCHEME
+from app.utils.plates import RoundingGrid
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Below this many rows the pure-Python path is faster than building arrays
+NUMPY_MIN_BATCH = 64
+
+_WARMUP_PERCENTAGES = tuple(percentage for percentage, _ in WARMUP_SCHEME)
+
+
+def _check_lengths(*columns: Sequence) -> int:
+    lengths = {len(column) for column in columns}
+    if len(lengths) > 1:
+        raise ValueError("All prescription inputs must have the same length")
+    return lengths.pop() if lengths else 0
+
+
+def _use_numpy(rows: int) -> bool:
+    return np is not None and rows >= NUMPY_MIN_BATCH
+
+
+def _snap_to_grid(raw, grid: RoundingGrid):
+    """Vectorized RoundingGrid.round: nearest grid weight, the lighter one on ties."""
+    weights = np.asarray(grid.weights, dtype=float)
+    above = np.clip(np.searchsorted(weights, raw), 0, len(weights) - 1)
+    below = np.clip(above - 1, 0, len(weights) - 1)
+    use_above = (weights[above] - raw < raw - weights[below]) | (weights[above] == raw)
+    return np.where(use_above | (raw < weights[0]), weights[above], weights[below])
+
+
+def prescribe_working_weights(
+    training_maxes: Sequence[float],
+    weeks: Sequence[int],
+    rounding_increments: Sequence[float],
+    grid: Optional[RoundingGrid] = None
+) -> List[List[float]]:
+    """
+    Calculate the three working set weights for many lifts at once.
+
+    Row i matches calculate_working_weight(training_maxes[i], weeks[i], set, rounding_increments[i])
+    for sets 1-3.
+
+    Args:
+        training_maxes: Training max per row
+        weeks: Week number (1-4) per row
+        rounding_increments: Rounding increment per row
+        grid: Loadable weights to round to instead of the increments
+
+    Returns:
+        One [set 1, set 2, set 3] weight list per row
+
+    Raises:
+        ValueError: If the inputs differ in length
+        KeyError: If a week is not 1-4
+    """
+    rows = _check_lengths(training_maxes, weeks, rounding_increments)
+
+    if _use_numpy(rows):
+        percentages = np.array([WORKING_SET_PERCENTAGES[week] for week in weeks], dtype=float)
+        maxes = np.asarray(training_maxes, dtype=float)[:, None]
+        if grid is not None:
+            return _snap_to_grid(maxes * percentages, grid).tolist()
+        increments = np.asarray(rounding_increments, dtype=float)[:, None]
+        return (np.round(maxes * percentages / increments) * increments).tolist()
+
+    if grid is not None:
+        return [
+            [grid.round(training_max * percentage) for percentage in WORKING_SET_PERCENTAGES[week]]
+            for training_max, week in zip(training_maxes, weeks)
+        ]
+
+    return [
+        [round(training_max * percentage / increment) * increment for percentage in WORKING_SET_PERCENTAGES[week]]
+        for training_max, week, increment in zip(training_maxes, weeks, rounding_increments)
+    ]
+
+
+def prescribe_warmup_weights(
+    training_maxes: Sequence[float],
+    rounding_increments: Sequence[float],
+    bar_weight: float = 45.0,
+    grid: Optional[RoundingGrid] = None
+) -> List[List[float]]:
+    """
+    Calculate the warmup weights for many lifts at once.
+
+    Row i matches the weights from calculate_warmup_weights(training_maxes[i], rounding_increments[i]);
+    the reps and percentages come from WARMUP_SCHEME.
+
+    Args:
+        training_maxes: Training max per row
+        rounding_increments: Rounding increment per row
+        bar_weight: Weight of the barbell (the empty-bar set)
+        grid: Loadable weights to round to instead of the increments; its bar
+            replaces bar_weight
+
+    Returns:
+        One weight list per row, in WARMUP_SCHEME order
+
+    Raises:
+        ValueError: If the inputs differ in length
+    """
+    rows = _check_lengths(training_maxes, rounding_increments)
+    if grid is not None:
+        bar_weight = grid.bar_weight
+
+    if _use_numpy(rows):
+        percentages = np.array(_WARMUP_PERCENTAGES, dtype=float)
+        maxes = np.asarray(training_maxes, dtype=float)[:, None]
+        if grid is not None:
+            weights = _snap_to_grid(maxes * percentages, grid)
+        else:
+            increments = np.asarray(rounding_increments, dtype=float)[:, None]
+            weights = np.round(maxes * percentages / increments) * increments
+        weights[:, percentages == 0.0] = bar_weight
+        return weights.tolist()
+
+    if grid is not None:
+        return [
+            [
+                bar_weight if percentage == 0.0 else grid.round(training_max * percentage)
+                for percentage in _WARMUP_PERCENTAGES
+            ]
+            for training_max in training_maxes
+        ]
+
+    return [
+        [
+            bar_weight if percentage == 0.0 else round(training_max * percentage / increment) * increment
+            for percentage in _WARMUP_PERCENTAGES
+        ]
+        for training_max, increment in zip(training_maxes, rounding_increments)
+    ]
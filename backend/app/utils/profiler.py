@@ -0,0 +1,215 @@
+"""
+On-demand sampling profiler for single requests.
+
+A request carrying an X-Profile-Token header equal to PROFILING_TOKEN is
+profiled. Endpoints decorated with @profiled then have their worker thread's
+stack sampled every PROFILING_INTERVAL_SECONDS. A sample taken while a SQL
+statement is running gets the statement as its innermost frame, so database
+time shows up inline in the flame graph. Every statement the request runs is
+also recorded with its duration, whether or not the endpoint is decorated.
+
+Finished profiles go to a ring buffer of the last PROFILING_BUFFER_SIZE
+profiles in this process. They can be fetched from /api/v1/profiles, and the
+collapsed-stack output can be read by flamegraph.pl or speedscope.
+"""
+import functools
+import hmac
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.utils.query_tracker import statement_shape
+
+# Longest statement kept as a flame graph frame
+_MAX_FRAME_SQL = 200
+
+
+class ProfiledStatement(NamedTuple):
+    """A SQL statement run by a profiled request (parameters are not kept)."""
+    sql: str
+    seconds: float
+
+
+class RequestProfile:
+    """Stack samples and SQL statements collected while serving one request."""
+
+    def __init__(self, method: str, path: str, interval_seconds: float):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.created_at = datetime.utcnow()
+        self.status_code: Optional[int] = None
+        self.duration_seconds = 0.0
+        self.samples: Counter = Counter()
+        self.statements: List[ProfiledStatement] = []
+        self.current_statement: Optional[str] = None
+        self._started = time.perf_counter()
+
+    def finish(self, status_code: int) -> None:
+        """Record the response status and the request's duration."""
+        self.status_code = status_code
+        self.duration_seconds = time.perf_counter() - self._started
+
+    def collapsed(self) -> str:
+        """
+        Get the samples in collapsed-stack format.
+
+        Returns:
+            One "outer;...;inner count" line per distinct stack
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.samples.items()))
+
+    def summary(self) -> Dict[str, object]:
+        """Get the profile's fields without samples or statements."""
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "created_at": self.created_at,
+            "duration_ms": round(self.duration_seconds * 1000, 3),
+            "interval_ms": self.interval_seconds * 1000,
+            "sample_count": sum(self.samples.values()),
+            "statement_count": len(self.statements),
+            "db_ms": round(sum(s.seconds for s in self.statements) * 1000, 3)
+        }
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def _frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+class _Sampler(threading.Thread):
+    """Samples one thread's stack, from root_frame inwards, until stopped."""
+
+    def __init__(self, profile: RequestProfile, thread_id: int, root_frame):
+        super().__init__(name="request-profiler", daemon=True)
+        self.profile = profile
+        self.thread_id = thread_id
+        self.root_frame = root_frame
+        self.stopped = threading.Event()
+
+    def sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        names = []
+        while frame is not None and frame is not self.root_frame:
+            names.append(_frame_name(frame))
+            frame = frame.f_back
+        if not names:
+            return
+        names.reverse()
+        statement = self.profile.current_statement
+        if statement is not None:
+            names.append("sql: " + statement_shape(statement)[:_MAX_FRAME_SQL].replace(";", ","))
+        self.profile.samples[";".join(names)] += 1
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.profile.interval_seconds):
+            self.sample()
+
+
+class RequestProfiler:
+    """Starts request profiles and keeps the most recent ones."""
+
+    def __init__(self, token: str, interval_seconds: float, buffer_size: int):
+        self.token = token
+        self.interval_seconds = interval_seconds
+        self._profiles: Deque[RequestProfile] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def authorized(self, token: Optional[str]) -> bool:
+        """Check a request's profiling token against PROFILING_TOKEN."""
+        if not self.enabled or token is None:
+            return False
+        # Compared as bytes: compare_digest rejects str with non-ASCII characters
+        return hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def start(self, method: str, path: str) -> RequestProfile:
+        """Start profiling the current request."""
+        profile = RequestProfile(method, path, self.interval_seconds)
+        _current_profile.set(profile)
+        return profile
+
+    def finish(self, profile: RequestProfile, status_code: int) -> None:
+        """Finish a profile and add it to the ring buffer, dropping the oldest if full."""
+        profile.finish(status_code)
+        with self._lock:
+            self._profiles.append(profile)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        """Get a buffered profile by id."""
+        with self._lock:
+            return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def list(self) -> List[RequestProfile]:
+        """Get the buffered profiles, newest first."""
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def clear(self) -> None:
+        """Drop every buffered profile."""
+        with self._lock:
+            self._profiles.clear()
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Sample a sync endpoint's stack when its request is being profiled.
+
+    Goes between the route decorator and the function; the endpoint keeps
+    its signature and still runs in the threadpool.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return func(*args, **kwargs)
+
+        sampler = _Sampler(profile, threading.get_ident(), sys._getframe())
+        sampler.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sampler.stopped.set()
+            sampler.join()
+
+    return wrapper
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _statement_started(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is not None and context is not None:
+        profile.current_statement = statement
+        context._profiler_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = getattr(context, "_profiler_started", None)
+    if profile is not None and started is not None:
+        profile.current_statement = None
+        profile.statements.append(ProfiledStatement(statement, time.perf_counter() - started))
+
+
+request_profiler = RequestProfiler(
+    token=settings.PROFILING_TOKEN,
+    interval_seconds=settings.PROFILING_INTERVAL_SECONDS,
+    buffer_size=settings.PROFILING_BUFFER_SIZE
+)
@@ -0,0 +1,128 @@
+"""
+Short-lived cache of program detail responses.
+
+Entries are keyed by program id and hold the ProgramDetailResponse and the
+owner's id, so repeat loads of the program screen skip the detail query.
+Writes that change what the detail shows (program updates, cycle
+completion, next-cycle generation, workout completion and deletion)
+publish an invalidation for the program through an InvalidationChannel, so
+every worker drops entries for it that were cached before the change.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+from app.config import settings
+from app.schemas.program import ProgramDetailResponse
+from app.utils.auth_cache import FileInvalidationChannel, InvalidationChannel, LocalInvalidationChannel
+
+
+class _Entry(NamedTuple):
+    user_id: str
+    detail: ProgramDetailResponse
+    cached_at: float
+    expires_at: float
+
+
+class ProgramDetailCache:
+    """Bounded, thread-safe LRU cache of program details with a TTL."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int, channel: InvalidationChannel):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.channel = channel
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, program_id: str, user_id: str) -> Optional[ProgramDetailResponse]:
+        """
+        Get the cached detail of a program.
+
+        Args:
+            program_id: Program ID
+            user_id: Current user's ID; entries of other owners are not returned
+
+        Returns:
+            ProgramDetailResponse, or None if missing, expired or invalidated
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(program_id)
+            if entry is None or entry.user_id != user_id:
+                self._misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[program_id]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(program_id)
+
+        if self.channel.invalidated_since(program_id, entry.cached_at):
+            with self._lock:
+                self._entries.pop(program_id, None)
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._hits += 1
+        return entry.detail
+
+    def put(self, program_id: str, user_id: str, detail: ProgramDetailResponse, loaded_at: float) -> None:
+        """
+        Cache the detail of a program.
+
+        Args:
+            program_id: Program ID
+            user_id: Owner's ID
+            detail: Program detail
+            loaded_at: time.time() taken before the detail was read, so a change
+                committed while the read was in flight still invalidates it
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[program_id] = _Entry(user_id, detail, loaded_at, loaded_at + self.ttl_seconds)
+            self._entries.move_to_end(program_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, program_id: str) -> None:
+        """Drop the cached detail of a program in this and every other worker on the channel."""
+        self.channel.publish(program_id)
+
+    def clear(self) -> None:
+        """Drop every entry held by this process."""
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Get this process's lookup counts.
+
+        Returns:
+            Dict with hits, misses and entries
+        """
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "entries": len(self._entries)}
+
+
+def _create_channel() -> InvalidationChannel:
+    if settings.PROGRAM_DETAIL_CACHE_INVALIDATION_DIR:
+        return FileInvalidationChannel(settings.PROGRAM_DETAIL_CACHE_INVALIDATION_DIR)
+    return LocalInvalidationChannel()
+
+
+program_detail_cache = ProgramDetailCache(
+    ttl_seconds=settings.PROGRAM_DETAIL_CACHE_TTL_SECONDS,
+    max_entries=settings.PROGRAM_DETAIL_CACHE_MAX_ENTRIES,
+    channel=_create_channel()
+)
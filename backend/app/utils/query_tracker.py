@@ -0,0 +1,139 @@
+"""
+Per-request SQL statement counting and N+1 detection.
+
+Cursor events on every engine add each statement's count and duration to
+the stats of the request being served, found through a ContextVar that the
+HTTP middleware sets (the ContextVar is copied into the worker thread
+running a sync endpoint). Statements are grouped by shape, their SQL with
+IN lists collapsed, and a shape executed QUERY_N_PLUS_ONE_THRESHOLD times
+or more in one request is reported as a likely N+1.
+
+Streaming responses only count the statements run before the headers are
+sent.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"IN \((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Get a statement's SQL with whitespace normalized and IN lists collapsed."""
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class RequestQueryStats:
+    """Statements executed while serving one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        """Count one executed statement."""
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Get the shapes executed at least threshold times, most repeated first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+class QueryTracker:
+    """Collects per-request statement stats and keeps totals across requests."""
+
+    def __init__(self, enabled: bool, n_plus_one_threshold: int):
+        self.enabled = enabled
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._statements = 0
+        self._db_seconds = 0.0
+        self._max_statements = 0
+        self._n_plus_one_requests = 0
+
+    def start_request(self) -> Optional[RequestQueryStats]:
+        """Start collecting stats for the current request (None if tracking is disabled)."""
+        if not self.enabled:
+            return None
+        stats = RequestQueryStats()
+        _current_stats.set(stats)
+        return stats
+
+    def finish_request(self, stats: RequestQueryStats, route: str) -> List[Tuple[str, int]]:
+        """
+        Add a finished request's stats to the totals.
+
+        Args:
+            stats: Stats returned by start_request
+            route: Method and path, used when logging a likely N+1
+
+        Returns:
+            Statement shapes repeated often enough to be a likely N+1
+        """
+        repeated = stats.repeated_shapes(self.n_plus_one_threshold)
+        for shape, count in repeated:
+            logger.warning("Likely N+1 in %s: %d executions of %s", route, count, shape)
+
+        with self._lock:
+            self._requests += 1
+            self._statements += stats.count
+            self._db_seconds += stats.seconds
+            self._max_statements = max(self._max_statements, stats.count)
+            if repeated:
+                self._n_plus_one_requests += 1
+        return repeated
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Get totals across tracked requests.
+
+        Returns:
+            Dict with requests, statements, db_seconds, avg_statements,
+            max_statements and n_plus_one_requests
+        """
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "statements": self._statements,
+                "db_seconds": self._db_seconds,
+                "avg_statements": self._statements / self._requests if self._requests else 0.0,
+                "max_statements": self._max_statements,
+                "n_plus_one_requests": self._n_plus_one_requests
+            }
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_stats.get() is not None:
+        context._query_tracker_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = getattr(context, "_query_tracker_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+query_tracker = QueryTracker(
+    enabled=settings.QUERY_TRACKING_ENABLED,
+    n_plus_one_threshold=settings.QUERY_N_PLUS_ONE_THRESHOLD
+)
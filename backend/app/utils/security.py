@@ -26,7 +26,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
     """
     Hash a password using bcrypt.
 
@@ -35,6 +35,7 @@ def get_password_hash(password: str) -> str:
 
     Args:
         password: The plain text password to hash
+        rounds: bcrypt cost factor (defaults to settings.BCRYPT_ROUNDS)
 
     Returns:
         The hashed password as a string
@@ -43,13 +44,29 @@ def get_password_hash(password: str) -> str:
     password_bytes = password.encode('utf-8')[:72]
 
     # Generate salt and hash
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
 
     # Return as string
     return hashed.decode('utf-8')
 
 
+def get_password_hash_rounds(hashed_password: str) -> Optional[int]:
+    """
+    Get the bcrypt cost factor a password hash was created with.
+
+    Args:
+        hashed_password: A bcrypt hash ("$2b$<rounds>$<salt+hash>")
+
+    Returns:
+        The cost factor, or None if the hash is not in bcrypt format
+    """
+    parts = hashed_password.split('$')
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -0,0 +1,52 @@
+"""
+SQL expressions and statements that compile differently on PostgreSQL and SQLite.
+"""
+from sqlalchemy import Date
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class date_add_days(FunctionElement):
+    """
+    SQL expression for a date column plus a number of days.
+
+    PostgreSQL adds an integer to a date directly. SQLite stores dates as
+    ISO strings, so it uses the date() function with a day modifier.
+
+    Example:
+        db.query(Workout).update({Workout.scheduled_date: date_add_days(Workout.scheduled_date, 3)})
+    """
+    type = Date()
+    name = "date_add_days"
+    inherit_cache = True
+
+
+@compiles(date_add_days)
+def _compile_date_add_days(element, compiler, **kw):
+    day, days = list(element.clauses)
+    return f"({compiler.process(day, **kw)} + {compiler.process(days, **kw)})"
+
+
+@compiles(date_add_days, "sqlite")
+def _compile_date_add_days_sqlite(element, compiler, **kw):
+    day, days = list(element.clauses)
+    return f"date({compiler.process(day, **kw)}, printf('%+d days', {compiler.process(days, **kw)}))"
+
+
+def upsert(db: Session, model):
+    """
+    Start an INSERT for the session's database that supports ON CONFLICT.
+
+    PostgreSQL and SQLite share the ON CONFLICT ... DO UPDATE syntax but
+    SQLAlchemy builds it from each dialect's own insert().
+
+    Example:
+        stmt = upsert(db, WeeklyLiftRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[...], set_={"tonnage": WeeklyLiftRollup.tonnage + stmt.excluded.tonnage}
+        )
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(model)
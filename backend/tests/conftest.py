@@ -5,8 +5,10 @@ import pytest
 import os
 import uuid
 import tempfile
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 from app.database import Base, get_db
@@ -19,7 +21,10 @@ from app.models import (
 from app.models.program import LiftType, ProgramStatus, TrainingMaxReason
 from app.models.workout import WorkoutStatus, WeekType, SetType, WeightUnit
 from app.models.user import MissedWorkoutPreference
+from app.services.rep_max import RepMaxService
 from app.utils.security import get_password_hash
+from app.utils.auth_cache import auth_cache
+from app.utils.program_cache import program_detail_cache
 
 # Use a temporary file-based SQLite database for tests
 test_db_fd, test_db_path = tempfile.mkstemp(suffix=".db")
@@ -49,6 +54,8 @@ def pytest_unconfigure(config):
 def cleanup_db():
     """Clean up database after each test."""
     yield
+    auth_cache.clear()
+    program_detail_cache.clear()
     # Clear all data but keep tables
     with engine.begin() as conn:
         for table in reversed(Base.metadata.sorted_tables):
@@ -65,6 +72,47 @@ def db():
         db.close()
 
 
+class RecordedStatements(list):
+    """SQL statements run in a block, in order; calls keeps (statement, parameters, executemany) for each."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Record the SQL statements a block runs, failing the test if it runs more than it declares.
+
+    Pass None to only record them.
+
+    Example:
+        with query_budget(4) as statements:
+            client.get("/api/v1/rep-maxes", headers=auth_headers)
+        assert not [s for s in statements if "FROM rep_maxes" in s]
+    """
+    @contextmanager
+    def budget(max_statements: Optional[int]):
+        statements = RecordedStatements()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+            statements.calls.append((statement, parameters, executemany))
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        if max_statements is not None:
+            assert len(statements) <= max_statements, (
+                f"{len(statements)} SQL statements over a budget of {max_statements}:\n" + "\n".join(statements)
+            )
+
+    return budget
+
+
 @pytest.fixture(scope="function")
 def client():
     """Create a test client with database override."""
@@ -159,6 +207,45 @@ def test_program(db, test_user):
     return program
 
 
+TEMPLATE_TRAINING_DAYS = {
+    "2_day": ["monday", "thursday"],
+    "3_day": ["monday", "wednesday", "friday"],
+    "4_day": ["monday", "tuesday", "thursday", "friday"],
+}
+
+
+@pytest.fixture
+def create_program(client):
+    """
+    Create a program through the API and return its response data.
+
+    Example:
+        program = create_program(headers, schedule_mode="VIRTUAL", start_date=date.today() - timedelta(days=10))
+    """
+    def create(headers, template_type="4_day", schedule_mode="MATERIALIZED", start_date=None, accessories=None):
+        training_days = TEMPLATE_TRAINING_DAYS[template_type]
+        if accessories is None:
+            # Accessories are keyed by workout type; only the 2-day template has fewer than four
+            accessories = {str(n): [] for n in range(1, 3 if template_type == "2_day" else 5)}
+        response = client.post(
+            "/api/v1/programs",
+            json={
+                "name": "Test Program",
+                "template_type": template_type,
+                "start_date": (start_date or date.today()).isoformat(),
+                "training_days": training_days,
+                "schedule_mode": schedule_mode,
+                "training_maxes": {"press": 100, "deadlift": 300, "bench_press": 200, "squat": 250},
+                "accessories": accessories
+            },
+            headers=headers
+        )
+        assert response.status_code == 201, response.json()
+        return response.json()
+
+    return create
+
+
 @pytest.fixture
 def test_program_with_training_maxes(db, test_program):
     """Create a program with training maxes for all lifts."""
@@ -424,6 +511,8 @@ def test_rep_max(db, test_user, completed_workout):
         workout_set_id=workout_set.id if workout_set else str(uuid.uuid4())
     )
     db.add(rep_max)
+    db.flush()
+    RepMaxService.rebuild_best_rep_maxes(db, test_user.id)
     db.commit()
     db.refresh(rep_max)
     return rep_max
@@ -479,6 +568,8 @@ def multiple_rep_maxes(db, test_user, completed_workout):
     for rm in rep_maxes:
         db.add(rm)
 
+    db.flush()
+    RepMaxService.rebuild_best_rep_maxes(db, test_user.id)
     db.commit()
     return rep_maxes
 
@@ -1,7 +1,13 @@
 """
 Tests for analytics endpoints.
 """
+import pytest
 from datetime import date
+from sqlalchemy.orm import sessionmaker
+from app.models.analytics import WorkoutSummary, WeeklyLiftRollup
+from app.models.program import LiftType
+from app.models.workout import WorkoutStatus
+from app.services.analytics import AnalyticsService
 
 
 class TestTrainingMaxProgression:
@@ -145,18 +151,19 @@ class TestWorkoutHistory:
     """Tests for GET /api/v1/analytics/programs/{program_id}/workout-history."""
 
     def test_get_workout_history_success(
-        self, client, auth_headers, completed_workout
+        self, client, auth_headers, completed_workout, query_budget
     ):
         """Test getting workout history returns data."""
         program_id = completed_workout.program_id
-        response = client.get(
-            f"/api/v1/analytics/programs/{program_id}/workout-history",
-            headers=auth_headers
-        )
+        with query_budget(6):
+            response = client.get(
+                f"/api/v1/analytics/programs/{program_id}/workout-history",
+                headers=auth_headers
+            )
         assert response.status_code == 200
         data = response.json()
         assert "workouts" in data
-        assert "total" in data
+        assert "next_cursor" in data
 
     def test_get_workout_history_includes_completed(
         self, client, auth_headers, completed_workout
@@ -190,12 +197,108 @@ class TestWorkoutHistory:
         program_id = completed_workout.program_id
         response = client.get(
             f"/api/v1/analytics/programs/{program_id}/workout-history",
-            params={"limit": 5, "offset": 0},
+            params={"limit": 5},
             headers=auth_headers
         )
         assert response.status_code == 200
         data = response.json()
         assert len(data["workouts"]) <= 5
+        assert data["next_cursor"] is None
+
+    def test_get_workout_history_cursor_walks_all_pages(
+        self, client, auth_headers, test_program_with_training_maxes, db
+    ):
+        """Test following next_cursor returns every workout once, newest first."""
+        from app.models import Workout, WorkoutMainLift
+        from app.models.program import LiftType
+        from app.models.workout import WorkoutStatus, WeekType
+        from datetime import datetime, timedelta
+        import uuid
+
+        program_id = test_program_with_training_maxes.id
+        completed_at = datetime(2026, 1, 5, 18, 0)
+        for i in range(5):
+            workout = Workout(
+                id=str(uuid.uuid4()),
+                program_id=program_id,
+                scheduled_date=completed_at.date() + timedelta(days=i),
+                # Two workouts share a timestamp so the id tie-breaker is exercised
+                completed_date=completed_at + timedelta(days=min(i, 3)),
+                cycle_number=1,
+                week_number=1,
+                week_type=WeekType.WEEK_1_5S,
+                status=WorkoutStatus.COMPLETED
+            )
+            db.add(workout)
+            db.add(WorkoutMainLift(
+                id=str(uuid.uuid4()),
+                workout_id=workout.id,
+                lift_type=LiftType.SQUAT,
+                lift_order=1,
+                current_training_max=250.0,
+                week_type=WeekType.WEEK_1_5S
+            ))
+        db.commit()
+
+        seen = []
+        cursor = None
+        for _ in range(5):
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            data = client.get(
+                f"/api/v1/analytics/programs/{program_id}/workout-history",
+                params=params,
+                headers=auth_headers
+            ).json()
+            seen.extend(item["id"] for item in data["workouts"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+        dates = [
+            db.query(Workout).filter(Workout.id == workout_id).one().completed_date
+            for workout_id in seen
+        ]
+        assert dates == sorted(dates, reverse=True)
+
+    def test_get_workout_history_invalid_cursor(
+        self, client, auth_headers, completed_workout
+    ):
+        """Test a malformed cursor is rejected."""
+        response = client.get(
+            f"/api/v1/analytics/programs/{completed_workout.program_id}/workout-history",
+            params={"cursor": "not-a-cursor"},
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    def test_get_workout_history_multi_lift_stats_per_lift(
+        self, client, auth_headers, multi_lift_workout
+    ):
+        """Test each lift of a 2-lift workout reports its own AMRAP set."""
+        sets_data = [
+            {"set_type": "amrap", "set_number": 3, "exercise_id": "squat", "lift_type": "SQUAT", "actual_reps": 8, "actual_weight": 215},
+            {"set_type": "amrap", "set_number": 3, "exercise_id": "bench", "lift_type": "BENCH_PRESS", "actual_reps": 6, "actual_weight": 170},
+        ]
+        response = client.post(
+            f"/api/v1/workouts/{multi_lift_workout.id}/complete",
+            json={"sets": sets_data},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        data = client.get(
+            f"/api/v1/analytics/programs/{multi_lift_workout.program_id}/workout-history",
+            headers=auth_headers
+        ).json()
+        stats = {item["lift"]: item["key_stats"] for item in data["workouts"]}
+        assert stats["SQUAT"]["amrap_weight"] == 215.0
+        assert stats["SQUAT"]["amrap_reps"] == 8
+        assert stats["BENCH_PRESS"]["amrap_weight"] == 170.0
+        assert stats["BENCH_PRESS"]["amrap_reps"] == 6
 
     def test_get_workout_history_program_not_found(self, client, auth_headers):
         """Test getting workout history for non-existent program."""
@@ -214,3 +317,204 @@ class TestWorkoutHistory:
             f"/api/v1/analytics/programs/{program_id}/workout-history"
         )
         assert response.status_code == 403
+
+
+class TestWorkoutSummaries:
+    """Tests for the precomputed workout summary read model."""
+
+    def test_completion_writes_summary(
+        self, client, auth_headers, db, scheduled_workout, query_budget
+    ):
+        """Test completing a workout stores its tonnage, AMRAP and failed sets."""
+        sets_data = [
+            {"set_type": "warmup", "set_number": 1, "exercise_id": "squat", "actual_reps": 5, "actual_weight": 100},
+            {"set_type": "working", "set_number": 1, "exercise_id": "squat", "actual_reps": 5, "actual_weight": 165},
+            {"set_type": "working", "set_number": 2, "exercise_id": "squat", "actual_reps": 3, "actual_weight": 190},
+            {"set_type": "amrap", "set_number": 3, "exercise_id": "squat", "actual_reps": 8, "actual_weight": 215},
+        ]
+        with query_budget(20):
+            response = client.post(
+                f"/api/v1/workouts/{scheduled_workout.id}/complete",
+                json={"sets": sets_data},
+                headers=auth_headers
+            )
+        assert response.status_code == 200
+
+        summary = db.query(WorkoutSummary).filter(
+            WorkoutSummary.workout_id == scheduled_workout.id
+        ).one()
+        assert summary.total_tonnage == 500 + 825 + 570 + 1720
+        assert summary.failed_set_count == 1
+        squat = summary.lift_stats["SQUAT"]
+        assert squat["top_set_weight"] == 215
+        assert squat["amrap_reps"] == 8
+        assert squat["failed_sets"] == 1
+
+        # Listing workouts includes the summary for completed workouts
+        workouts = client.get("/api/v1/workouts", headers=auth_headers).json()
+        assert workouts[0]["summary"]["total_tonnage"] == summary.total_tonnage
+
+    def test_backfill_summarizes_existing_workouts(
+        self, client, auth_headers, db, completed_workout
+    ):
+        """Test workouts completed before summaries existed are backfilled once."""
+        assert AnalyticsService.backfill_workout_summaries(db) == 1
+        assert AnalyticsService.backfill_workout_summaries(db) == 0
+
+        summary = db.query(WorkoutSummary).filter(
+            WorkoutSummary.workout_id == completed_workout.id
+        ).one()
+        assert summary.lift_stats["SQUAT"]["amrap_reps"] == 8
+        assert summary.failed_set_count == 0
+
+        data = client.get(
+            f"/api/v1/analytics/programs/{completed_workout.program_id}/workout-history",
+            headers=auth_headers
+        ).json()
+        assert data["workouts"][0]["key_stats"]["amrap_weight"] == 215.0
+
+
+class TestWeeklyLiftRollups:
+    """Tests for the weekly rollup analytics endpoints."""
+
+    def _complete(self, client, auth_headers, workout_id):
+        sets_data = [
+            {"set_type": "warmup", "set_number": 1, "exercise_id": "squat", "actual_reps": 5, "actual_weight": 100},
+            {"set_type": "working", "set_number": 1, "exercise_id": "squat", "actual_reps": 5, "actual_weight": 165},
+            {"set_type": "working", "set_number": 2, "exercise_id": "squat", "actual_reps": 3, "actual_weight": 190},
+            {"set_type": "amrap", "set_number": 3, "exercise_id": "squat", "actual_reps": 8, "actual_weight": 215},
+        ]
+        response = client.post(
+            f"/api/v1/workouts/{workout_id}/complete",
+            json={"sets": sets_data, "completed_date": "2026-01-07T18:00:00"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+
+    def test_completion_updates_volume_and_tonnage(
+        self, client, auth_headers, scheduled_workout
+    ):
+        """Test a completed workout lands in its ISO week's rollup."""
+        self._complete(client, auth_headers, scheduled_workout.id)
+
+        volume = client.get("/api/v1/analytics/volume", headers=auth_headers).json()
+        assert volume["weeks"] == [{
+            "week_start": "2026-01-05",
+            "iso_week": "2026-W02",
+            "set_count": 4,
+            "total_reps": 21,
+            "tonnage": 500 + 825 + 570 + 1720
+        }]
+
+        tonnage = client.get("/api/v1/analytics/tonnage-by-lift", headers=auth_headers).json()
+        assert len(tonnage["lifts"]) == 1
+        assert tonnage["lifts"][0]["lift_type"] == "SQUAT"
+        assert tonnage["lifts"][0]["best_e1rm"] == pytest.approx(215 * (1 + 8 / 30))
+        assert tonnage["total_tonnage"] == 3615
+
+        later = client.get(
+            "/api/v1/analytics/volume",
+            params={"start_date": "2026-01-12"},
+            headers=auth_headers
+        ).json()
+        assert later["weeks"] == []
+
+    def test_consistency_counts_completed_and_skipped(
+        self, client, auth_headers, scheduled_workout, scheduled_workout_week3
+    ):
+        """Test completed and skipped sessions feed the consistency rate."""
+        self._complete(client, auth_headers, scheduled_workout.id)
+        response = client.post(
+            f"/api/v1/workouts/{scheduled_workout_week3.id}/skip",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        data = client.get("/api/v1/analytics/consistency", headers=auth_headers).json()
+        assert data["sessions_completed"] == 1
+        assert data["sessions_skipped"] == 1
+        assert data["completion_rate"] == 0.5
+
+    def test_rebuild_matches_incremental_rollups(
+        self, client, auth_headers, db, test_user, scheduled_workout, scheduled_workout_week3
+    ):
+        """Test replaying history reproduces the incrementally maintained rollups."""
+        self._complete(client, auth_headers, scheduled_workout.id)
+        client.post(f"/api/v1/workouts/{scheduled_workout_week3.id}/skip", headers=auth_headers)
+
+        def snapshot():
+            db.expire_all()
+            return sorted(
+                (r.lift_type, r.week_start, r.sessions_completed, r.sessions_skipped,
+                 r.set_count, r.total_reps, r.tonnage, r.best_e1rm, r.failed_targets)
+                for r in db.query(WeeklyLiftRollup).filter(WeeklyLiftRollup.user_id == test_user.id)
+            )
+
+        incremental = snapshot()
+        assert AnalyticsService.rebuild_lift_rollups(db, test_user.id) == 2
+        assert snapshot() == incremental
+
+    def test_completing_skipped_workout_matches_rebuild(
+        self, client, auth_headers, db, test_user, scheduled_workout, scheduled_workout_week3
+    ):
+        """Test a skip followed by a completion leaves the rollups a rebuild produces."""
+        self._complete(client, auth_headers, scheduled_workout.id)
+        response = client.post(f"/api/v1/workouts/{scheduled_workout_week3.id}/skip", headers=auth_headers)
+        assert response.status_code == 200
+        self._complete(client, auth_headers, scheduled_workout_week3.id)
+
+        def snapshot():
+            db.expire_all()
+            return sorted(
+                (r.lift_type, r.week_start, r.sessions_completed, r.sessions_skipped,
+                 r.set_count, r.total_reps, r.tonnage, r.best_e1rm, r.failed_targets)
+                for r in db.query(WeeklyLiftRollup).filter(WeeklyLiftRollup.user_id == test_user.id)
+            )
+
+        incremental = snapshot()
+        assert [(row[2], row[3]) for row in incremental] == [(2, 0)]
+        assert AnalyticsService.rebuild_lift_rollups(db, test_user.id) == 1
+        assert snapshot() == incremental
+
+    def test_completing_skip_without_rollup_row(
+        self, client, auth_headers, db, test_user, scheduled_workout_week3
+    ):
+        """Test a workout skipped before rollups were built leaves no negative skip count."""
+        scheduled_workout_week3.status = WorkoutStatus.SKIPPED
+        db.commit()
+
+        self._complete(client, auth_headers, scheduled_workout_week3.id)
+
+        db.expire_all()
+        rows = [
+            (r.lift_type, r.week_start, r.sessions_completed, r.sessions_skipped)
+            for r in db.query(WeeklyLiftRollup).filter(WeeklyLiftRollup.user_id == test_user.id)
+        ]
+        assert rows == [(LiftType.SQUAT, date(2026, 1, 5), 1, 0)]
+
+    def test_rollup_deltas_add_to_rows_written_by_other_sessions(self, db, test_user):
+        """Test deltas are added to the stored row in SQL rather than to a value read earlier."""
+        week = date(2026, 1, 5)
+        first = {**AnalyticsService._empty_rollup_totals(), "sessions_completed": 1, "set_count": 4,
+                 "total_reps": 21, "tonnage": 3615.0, "best_e1rm": 272.3}
+        second = {**AnalyticsService._empty_rollup_totals(), "sessions_completed": 1, "set_count": 2,
+                  "total_reps": 10, "tonnage": 1000.0, "failed_targets": 1}
+
+        other = sessionmaker(bind=db.get_bind())()
+        try:
+            AnalyticsService._apply_rollup_deltas_bulk(other, {(test_user.id, week): {LiftType.SQUAT: first}})
+            other.commit()
+        finally:
+            other.close()
+        AnalyticsService._apply_rollup_deltas_bulk(db, {(test_user.id, week): {LiftType.SQUAT: second}})
+        db.commit()
+
+        rollup = db.query(WeeklyLiftRollup).filter(WeeklyLiftRollup.user_id == test_user.id).one()
+        assert (rollup.sessions_completed, rollup.set_count, rollup.total_reps) == (2, 6, 31)
+        assert (rollup.tonnage, rollup.failed_targets) == (4615.0, 1)
+        assert rollup.best_e1rm == 272.3
+
+    def test_rollup_endpoints_unauthorized(self, client):
+        """Test rollup analytics require authentication."""
+        for path in ["volume", "tonnage-by-lift", "consistency"]:
+            assert client.get(f"/api/v1/analytics/{path}").status_code == 403
@@ -0,0 +1,34 @@
+"""
+Tests for application-wide wiring.
+"""
+import inspect
+from fastapi.routing import APIRoute
+from app.database import get_db
+from app.main import app
+
+# These await the password worker pool and run their queries via run_in_threadpool
+ASYNC_DB_ROUTES = {"/api/v1/auth/register", "/api/v1/auth/login"}
+
+
+def _uses_db(dependant) -> bool:
+    """Check whether a route or any of its sub-dependencies needs a DB session."""
+    return any(
+        dep.call is get_db or _uses_db(dep)
+        for dep in dependant.dependencies
+    )
+
+
+class TestEndpointDispatch:
+    """Endpoints using the sync DB session must not run on the event loop."""
+
+    def test_db_endpoints_are_sync(self):
+        """Test every DB-backed endpoint is a plain function run on the threadpool."""
+        async_db_routes = [
+            route.path
+            for route in app.routes
+            if isinstance(route, APIRoute)
+            and _uses_db(route.dependant)
+            and inspect.iscoroutinefunction(route.endpoint)
+            and route.path not in ASYNC_DB_ROUTES
+        ]
+        assert async_db_routes == []
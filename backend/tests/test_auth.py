@@ -1,7 +1,17 @@
 """
 Tests for authentication endpoints.
 """
-from fastapi import status
+import os
+import time
+import pytest
+from fastapi import HTTPException, status
+from app.schemas.auth import UserLoginRequest
+from app.services.auth import AuthService
+from app.utils.auth_cache import (
+    auth_cache, AuthCache, CachedAuth, FileInvalidationChannel, LocalInvalidationChannel
+)
+from app.utils.password_hasher import PasswordHasher, password_hasher
+from app.utils.security import get_password_hash, get_password_hash_rounds, verify_password
 
 
 class TestUserRegistration:
@@ -373,3 +383,150 @@ class TestAuthenticatedEndpoints:
         assert data["weight_unit_preference"].upper() == "KG"
         assert data["rounding_increment"] == 2.5
         assert data["missed_workout_preference"].upper() == "RESCHEDULE"
+
+
+class TestCurrentUserCache:
+    """Tests for the cached token -> user resolution."""
+
+    def test_repeat_requests_use_cached_user(self, client, auth_headers, db, test_user):
+        """Test a cached token is served without re-reading the user."""
+        assert client.get("/api/v1/users/me", headers=auth_headers).status_code == 200
+
+        # A change that bypasses the API is not seen until the entry is invalidated
+        test_user.first_name = "Changed"
+        db.commit()
+        response = client.get("/api/v1/users/me", headers=auth_headers)
+        assert response.json()["first_name"] == "Test"
+
+        auth_cache.invalidate_user(test_user.id)
+        response = client.get("/api/v1/users/me", headers=auth_headers)
+        assert response.json()["first_name"] == "Changed"
+
+    def test_profile_update_invalidates_cache(self, client, auth_headers):
+        """Test updating the profile through the API is visible on the next request."""
+        client.get("/api/v1/users/me", headers=auth_headers)
+
+        response = client.put(
+            "/api/v1/users/me",
+            json={"first_name": "Updated", "rounding_increment": 2.5},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        data = client.get("/api/v1/users/me", headers=auth_headers).json()
+        assert data["first_name"] == "Updated"
+        assert data["rounding_increment"] == 2.5
+
+    def test_file_channel_invalidates_other_workers(self, tmp_path):
+        """Test an invalidation published by one worker evicts another worker's entry."""
+        worker_a = AuthCache(60, 10, FileInvalidationChannel(str(tmp_path)))
+        worker_b = AuthCache(60, 10, FileInvalidationChannel(str(tmp_path)))
+        auth = CachedAuth(payload={"sub": "user-1"}, user={"id": "user-1"})
+
+        worker_b.put("token", auth, time.time() - 1)
+        assert worker_b.get("token") == auth
+
+        worker_a.invalidate_user("user-1")
+        assert worker_b.get("token") is None
+
+    def test_file_channel_compares_published_time(self, tmp_path):
+        """Test the file channel uses the time written by publish, not the marker's mtime."""
+        channel = FileInvalidationChannel(str(tmp_path))
+        before = time.time()
+        channel.publish("user-1")
+        after = time.time()
+
+        # A filesystem with coarse or skewed timestamps must not hide the change
+        os.utime(channel._path("user-1"), (0, 0))
+        assert channel.invalidated_since("user-1", before - 0.001)
+        assert not channel.invalidated_since("user-1", after)
+        assert not channel.invalidated_since("user-2", 0)
+
+    def test_cache_is_bounded_and_expires(self):
+        """Test least recently used entries are evicted and expired entries dropped."""
+        cache = AuthCache(60, 2, LocalInvalidationChannel())
+        now = time.time()
+        for token in ["a", "b", "c"]:
+            cache.put(token, CachedAuth(payload={}, user={"id": token}), now)
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+        cache.put("expired", CachedAuth(payload={"exp": now - 1}, user={"id": "x"}), now)
+        assert cache.get("expired") is None
+
+
+class TestPasswordHashing:
+    """Tests for the bcrypt worker pool and rehash-on-login."""
+
+    def test_login_rehashes_at_configured_cost(self, client, db, test_user):
+        """Test a hash made at an old cost factor is upgraded on login."""
+        test_user.password_hash = get_password_hash("TestPassword123!", rounds=4)
+        db.commit()
+
+        response = client.post("/api/v1/auth/login", json={
+            "email": "testuser@example.com",
+            "password": "TestPassword123!"
+        })
+        assert response.status_code == 200
+
+        db.refresh(test_user)
+        assert get_password_hash_rounds(test_user.password_hash) == password_hasher.rounds
+        assert verify_password("TestPassword123!", test_user.password_hash)
+
+    async def test_rehash_login_runs_no_queries_on_event_loop(self, db, test_user, monkeypatch, query_budget):
+        """Test the rehash path returns the user's details without lazy-loading them on the event loop."""
+        test_user.password_hash = get_password_hash("TestPassword123!", rounds=4)
+        db.commit()
+
+        # Everything else runs in the threadpool; building the response must not query
+        token_response = AuthService._token_response
+
+        def token_response_without_queries(user):
+            with query_budget(0):
+                return token_response(user)
+
+        monkeypatch.setattr(AuthService, "_token_response", staticmethod(token_response_without_queries))
+        response = await AuthService.login_user(
+            db, UserLoginRequest(email="testuser@example.com", password="TestPassword123!")
+        )
+
+        assert response.user_id == test_user.id
+        assert response.first_name == "Test"
+        assert response.last_name == "User"
+        assert response.email == "testuser@example.com"
+        assert get_password_hash_rounds(test_user.password_hash) == password_hasher.rounds
+
+    def test_failed_login_keeps_hash(self, client, db, test_user):
+        """Test a wrong password never triggers a rehash."""
+        old_hash = get_password_hash("TestPassword123!", rounds=4)
+        test_user.password_hash = old_hash
+        db.commit()
+
+        response = client.post("/api/v1/auth/login", json={
+            "email": "testuser@example.com",
+            "password": "WrongPassword123!"
+        })
+        assert response.status_code == 401
+
+        db.refresh(test_user)
+        assert test_user.password_hash == old_hash
+
+    async def test_pool_records_metrics(self):
+        """Test completed work and wait times are tracked."""
+        hasher = PasswordHasher(workers=1, max_queue=10, rounds=4)
+        hashed = await hasher.hash("Secret123")
+        assert await hasher.verify("Secret123", hashed)
+        assert not hasher.needs_rehash(hashed)
+
+        metrics = hasher.metrics()
+        assert metrics["completed"] == 2
+        assert metrics["queued"] == 0
+        assert metrics["running"] == 0
+
+    async def test_pool_rejects_when_queue_full(self):
+        """Test requests beyond the queue limit get 503 instead of waiting."""
+        hasher = PasswordHasher(workers=1, max_queue=0, rounds=4)
+        with pytest.raises(HTTPException) as exc_info:
+            await hasher.hash("Secret123")
+        assert exc_info.value.status_code == 503
+        assert hasher.metrics()["rejected"] == 1
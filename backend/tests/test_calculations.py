@@ -1,6 +1,7 @@
 """
 Unit tests for calculation utilities.
 """
+import time
 import pytest
 from app.utils.calculations import (
     calculate_1rm,
@@ -11,6 +12,26 @@ from app.utils.calculations import (
     calculate_plates,
     format_plate_display
 )
+from app.utils import prescriptions
+from app.utils.plates import (
+    DEFAULT_PLATE_INVENTORY,
+    MAX_LOAD_PER_SIDE,
+    PlateInventory,
+    PlateSolver,
+    get_plate_solver,
+    get_rounding_grid,
+    plan_plate_changes
+)
+from app.utils.prescriptions import prescribe_working_weights, prescribe_warmup_weights
+
+
+def _prescription_rows(count):
+    """Build (training_max, week, increment) rows covering every week and increment."""
+    increments = [2.5, 5.0, 10.0]
+    return [
+        (100 + i * 7.5, i % 4 + 1, increments[i % len(increments)])
+        for i in range(count)
+    ]
 
 
 class TestCalculate1RM:
@@ -228,6 +249,114 @@ class TestCalculatePlates:
         plates = calculate_plates(50, bar_weight=45)
         assert plates == [2.5]
 
+    def test_non_greedy_inventory(self):
+        """Test an inventory where largest-plate-first cannot build the target."""
+        # 165 lbs = 60 per side; greedy takes 45 and is stuck, exact is 35 + 25
+        plates = calculate_plates(165, bar_weight=45, available_plates=[45, 35, 25])
+        assert plates == [35, 25]
+
+    def test_no_float_drift(self):
+        """Test many small plates sum exactly."""
+        plates = calculate_plates(45 + 2 * 0.75, bar_weight=45, available_plates=[0.25])
+        assert plates == [0.25, 0.25, 0.25]
+
+
+class TestPlateSolver:
+    """Tests for the exact plate-loading solver."""
+
+    def test_minimizes_plate_count(self):
+        """Test the solver uses the fewest plates."""
+        inventory = PlateInventory(bar_weight=20.0, plates=((25, None), (20, None), (5, None)))
+        # 40 per side: 20 + 20 beats 25 + 5 + 5 + 5
+        load = get_plate_solver(inventory).solve(100)
+        assert load.plates == [20, 20]
+        assert load.exact
+
+    def test_respects_plate_counts(self):
+        """Test the solver never uses more pairs than the inventory has."""
+        inventory = PlateInventory(bar_weight=45.0, plates=((45, 2), (10, 3)))
+        load = get_plate_solver(inventory).solve(325)
+        # 140 per side needs a third pair of 45s; the most the bar takes is 120 per side
+        assert load.plates == [45, 45, 10, 10, 10]
+        assert load.total_weight == 285
+        assert not load.exact
+
+    def test_nearest_loadable_weight(self):
+        """Test an unbuildable target reports the nearest loadable weight."""
+        inventory = PlateInventory(bar_weight=45.0, plates=((10, None),))
+        solver = get_plate_solver(inventory)
+
+        assert solver.solve(72).total_weight == 65
+        assert solver.solve(79).total_weight == 85
+        # Ties go to the lighter weight
+        assert solver.solve(75).total_weight == 65
+
+    def test_below_bar(self):
+        """Test a target below the bar loads nothing."""
+        load = get_plate_solver().solve(30)
+        assert load.plates == []
+        assert load.total_weight == 45
+        assert not load.exact
+
+    def test_loadable_weights(self):
+        """Test the table lists every buildable total."""
+        inventory = PlateInventory(bar_weight=20.0, plates=((20, 1), (10, 1)))
+        assert get_plate_solver(inventory).loadable_weights == [20, 40, 60, 80]
+
+    def test_solver_is_memoized_per_inventory(self):
+        """Test the table is built once per inventory."""
+        inventory = PlateInventory(bar_weight=15.0, plates=((25, None), (2.5, 4)))
+        assert get_plate_solver(inventory) is get_plate_solver(inventory)
+
+    def test_large_counted_inventory_is_capped(self):
+        """Test a large counted inventory compiles only up to MAX_LOAD_PER_SIDE."""
+        inventory = PlateInventory(bar_weight=45.0, plates=((100, 50), (0.01, 1)))
+        started = time.perf_counter()
+        solver = PlateSolver(inventory)
+        assert time.perf_counter() - started < 5
+
+        assert len(solver.loadable_weights) <= MAX_LOAD_PER_SIDE * 100 + 1
+        assert solver.solve(45 + 2 * 400).plates == [100, 100, 100, 100]
+        assert solver.solve(10_000).total_weight == 45 + 2 * MAX_LOAD_PER_SIDE
+
+    def test_rejects_unsupported_plate(self):
+        """Test plates finer than the weight resolution are rejected."""
+        with pytest.raises(ValueError):
+            PlateSolver(PlateInventory(bar_weight=45.0, plates=((0.125, None),)))
+
+
+class TestPlanPlateChanges:
+    """Tests for whole-session plate-change planning."""
+
+    def test_keeps_plates_on_to_save_changes(self):
+        """Test the plan builds on the previous loading instead of reloading."""
+        # Set by set: 165 = 35 + 25, then 185 = 45 + 25 swaps both plates (4 changes)
+        plan = plan_plate_changes(DEFAULT_PLATE_INVENTORY, (165.0, 185.0))
+        assert plan.steps[1].load.plates == [35, 25, 10]
+        assert plan.steps[1].removed == []
+        assert plan.steps[1].added == [10]
+        assert plan.total_changes == 3
+
+    def test_unloadable_target_uses_nearest(self):
+        """Test targets the plates cannot make load the nearest weight."""
+        inventory = PlateInventory(bar_weight=45.0, plates=((45, None), (10, None)))
+        plan = plan_plate_changes(inventory, (137.0,))
+        assert plan.steps[0].load.total_weight == 135
+        assert not plan.steps[0].load.exact
+
+    def test_empty_sequence(self):
+        """Test an empty session needs no changes."""
+        plan = plan_plate_changes(DEFAULT_PLATE_INVENTORY, ())
+        assert plan.steps == []
+        assert plan.total_changes == 0
+
+    def test_plan_is_memoized(self):
+        """Test the same inventory and weights reuse the cached plan."""
+        weights = (95.0, 135.0, 185.0)
+        assert plan_plate_changes(DEFAULT_PLATE_INVENTORY, weights) is plan_plate_changes(
+            DEFAULT_PLATE_INVENTORY, weights
+        )
+
 
 class TestFormatPlateDisplay:
     """Tests for plate display formatting."""
@@ -256,3 +385,62 @@ class TestFormatPlateDisplay:
         """Test formatting many plates."""
         result = format_plate_display([45, 45, 25, 10, 5])
         assert result == "45 + 45 + 25 + 10 + 5 per side"
+
+
+class TestPrescriptionEngine:
+    """Tests for the batched prescription engine."""
+
+    def _assert_matches_scalar(self, rows):
+        maxes = [tm for tm, _, _ in rows]
+        weeks = [week for _, week, _ in rows]
+        increments = [inc for _, _, inc in rows]
+
+        working = prescribe_working_weights(maxes, weeks, increments)
+        warmups = prescribe_warmup_weights(maxes, increments)
+
+        for (tm, week, inc), working_row, warmup_row in zip(rows, working, warmups):
+            assert working_row == [calculate_working_weight(tm, week, s, inc) for s in (1, 2, 3)]
+            assert warmup_row == [w["weight"] for w in calculate_warmup_weights(tm, inc)]
+
+    def test_small_batch_matches_scalar(self):
+        """Test a small batch matches the per-set functions."""
+        self._assert_matches_scalar(_prescription_rows(12))
+
+    def test_large_batch_matches_scalar(self, monkeypatch):
+        """Test a large batch matches the per-set functions on the pure-Python path."""
+        monkeypatch.setattr(prescriptions, "np", None)
+        self._assert_matches_scalar(_prescription_rows(prescriptions.NUMPY_MIN_BATCH * 2))
+
+    def test_numpy_batch_matches_scalar(self):
+        """Test a large batch matches the per-set functions on the NumPy path."""
+        pytest.importorskip("numpy")
+        self._assert_matches_scalar(_prescription_rows(prescriptions.NUMPY_MIN_BATCH * 2))
+
+    def test_grid_matches_scalar(self, monkeypatch):
+        """Test rounding to an equipment grid matches the per-set functions."""
+        monkeypatch.setattr(prescriptions, "np", None)
+        grid = get_rounding_grid(PlateInventory(bar_weight=35.0, plates=((45, None), (10, 2), (2.5, 1))))
+        rows = _prescription_rows(prescriptions.NUMPY_MIN_BATCH * 2)
+        maxes = [tm for tm, _, _ in rows]
+        weeks = [week for _, week, _ in rows]
+        increments = [inc for _, _, inc in rows]
+
+        working = prescribe_working_weights(maxes, weeks, increments, grid=grid)
+        warmups = prescribe_warmup_weights(maxes, increments, grid=grid)
+
+        for (tm, week, inc), working_row, warmup_row in zip(rows, working, warmups):
+            assert working_row == [calculate_working_weight(tm, week, s, inc, grid) for s in (1, 2, 3)]
+            assert warmup_row == [w["weight"] for w in calculate_warmup_weights(tm, inc, grid=grid)]
+            assert warmup_row[0] == 35
+
+    def test_empty_batch(self):
+        """Test an empty batch returns no rows."""
+        assert prescribe_working_weights([], [], []) == []
+        assert prescribe_warmup_weights([], []) == []
+
+    def test_mismatched_lengths(self):
+        """Test inputs of different lengths are rejected."""
+        with pytest.raises(ValueError):
+            prescribe_working_weights([300, 200], [1], [5, 5])
+        with pytest.raises(ValueError):
+            prescribe_warmup_weights([300], [5, 5])
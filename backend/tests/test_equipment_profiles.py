@@ -0,0 +1,190 @@
+"""
+Tests for equipment profile endpoints and profile-based rounding.
+"""
+from app.utils.plates import PlateInventory, get_rounding_grid
+
+
+# 35 lb bar with no change plates below 5 lb: loadable totals step by 10 lb
+WOMENS_BAR_PROFILE = {
+    "name": "Garage",
+    "weight_unit": "LBS",
+    "bar_weight": 35,
+    "is_default": True,
+    "plates": [
+        {"weight": 45, "pairs": 4},
+        {"weight": 25, "pairs": 2},
+        {"weight": 10, "pairs": 2},
+        {"weight": 5, "pairs": 2}
+    ],
+    "microplates": []
+}
+
+
+class TestEquipmentProfileCrud:
+    """Tests for /api/v1/equipment-profiles endpoints."""
+
+    def test_list_equipment_profiles_empty(self, client, auth_headers):
+        """Test listing profiles when the user has none."""
+        response = client.get("/api/v1/equipment-profiles", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_create_equipment_profile(self, client, auth_headers):
+        """Test creating a profile stores plates and microplates."""
+        profile = {**WOMENS_BAR_PROFILE, "microplates": [{"weight": 1.25, "pairs": 1}]}
+        response = client.post("/api/v1/equipment-profiles", json=profile, headers=auth_headers)
+        assert response.status_code == 201
+        data = response.json()
+        assert data["bar_weight"] == 35
+        assert data["is_default"] is True
+        assert data["plates"][0] == {"weight": 45, "pairs": 4}
+        assert data["microplates"] == [{"weight": 1.25, "pairs": 1}]
+
+    def test_only_one_default_profile(self, client, auth_headers):
+        """Test creating a new default profile unsets the previous one."""
+        first = client.post(
+            "/api/v1/equipment-profiles", json=WOMENS_BAR_PROFILE, headers=auth_headers
+        ).json()
+        second = client.post(
+            "/api/v1/equipment-profiles",
+            json={**WOMENS_BAR_PROFILE, "name": "Commercial gym", "bar_weight": 45},
+            headers=auth_headers
+        ).json()
+
+        profiles = client.get("/api/v1/equipment-profiles", headers=auth_headers).json()
+        assert [p["id"] for p in profiles] == [second["id"], first["id"]]
+        assert [p["is_default"] for p in profiles] == [True, False]
+
+    def test_update_and_delete_equipment_profile(self, client, auth_headers):
+        """Test replacing and deleting a profile."""
+        created = client.post(
+            "/api/v1/equipment-profiles", json=WOMENS_BAR_PROFILE, headers=auth_headers
+        ).json()
+
+        response = client.put(
+            f"/api/v1/equipment-profiles/{created['id']}",
+            json={**WOMENS_BAR_PROFILE, "name": "Garage (new bar)", "bar_weight": 33},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["bar_weight"] == 33
+
+        response = client.delete(f"/api/v1/equipment-profiles/{created['id']}", headers=auth_headers)
+        assert response.status_code == 204
+        response = client.get(f"/api/v1/equipment-profiles/{created['id']}", headers=auth_headers)
+        assert response.status_code == 404
+
+    def test_other_users_profile_not_found(self, client, auth_headers, second_user):
+        """Test a profile is only visible to its owner."""
+        created = client.post(
+            "/api/v1/equipment-profiles", json=WOMENS_BAR_PROFILE, headers=auth_headers
+        ).json()
+        login = client.post(
+            "/api/v1/auth/login",
+            json={"email": second_user.email, "password": "OtherPassword123!"}
+        )
+        other_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        response = client.get(f"/api/v1/equipment-profiles/{created['id']}", headers=other_headers)
+        assert response.status_code == 404
+
+    def test_create_equipment_profile_invalid_plates(self, client, auth_headers):
+        """Test duplicate plates, heavy microplates and too many plate sizes are rejected."""
+        duplicate = {**WOMENS_BAR_PROFILE, "plates": [{"weight": 45}, {"weight": 45, "pairs": 2}]}
+        response = client.post("/api/v1/equipment-profiles", json=duplicate, headers=auth_headers)
+        assert response.status_code == 422
+
+        heavy_micro = {**WOMENS_BAR_PROFILE, "microplates": [{"weight": 5, "pairs": 1}]}
+        response = client.post("/api/v1/equipment-profiles", json=heavy_micro, headers=auth_headers)
+        assert response.status_code == 422
+
+        too_many = {**WOMENS_BAR_PROFILE, "plates": [{"weight": n + 1, "pairs": 1} for n in range(21)]}
+        response = client.post("/api/v1/equipment-profiles", json=too_many, headers=auth_headers)
+        assert response.status_code == 422
+
+        too_many_micro = {
+            **WOMENS_BAR_PROFILE, "microplates": [{"weight": (n + 1) / 10, "pairs": 1} for n in range(21)]
+        }
+        response = client.post("/api/v1/equipment-profiles", json=too_many_micro, headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_equipment_profiles_unauthorized(self, client):
+        """Test profiles require authentication."""
+        response = client.get("/api/v1/equipment-profiles")
+        assert response.status_code in [401, 403]
+
+
+class TestProfileRounding:
+    """Tests for prescriptions rounded to the default profile's grid."""
+
+    def test_rounding_grid_binary_search(self):
+        """Test the grid rounds to the nearest loadable weight, lighter on ties."""
+        grid = get_rounding_grid(PlateInventory(bar_weight=35.0, plates=((45, 4), (5, 1))))
+        assert grid.weights[:3] == (35, 45, 125)
+        assert grid.round(20) == 35
+        assert grid.round(84) == 45
+        assert grid.round(85) == 45
+        assert grid.round(86) == 125
+        assert grid.round(10_000) == grid.weights[-1]
+
+    def test_workout_detail_uses_profile(self, client, auth_headers, scheduled_workout):
+        """Test prescribed weights snap to what the profile can load."""
+        client.post("/api/v1/equipment-profiles", json=WOMENS_BAR_PROFILE, headers=auth_headers)
+
+        data = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}", headers=auth_headers
+        ).json()
+        lift_sets = data["sets_by_lift"]["SQUAT"]
+
+        # TM 250, week 1: 162.5 / 187.5 / 212.5 -> nearest 35 + 10n
+        assert [s["prescribed_weight"] for s in lift_sets["main_sets"]] == [165, 185, 215]
+        # Empty bar, then 100 / 125 / 150 -> ties go lighter
+        assert [s["prescribed_weight"] for s in lift_sets["warmup_sets"]] == [35, 95, 125, 145]
+
+    def test_profile_in_other_unit_is_ignored(self, client, auth_headers, scheduled_workout):
+        """Test a kilogram profile does not round a pounds user's prescriptions."""
+        client.post(
+            "/api/v1/equipment-profiles",
+            json={**WOMENS_BAR_PROFILE, "weight_unit": "KG", "bar_weight": 15},
+            headers=auth_headers
+        )
+
+        data = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}", headers=auth_headers
+        ).json()
+        main_sets = data["sets_by_lift"]["SQUAT"]["main_sets"]
+        assert [s["prescribed_weight"] for s in main_sets] == [160, 190, 210]
+
+    def test_completion_uses_profile(self, client, auth_headers, scheduled_workout):
+        """Test logged sets record the profile-rounded prescription."""
+        client.post("/api/v1/equipment-profiles", json=WOMENS_BAR_PROFILE, headers=auth_headers)
+
+        sets_data = [
+            {"set_type": "warmup", "set_number": 2, "exercise_id": "squat", "lift_type": "SQUAT", "actual_reps": 5, "actual_weight": 95},
+            {"set_type": "working", "set_number": 2, "exercise_id": "squat", "lift_type": "SQUAT", "actual_reps": 5, "actual_weight": 185},
+        ]
+        response = client.post(
+            f"/api/v1/workouts/{scheduled_workout.id}/complete",
+            json={"sets": sets_data},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        data = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}", headers=auth_headers
+        ).json()
+        lift_sets = data["sets_by_lift"]["SQUAT"]
+        assert [s["prescribed_weight"] for s in lift_sets["warmup_sets"]] == [95]
+        assert [s["prescribed_weight"] for s in lift_sets["main_sets"]] == [185]
+
+    def test_loading_plan_uses_profile(self, client, auth_headers, scheduled_workout):
+        """Test the loading plan loads the profile's bar and plates."""
+        client.post("/api/v1/equipment-profiles", json=WOMENS_BAR_PROFILE, headers=auth_headers)
+
+        data = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}/loading-plan", headers=auth_headers
+        ).json()
+        assert data["bar_weight"] == 35
+        for step in data["steps"]:
+            assert step["loaded_weight"] == step["target_weight"]
+            assert set(step["plates"]) <= {45, 25, 10, 5}
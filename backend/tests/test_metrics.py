@@ -0,0 +1,87 @@
+"""
+Tests for the /metrics endpoint and its collectors.
+"""
+import time
+from app.utils.auth_cache import LocalInvalidationChannel
+from app.utils.metrics import Histogram
+from app.utils.program_cache import ProgramDetailCache
+
+
+class TestHistogram:
+    """Tests for Histogram rendering."""
+
+    def test_buckets_are_cumulative(self):
+        """Test bucket counts include every smaller bucket and +Inf counts everything."""
+        histogram = Histogram("job_seconds", "Job time.", ("job",), (0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, ("nightly",))
+
+        assert histogram.render() == [
+            "# HELP job_seconds Job time.",
+            "# TYPE job_seconds histogram",
+            'job_seconds_bucket{job="nightly",le="0.1"} 1',
+            'job_seconds_bucket{job="nightly",le="1.0"} 3',
+            'job_seconds_bucket{job="nightly",le="+Inf"} 4',
+            'job_seconds_sum{job="nightly"} 4.25',
+            'job_seconds_count{job="nightly"} 4'
+        ]
+
+    def test_label_values_are_escaped(self):
+        """Test quotes and backslashes in label values are escaped."""
+        histogram = Histogram("x", "X.", ("path",), (1.0,))
+        histogram.observe(0.5, ('a"b\\c',))
+        assert 'x_count{path="a\\"b\\\\c"} 1' in histogram.render()
+
+
+class TestCacheMetrics:
+    """Tests for cache hit and miss counts."""
+
+    def test_hits_and_misses(self):
+        """Test lookups are counted as hits or misses."""
+        cache = ProgramDetailCache(ttl_seconds=60, max_entries=10, channel=LocalInvalidationChannel())
+        assert cache.get("p1", "u1") is None
+        cache.put("p1", "u1", detail={"id": "p1"}, loaded_at=time.time())
+        assert cache.get("p1", "u1") == {"id": "p1"}
+        assert cache.get("p1", "someone-else") is None
+
+        assert cache.metrics() == {"hits": 1, "misses": 2, "entries": 1}
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_exposition(self, client, auth_headers, test_rep_max):
+        """Test the endpoint reports routes, statements, caches and component snapshots."""
+        assert client.get("/api/v1/rep-maxes", headers=auth_headers).status_code == 200
+        assert client.get("/api/v1/rep-maxes", headers=auth_headers).status_code == 200
+        assert client.get("/no-such-path").status_code == 404
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+
+        assert "# TYPE http_request_duration_seconds histogram" in body
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/rep-maxes",le="+Inf"}' in body
+        assert 'http_requests_total{method="GET",route="/api/v1/rep-maxes",status="200"}' in body
+        assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in body
+        assert "/no-such-path" not in body
+        # The scrape itself is in flight
+        assert "http_requests_in_flight 1\n" in body
+        assert "db_pool_checkouts_total " in body
+        assert 'db_statement_duration_seconds_count{service_method="RepMaxService.get_all_rep_maxes"}' in body
+        assert 'cache_hits_total{cache="auth"}' in body
+        assert 'cache_misses_total{cache="program_detail"}' in body
+        assert "password_hasher_workers " in body
+        assert "missed_workout_job_runs " in body
+        assert "query_tracker_requests " in body
+
+    def test_every_sample_is_well_formed(self, client):
+        """Test each line is a comment or a name, optional labels and a number."""
+        client.get("/health")
+        for line in client.get("/metrics").text.splitlines():
+            if line.startswith("#"):
+                assert line.split()[1] in ("HELP", "TYPE")
+                continue
+            _, value = line.rsplit(" ", 1)
+            float(value.replace("Inf", "inf"))
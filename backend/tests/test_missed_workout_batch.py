@@ -0,0 +1,187 @@
+"""
+Tests for the nightly missed-workout batch.
+"""
+import logging
+import uuid
+from datetime import date, datetime, time, timedelta
+from sqlalchemy.orm import sessionmaker
+from app.models.analytics import WeeklyLiftRollup
+from app.models.program import LiftType, Program, ProgramStatus
+from app.models.user import MissedWorkoutPreference
+from app.models.workout import Workout, WorkoutMainLift, WorkoutStatus, WeekType
+from app.services.missed_workouts import MissedWorkoutBatchService
+from app.utils.job_lock import acquire_job_lock, release_job_lock
+from app.utils.missed_workout_scheduler import JOB_LOCK_NAME, MissedWorkoutScheduler
+
+
+def _add_program(db, user, workout_days):
+    """Add a program for user with one scheduled squat workout per day offset from today."""
+    program = Program(
+        id=str(uuid.uuid4()),
+        user_id=user.id,
+        name="Batch Program",
+        template_type="4_day",
+        start_date=date.today() - timedelta(days=60),
+        training_days=["monday", "tuesday", "thursday", "friday"],
+        status=ProgramStatus.ACTIVE
+    )
+    db.add(program)
+    for offset in workout_days:
+        db.add(Workout(
+            id=str(uuid.uuid4()),
+            program_id=program.id,
+            scheduled_date=date.today() + timedelta(days=offset),
+            cycle_number=1,
+            week_number=1,
+            week_type=WeekType.WEEK_1_5S,
+            status=WorkoutStatus.SCHEDULED,
+            main_lifts=[WorkoutMainLift(
+                id=str(uuid.uuid4()),
+                lift_type=LiftType.SQUAT,
+                lift_order=1,
+                current_training_max=250.0,
+                week_type=WeekType.WEEK_1_5S
+            )]
+        ))
+    db.commit()
+    return program
+
+
+def _workouts(db, program):
+    db.expire_all()
+    return db.query(Workout).filter(Workout.program_id == program.id).order_by(Workout.scheduled_date).all()
+
+
+class TestMissedWorkoutBatch:
+    """Tests for MissedWorkoutBatchService.run."""
+
+    def test_run_handles_each_preference(self, db, test_user, second_user):
+        """Test skip and reschedule users are processed and 'ask' users are left alone."""
+        test_user.missed_workout_preference = MissedWorkoutPreference.RESCHEDULE
+        second_user.missed_workout_preference = MissedWorkoutPreference.SKIP
+        db.commit()
+        rescheduled = _add_program(db, test_user, [-10, -7, -3, 2])
+        skipped = _add_program(db, second_user, [-9, -8, 4])
+
+        stats = MissedWorkoutBatchService.run(db, chunk_size=1)
+
+        assert stats.chunks == 2
+        assert stats.users == 2
+        assert stats.workouts_skipped == 2
+        assert stats.workouts_rescheduled == 3
+        assert stats.workouts_shifted == 4
+
+        assert [w.scheduled_date for w in _workouts(db, rescheduled)] == [
+            date.today() + timedelta(days=offset) for offset in (0, 3, 7, 12)
+        ]
+        assert [w.status for w in _workouts(db, skipped)] == [
+            WorkoutStatus.SKIPPED, WorkoutStatus.SKIPPED, WorkoutStatus.SCHEDULED
+        ]
+        rollups = db.query(WeeklyLiftRollup).filter(WeeklyLiftRollup.user_id == second_user.id).all()
+        assert sum(r.sessions_skipped for r in rollups) == 2
+
+    def test_ask_users_are_not_processed(self, db, test_user, past_scheduled_workout):
+        """Test users who want to be asked keep their missed workouts."""
+        stats = MissedWorkoutBatchService.run(db)
+        assert stats.users == 0
+        db.expire_all()
+        assert db.get(Workout, past_scheduled_workout.id).status == WorkoutStatus.SCHEDULED
+
+    def test_statements_do_not_grow_with_backlog(self, db, test_user, second_user, query_budget):
+        """Test a chunk uses the same statements for a short and a long backlog."""
+        test_user.missed_workout_preference = MissedWorkoutPreference.RESCHEDULE
+        second_user.missed_workout_preference = MissedWorkoutPreference.SKIP
+        db.commit()
+        _add_program(db, test_user, range(-40, 0, 2))
+        _add_program(db, second_user, range(-40, 0, 2))
+
+        with query_budget(None) as statements:
+            stats = MissedWorkoutBatchService.run(db)
+
+        assert stats.workouts_skipped == 20
+        assert stats.workouts_rescheduled == 20
+        assert len([s for s in statements if s.startswith("UPDATE workouts")]) == 2
+        assert len([s for s in statements if s.startswith("INSERT INTO weekly_lift_rollups")]) <= 1
+
+    def test_virtual_schedule_users(self, client, auth_headers, db, test_user, create_program):
+        """Test missed virtual-schedule workouts are shifted without storing rows."""
+        test_user.missed_workout_preference = MissedWorkoutPreference.RESCHEDULE
+        db.commit()
+        create_program(auth_headers, schedule_mode="VIRTUAL", start_date=date.today() - timedelta(days=10))
+
+        stats = MissedWorkoutBatchService.run(db)
+        assert stats.workouts_rescheduled > 0
+        assert stats.workouts_shifted == 16
+        assert db.query(Workout).count() == 0
+
+        missed = client.get("/api/v1/workouts/missed", headers=auth_headers).json()
+        assert missed["count"] == 0
+
+    def test_shards_partition_users(self, db, test_user, second_user):
+        """Test every user falls in exactly one shard."""
+        for user in (test_user, second_user):
+            user.missed_workout_preference = MissedWorkoutPreference.SKIP
+        db.commit()
+
+        assert MissedWorkoutBatchService.shard_bounds(0, 1) == (None, None)
+        assert MissedWorkoutBatchService.shard_bounds(1, 4) == ("40000000", "80000000")
+        assert sum(MissedWorkoutBatchService.run(db, shard_index=i, shard_count=4).users for i in range(4)) == 2
+
+
+class TestMissedWorkoutScheduler:
+    """Tests for the in-process daily scheduler."""
+
+    def test_seconds_until_next_run(self):
+        """Test the next run is later today or tomorrow at run_at."""
+        scheduler = MissedWorkoutScheduler(run_at=time(3, 0), chunk_size=100)
+        assert scheduler.seconds_until_next_run(datetime(2026, 1, 5, 2, 0)) == 3600
+        assert scheduler.seconds_until_next_run(datetime(2026, 1, 5, 3, 0)) == 24 * 3600
+        assert scheduler.metrics() == {"runs": 0, "failures": 0, "lock_skips": 0}
+
+    def test_run_once_skips_while_job_lock_is_held(self, db, test_user):
+        """Test a second worker's run does nothing while another holds the job lock."""
+        test_user.missed_workout_preference = MissedWorkoutPreference.RESCHEDULE
+        db.commit()
+        program = _add_program(db, test_user, [-2, 1])
+        scheduler = MissedWorkoutScheduler(run_at=time(3, 0), chunk_size=100, session_factory=sessionmaker(bind=db.get_bind()))
+
+        token = acquire_job_lock(db, JOB_LOCK_NAME, timedelta(hours=1))
+        assert token is not None
+        assert scheduler.run_once() is None
+        assert [w.scheduled_date for w in _workouts(db, program)] == [
+            date.today() - timedelta(days=2), date.today() + timedelta(days=1)
+        ]
+
+        release_job_lock(db, JOB_LOCK_NAME, token)
+        stats = scheduler.run_once()
+        assert stats.workouts_rescheduled == 1
+        assert scheduler.metrics()["lock_skips"] == 1
+        assert scheduler.metrics()["runs"] == 1
+
+        # The run released the lock for the next night
+        assert acquire_job_lock(db, JOB_LOCK_NAME, timedelta(hours=1)) is not None
+
+    def test_expired_job_lock_is_taken_over(self, db):
+        """Test a lock left by a crashed run frees up once its TTL passes."""
+        now = datetime(2026, 1, 5, 3, 0)
+        assert acquire_job_lock(db, JOB_LOCK_NAME, timedelta(hours=1), now=now) is not None
+        assert acquire_job_lock(db, JOB_LOCK_NAME, timedelta(hours=1), now=now + timedelta(minutes=30)) is None
+        assert acquire_job_lock(db, JOB_LOCK_NAME, timedelta(hours=1), now=now + timedelta(hours=2)) is not None
+
+    def test_failed_run_is_logged(self, db, monkeypatch, caplog):
+        """Test a failing run is counted, logged with its traceback and releases the lock."""
+        def fail(*args, **kwargs):
+            raise RuntimeError("batch failed")
+
+        monkeypatch.setattr(MissedWorkoutBatchService, "run", fail)
+        scheduler = MissedWorkoutScheduler(run_at=time(3, 0), chunk_size=100, session_factory=sessionmaker(bind=db.get_bind()))
+        stop_after_one_run = iter([False, True])
+        monkeypatch.setattr(scheduler._stop, "wait", lambda timeout: next(stop_after_one_run))
+
+        with caplog.at_level(logging.ERROR, logger="app.utils.missed_workout_scheduler"):
+            scheduler._loop()
+
+        assert scheduler.metrics()["failures"] == 1
+        assert "Missed-workout job failed" in caplog.text
+        assert "RuntimeError: batch failed" in caplog.text
+        assert acquire_job_lock(db, JOB_LOCK_NAME, timedelta(hours=1)) is not None
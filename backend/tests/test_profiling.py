@@ -0,0 +1,136 @@
+"""
+Tests for on-demand request profiling.
+"""
+import contextvars
+import time
+import pytest
+from sqlalchemy import text
+from app.utils.profiler import RequestProfiler, profiled, request_profiler
+
+
+@pytest.fixture
+def profiling_token(monkeypatch):
+    """Enable profiling with a known token and an empty buffer."""
+    monkeypatch.setattr(request_profiler, "token", "let-me-profile")
+    monkeypatch.setattr(request_profiler, "interval_seconds", 0.001)
+    request_profiler.clear()
+    yield "let-me-profile"
+    request_profiler.clear()
+
+
+class TestProfiler:
+    """Tests for sampling and the ring buffer."""
+
+    def test_samples_include_sql_frames(self, db):
+        """Test samples taken during a statement end in the statement."""
+        profiler = RequestProfiler(token="t", interval_seconds=0.001, buffer_size=5)
+        db.connection().connection.driver_connection.create_function(
+            "pause", 1, lambda seconds: time.sleep(seconds) or 1
+        )
+
+        @profiled
+        def slow_endpoint():
+            time.sleep(0.03)
+            db.execute(text("SELECT pause(0.05)"))
+
+        def run():
+            profile = profiler.start("GET", "/slow")
+            slow_endpoint()
+            profiler.finish(profile, 200)
+            return profile
+
+        profile = contextvars.copy_context().run(run)
+
+        assert profile.summary()["statement_count"] == 1
+        assert profile.statements[0].sql == "SELECT pause(0.05)"
+        assert profile.statements[0].seconds >= 0.05
+        stacks = profile.collapsed().splitlines()
+        assert any(line.startswith("tests.test_profiling:") for line in stacks)
+        assert any("slow_endpoint;" in line and ";sql: SELECT pause(0.05) " in line for line in stacks)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+        assert profiler.get(profile.id) is profile
+
+    def test_unprofiled_calls_take_no_samples(self):
+        """Test a decorated function runs normally outside a profiled request."""
+        assert profiled(lambda x: x * 2)(21) == 42
+
+    def test_ring_buffer_is_bounded(self):
+        """Test the oldest profile is dropped when the buffer is full."""
+        profiler = RequestProfiler(token="t", interval_seconds=0.001, buffer_size=2)
+        profiles = [contextvars.copy_context().run(profiler.start, "GET", f"/{n}") for n in range(3)]
+        for profile in profiles:
+            profiler.finish(profile, 200)
+
+        assert [p.path for p in profiler.list()] == ["/2", "/1"]
+        assert profiler.get(profiles[0].id) is None
+
+    def test_token_check(self):
+        """Test profiling needs a configured token and an exact match."""
+        assert not RequestProfiler(token="", interval_seconds=0.001, buffer_size=1).authorized("")
+        profiler = RequestProfiler(token="secret", interval_seconds=0.001, buffer_size=1)
+        assert profiler.authorized("secret")
+        assert not profiler.authorized("secre")
+        assert not profiler.authorized(None)
+        assert not profiler.authorized("s\xe9cret")
+
+
+class TestProfilingEndpoints:
+    """Tests for profiled requests and /api/v1/profiles."""
+
+    def test_profile_workout_detail(self, client, auth_headers, scheduled_workout, profiling_token):
+        """Test a request with the token is profiled and its profile can be fetched."""
+        response = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}",
+            headers={**auth_headers, "X-Profile-Token": profiling_token}
+        )
+        assert response.status_code == 200
+        profile_id = response.headers["X-Profile-Id"]
+
+        listed = client.get("/api/v1/profiles", headers={"X-Profile-Token": profiling_token})
+        assert listed.status_code == 200
+        assert [p["id"] for p in listed.json()] == [profile_id]
+
+        detail = client.get(f"/api/v1/profiles/{profile_id}", headers={"X-Profile-Token": profiling_token})
+        assert detail.status_code == 200
+        data = detail.json()
+        assert data["path"] == f"/api/v1/workouts/{scheduled_workout.id}"
+        assert data["status_code"] == 200
+        assert data["statement_count"] == len(data["statements"]) >= 1
+        assert all(s["sql"] and s["duration_ms"] >= 0 for s in data["statements"])
+
+        collapsed = client.get(
+            f"/api/v1/profiles/{profile_id}/collapsed", headers={"X-Profile-Token": profiling_token}
+        )
+        assert collapsed.status_code == 200
+        assert collapsed.text == data["collapsed_stacks"]
+
+    def test_wrong_or_missing_token(self, client, auth_headers, scheduled_workout, profiling_token):
+        """Test requests without the right token are not profiled and cannot read profiles."""
+        response = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}",
+            headers={**auth_headers, "X-Profile-Token": "guess"}
+        )
+        assert response.status_code == 200
+        assert "X-Profile-Id" not in response.headers
+        assert request_profiler.list() == []
+
+        assert client.get("/api/v1/profiles", headers={"X-Profile-Token": "guess"}).status_code == 403
+        assert client.get("/api/v1/profiles").status_code == 403
+        assert client.get(
+            "/api/v1/profiles/missing", headers={"X-Profile-Token": profiling_token}
+        ).status_code == 404
+
+    def test_non_ascii_token(self, client, auth_headers, scheduled_workout, profiling_token):
+        """Test a token header with non-ASCII bytes is rejected like any wrong token."""
+        token = "let-me-profil\xe9".encode("latin-1")
+        response = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}",
+            headers={**auth_headers, "X-Profile-Token": token}
+        )
+        assert response.status_code == 200
+        assert "X-Profile-Id" not in response.headers
+        assert client.get("/api/v1/profiles", headers={"X-Profile-Token": token}).status_code == 403
+
+    def test_disabled_by_default(self, client):
+        """Test the profiles API is hidden when no token is configured."""
+        assert client.get("/api/v1/profiles", headers={"X-Profile-Token": ""}).status_code == 404
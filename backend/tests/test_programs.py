@@ -5,7 +5,11 @@ import pytest
 from datetime import date, timedelta
 from app.models.user import User
 from app.models.exercise import Exercise, ExerciseCategory
-from app.models.program import Program, ProgramStatus
+from fastapi import HTTPException
+from app.models.program import Program, ProgramStatus, TrainingMax
+from app.models.workout import Workout
+from app.services.program import ProgramService
+from app.utils.program_cache import program_detail_cache
 from app.utils.security import get_password_hash
 import uuid
 
@@ -728,3 +732,373 @@ class TestProgramTemplates:
             # All templates for the same day should have the same accessories
             for template in day_templates:
                 assert template["accessories"] == day_acc["accessories"]
+
+
+class TestWorkoutGeneration:
+    """Tests for workout generation on program creation and next cycle."""
+
+    def test_two_day_workouts_carry_training_maxes(self, client, auth_token, create_program):
+        """Test each main lift of a 2-day program gets its cycle training max."""
+        program = create_program({"Authorization": f"Bearer {auth_token}"}, template_type="2_day")
+        assert program["workouts_generated"] == 8  # 4 weeks * 2 days
+
+        response = client.get(
+            "/api/v1/workouts",
+            params={"program_id": program["id"]},
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        workouts = response.json()
+        assert len(workouts) == 8
+
+        expected = {"SQUAT": 250, "BENCH_PRESS": 200, "DEADLIFT": 300, "PRESS": 100}
+        for workout in workouts:
+            assert len(workout["main_lifts"]) == 2
+            for main_lift in workout["main_lifts"]:
+                assert main_lift["current_training_max"] == expected[main_lift["lift_type"]]
+
+    def test_three_day_workouts_generated(self, auth_token, create_program):
+        """Test a 3-day program generates its rolling 5-week cycle."""
+        program = create_program({"Authorization": f"Bearer {auth_token}"}, template_type="3_day")
+        assert program["workouts_generated"] == 15  # 5 weeks * 3 days
+
+    def test_generate_next_cycle_uses_new_training_maxes(self, client, auth_token, create_program):
+        """Test the next cycle's workouts use the progressed training maxes."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers)
+
+        assert client.post(
+            f"/api/v1/programs/{program['id']}/complete-cycle", headers=headers
+        ).status_code == 200
+
+        response = client.post(
+            f"/api/v1/programs/{program['id']}/generate-next-cycle", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["workouts_generated"] == 16
+
+        workouts = client.get(
+            "/api/v1/workouts",
+            params={"program_id": program["id"], "cycle_number": 2},
+            headers=headers
+        ).json()
+        assert len(workouts) == 16
+
+        expected = {"SQUAT": 260, "BENCH_PRESS": 205, "DEADLIFT": 310, "PRESS": 105}
+        for workout in workouts:
+            main_lift = workout["main_lifts"][0]
+            assert main_lift["current_training_max"] == expected[main_lift["lift_type"]]
+
+
+class TestVirtualSchedule:
+    """Tests for programs whose upcoming workouts are computed on demand."""
+
+    def _list_workouts(self, client, headers, **params):
+        response = client.get("/api/v1/workouts", params=params, headers=headers)
+        assert response.status_code == 200
+        return response.json()
+
+    def test_create_virtual_program_stores_no_workouts(self, client, auth_token, db, create_program):
+        """Test a virtual program lists its cycle without writing workout rows."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers, schedule_mode="VIRTUAL")
+        assert program["schedule_mode"] == "VIRTUAL"
+        assert program["workouts_generated"] == 16
+        assert db.query(Workout).count() == 0
+
+        workouts = self._list_workouts(client, headers, program_id=program["id"])
+        assert len(workouts) == 16
+        assert [w["id"] for w in self._list_workouts(client, headers)] == [w["id"] for w in workouts]
+        assert {w["status"] for w in workouts} == {"SCHEDULED"}
+
+        expected = {"SQUAT": 250, "BENCH_PRESS": 200, "DEADLIFT": 300, "PRESS": 100}
+        for workout in workouts:
+            main_lift = workout["main_lifts"][0]
+            assert main_lift["current_training_max"] == expected[main_lift["lift_type"]]
+
+        detail = client.get(f"/api/v1/workouts/{workouts[0]['id']}", headers=headers)
+        assert detail.status_code == 200
+        assert detail.json()["scheduled_date"] == workouts[0]["scheduled_date"]
+
+        calendar = client.get(
+            "/api/v1/workouts/calendar",
+            params={"start_date": date.today().isoformat(), "end_date": (date.today() + timedelta(days=27)).isoformat()},
+            headers=headers
+        ).json()
+        assert [w["id"] for w in calendar] == [w["id"] for w in workouts]
+        assert all(w["sets_by_lift"] for w in calendar)
+
+        program_detail = client.get(f"/api/v1/programs/{program['id']}", headers=headers).json()
+        assert program_detail["workouts_generated"] == 16
+        assert db.query(Workout).count() == 0
+
+    def test_virtual_workouts_paginate_with_stored_ones(self, client, auth_token, create_program):
+        """Test keyset pages cover stored and computed workouts exactly once."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers, schedule_mode="VIRTUAL")
+        workouts = self._list_workouts(client, headers, program_id=program["id"])
+        client.post(f"/api/v1/workouts/{workouts[5]['id']}/skip", headers=headers)
+
+        seen = []
+        params = {"program_id": program["id"], "limit": 5}
+        while True:
+            response = client.get("/api/v1/workouts", params=params, headers=headers)
+            seen.extend(w["id"] for w in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
+        assert seen == [w["id"] for w in workouts]
+
+    def test_unknown_workout_id_does_not_build_schedule(self, client, auth_token, query_budget, create_program):
+        """Test a 404 lookup never computes the virtual schedule."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers, schedule_mode="VIRTUAL")
+        client.get("/api/v1/workouts", params={"program_id": program["id"]}, headers=headers)
+
+        # Stored workout ids are random UUIDs, which can't be virtual ids
+        with query_budget(1) as statements:
+            response = client.get(f"/api/v1/workouts/{uuid.uuid4()}", headers=headers)
+        assert response.status_code == 404
+        assert not any("FROM programs" in statement for statement in statements)
+
+        # A virtual-style id no slot has costs one programs query
+        with query_budget(2):
+            response = client.get(f"/api/v1/workouts/{uuid.uuid5(uuid.uuid4(), 'x')}", headers=headers)
+        assert response.status_code == 404
+
+    def test_find_virtual_workout_builds_one_workout(self, client, auth_token, db, query_budget, create_program):
+        """Test a virtual workout is found by id with its shifted date and cycle training maxes."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers, schedule_mode="VIRTUAL")
+        workout = self._list_workouts(client, headers, program_id=program["id"])[-1]
+
+        with query_budget(7) as statements:
+            detail = client.get(f"/api/v1/workouts/{workout['id']}", headers=headers)
+        assert detail.status_code == 200
+        assert len([s for s in statements if "FROM training_maxes" in s]) == 1
+        data = detail.json()
+        assert (data["id"], data["cycle_number"], data["scheduled_date"]) == (
+            workout["id"], workout["cycle_number"], workout["scheduled_date"]
+        )
+        assert data["main_lifts"] == workout["main_lifts"]
+
+    def test_complete_materializes_one_workout(self, client, auth_token, db, create_program):
+        """Test completing a virtual workout stores it under the same id."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers, schedule_mode="VIRTUAL")
+        workout = self._list_workouts(client, headers, program_id=program["id"])[0]
+        lift_type = workout["main_lifts"][0]["lift_type"]
+
+        response = client.post(
+            f"/api/v1/workouts/{workout['id']}/complete",
+            json={"sets": [{
+                "set_type": "working", "set_number": 1, "exercise_id": "main_lift",
+                "lift_type": lift_type, "actual_reps": 5, "actual_weight": 100
+            }]},
+            headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["workout"]["id"] == workout["id"]
+
+        stored = db.query(Workout).all()
+        assert [w.id for w in stored] == [workout["id"]]
+        assert len(stored[0].main_lifts) == 1
+
+        workouts = self._list_workouts(client, headers, program_id=program["id"])
+        assert len(workouts) == 16
+        assert workouts[0]["id"] == workout["id"]
+        assert workouts[0]["status"] == "COMPLETED"
+
+    def test_skip_materializes_one_workout(self, client, auth_token, db, create_program):
+        """Test skipping a virtual workout stores it and hides the computed copy."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers, schedule_mode="VIRTUAL")
+        workout = self._list_workouts(client, headers, program_id=program["id"])[3]
+
+        response = client.post(f"/api/v1/workouts/{workout['id']}/skip", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["status"] == "SKIPPED"
+        assert db.query(Workout).count() == 1
+
+        skipped = self._list_workouts(client, headers, program_id=program["id"], workout_status="skipped")
+        assert [w["id"] for w in skipped] == [workout["id"]]
+        scheduled = self._list_workouts(client, headers, program_id=program["id"], workout_status="scheduled")
+        assert len(scheduled) == 15
+
+    def test_generate_next_cycle_virtual(self, client, auth_token, db, create_program):
+        """Test the next virtual cycle follows the first with progressed training maxes."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        start = date.today()
+        program = create_program(headers, schedule_mode="VIRTUAL", start_date=start)
+
+        assert client.post(
+            f"/api/v1/programs/{program['id']}/complete-cycle", headers=headers
+        ).status_code == 200
+        response = client.post(
+            f"/api/v1/programs/{program['id']}/generate-next-cycle", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["cycle_number"] == 2
+        assert response.json()["start_date"] == (start + timedelta(weeks=4)).isoformat()
+        assert response.json()["workouts_generated"] == 16
+
+        workouts = self._list_workouts(client, headers, program_id=program["id"], cycle_number=2)
+        assert len(workouts) == 16
+        assert min(w["scheduled_date"] for w in workouts) >= (start + timedelta(weeks=4)).isoformat()
+        expected = {"SQUAT": 260, "BENCH_PRESS": 205, "DEADLIFT": 310, "PRESS": 105}
+        for workout in workouts:
+            main_lift = workout["main_lifts"][0]
+            assert main_lift["current_training_max"] == expected[main_lift["lift_type"]]
+        assert db.query(Workout).count() == 0
+
+    def test_reschedule_missed_virtual_workout(self, client, auth_token, db, create_program):
+        """Test rescheduling a missed virtual workout shifts the rest of the schedule."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers, schedule_mode="VIRTUAL", start_date=date.today() - timedelta(days=10))
+        before = self._list_workouts(client, headers, program_id=program["id"])
+
+        missed = client.get("/api/v1/workouts/missed", headers=headers).json()
+        first_missed = missed["missed_workouts"][0]["workout"]
+        assert first_missed["id"] == before[0]["id"]
+
+        response = client.post(
+            f"/api/v1/workouts/{first_missed['id']}/handle-missed",
+            json={"action": "reschedule", "reschedule_date": date.today().isoformat()},
+            headers=headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rescheduled_count"] == 16
+        assert data["workout"]["id"] == first_missed["id"]
+        assert data["workout"]["scheduled_date"] == date.today().isoformat()
+
+        days = (date.today() - date.fromisoformat(before[0]["scheduled_date"])).days
+        after = self._list_workouts(client, headers, program_id=program["id"])
+        assert [w["id"] for w in after] == [w["id"] for w in before]
+        for old, new in zip(before, after):
+            assert date.fromisoformat(new["scheduled_date"]) == \
+                date.fromisoformat(old["scheduled_date"]) + timedelta(days=days)
+        assert db.query(Workout).count() == 0
+        assert client.get("/api/v1/workouts/missed", headers=headers).json()["count"] == 0
+
+
+class TestProgramDeletion:
+    """Tests for soft delete and background purge of programs."""
+
+    def test_delete_program_purges_data(self, client, auth_token, db, create_program):
+        """Test deleting a program removes it and its rows after the response."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers)
+
+        response = client.delete(f"/api/v1/programs/{program['id']}", headers=headers)
+        assert response.status_code == 204
+
+        assert client.get(f"/api/v1/programs/{program['id']}", headers=headers).status_code == 404
+        assert db.query(Program).execution_options(include_deleted=True).count() == 0
+        assert db.query(Workout).count() == 0
+        assert db.query(TrainingMax).count() == 0
+
+    def test_soft_delete_hides_program_before_purge(self, client, auth_token, db, test_user, create_program):
+        """Test a soft-deleted program and its workouts are hidden until purged."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers)
+
+        ProgramService.delete_program(db, test_user, program["id"])
+
+        assert client.get("/api/v1/programs", headers=headers).json() == []
+        assert client.get("/api/v1/workouts", headers=headers).json() == []
+        assert client.delete(f"/api/v1/programs/{program['id']}", headers=headers).status_code == 404
+        assert db.query(Workout).count() == 16  # Rows stay until the purge
+
+        assert ProgramService.purge_deleted_programs(db) == 1
+        assert db.query(Workout).count() == 0
+        assert ProgramService.purge_deleted_programs(db) == 0
+
+    def test_purge_statements_do_not_depend_on_workouts(self, client, auth_token, db, test_user, query_budget, create_program):
+        """Test the purge issues one DELETE per table however many workouts there are."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers)
+        assert client.post(
+            f"/api/v1/programs/{program['id']}/complete-cycle", headers=headers
+        ).status_code == 200
+        assert client.post(
+            f"/api/v1/programs/{program['id']}/generate-next-cycle", headers=headers
+        ).status_code == 200
+        ProgramService.delete_program(db, test_user, program["id"])
+
+        with query_budget(None) as statements:
+            ProgramService.purge_program(db, program["id"])
+
+        deletes = [
+            s for s in statements
+            if s.startswith("DELETE FROM") and "weekly_lift_rollups" not in s and "best_rep_maxes" not in s
+        ]
+        assert len(deletes) == 10
+        assert db.query(Workout).count() == 0
+
+
+class TestProgramDetail:
+    """Tests for the single-query program detail and its cache."""
+
+    def test_detail_in_one_query(self, client, auth_token, db, test_user, query_budget, create_program):
+        """Test the detail's training maxes, count and cycle come from one query."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers)
+        assert client.post(
+            f"/api/v1/programs/{program['id']}/complete-cycle", headers=headers
+        ).status_code == 200
+        assert client.post(
+            f"/api/v1/programs/{program['id']}/generate-next-cycle", headers=headers
+        ).status_code == 200
+        program_detail_cache.clear()
+
+        with query_budget(1):
+            detail = ProgramService.get_program_detail(db, test_user, program["id"])
+
+        assert detail.workouts_generated == 32
+        assert detail.current_cycle == 2
+        assert detail.current_week == 4
+        assert detail.training_maxes["SQUAT"].cycle == 2
+        assert detail.training_maxes["SQUAT"].value == 260
+        assert detail.training_maxes["PRESS"].value == 105
+
+    def test_detail_cached_until_program_changes(self, client, auth_token, db, test_user, query_budget, create_program):
+        """Test repeat loads are served from the cache and updates invalidate it."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers)
+        assert client.get(f"/api/v1/programs/{program['id']}", headers=headers).status_code == 200
+
+        with query_budget(0):
+            detail = ProgramService.get_program_detail(db, test_user, program["id"])
+        assert detail.name == "Test Program"
+
+        assert client.put(
+            f"/api/v1/programs/{program['id']}", json={"name": "Renamed"}, headers=headers
+        ).status_code == 200
+        assert client.get(f"/api/v1/programs/{program['id']}", headers=headers).json()["name"] == "Renamed"
+
+        assert client.post(
+            f"/api/v1/programs/{program['id']}/complete-cycle", headers=headers
+        ).status_code == 200
+        response = client.get(f"/api/v1/programs/{program['id']}", headers=headers)
+        assert response.json()["training_maxes"]["SQUAT"]["cycle"] == 2
+
+    def test_cached_detail_not_shared_with_other_users(self, client, auth_token, db, create_program):
+        """Test a cached detail is not returned to a user who does not own the program."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        program = create_program(headers)
+        assert client.get(f"/api/v1/programs/{program['id']}", headers=headers).status_code == 200
+
+        other = User(
+            id=str(uuid.uuid4()),
+            first_name="Other",
+            last_name="User",
+            email="other@example.com",
+            password_hash=get_password_hash("OtherPassword123!")
+        )
+        db.add(other)
+        db.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            ProgramService.get_program_detail(db, other, program["id"])
+        assert exc_info.value.status_code == 404
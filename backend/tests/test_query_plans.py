@@ -0,0 +1,166 @@
+"""
+Query-plan regression tests.
+
+Hot service queries are captured while exercising the API and re-run with
+EXPLAIN QUERY PLAN on the SQLite test database (and with EXPLAIN on
+PostgreSQL when TEST_POSTGRES_URL is set). A test fails when a query reads
+one of the large per-user tables with a full scan instead of an index.
+"""
+import os
+import re
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.program import LiftType
+from app.services.rep_max import RepMaxService
+from app.services.workout import WorkoutService
+
+# Tables that grow with every workout logged
+HOT_TABLES = ("workouts", "workout_sets", "workout_main_lifts", "rep_maxes", "best_rep_maxes", "training_maxes")
+
+
+def _hot_selects(statements):
+    """Get the (statement, parameters) pairs of recorded SELECTs that read the hot tables."""
+    captured = [
+        (statement, parameters)
+        for statement, parameters, executemany in statements.calls
+        if not executemany and statement.lstrip().upper().startswith("SELECT") and any(
+            re.search(rf"\b{table}\b", statement) for table in HOT_TABLES
+        )
+    ]
+    assert captured
+    return captured
+
+
+def _sqlite_plans(db, statements):
+    """Get (plan line, statement) pairs from EXPLAIN QUERY PLAN for each statement."""
+    plans = []
+    with db.get_bind().connect() as conn:
+        for statement, parameters in statements:
+            for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+                plans.append((row[-1], statement))
+    return plans
+
+
+def _full_scans(plans):
+    """Get the plan lines that scan a hot table without an index search."""
+    full_scans = []
+    for detail, statement in plans:
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and match.group(1) in HOT_TABLES:
+            full_scans.append(f"{detail}\n    in: {statement}")
+    return full_scans
+
+
+def _indexes_used(plans):
+    """Get the names of the indexes the plans search."""
+    return {match.group(1) for detail, _ in plans for match in [re.search(r"USING (?:COVERING )?INDEX (\w+)", detail)] if match}
+
+
+class TestQueryPlans:
+    """Tests that hot queries use indexes on SQLite."""
+
+    def test_workout_queries_use_indexes(
+        self, client, auth_headers, db, test_program_with_training_maxes,
+        past_scheduled_workout, scheduled_workout_week3, query_budget
+    ):
+        """Test workout listing, calendar, missed and completion queries use indexes."""
+        program_id = test_program_with_training_maxes.id
+
+        def exercise():
+            for params in (
+                {"program_id": program_id, "workout_status": "scheduled"},
+                {"program_id": program_id, "cycle_number": 1, "week_number": 3},
+            ):
+                assert client.get("/api/v1/workouts", params=params, headers=auth_headers).status_code == 200
+            assert client.get("/api/v1/workouts/missed", headers=auth_headers).status_code == 200
+            assert client.get(f"/api/v1/workouts/{scheduled_workout_week3.id}", headers=auth_headers).status_code == 200
+            response = client.post(
+                f"/api/v1/workouts/{scheduled_workout_week3.id}/complete",
+                json={"sets": [
+                    {"set_type": "working", "set_number": 1, "exercise_id": "squat", "lift_type": "SQUAT", "actual_reps": 3, "actual_weight": 190},
+                    {"set_type": "working", "set_number": 2, "exercise_id": "squat", "lift_type": "SQUAT", "actual_reps": 3, "actual_weight": 210},
+                    {"set_type": "amrap", "set_number": 3, "exercise_id": "squat", "lift_type": "SQUAT", "actual_reps": 6, "actual_weight": 235},
+                ]},
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+
+        with query_budget(None) as statements:
+            exercise()
+        plans = _sqlite_plans(db, _hot_selects(statements))
+        assert _full_scans(plans) == []
+        assert {"ix_workouts_program_status_date", "ix_workout_sets_workout_target_met"} <= _indexes_used(plans)
+
+    def test_program_and_analytics_queries_use_indexes(
+        self, client, auth_headers, db, test_user, test_program_with_training_maxes, multiple_rep_maxes,
+        query_budget
+    ):
+        """Test program detail, cycle progression, history and rep max queries use indexes."""
+        program_id = test_program_with_training_maxes.id
+
+        def exercise():
+            for path in (
+                f"/api/v1/programs/{program_id}",
+                f"/api/v1/analytics/programs/{program_id}/workout-history",
+                f"/api/v1/analytics/programs/{program_id}/training-max-progression",
+                "/api/v1/rep-maxes",
+            ):
+                assert client.get(path, headers=auth_headers).status_code == 200
+            assert client.post(f"/api/v1/programs/{program_id}/complete-cycle", headers=auth_headers).status_code == 200
+            assert client.post(
+                f"/api/v1/programs/{program_id}/generate-next-cycle", headers=auth_headers
+            ).status_code == 200
+            WorkoutService.get_suggested_training_max(db, test_user.id, LiftType.SQUAT)
+            RepMaxService.get_rep_maxes_by_lift(db, test_user, "squat")
+
+        with query_budget(None) as statements:
+            exercise()
+        plans = _sqlite_plans(db, _hot_selects(statements))
+        assert _full_scans(plans) == []
+        assert {
+            "ix_workout_sets_workout_type_number",
+            "ix_rep_maxes_user_lift_date",
+            "ix_training_maxes_program_lift_cycle",
+        } <= _indexes_used(plans)
+
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+class TestPostgresQueryPlans:
+    """Tests that the hot filters have usable indexes on PostgreSQL."""
+
+    # Filters the services apply to each hot table, as WHERE clauses with sample values
+    HOT_FILTERS = [
+        "SELECT id FROM workouts WHERE program_id = 'p' AND status = 'SCHEDULED' AND scheduled_date < CURRENT_DATE",
+        "SELECT id FROM workouts WHERE program_id = 'p' AND status = 'COMPLETED'",
+        "SELECT id FROM workout_sets WHERE workout_id IN ('w1', 'w2') AND set_type = 'AMRAP' AND set_number = 3",
+        "SELECT id FROM workout_sets WHERE workout_id IN ('w1', 'w2') AND is_target_met = false",
+        "SELECT id FROM rep_maxes WHERE user_id = 'u' AND lift_type = 'SQUAT' AND achieved_date >= CURRENT_DATE",
+        "SELECT id FROM best_rep_maxes WHERE user_id = 'u' AND lift_type = 'SQUAT' AND reps = 5 AND weight_unit = 'LBS'",
+        "SELECT id FROM training_maxes WHERE program_id = 'p' AND lift_type = 'SQUAT' AND cycle_number = 1",
+    ]
+
+    @pytest.fixture(scope="class")
+    def pg_session(self):
+        engine = create_engine(POSTGRES_URL)
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        try:
+            yield session
+        finally:
+            session.close()
+            Base.metadata.drop_all(bind=engine)
+            engine.dispose()
+
+    @pytest.mark.parametrize("query", HOT_FILTERS)
+    def test_hot_filter_uses_index(self, pg_session, query):
+        """Test the planner can answer the filter without a sequential scan."""
+        # Empty tables always favour a sequential scan, so only check one is avoidable
+        pg_session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(row[0] for row in pg_session.execute(text(f"EXPLAIN {query}")))
+        pg_session.rollback()
+        assert "Seq Scan" not in plan, plan
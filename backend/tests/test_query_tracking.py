@@ -0,0 +1,82 @@
+"""
+Tests for per-request query tracking.
+"""
+from app.utils.query_tracker import QueryTracker, RequestQueryStats, query_tracker, statement_shape
+
+
+class TestStatementShape:
+    """Tests for grouping statements by shape."""
+
+    def test_in_lists_are_collapsed(self):
+        """Test statements differing only in IN list length share a shape."""
+        one = statement_shape("SELECT * FROM workouts WHERE id IN (?)")
+        three = statement_shape("SELECT *\n  FROM workouts WHERE id IN (?, ?, ?)")
+        assert one == three == "SELECT * FROM workouts WHERE id IN (...)"
+
+    def test_repeated_shapes(self):
+        """Test only shapes reaching the threshold are reported, most repeated first."""
+        stats = RequestQueryStats()
+        for _ in range(3):
+            stats.record("SELECT * FROM users WHERE id = ?", 0.001)
+        for _ in range(5):
+            stats.record("SELECT * FROM workout_sets WHERE workout_id = ?", 0.001)
+        stats.record("SELECT * FROM programs", 0.001)
+
+        assert stats.count == 9
+        assert stats.repeated_shapes(3) == [
+            ("SELECT * FROM workout_sets WHERE workout_id = ?", 5),
+            ("SELECT * FROM users WHERE id = ?", 3)
+        ]
+        assert stats.repeated_shapes(6) == []
+
+
+class TestQueryTracker:
+    """Tests for QueryTracker totals."""
+
+    def test_metrics(self):
+        """Test totals and N+1 counts across requests."""
+        tracker = QueryTracker(enabled=True, n_plus_one_threshold=2)
+        quiet = RequestQueryStats()
+        quiet.record("SELECT 1", 0.002)
+        noisy = RequestQueryStats()
+        for _ in range(3):
+            noisy.record("SELECT * FROM rep_maxes WHERE id = ?", 0.001)
+
+        assert tracker.finish_request(quiet, "GET /a") == []
+        assert tracker.finish_request(noisy, "GET /b") == [("SELECT * FROM rep_maxes WHERE id = ?", 3)]
+
+        metrics = tracker.metrics()
+        assert metrics["requests"] == 2
+        assert metrics["statements"] == 4
+        assert metrics["avg_statements"] == 2
+        assert metrics["max_statements"] == 3
+        assert metrics["n_plus_one_requests"] == 1
+
+    def test_disabled(self):
+        """Test a disabled tracker collects nothing."""
+        assert QueryTracker(enabled=False, n_plus_one_threshold=5).start_request() is None
+
+
+class TestQueryTrackingMiddleware:
+    """Tests for the query tracking response headers."""
+
+    def test_headers(self, client, auth_headers, test_rep_max):
+        """Test responses report their statement count and database time."""
+        response = client.get("/api/v1/rep-maxes", headers=auth_headers)
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Query-Count"]) >= 1
+        assert float(response.headers["X-DB-Time-Ms"]) >= 0
+        assert "X-DB-Repeated-Queries" not in response.headers
+
+        response = client.get("/health")
+        assert response.headers["X-DB-Query-Count"] == "0"
+
+    def test_repeated_queries_header(self, client, auth_headers, test_rep_max, monkeypatch):
+        """Test a request repeating a statement shape is flagged."""
+        monkeypatch.setattr(query_tracker, "n_plus_one_threshold", 1)
+        before = query_tracker.metrics()["n_plus_one_requests"]
+
+        response = client.get("/api/v1/rep-maxes", headers=auth_headers)
+
+        assert int(response.headers["X-DB-Repeated-Queries"]) >= 1
+        assert query_tracker.metrics()["n_plus_one_requests"] == before + 1
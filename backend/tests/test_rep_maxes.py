@@ -1,15 +1,21 @@
 """
 Tests for rep max (personal records) endpoints.
 """
+import uuid
 from datetime import date, timedelta
+from app.models.program import LiftType
+from app.models.rep_max import BestRepMax, RepMax
+from app.models.workout import SetType, WeightUnit, WorkoutSet
+from app.services.rep_max import RepMaxService
 
 
 class TestGetAllRepMaxes:
     """Tests for GET /api/v1/rep-maxes endpoint."""
 
-    def test_get_all_rep_maxes_success(self, client, auth_headers, test_rep_max):
+    def test_get_all_rep_maxes_success(self, client, auth_headers, test_rep_max, query_budget):
         """Test getting all rep maxes returns data."""
-        response = client.get("/api/v1/rep-maxes", headers=auth_headers)
+        with query_budget(2):
+            response = client.get("/api/v1/rep-maxes", headers=auth_headers)
         assert response.status_code == 200
         data = response.json()
         assert "lifts" in data
@@ -154,3 +160,73 @@ class TestGetRepMaxesByLift:
             )
             assert response.status_code == 200
             assert response.json()["lift_type"] == lift
+
+
+class TestBestRepMaxes:
+    """Tests for the best_rep_maxes table kept alongside the rep_maxes log."""
+
+    def _amrap_set(self, db, workout, weight, reps, unit=WeightUnit.LBS):
+        """Get a transient copy of the workout's AMRAP set with new numbers."""
+        amrap = db.query(WorkoutSet).filter(
+            WorkoutSet.workout_id == workout.id,
+            WorkoutSet.set_type == SetType.AMRAP
+        ).first()
+        return WorkoutSet(id=amrap.id, actual_weight=weight, actual_reps=reps, weight_unit=unit)
+
+    def test_record_rep_max_upserts_best(self, db, test_user, completed_workout):
+        """Test each PR is logged and the best row is updated in place."""
+        for weight in (200.0, 215.0, 210.0):
+            RepMaxService.record_rep_max(
+                db, test_user.id, LiftType.SQUAT, self._amrap_set(db, completed_workout, weight, 5), date.today()
+            )
+            db.commit()
+
+        assert [rm.weight for rm in db.query(RepMax).order_by(RepMax.weight).all()] == [200.0, 215.0]
+        best = db.query(BestRepMax).one()
+        assert best.weight == 215.0
+        assert best.rep_max_id == db.query(RepMax).filter(RepMax.weight == 215.0).one().id
+
+    def test_units_are_tracked_separately(self, db, test_user, completed_workout):
+        """Test a PR in kg does not have to beat the best in lbs."""
+        RepMaxService.record_rep_max(
+            db, test_user.id, LiftType.SQUAT, self._amrap_set(db, completed_workout, 200.0, 5), date.today()
+        )
+        RepMaxService.record_rep_max(
+            db, test_user.id, LiftType.SQUAT,
+            self._amrap_set(db, completed_workout, 100.0, 5, WeightUnit.KG), date.today()
+        )
+        db.commit()
+
+        assert db.query(BestRepMax).count() == 2
+
+    def test_rebuild_picks_heaviest_entry(self, db, test_user, multiple_rep_maxes):
+        """Test rebuilding from the log keeps the heaviest entry per rep count."""
+        db.add(RepMax(
+            id=str(uuid.uuid4()),
+            user_id=test_user.id,
+            lift_type=LiftType.SQUAT,
+            reps=5,
+            weight=235.0,
+            weight_unit=WeightUnit.LBS,
+            calculated_1rm=235.0 * (1 + 5/30),
+            achieved_date=date.today(),
+            workout_set_id=multiple_rep_maxes[0].workout_set_id
+        ))
+        db.flush()
+
+        assert RepMaxService.rebuild_best_rep_maxes(db, test_user.id) == 3
+        db.commit()
+        best = db.query(BestRepMax).filter(
+            BestRepMax.lift_type == LiftType.SQUAT, BestRepMax.reps == 5
+        ).one()
+        assert best.weight == 235.0
+
+    def test_all_rep_maxes_in_one_query(self, client, auth_headers, db, multiple_rep_maxes, query_budget):
+        """Test the all-lifts response reads best_rep_maxes once and not the log."""
+        with query_budget(None) as statements:
+            response = client.get("/api/v1/rep-maxes", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["lifts"]["SQUAT"]["3"]["weight"] == 240.0
+        assert len([s for s in statements if "FROM best_rep_maxes" in s]) == 1
+        assert not [s for s in statements if "FROM rep_maxes" in s]
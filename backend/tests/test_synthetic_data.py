@@ -0,0 +1,134 @@
+"""
+Tests for the synthetic dataset generator.
+"""
+from datetime import date, timedelta
+from sqlalchemy import func
+from app.models.analytics import WeeklyLiftRollup, WorkoutSummary
+from app.models.program import Program, ProgramStatus, TrainingMax, TrainingMaxReason
+from app.models.rep_max import BestRepMax, RepMax
+from app.models.user import User
+from app.models.workout import SetType, Workout, WorkoutSet, WorkoutStatus
+from app.services.analytics import AnalyticsService
+from app.services.program import ProgramService
+from app.services.synthetic_data import SyntheticDataGenerator
+from app.utils.security import verify_password
+
+TODAY = date(2026, 10, 17)
+
+
+def _generate(db, users=4, years=1.5, **kwargs):
+    generator = SyntheticDataGenerator(db, seed=7, years=years, today=TODAY, password="pw")
+    return generator.run(users, batch_size=3, **kwargs)
+
+
+class TestSyntheticDataGenerator:
+    """Tests for SyntheticDataGenerator.run."""
+
+    def test_generates_histories(self, db, test_exercises):
+        """Test users get programs, workouts in every status, sets and PRs."""
+        stats = _generate(db)
+
+        assert stats.batches == 2
+        assert stats.users == db.query(User).count() == 4
+        assert stats.workouts == db.query(Workout).count() > 4 * 52
+        assert stats.sets == db.query(WorkoutSet).count()
+        assert stats.rep_maxes == db.query(RepMax).count() > 0
+
+        statuses = dict(db.query(Workout.status, func.count()).group_by(Workout.status).all())
+        assert set(statuses) == {
+            WorkoutStatus.COMPLETED, WorkoutStatus.SKIPPED, WorkoutStatus.SCHEDULED
+        }
+        assert statuses[WorkoutStatus.COMPLETED] > statuses[WorkoutStatus.SKIPPED]
+        assert db.query(Workout).filter(
+            Workout.status != WorkoutStatus.SCHEDULED, Workout.scheduled_date > TODAY
+        ).count() == 0
+
+        # Exactly one active program per user, none overlapping
+        assert db.query(Program).filter(Program.status == ProgramStatus.ACTIVE).count() == 4
+        for user in db.query(User).all():
+            programs = db.query(Program).filter(Program.user_id == user.id).order_by(Program.start_date).all()
+            for earlier, later in zip(programs, programs[1:]):
+                assert earlier.end_date < later.start_date
+
+        user = db.query(User).first()
+        assert verify_password("pw", user.password_hash)
+
+    def test_sets_follow_the_prescriptions(self, db, test_exercises):
+        """Test completed workouts have warmup, working, AMRAP and accessory sets at prescribed weights."""
+        _generate(db, users=2)
+
+        workout = db.query(Workout).filter(
+            Workout.status == WorkoutStatus.COMPLETED, Workout.week_number == 1
+        ).order_by(Workout.scheduled_date).first()
+        main_lift = workout.main_lifts[0]
+        sets = db.query(WorkoutSet).filter(
+            WorkoutSet.workout_id == workout.id, WorkoutSet.lift_type == main_lift.lift_type
+        ).all()
+        by_type = {}
+        for ws in sets:
+            by_type.setdefault(ws.set_type, []).append(ws)
+
+        assert len(by_type[SetType.WARMUP]) == 4
+        assert len(by_type[SetType.WORKING]) == 2
+        assert len(by_type[SetType.AMRAP]) == 1
+        assert by_type[SetType.ACCESSORY]
+        amrap = by_type[SetType.AMRAP][0]
+        assert amrap.percentage_of_tm == 0.85
+        assert abs(amrap.prescribed_weight - main_lift.current_training_max * 0.85) <= 2.5
+        assert all(ws.exercise_id for ws in by_type[SetType.ACCESSORY])
+
+        # PRs point at AMRAP sets
+        rep_max = db.query(RepMax).first()
+        assert db.get(WorkoutSet, rep_max.workout_set_id).set_type == SetType.AMRAP
+
+    def test_training_maxes_progress_per_cycle(self, db, test_exercises):
+        """Test each cycle after the first gets training maxes by increment or reset."""
+        _generate(db, users=2)
+
+        program = db.query(Program).filter(Program.scheduled_cycles > 2).first()
+        tms = db.query(TrainingMax).filter(TrainingMax.program_id == program.id).all()
+        by_cycle = {}
+        for tm in tms:
+            by_cycle.setdefault(tm.cycle_number, {})[tm.lift_type] = tm
+
+        assert all(tm.reason == TrainingMaxReason.INITIAL for tm in by_cycle[1].values())
+        for lift, tm in by_cycle[2].items():
+            previous = by_cycle[1][lift].value
+            if tm.reason == TrainingMaxReason.CYCLE_COMPLETION:
+                assert tm.value > previous
+            else:
+                assert tm.reason == TrainingMaxReason.FAILED_REPS and tm.value < previous
+
+        # Cycles are laid out back to back like virtual schedules
+        second_cycle = db.query(func.min(Workout.scheduled_date)).filter(
+            Workout.program_id == program.id, Workout.cycle_number == 2
+        ).scalar()
+        cycle_start = ProgramService.get_cycle_start_date(program, 2)
+        assert cycle_start <= second_cycle < cycle_start + timedelta(days=7)
+
+    def test_rebuilds_derived_tables(self, db, test_exercises):
+        """Test summaries, rollups and best rep maxes are built batch by batch for the generated history."""
+        _generate(db, users=4)
+
+        completed = db.query(Workout).filter(Workout.status == WorkoutStatus.COMPLETED).count()
+        assert db.query(WorkoutSummary).count() == completed
+        assert db.query(BestRepMax).count() > 0
+
+        def rollups():
+            db.expire_all()
+            return sorted(
+                (r.user_id, r.lift_type, r.week_start, r.sessions_completed, r.sessions_skipped,
+                 r.set_count, r.total_reps, r.tonnage, r.best_e1rm, r.failed_targets)
+                for r in db.query(WeeklyLiftRollup)
+            )
+
+        per_batch = rollups()
+        assert {row[0] for row in per_batch} == {user.id for user in db.query(User)}
+        assert AnalyticsService.rebuild_lift_rollups(db, users_per_batch=3) == len(per_batch)
+        assert rollups() == per_batch
+
+    def test_skip_derived(self, db, test_exercises):
+        """Test the derived tables can be left for the rebuild commands."""
+        _generate(db, users=1, years=0.5, rebuild_derived=False)
+        assert db.query(WorkoutSummary).count() == 0
+        assert db.query(BestRepMax).count() == 0
@@ -303,6 +303,45 @@ class TestRepMaxPRCreation:
             expected_1rm = weight * (1 + reps / 30)
             assert abs(rep_max.calculated_1rm - expected_1rm) < 0.01
 
+    def test_pr_references_logged_amrap_set(
+        self, client, auth_headers, multi_lift_workout, db, test_user
+    ):
+        """Test each lift's PR points at its own persisted AMRAP set and completion date."""
+        from app.models import RepMax, WorkoutSet
+
+        sets_data = [
+            {"set_type": "warmup", "set_number": 1, "exercise_id": "squat", "lift_type": "SQUAT", "actual_reps": 5, "actual_weight": 45},
+            {"set_type": "working", "set_number": 1, "exercise_id": "squat", "lift_type": "SQUAT", "actual_reps": 5, "actual_weight": 165},
+            {"set_type": "working", "set_number": 2, "exercise_id": "squat", "lift_type": "SQUAT", "actual_reps": 5, "actual_weight": 190},
+            {"set_type": "amrap", "set_number": 3, "exercise_id": "squat", "lift_type": "SQUAT", "actual_reps": 9, "actual_weight": 215},
+            {"set_type": "working", "set_number": 1, "exercise_id": "bench", "lift_type": "BENCH_PRESS", "actual_reps": 5, "actual_weight": 130},
+            {"set_type": "working", "set_number": 2, "exercise_id": "bench", "lift_type": "BENCH_PRESS", "actual_reps": 5, "actual_weight": 150},
+            {"set_type": "amrap", "set_number": 3, "exercise_id": "bench", "lift_type": "BENCH_PRESS", "actual_reps": 6, "actual_weight": 170},
+        ]
+
+        response = client.post(
+            f"/api/v1/workouts/{multi_lift_workout.id}/complete",
+            json={"sets": sets_data, "completed_date": "2026-01-05T18:30:00"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        logged_sets = db.query(WorkoutSet).filter(
+            WorkoutSet.workout_id == multi_lift_workout.id
+        ).all()
+        assert len(logged_sets) == len(sets_data)
+
+        for lift_type, reps, weight in [(LiftType.SQUAT, 9, 215.0), (LiftType.BENCH_PRESS, 6, 170.0)]:
+            rep_max = db.query(RepMax).filter(
+                RepMax.user_id == test_user.id,
+                RepMax.lift_type == lift_type,
+                RepMax.reps == reps
+            ).one()
+            amrap_set = db.query(WorkoutSet).filter(WorkoutSet.id == rep_max.workout_set_id).one()
+            assert amrap_set.lift_type == lift_type
+            assert amrap_set.actual_weight == weight
+            assert rep_max.achieved_date.isoformat() == "2026-01-05"
+
 
 class TestWeekTypeSetGeneration:
     """Tests for correct set generation based on week type."""
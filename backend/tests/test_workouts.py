@@ -1,15 +1,26 @@
 """
 Tests for workout listing, detail, and skip endpoints.
 """
+import json
+import uuid
+import pytest
 from datetime import date, timedelta
+from app.models.exercise import Exercise, ExerciseCategory
+from app.models.analytics import WeeklyLiftRollup
+from app.models.program import LiftType
+from app.models.user import MissedWorkoutPreference
+from app.models.workout import Workout, WorkoutMainLift, WorkoutStatus, WeekType
+from app.services.workout import WorkoutService
+from app.utils.plates import get_plate_solver
 
 
 class TestWorkoutListing:
     """Tests for GET /api/v1/workouts endpoint."""
 
-    def test_list_workouts_success(self, client, auth_headers, scheduled_workout):
+    def test_list_workouts_success(self, client, auth_headers, scheduled_workout, query_budget):
         """Test listing workouts returns workouts."""
-        response = client.get("/api/v1/workouts", headers=auth_headers)
+        with query_budget(4):
+            response = client.get("/api/v1/workouts", headers=auth_headers)
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
@@ -150,6 +161,72 @@ class TestWorkoutListing:
         workout_ids = [w["id"] for w in data]
         assert other_workout.id not in workout_ids
 
+    def test_list_workouts_cursor_pages(
+        self, client, auth_headers, scheduled_workout, scheduled_workout_week3,
+        scheduled_workout_deload, past_scheduled_workout, multi_lift_workout
+    ):
+        """Test paging with limit/cursor returns every workout once, in order."""
+        full = client.get("/api/v1/workouts", headers=auth_headers).json()
+        assert len(full) == 5
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/v1/workouts", params=params, headers=auth_headers)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 2
+            seen.extend(w["id"] for w in page)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert seen == [w["id"] for w in full]
+
+    def test_list_workouts_invalid_cursor(self, client, auth_headers, scheduled_workout):
+        """Test a malformed cursor is rejected."""
+        response = client.get(
+            "/api/v1/workouts",
+            params={"limit": 2, "cursor": "not-a-cursor"},
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    def test_stream_workouts_ndjson(
+        self, client, auth_headers, scheduled_workout, completed_workout, multi_lift_workout
+    ):
+        """Test the stream endpoint returns one JSON workout per line."""
+        full = client.get("/api/v1/workouts", headers=auth_headers).json()
+
+        response = client.get("/api/v1/workouts/stream", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        streamed = [json.loads(line) for line in response.text.splitlines()]
+        assert streamed == full
+
+        response = client.get(
+            "/api/v1/workouts/stream",
+            params={"main_lifts": ["BENCH_PRESS"]},
+            headers=auth_headers
+        )
+        assert [json.loads(line)["id"] for line in response.text.splitlines()] == [multi_lift_workout.id]
+
+
+    def test_stream_workouts_across_batches(
+        self, db, test_user, scheduled_workout, scheduled_workout_week3,
+        scheduled_workout_deload, past_scheduled_workout, multi_lift_workout
+    ):
+        """Test streaming yields every workout when results span several batches."""
+        lines = list(WorkoutService.stream_workouts(db, test_user, batch_size=2))
+        workouts = [json.loads(line) for line in lines]
+        assert len(workouts) == 5
+        assert all(w["main_lifts"] for w in workouts)
+        keys = [(w["scheduled_date"], w["id"]) for w in workouts]
+        assert keys == sorted(keys)
+
 
 class TestWorkoutDetail:
     """Tests for GET /api/v1/workouts/{workout_id} endpoint."""
@@ -300,6 +377,212 @@ class TestWorkoutDetail:
         assert response.status_code == 403
 
 
+class TestWorkoutCalendar:
+    """Tests for GET /api/v1/workouts/calendar endpoint."""
+
+    @pytest.fixture
+    def accessory_exercises(self, db):
+        """Create one exercise per category."""
+        exercises = [
+            Exercise(id=str(uuid.uuid4()), name=f"Test {category.value}", category=category, is_predefined=True)
+            for category in ExerciseCategory
+        ]
+        db.add_all(exercises)
+        db.commit()
+        return [e.id for e in exercises]
+
+    def _accessories(self, exercise_ids):
+        """One accessory per workout type, cycling through the exercises."""
+        return {
+            str(day): [{"exercise_id": exercise_ids[day % len(exercise_ids)], "sets": 3, "reps": 10}]
+            for day in range(1, 5)
+        }
+
+    def test_calendar_matches_workout_detail(
+        self, client, auth_headers, accessory_exercises, create_program
+    ):
+        """Test each calendar entry equals the workout's detail response."""
+        create_program(auth_headers, accessories=self._accessories(accessory_exercises))
+        start = date.today()
+        end = start + timedelta(days=27)
+
+        response = client.get(
+            "/api/v1/workouts/calendar",
+            params={"start_date": start.isoformat(), "end_date": end.isoformat()},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        calendar = response.json()
+        assert len(calendar) > 4
+        assert all(entry["accessory_sets"] for entry in calendar)
+
+        for entry in calendar:
+            detail = client.get(f"/api/v1/workouts/{entry['id']}", headers=auth_headers).json()
+            assert entry == detail
+
+    def test_calendar_query_count_is_constant(
+        self, client, auth_headers, db, accessory_exercises, query_budget, create_program
+    ):
+        """Test a month costs the same number of queries as a week."""
+        create_program(auth_headers, accessories=self._accessories(accessory_exercises))
+
+        # Include a completed workout so logged sets are loaded too
+        first = client.get("/api/v1/workouts", params={"limit": 1}, headers=auth_headers).json()[0]
+        response = client.post(
+            f"/api/v1/workouts/{first['id']}/complete",
+            json={"sets": [{"set_type": "working", "set_number": 1, "exercise_id": "main", "actual_reps": 5, "actual_weight": 100}]},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        def queries_for(days):
+            with query_budget(None) as statements:
+                response = client.get(
+                    "/api/v1/workouts/calendar",
+                    params={
+                        "start_date": date.today().isoformat(),
+                        "end_date": (date.today() + timedelta(days=days)).isoformat()
+                    },
+                    headers=auth_headers
+                )
+            assert response.status_code == 200
+            return len(statements), len(response.json())
+
+        week_queries, week_workouts = queries_for(6)
+        month_queries, month_workouts = queries_for(27)
+
+        assert month_workouts > week_workouts
+        assert month_queries == week_queries
+
+    def test_calendar_rejects_invalid_range(self, client, auth_headers):
+        """Test reversed and overly long ranges are rejected."""
+        today = date.today()
+        reversed_range = client.get(
+            "/api/v1/workouts/calendar",
+            params={"start_date": today.isoformat(), "end_date": (today - timedelta(days=1)).isoformat()},
+            headers=auth_headers
+        )
+        assert reversed_range.status_code == 400
+
+        too_long = client.get(
+            "/api/v1/workouts/calendar",
+            params={"start_date": today.isoformat(), "end_date": (today + timedelta(days=365)).isoformat()},
+            headers=auth_headers
+        )
+        assert too_long.status_code == 400
+
+
+class TestWorkoutLoadingPlan:
+    """Tests for GET /api/v1/workouts/{workout_id}/loading-plan endpoint."""
+
+    def test_loading_plan_covers_session(
+        self, client, auth_headers, scheduled_workout
+    ):
+        """Test the plan has one step per warmup and working set, in order."""
+        detail = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}", headers=auth_headers
+        ).json()
+        response = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}/loading-plan",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        lift_sets = detail["sets_by_lift"]["SQUAT"]
+        expected = lift_sets["warmup_sets"] + lift_sets["main_sets"]
+        assert [(s["set_type"], s["set_number"]) for s in data["steps"]] == [
+            (s["set_type"], s["set_number"]) for s in expected
+        ]
+        assert data["steps"][-1]["set_type"] == "amrap"
+
+        for step in data["steps"]:
+            assert step["loaded_weight"] == step["target_weight"]
+            assert data["bar_weight"] + 2 * sum(step["plates"]) == step["loaded_weight"]
+
+    def test_loading_plan_changes_are_consistent(
+        self, client, auth_headers, scheduled_workout
+    ):
+        """Test replaying the removals and additions reproduces each loading."""
+        data = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}/loading-plan",
+            headers=auth_headers
+        ).json()
+
+        sleeve = []
+        changes = 0
+        for step in data["steps"]:
+            for plate in step["remove"]:
+                assert sleeve.pop() == plate
+            sleeve.extend(step["add"])
+            changes += len(step["remove"]) + len(step["add"])
+            assert sleeve == step["plates"]
+        assert changes == data["total_changes"]
+
+    def test_loading_plan_beats_set_by_set_loading(
+        self, client, auth_headers, scheduled_workout
+    ):
+        """Test the plan needs no more changes than loading each set on its own."""
+        data = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}/loading-plan",
+            headers=auth_headers
+        ).json()
+
+        solver = get_plate_solver()
+        sleeve = []
+        greedy_changes = 0
+        for step in data["steps"]:
+            plates = solver.solve(step["target_weight"]).plates
+            shared = 0
+            while shared < min(len(sleeve), len(plates)) and sleeve[shared] == plates[shared]:
+                shared += 1
+            greedy_changes += len(sleeve) + len(plates) - 2 * shared
+            sleeve = plates
+        assert data["total_changes"] <= greedy_changes
+
+    def test_loading_plan_share_bar(
+        self, client, auth_headers, db, scheduled_workout
+    ):
+        """Test two main lifts run back to back, on one bar or a fresh bar each."""
+        db.add(WorkoutMainLift(
+            id=str(uuid.uuid4()),
+            workout_id=scheduled_workout.id,
+            lift_type=LiftType.BENCH_PRESS,
+            lift_order=2,
+            current_training_max=185.0,
+            week_type=WeekType.WEEK_1_5S
+        ))
+        db.commit()
+
+        separate = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}/loading-plan",
+            headers=auth_headers
+        ).json()
+        shared = client.get(
+            f"/api/v1/workouts/{scheduled_workout.id}/loading-plan",
+            params={"share_bar": True},
+            headers=auth_headers
+        ).json()
+
+        for plan in (separate, shared):
+            lifts = [step["lift_type"] for step in plan["steps"]]
+            assert lifts == ["SQUAT"] * 7 + ["BENCH_PRESS"] * 7
+
+        # A fresh bar starts empty; a shared bar carries the squat's last loading over
+        first_bench = 7
+        assert separate["steps"][first_bench]["remove"] == []
+        assert shared["share_bar"] is True
+        assert shared["steps"][first_bench]["remove"] != []
+
+    def test_loading_plan_not_found(self, client, auth_headers):
+        """Test loading plan for non-existent workout returns 404."""
+        response = client.get(
+            "/api/v1/workouts/nonexistent-id/loading-plan",
+            headers=auth_headers
+        )
+        assert response.status_code == 404
+
+
 class TestWorkoutSkip:
     """Tests for POST /api/v1/workouts/{workout_id}/skip endpoint."""
 
@@ -394,6 +677,94 @@ class TestMissedWorkouts:
         data = response.json()
         assert data["action_taken"] == "rescheduled"
 
+    def test_handle_missed_reschedule_shifts_later_workouts(
+        self, db, client, auth_headers, past_scheduled_workout, scheduled_workout
+    ):
+        """Test rescheduling moves the rest of the schedule by the same number of days."""
+        original_date = scheduled_workout.scheduled_date
+        response = client.post(
+            f"/api/v1/workouts/{past_scheduled_workout.id}/handle-missed",
+            json={"action": "reschedule", "reschedule_date": date.today().isoformat()},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rescheduled_count"] == 2
+        assert data["workout"]["scheduled_date"] == date.today().isoformat()
+
+        db.expire_all()
+        assert db.get(Workout, scheduled_workout.id).scheduled_date == original_date + timedelta(days=3)
+
+    def _add_missed_workouts(self, db, program, days_ago):
+        """Add one scheduled squat workout for each number of days ago."""
+        workouts = []
+        for days in days_ago:
+            workout = Workout(
+                id=str(uuid.uuid4()),
+                program_id=program.id,
+                scheduled_date=date.today() - timedelta(days=days),
+                cycle_number=1,
+                week_number=1,
+                week_type=WeekType.WEEK_1_5S,
+                status=WorkoutStatus.SCHEDULED,
+                main_lifts=[WorkoutMainLift(
+                    id=str(uuid.uuid4()),
+                    lift_type=LiftType.SQUAT,
+                    lift_order=1,
+                    current_training_max=250.0,
+                    week_type=WeekType.WEEK_1_5S
+                )]
+            )
+            db.add(workout)
+            workouts.append(workout)
+        db.commit()
+        return workouts
+
+    def test_auto_reschedule_shifts_once(
+        self, db, test_user, test_program_with_training_maxes, scheduled_workout, query_budget
+    ):
+        """Test auto-rescheduling a backlog moves the earliest missed workout to today with one UPDATE."""
+        self._add_missed_workouts(db, test_program_with_training_maxes, [30, 28, 25, 21, 18])
+        test_user.missed_workout_preference = MissedWorkoutPreference.RESCHEDULE
+        db.commit()
+
+        with query_budget(None) as statements:
+            results = WorkoutService.auto_handle_missed_workouts(db, test_user)
+
+        assert len([s for s in statements if s.startswith("UPDATE workouts")]) == 1
+        assert [r.workout.scheduled_date for r in results] == [
+            date.today() + timedelta(days=offset) for offset in (0, 2, 5, 9, 12)
+        ]
+        assert {r.rescheduled_count for r in results} == {6}
+
+        db.expire_all()
+        stored = db.query(Workout).order_by(Workout.scheduled_date).all()
+        assert [w.scheduled_date for w in stored][:5] == [r.workout.scheduled_date for r in results]
+        assert db.get(Workout, scheduled_workout.id).scheduled_date == date.today() + timedelta(days=30)
+        assert WorkoutService.get_missed_workouts(db, test_user).count == 0
+
+    def test_auto_skip_marks_backlog(self, db, test_user, test_program_with_training_maxes):
+        """Test auto-skipping marks every missed workout and counts skips once per week."""
+        self._add_missed_workouts(db, test_program_with_training_maxes, [30, 29, 28, 27, 26, 25, 24])
+        test_user.missed_workout_preference = MissedWorkoutPreference.SKIP
+        db.commit()
+
+        results = WorkoutService.auto_handle_missed_workouts(db, test_user)
+        assert len(results) == 7
+        assert {r.action_taken for r in results} == {"skipped"}
+
+        db.expire_all()
+        assert db.query(Workout).filter(Workout.status == WorkoutStatus.SKIPPED).count() == 7
+        rollups = db.query(WeeklyLiftRollup).filter(WeeklyLiftRollup.lift_type == LiftType.SQUAT).all()
+        assert len({r.week_start for r in rollups}) == len(rollups)
+        assert sum(r.sessions_skipped for r in rollups) == 7
+
+    def test_auto_handle_ask_does_nothing(self, db, test_user, past_scheduled_workout):
+        """Test the 'ask' preference leaves missed workouts alone."""
+        assert WorkoutService.auto_handle_missed_workouts(db, test_user) == []
+        db.expire_all()
+        assert db.get(Workout, past_scheduled_workout.id).status == WorkoutStatus.SCHEDULED
+
     def test_handle_missed_invalid_action(
         self, client, auth_headers, past_scheduled_workout
     ):